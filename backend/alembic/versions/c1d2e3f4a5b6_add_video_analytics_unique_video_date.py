@@ -0,0 +1,49 @@
+"""add_video_analytics_unique_video_date
+
+Revision ID: c1d2e3f4a5b6
+Revises: 88d468032377
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c1d2e3f4a5b6'
+down_revision: Union[str, None] = '88d468032377'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 既存の重複行を除去（(video_id, date) ごとに最新の1行を残す）
+    op.execute("""
+        DELETE FROM video_analytics va
+        USING (
+            SELECT id,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY video_id, date
+                       ORDER BY created_at DESC, id DESC
+                   ) AS rn
+            FROM video_analytics
+        ) dup
+        WHERE va.id = dup.id AND dup.rn > 1
+    """)
+
+    # バルクUPSERT（INSERT ... ON CONFLICT）用のユニーク制約
+    op.create_unique_constraint(
+        'uq_video_analytics_video_id_date',
+        'video_analytics',
+        ['video_id', 'date'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        'uq_video_analytics_video_id_date',
+        'video_analytics',
+        type_='unique',
+    )
@@ -0,0 +1,114 @@
+"""add_analytics_rollup_tables
+
+Revision ID: d2e3f4a5b6c7
+Revises: c1d2e3f4a5b6
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2e3f4a5b6c7'
+down_revision: Union[str, None] = 'c1d2e3f4a5b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+METRIC_COLUMNS = [
+    ('views', sa.Integer(), '視聴回数'),
+    ('watch_time_minutes', sa.Float(), '総視聴時間（分）'),
+    ('likes', sa.Integer(), 'いいね数'),
+    ('comments', sa.Integer(), 'コメント数'),
+    ('shares', sa.Integer(), 'シェア数'),
+    ('subscribers_gained', sa.Integer(), '獲得登録者数'),
+    ('subscribers_lost', sa.Integer(), '解除登録者数'),
+    ('impressions', sa.Integer(), 'インプレッション数'),
+    ('ctr_sum', sa.Float(), 'CTR合計（平均算出用）'),
+    ('sample_days', sa.Integer(), '集計元の日次レコード数'),
+]
+
+
+def _metric_columns():
+    return [
+        sa.Column(name, type_, nullable=False, server_default='0', comment=comment)
+        for name, type_, comment in METRIC_COLUMNS
+    ]
+
+
+def upgrade() -> None:
+    # ============================================================
+    # video_analytics.updated_at（ロールアップのウォーターマーク）
+    # ============================================================
+    op.add_column(
+        'video_analytics',
+        sa.Column('updated_at', sa.DateTime(), nullable=True, comment='更新日時（ロールアップのウォーターマーク）'),
+    )
+    op.execute('UPDATE video_analytics SET updated_at = created_at')
+    op.alter_column('video_analytics', 'updated_at', nullable=False, server_default=sa.text('NOW()'))
+    op.create_index('ix_video_analytics_updated_at', 'video_analytics', ['updated_at'])
+
+    rollup_period = sa.Enum('DAILY', 'WEEKLY', 'MONTHLY', name='rollupperiod')
+
+    # ============================================================
+    # Video Analytics Rollups table
+    # ============================================================
+    op.create_table('video_analytics_rollups',
+        sa.Column('id', UUID(as_uuid=True), nullable=False, comment='ロールアップID（UUID）'),
+        sa.Column('period', rollup_period, nullable=False, comment='集計単位'),
+        sa.Column('video_id', UUID(as_uuid=True), nullable=False, comment='動画ID（外部キー）'),
+        sa.Column('client_id', UUID(as_uuid=True), nullable=False, comment='クライアントID（非正規化）'),
+        sa.Column('date', sa.Date(), nullable=False, comment='集計期間の開始日'),
+        *_metric_columns(),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('NOW()'), comment='更新日時'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['video_id'], ['videos.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['client_id'], ['clients.id'], ondelete='CASCADE'),
+        sa.UniqueConstraint('period', 'video_id', 'date', name='uq_video_analytics_rollups_period_video_date'),
+    )
+    op.create_index('ix_video_analytics_rollups_client_id', 'video_analytics_rollups', ['client_id'])
+    op.create_index('ix_video_analytics_rollups_date_brin', 'video_analytics_rollups', ['date'], postgresql_using='brin')
+
+    # ============================================================
+    # Client Analytics Rollups table
+    # ============================================================
+    op.create_table('client_analytics_rollups',
+        sa.Column('id', UUID(as_uuid=True), nullable=False, comment='ロールアップID（UUID）'),
+        sa.Column('period', sa.Enum('DAILY', 'WEEKLY', 'MONTHLY', name='rollupperiod', create_type=False), nullable=False, comment='集計単位'),
+        sa.Column('client_id', UUID(as_uuid=True), nullable=False, comment='クライアントID（外部キー）'),
+        sa.Column('date', sa.Date(), nullable=False, comment='集計期間の開始日'),
+        *_metric_columns(),
+        sa.Column('video_count', sa.Integer(), nullable=False, server_default='0', comment='データのある動画数'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('NOW()'), comment='更新日時'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['client_id'], ['clients.id'], ondelete='CASCADE'),
+        sa.UniqueConstraint('period', 'client_id', 'date', name='uq_client_analytics_rollups_period_client_date'),
+    )
+    op.create_index('ix_client_analytics_rollups_date_brin', 'client_analytics_rollups', ['date'], postgresql_using='brin')
+
+    # ============================================================
+    # Analytics Rollup Watermarks table
+    # ============================================================
+    op.create_table('analytics_rollup_watermarks',
+        sa.Column('name', sa.String(100), nullable=False, comment='ウォーターマーク名'),
+        sa.Column('watermark', sa.DateTime(), nullable=False, comment='処理済みの最終更新日時'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('NOW()'), comment='更新日時'),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('analytics_rollup_watermarks')
+    op.drop_index('ix_client_analytics_rollups_date_brin', table_name='client_analytics_rollups')
+    op.drop_table('client_analytics_rollups')
+    op.drop_index('ix_video_analytics_rollups_date_brin', table_name='video_analytics_rollups')
+    op.drop_index('ix_video_analytics_rollups_client_id', table_name='video_analytics_rollups')
+    op.drop_table('video_analytics_rollups')
+    op.execute('DROP TYPE IF EXISTS rollupperiod')
+
+    op.drop_index('ix_video_analytics_updated_at', table_name='video_analytics')
+    op.drop_column('video_analytics', 'updated_at')
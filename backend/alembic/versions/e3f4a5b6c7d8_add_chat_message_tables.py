@@ -0,0 +1,146 @@
+"""add_chat_message_tables
+
+Revision ID: e3f4a5b6c7d8
+Revises: d2e3f4a5b6c7
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3f4a5b6c7d8'
+down_revision: Union[str, None] = 'd2e3f4a5b6c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+UUID_PATTERN = '^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$'
+
+
+def upgrade() -> None:
+    # ============================================================
+    # Chat Messages table（ナレッジ構築チャット）
+    # ============================================================
+    op.create_table('chat_messages',
+        sa.Column('id', UUID(as_uuid=True), nullable=False, comment='メッセージID（UUID）'),
+        sa.Column('session_id', UUID(as_uuid=True), nullable=False, comment='チャットセッションID（外部キー）'),
+        sa.Column('role', sa.String(20), nullable=False, comment='ロール（user/assistant）'),
+        sa.Column('content', sa.Text(), nullable=False, comment='メッセージ内容'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='送信日時'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['session_id'], ['chat_sessions.id'], ondelete='CASCADE'),
+    )
+    op.create_index('ix_chat_messages_session_id_created_at', 'chat_messages', ['session_id', 'created_at'])
+
+    # ============================================================
+    # Planning Chat Messages table（企画チャット）
+    # ============================================================
+    op.create_table('planning_chat_messages',
+        sa.Column('id', UUID(as_uuid=True), nullable=False, comment='メッセージID（UUID）'),
+        sa.Column('session_id', UUID(as_uuid=True), nullable=False, comment='セッションID（外部キー）'),
+        sa.Column('role', sa.String(20), nullable=False, comment='ロール（user/assistant）'),
+        sa.Column('content', sa.Text(), nullable=False, comment='メッセージ内容'),
+        sa.Column('suggestions', JSONB(), nullable=True, comment='提案（[{id, title, description, type, tags, estimated_views, confidence}]）'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='送信日時'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['session_id'], ['planning_chat_sessions.id'], ondelete='CASCADE'),
+    )
+    op.create_index('ix_planning_chat_messages_session_id_created_at', 'planning_chat_messages', ['session_id', 'created_at'])
+
+    # ============================================================
+    # 既存のJSONB履歴をバックフィル
+    # 配列内の順序を保つため、送信日時に配列位置（マイクロ秒）を加算する
+    # ============================================================
+    op.execute("""
+        INSERT INTO chat_messages (id, session_id, role, content, created_at)
+        SELECT
+            gen_random_uuid(),
+            s.id,
+            COALESCE(m.elem->>'role', 'user'),
+            COALESCE(m.elem->>'content', ''),
+            COALESCE((m.elem->>'timestamp')::timestamp, s.created_at)
+                + m.ord * INTERVAL '1 microsecond'
+        FROM chat_sessions s
+        CROSS JOIN LATERAL jsonb_array_elements(s.messages) WITH ORDINALITY AS m(elem, ord)
+        WHERE jsonb_typeof(s.messages) = 'array'
+    """)
+
+    op.execute(f"""
+        INSERT INTO planning_chat_messages (id, session_id, role, content, suggestions, created_at)
+        SELECT
+            CASE
+                WHEN m.elem->>'message_id' ~ '{UUID_PATTERN}' THEN (m.elem->>'message_id')::uuid
+                ELSE gen_random_uuid()
+            END,
+            s.id,
+            COALESCE(m.elem->>'type', 'user'),
+            COALESCE(m.elem->>'content', ''),
+            COALESCE(m.elem->'suggestions', '[]'::jsonb),
+            COALESCE((m.elem->>'created_at')::timestamp, s.created_at)
+                + m.ord * INTERVAL '1 microsecond'
+        FROM planning_chat_sessions s
+        CROSS JOIN LATERAL jsonb_array_elements(s.messages) WITH ORDINALITY AS m(elem, ord)
+        WHERE jsonb_typeof(s.messages) = 'array'
+        ON CONFLICT (id) DO NOTHING
+    """)
+
+    # 旧履歴の列は書き込まなくなるため、INSERT時に省略できるよう既定値を付ける
+    for table in ('chat_sessions', 'planning_chat_sessions'):
+        op.alter_column(table, 'messages', server_default=sa.text("'[]'::jsonb"))
+
+
+def downgrade() -> None:
+    for table in ('chat_sessions', 'planning_chat_sessions'):
+        op.alter_column(table, 'messages', server_default=None)
+
+    # メッセージテーブルの内容をJSONB履歴へ書き戻す
+    op.execute("""
+        UPDATE chat_sessions s
+        SET messages = agg.messages
+        FROM (
+            SELECT
+                session_id,
+                jsonb_agg(
+                    jsonb_build_object(
+                        'role', role,
+                        'content', content,
+                        'timestamp', to_char(created_at, 'YYYY-MM-DD"T"HH24:MI:SS.US')
+                    )
+                    ORDER BY created_at, id
+                ) AS messages
+            FROM chat_messages
+            GROUP BY session_id
+        ) agg
+        WHERE s.id = agg.session_id
+    """)
+    op.execute("""
+        UPDATE planning_chat_sessions s
+        SET messages = agg.messages
+        FROM (
+            SELECT
+                session_id,
+                jsonb_agg(
+                    jsonb_build_object(
+                        'message_id', id::text,
+                        'type', role,
+                        'content', content,
+                        'suggestions', COALESCE(suggestions, '[]'::jsonb),
+                        'created_at', to_char(created_at, 'YYYY-MM-DD"T"HH24:MI:SS.US')
+                    )
+                    ORDER BY created_at, id
+                ) AS messages
+            FROM planning_chat_messages
+            GROUP BY session_id
+        ) agg
+        WHERE s.id = agg.session_id
+    """)
+
+    op.drop_index('ix_planning_chat_messages_session_id_created_at', table_name='planning_chat_messages')
+    op.drop_table('planning_chat_messages')
+    op.drop_index('ix_chat_messages_session_id_created_at', table_name='chat_messages')
+    op.drop_table('chat_messages')
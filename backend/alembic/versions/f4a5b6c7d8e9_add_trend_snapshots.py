@@ -0,0 +1,52 @@
+"""add_trend_snapshots
+
+Revision ID: f4a5b6c7d8e9
+Revises: e3f4a5b6c7d8
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a5b6c7d8e9'
+down_revision: Union[str, None] = 'e3f4a5b6c7d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ============================================================
+    # Trend Snapshots table（キーワードごとのトレンドスコア時系列）
+    # ============================================================
+    op.create_table('trend_snapshots',
+        sa.Column('id', UUID(as_uuid=True), nullable=False, comment='スナップショットID（UUID）'),
+        sa.Column('knowledge_id', UUID(as_uuid=True), nullable=True, comment='ナレッジID（外部キー）'),
+        sa.Column('keyword', sa.String(length=255), nullable=False, comment='監視キーワード'),
+        sa.Column('score', sa.Float(), nullable=False, comment='総合トレンドスコア'),
+        sa.Column('trends_score', sa.Float(), nullable=False, server_default='0', comment='Google Trendsスコア'),
+        sa.Column('youtube_score', sa.Float(), nullable=False, server_default='0', comment='YouTubeスコア'),
+        sa.Column('delta', sa.Float(), nullable=True, comment='前回スナップショットとの差分'),
+        sa.Column('importance', sa.String(length=20), nullable=True, comment='重要度（high/medium/low）'),
+        sa.Column('captured_at', sa.DateTime(), nullable=False, server_default=sa.text('NOW()'), comment='取得日時'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['knowledge_id'], ['knowledges.id'], ondelete='CASCADE'),
+    )
+    op.create_index(
+        'ix_trend_snapshots_knowledge_id_keyword_captured_at',
+        'trend_snapshots',
+        ['knowledge_id', 'keyword', 'captured_at'],
+    )
+
+    # 未対応アラートの重複チェック用
+    op.create_index('ix_trend_alerts_knowledge_id_keyword', 'trend_alerts', ['knowledge_id', 'keyword'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_trend_alerts_knowledge_id_keyword', table_name='trend_alerts')
+    op.drop_index('ix_trend_snapshots_knowledge_id_keyword_captured_at', table_name='trend_snapshots')
+    op.drop_table('trend_snapshots')
@@ -0,0 +1,43 @@
+"""add_keyset_pagination_indexes
+
+Revision ID: g5b6c7d8e9f0
+Revises: f4a5b6c7d8e9
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'g5b6c7d8e9f0'
+down_revision: Union[str, None] = 'f4a5b6c7d8e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 一覧のキーセットページング用インデックス（並び順の列, id）
+# (インデックス名, テーブル名, 列)
+KEYSET_INDEXES = [
+    ('ix_projects_created_at_id', 'projects', ['created_at', 'id']),
+    ('ix_projects_client_id_created_at_id', 'projects', ['client_id', 'created_at', 'id']),
+    ('ix_knowledges_created_at_id', 'knowledges', ['created_at', 'id']),
+    ('ix_knowledges_client_id_created_at_id', 'knowledges', ['client_id', 'created_at', 'id']),
+    ('ix_audit_logs_created_at_id', 'audit_logs', ['created_at', 'id']),
+    ('ix_agent_tasks_created_at_id', 'agent_tasks', ['created_at', 'id']),
+    ('ix_agent_tasks_agent_id_created_at_id', 'agent_tasks', ['agent_id', 'created_at', 'id']),
+    ('ix_performance_records_recorded_at_id', 'performance_records', ['recorded_at', 'id']),
+    ('ix_content_dnas_created_at_id', 'content_dnas', ['created_at', 'id']),
+    ('ix_ab_tests_created_at_id', 'ab_tests', ['created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in KEYSET_INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(KEYSET_INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,81 @@
+"""add_daily_stat_counters
+
+Revision ID: h6c7d8e9f0a1
+Revises: g5b6c7d8e9f0
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'h6c7d8e9f0a1'
+down_revision: Union[str, None] = 'g5b6c7d8e9f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ============================================================
+    # CTA Daily Stats table（CTAごとの日次クリック数）
+    # ============================================================
+    op.create_table('cta_daily_stats',
+        sa.Column('id', UUID(as_uuid=True), nullable=False, comment='集計ID（UUID）'),
+        sa.Column('cta_id', UUID(as_uuid=True), nullable=False, comment='CTA ID'),
+        sa.Column('date', sa.Date(), nullable=False, comment='集計日（UTC）'),
+        sa.Column('clicks', sa.Integer(), nullable=False, server_default='0', comment='クリック数'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('NOW()'), comment='更新日時'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['cta_id'], ['cta_templates.id'], ondelete='CASCADE'),
+        sa.UniqueConstraint('cta_id', 'date', name='uq_cta_daily_stats_cta_id_date'),
+    )
+
+    # ============================================================
+    # Engagement Daily Stats table（連携ごとの日次指標）
+    # ============================================================
+    op.create_table('engagement_daily_stats',
+        sa.Column('id', UUID(as_uuid=True), nullable=False, comment='集計ID（UUID）'),
+        sa.Column('link_id', UUID(as_uuid=True), nullable=False, comment='連携ID（外部キー）'),
+        sa.Column('date', sa.Date(), nullable=False, comment='集計日'),
+        sa.Column('short_views', sa.Integer(), nullable=False, server_default='0', comment='ショート動画再生回数'),
+        sa.Column('click_through_count', sa.Integer(), nullable=False, server_default='0', comment='クリックスルー数'),
+        sa.Column('conversion_count', sa.Integer(), nullable=False, server_default='0', comment='コンバージョン数'),
+        sa.Column('ctr_sum', sa.Float(), nullable=False, server_default='0', comment='CTR合計（平均算出用）'),
+        sa.Column('ctr_samples', sa.Integer(), nullable=False, server_default='0', comment='CTRを算出できた記録数'),
+        sa.Column('conversion_rate_sum', sa.Float(), nullable=False, server_default='0', comment='コンバージョン率合計（平均算出用）'),
+        sa.Column('conversion_rate_samples', sa.Integer(), nullable=False, server_default='0', comment='コンバージョン率を算出できた記録数'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('NOW()'), comment='更新日時'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['link_id'], ['short_to_long_links.id'], ondelete='CASCADE'),
+        sa.UniqueConstraint('link_id', 'date', name='uq_engagement_daily_stats_link_id_date'),
+    )
+
+    # 既存の生データから初期値を集計
+    op.execute("""
+        INSERT INTO cta_daily_stats (id, cta_id, date, clicks)
+        SELECT gen_random_uuid(), cta_id, clicked_at::date, COUNT(*)
+        FROM cta_click_logs
+        GROUP BY cta_id, clicked_at::date
+    """)
+    op.execute("""
+        INSERT INTO engagement_daily_stats (
+            id, link_id, date, short_views, click_through_count, conversion_count,
+            ctr_sum, ctr_samples, conversion_rate_sum, conversion_rate_samples
+        )
+        SELECT
+            gen_random_uuid(), link_id, recorded_date::date,
+            SUM(short_views), SUM(click_through_count), SUM(conversion_count),
+            COALESCE(SUM(click_through_rate), 0), COUNT(click_through_rate),
+            COALESCE(SUM(conversion_rate), 0), COUNT(conversion_rate)
+        FROM engagement_metrics
+        GROUP BY link_id, recorded_date::date
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('engagement_daily_stats')
+    op.drop_table('cta_daily_stats')
@@ -0,0 +1,35 @@
+"""add_ab_test_evaluation
+
+Revision ID: i7d8e9f0a1b2
+Revises: h6c7d8e9f0a1
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'i7d8e9f0a1b2'
+down_revision: Union[str, None] = 'h6c7d8e9f0a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('ab_tests', sa.Column(
+        'evaluation', JSONB(), nullable=True,
+        comment='最新の評価結果（逐次検定・ベイズ事後分布）',
+    ))
+    op.add_column('ab_tests', sa.Column(
+        'evaluated_at', sa.DateTime(), nullable=True,
+        comment='評価日時',
+    ))
+
+
+def downgrade() -> None:
+    op.drop_column('ab_tests', 'evaluated_at')
+    op.drop_column('ab_tests', 'evaluation')
@@ -0,0 +1,33 @@
+"""add_cta_click_stream_entry_id
+
+Revision ID: j8e9f0a1b2c3
+Revises: i7d8e9f0a1b2
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'j8e9f0a1b2c3'
+down_revision: Union[str, None] = 'i7d8e9f0a1b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('cta_click_logs', sa.Column(
+        'stream_entry_id', sa.String(64), nullable=True,
+        comment='クリックストリームのエントリID（再処理時の重複書き込み防止。直接書き込みはNULL）',
+    ))
+    op.create_unique_constraint(
+        'uq_cta_click_logs_stream_entry_id', 'cta_click_logs', ['stream_entry_id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_cta_click_logs_stream_entry_id', 'cta_click_logs', type_='unique')
+    op.drop_column('cta_click_logs', 'stream_entry_id')
@@ -0,0 +1,29 @@
+"""add_trend_snapshot_importance_score
+
+Revision ID: k9f0a1b2c3d4
+Revises: j8e9f0a1b2c3
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'k9f0a1b2c3d4'
+down_revision: Union[str, None] = 'j8e9f0a1b2c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('trend_snapshots', sa.Column(
+        'importance_score', sa.Float(), nullable=True,
+        comment='重要度を判定した時点のスコア（再利用の可否はこのスコアとの差で判断）',
+    ))
+
+
+def downgrade() -> None:
+    op.drop_column('trend_snapshots', 'importance_score')
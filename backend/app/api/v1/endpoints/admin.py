@@ -187,13 +187,16 @@ async def list_audit_logs(
     page_size: int = Query(50, ge=1, le=100, description="ページサイズ"),
     action: Optional[AuditAction] = Query(None, description="アクションフィルター"),
     resource_type: Optional[str] = Query(None, description="リソース種別フィルター"),
+    cursor: Optional[str] = Query(None, description="前ページの next_cursor（指定時は page より優先）"),
+    exact_count: bool = Query(False, description="正確な総件数を返すか（デフォルトは推定値）"),
     db: AsyncSession = Depends(get_db_session),
     current_user_id: str = Depends(get_current_user_id),
     current_user_role: str = Depends(get_current_user_role),
 ) -> AuditLogListResponse:
     """監査ログ一覧取得エンドポイント"""
     return await AuditLogService.list_logs(
-        db, current_user_role, page, page_size, action, resource_type
+        db, current_user_role, page, page_size, action, resource_type,
+        cursor=cursor, exact_count=exact_count,
     )
 
 
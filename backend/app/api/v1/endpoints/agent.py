@@ -11,6 +11,7 @@ from sqlalchemy import select, func, and_, cast, String
 from uuid import UUID
 
 from app.core.database import get_db
+from app.core.pagination import paginate
 from app.api.deps import get_current_user_id_dev as get_current_user_id
 from app.models.agent import (
     Agent,
@@ -274,6 +275,8 @@ async def get_agent_tasks(
     priority: Optional[str] = Query(None, description="優先度でフィルタ"),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="前ページの next_cursor（指定時は skip より優先）"),
+    exact_count: bool = Query(False, description="正確な総件数を返すか（デフォルトは推定値）"),
     db: AsyncSession = Depends(get_db),
     _current_user_id: str = Depends(get_current_user_id),
 ):
@@ -287,19 +290,16 @@ async def get_agent_tasks(
     if priority:
         query = query.where(AgentTask.priority == priority)
 
-    # Count total
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-
-    # Fetch with pagination
-    query = query.offset(skip).limit(limit).order_by(AgentTask.created_at.desc())
-    result = await db.execute(query)
-    tasks = result.scalars().all()
+    page = await paginate(
+        db, query, AgentTask.created_at, AgentTask.id, limit,
+        cursor=cursor, offset=skip, exact_count=exact_count,
+    )
 
     return AgentTaskListResponse(
-        tasks=[AgentTaskResponse.model_validate(t) for t in tasks],
-        total=total,
+        tasks=[AgentTaskResponse.model_validate(t) for t in page.items],
+        total=page.total,
+        next_cursor=page.next_cursor,
+        total_is_estimate=page.total_is_estimate,
     )
 
 
@@ -248,7 +248,7 @@ async def get_cta_stats(
 @router.post(
     "/{cta_id}/click",
     summary="CTAクリック記録",
-    description="CTAクリックイベントを記録します（トラッキング用）。",
+    description="CTAクリックイベントを記録します（トラッキング用）。クリックはキューに追加され、集計への反映はバックグラウンドで行われます。",
 )
 async def record_cta_click(
     request: Request,
@@ -11,6 +11,7 @@ from sqlalchemy import select, func
 from uuid import UUID
 
 from app.core.database import get_db
+from app.core.pagination import paginate
 from app.api.deps import get_current_user_id_dev as get_current_user_id
 from app.models.dna import (
     ContentDNA,
@@ -57,6 +58,8 @@ async def get_content_dnas(
     video_id: Optional[str] = Query(None, description="動画IDでフィルタ"),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="前ページの next_cursor（指定時は skip より優先）"),
+    exact_count: bool = Query(False, description="正確な総件数を返すか（デフォルトは推定値）"),
     db: AsyncSession = Depends(get_db),
     _current_user_id: str = Depends(get_current_user_id),
 ):
@@ -68,15 +71,10 @@ async def get_content_dnas(
     if video_id:
         query = query.where(ContentDNA.video_id == UUID(video_id))
 
-    # Count total
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-
-    # Fetch with pagination
-    query = query.offset(skip).limit(limit).order_by(ContentDNA.created_at.desc())
-    result = await db.execute(query)
-    dnas = result.scalars().all()
+    page = await paginate(
+        db, query, ContentDNA.created_at, ContentDNA.id, limit,
+        cursor=cursor, offset=skip, exact_count=exact_count,
+    )
 
     return ContentDNAListResponse(
         dnas=[
@@ -104,9 +102,11 @@ async def get_content_dnas(
                 created_at=d.created_at,
                 updated_at=d.updated_at,
             )
-            for d in dnas
+            for d in page.items
         ],
-        total=total,
+        total=page.total,
+        next_cursor=page.next_cursor,
+        total_is_estimate=page.total_is_estimate,
     )
 
 
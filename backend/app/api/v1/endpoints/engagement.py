@@ -34,6 +34,7 @@ from app.schemas.engagement import (
     VideoSummary,
     EngagementDailyStats,
 )
+from app.services.daily_stats_service import DailyStatsService
 
 router = APIRouter()
 
@@ -298,55 +299,24 @@ async def get_engagement_summary(
     db: AsyncSession = Depends(get_db),
     _current_user_id: str = Depends(get_current_user_id),
 ):
-    """エンゲージメントサマリーを取得"""
-    # Total links
-    total_result = await db.execute(
-        select(func.count()).select_from(ShortToLongLink)
+    """エンゲージメントサマリーを取得（クリック・コンバージョンは日次集計から算出）"""
+    links_result = await db.execute(
+        select(
+            func.count(),
+            func.count().filter(ShortToLongLink.is_active == True),
+        ).select_from(ShortToLongLink)
     )
-    total_links = total_result.scalar() or 0
+    total_links, active_links = links_result.one()
 
-    # Active links
-    active_result = await db.execute(
-        select(func.count()).select_from(ShortToLongLink).where(
-            ShortToLongLink.is_active == True
-        )
-    )
-    active_links = active_result.scalar() or 0
-
-    # Total clicks
-    clicks_result = await db.execute(
-        select(func.sum(EngagementMetrics.click_through_count))
-    )
-    total_clicks = clicks_result.scalar() or 0
-
-    # Total conversions
-    conv_result = await db.execute(
-        select(func.sum(EngagementMetrics.conversion_count))
-    )
-    total_conversions = conv_result.scalar() or 0
-
-    # Calculate averages
-    avg_ctr = 0.0
-    avg_conv_rate = 0.0
-
-    if total_links > 0:
-        ctr_result = await db.execute(
-            select(func.avg(EngagementMetrics.click_through_rate))
-        )
-        avg_ctr = ctr_result.scalar() or 0.0
-
-        conv_rate_result = await db.execute(
-            select(func.avg(EngagementMetrics.conversion_rate))
-        )
-        avg_conv_rate = conv_rate_result.scalar() or 0.0
+    totals = await DailyStatsService.get_engagement_totals(db)
 
     return EngagementSummary(
         total_links=total_links,
         active_links=active_links,
-        total_clicks=total_clicks,
-        avg_ctr=round(avg_ctr, 2),
-        total_conversions=total_conversions,
-        avg_conversion_rate=round(avg_conv_rate, 2),
+        total_clicks=totals["total_clicks"],
+        avg_ctr=round(totals["avg_ctr"], 2),
+        total_conversions=totals["total_conversions"],
+        avg_conversion_rate=round(totals["avg_conversion_rate"], 2),
     )
 
 
@@ -465,6 +435,16 @@ async def record_metrics(
         conversion_rate=conv_rate,
     )
     db.add(metrics)
+    await DailyStatsService.add_engagement_metrics(
+        db,
+        link_id=UUID(link_id),
+        day=data.recorded_date.date(),
+        short_views=data.short_views,
+        click_through_count=data.click_through_count,
+        conversion_count=data.conversion_count,
+        click_through_rate=ctr,
+        conversion_rate=conv_rate,
+    )
     await db.commit()
     await db.refresh(metrics)
 
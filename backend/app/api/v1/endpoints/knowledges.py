@@ -6,6 +6,7 @@
 from typing import Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 import math
 
@@ -17,11 +18,11 @@ from app.schemas.knowledge import (
     KnowledgeListResponse,
     ChatSessionResponse,
     ChatMessageRequest,
-    ChatMessage,
     RAGAnalysisRequest,
     RAGAnalysisResponse,
     RAGMissingField,
 )
+from app.core.sse import sse_broker
 from app.services.knowledge_service import KnowledgeService
 from app.services.embedding_service import embedding_service
 
@@ -65,6 +66,8 @@ async def get_knowledges(
     page: int = 1,
     limit: int = 20,
     client_id: Optional[UUID] = None,
+    cursor: Optional[str] = None,
+    exact_count: bool = False,
     db: AsyncSession = Depends(get_db_session),
     current_user_role: str = Depends(get_current_user_role),
 ) -> KnowledgeListResponse:
@@ -75,25 +78,29 @@ async def get_knowledges(
         page: ページ番号（デフォルト: 1）
         limit: 1ページあたりの件数（デフォルト: 20）
         client_id: クライアントIDフィルタ（オプション）
+        cursor: 前ページの next_cursor（指定時は page より優先）
+        exact_count: 正確な総件数を返すか（デフォルト: 推定値）
         db: データベースセッション
         current_user_role: 実行者のロール
 
     Returns:
         KnowledgeListResponse: ナレッジ一覧データ
     """
-    knowledges, total = await KnowledgeService.get_knowledges(
-        db, current_user_role, page, limit, client_id
+    result = await KnowledgeService.get_knowledges(
+        db, current_user_role, page, limit, client_id, cursor=cursor, exact_count=exact_count
     )
 
     # ページ情報計算
-    total_pages = math.ceil(total / limit) if total > 0 else 1
+    total_pages = math.ceil(result.total / limit) if result.total > 0 else 1
 
     return KnowledgeListResponse(
-        data=[KnowledgeResponse.model_validate(knowledge) for knowledge in knowledges],
-        total=total,
+        data=[KnowledgeResponse.model_validate(knowledge) for knowledge in result.items],
+        total=result.total,
         page=page,
         page_size=limit,
         total_pages=total_pages,
+        next_cursor=result.next_cursor,
+        total_is_estimate=result.total_is_estimate,
     )
 
 
@@ -181,15 +188,7 @@ async def get_chat_session(
         db, knowledge_id, current_user_role
     )
 
-    # messagesをChatMessageのリストに変換
-    messages = [
-        ChatMessage(
-            role=msg["role"],
-            content=msg["content"],
-            timestamp=msg["timestamp"]
-        )
-        for msg in (chat_session.messages or [])
-    ]
+    messages = await KnowledgeService.get_chat_messages(db, chat_session.id)
 
     return ChatSessionResponse(
         id=chat_session.id,
@@ -230,15 +229,7 @@ async def send_chat_message(
         db, knowledge_id, message_data, current_user_role
     )
 
-    # messagesをChatMessageのリストに変換
-    messages = [
-        ChatMessage(
-            role=msg["role"],
-            content=msg["content"],
-            timestamp=msg["timestamp"]
-        )
-        for msg in (chat_session.messages or [])
-    ]
+    messages = await KnowledgeService.get_chat_messages(db, chat_session.id)
 
     return ChatSessionResponse(
         id=chat_session.id,
@@ -251,6 +242,37 @@ async def send_chat_message(
     )
 
 
+@router.post(
+    "/{knowledge_id}/chat/stream",
+    response_class=StreamingResponse,
+    summary="チャットメッセージ送信（ストリーミング）",
+    description="AI応答をServer-Sent Eventsで配信します。完了時にメッセージを保存します。"
+                "切断時は GET /streams/{stream_id} に Last-Event-ID を付けて再接続できます。Owner/Teamのみ実行可能です。",
+)
+async def stream_chat_message(
+    knowledge_id: UUID,
+    message_data: ChatMessageRequest,
+    db: AsyncSession = Depends(get_db_session),
+    current_user_role: str = Depends(get_current_user_role),
+) -> StreamingResponse:
+    """
+    チャットメッセージ送信ストリーミングエンドポイント
+
+    Args:
+        knowledge_id: ナレッジID
+        message_data: メッセージデータ
+        db: データベースセッション
+        current_user_role: 実行者のロール
+
+    Returns:
+        StreamingResponse: SSEストリーム
+    """
+    stream_id = await KnowledgeService.stream_chat_message(
+        db, knowledge_id, message_data, current_user_role
+    )
+    return sse_broker.response(stream_id)
+
+
 # ============================================================
 # RAG解析エンドポイント
 # ============================================================
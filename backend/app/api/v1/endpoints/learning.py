@@ -11,6 +11,7 @@ from sqlalchemy import select, func
 from uuid import UUID
 
 from app.core.database import get_db
+from app.core.pagination import paginate
 from app.api.deps import get_current_user_id_dev as get_current_user_id
 from app.models.learning import (
     PerformanceRecord,
@@ -42,6 +43,7 @@ from app.schemas.learning import (
     LearningAnalysisRequest,
     LearningAnalysisResponse,
 )
+from app.services.learning_service import learning_service
 
 router = APIRouter()
 
@@ -58,6 +60,8 @@ async def get_performance_records(
     video_type: Optional[str] = Query(None, description="動画タイプでフィルタ"),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="前ページの next_cursor（指定時は skip より優先）"),
+    exact_count: bool = Query(False, description="正確な総件数を返すか（デフォルトは推定値）"),
     db: AsyncSession = Depends(get_db),
     _current_user_id: str = Depends(get_current_user_id),
 ):
@@ -73,15 +77,10 @@ async def get_performance_records(
     if video_type:
         query = query.where(PerformanceRecord.video_type == video_type)
 
-    # Count total
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-
-    # Fetch with pagination
-    query = query.offset(skip).limit(limit).order_by(PerformanceRecord.recorded_at.desc())
-    result = await db.execute(query)
-    records = result.scalars().all()
+    page = await paginate(
+        db, query, PerformanceRecord.recorded_at, PerformanceRecord.id, limit,
+        cursor=cursor, offset=skip, exact_count=exact_count,
+    )
 
     return PerformanceRecordListResponse(
         records=[
@@ -120,9 +119,11 @@ async def get_performance_records(
                 created_at=r.created_at,
                 updated_at=r.updated_at,
             )
-            for r in records
+            for r in page.items
         ],
-        total=total,
+        total=page.total,
+        next_cursor=page.next_cursor,
+        total_is_estimate=page.total_is_estimate,
     )
 
 
@@ -170,6 +171,11 @@ async def create_performance_record(
 
     db.add(record)
     await db.commit()
+
+    # チャンネル単位のベースラインで再スコアリング（ベクトル化済みのため取り込み毎に実行）
+    if record.knowledge_id:
+        await learning_service.rescore_knowledge(db, record.knowledge_id)
+
     await db.refresh(record)
 
     return PerformanceRecordResponse(
@@ -209,6 +215,16 @@ async def create_performance_record(
     )
 
 
+@router.post("/records/rescore")
+async def rescore_performance_records(
+    knowledge_id: UUID = Query(..., description="再スコアリング対象のナレッジID"),
+    db: AsyncSession = Depends(get_db),
+    _current_user_id: str = Depends(get_current_user_id),
+):
+    """ナレッジの全パフォーマンス記録をチャンネル実績ベースラインで再スコアリング"""
+    return await learning_service.rescore_knowledge(db, knowledge_id)
+
+
 @router.get("/records/{record_id}", response_model=PerformanceRecordResponse)
 async def get_performance_record(
     record_id: str,
@@ -307,6 +323,10 @@ async def update_performance_record(
     record.updated_at = datetime.utcnow()
 
     await db.commit()
+
+    if record.knowledge_id:
+        await learning_service.rescore_knowledge(db, record.knowledge_id)
+
     await db.refresh(record)
 
     return PerformanceRecordResponse(
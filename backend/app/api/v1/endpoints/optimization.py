@@ -18,6 +18,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
+from app.core.pagination import paginate
+from app.services.ab_test_evaluator import (
+    DEFAULT_CONFIDENCE_LEVEL,
+    STOP_SIGNIFICANT,
+    ABTestEvaluation,
+    evaluate_ab_test,
+)
 from app.api.deps import get_current_user_id_dev as get_current_user_id
 from app.models.optimization import (
     RetentionCurve,
@@ -46,6 +53,7 @@ from app.schemas.optimization import (
     ABTestResponse,
     ABTestListResponse,
     ABTestResultResponse,
+    ABTestEvaluationResponse,
     ABTestVariantUpdate,
     PostingTimeAnalysisCreate,
     PostingTimeAnalysisResponse,
@@ -254,6 +262,8 @@ async def list_ab_tests(
     status: Optional[str] = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="前ページの next_cursor（指定時は skip より優先）"),
+    exact_count: bool = Query(False, description="正確な総件数を返すか（デフォルトは推定値）"),
     db: AsyncSession = Depends(get_db),
     _current_user_id: str = Depends(get_current_user_id),
 ):
@@ -267,23 +277,17 @@ async def list_ab_tests(
     if status:
         query = query.where(ABTest.status == ABTestStatusModel(status))
 
-    # カウント
-    count_query = select(func.count(ABTest.id))
-    if video_id:
-        count_query = count_query.where(ABTest.video_id == video_id)
-    if knowledge_id:
-        count_query = count_query.where(ABTest.knowledge_id == knowledge_id)
-    if status:
-        count_query = count_query.where(ABTest.status == ABTestStatusModel(status))
-
-    count_result = await db.execute(count_query)
-    total = count_result.scalar() or 0
-
-    query = query.order_by(ABTest.created_at.desc()).offset(skip).limit(limit)
-    result = await db.execute(query)
-    tests = result.scalars().all()
+    page = await paginate(
+        db, query, ABTest.created_at, ABTest.id, limit,
+        cursor=cursor, offset=skip, exact_count=exact_count,
+    )
 
-    return ABTestListResponse(tests=tests, total=total)
+    return ABTestListResponse(
+        tests=page.items,
+        total=page.total,
+        next_cursor=page.next_cursor,
+        total_is_estimate=page.total_is_estimate,
+    )
 
 
 @router.get("/abtest/{test_id}", response_model=ABTestResponse)
@@ -386,13 +390,8 @@ async def start_ab_test(
     return ab_test
 
 
-@router.post("/abtest/{test_id}/complete", response_model=ABTestResultResponse)
-async def complete_ab_test(
-    test_id: UUID,
-    db: AsyncSession = Depends(get_db),
-    _current_user_id: str = Depends(get_current_user_id),
-):
-    """A/Bテストを完了し結果を取得"""
+async def _get_ab_test(db: AsyncSession, test_id: UUID) -> ABTest:
+    """バリアントを含めてA/Bテストを取得（存在しない場合は404）"""
     result = await db.execute(
         select(ABTest)
         .options(selectinload(ABTest.variants))
@@ -406,34 +405,144 @@ async def complete_ab_test(
             detail="A/Bテストが見つかりません",
         )
 
+    return ab_test
+
+
+def _evaluate(ab_test: ABTest, final: bool = False) -> ABTestEvaluation:
+    """A/Bテストを評価（テスト設定が範囲外の場合は400）"""
+    try:
+        return evaluate_ab_test(ab_test, final=final)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A/Bテストの設定が不正です: {e}",
+        )
+
+
+def _significance_level(ab_test: ABTest, evaluation: Optional[ABTestEvaluation]) -> Optional[float]:
+    """有意差を確認した信頼水準（有意差がない場合はNone）"""
+    if evaluation is None or evaluation.stop_reason != STOP_SIGNIFICANT:
+        return None
+    return ab_test.confidence_level if ab_test.confidence_level is not None else DEFAULT_CONFIDENCE_LEVEL
+
+
+def _store_evaluation(ab_test: ABTest, evaluation: ABTestEvaluation) -> None:
+    """評価結果をテストに保存"""
+    ab_test.evaluation = evaluation.to_dict()
+    ab_test.evaluated_at = datetime.utcnow()
+    ab_test.statistical_significance = _significance_level(ab_test, evaluation)
+
+
+@router.put("/abtest/{test_id}/variants/{variant_id}", response_model=ABTestResponse)
+async def update_ab_test_variant(
+    test_id: UUID,
+    variant_id: UUID,
+    request: ABTestVariantUpdate,
+    db: AsyncSession = Depends(get_db),
+    _current_user_id: str = Depends(get_current_user_id),
+):
+    """
+    バリアントの指標を更新して再評価
+
+    インプレッション数・クリック数は累計値で送信する。
+    実行中のテストは、逐次検定の境界を超えた時点（または計画サンプルサイズに到達した時点）で自動的に完了する
+    """
+    ab_test = await _get_ab_test(db, test_id)
+
+    variant = next((v for v in ab_test.variants if v.id == variant_id), None)
+    if not variant:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="バリアントが見つかりません",
+        )
+
+    update_data = request.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(variant, field, value)
+
+    if (variant.clicks or 0) > (variant.impressions or 0):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="クリック数はインプレッション数以下である必要があります",
+        )
+    if "ctr" not in update_data and ("impressions" in update_data or "clicks" in update_data):
+        variant.ctr = variant.clicks / variant.impressions * 100 if variant.impressions else None
+
+    evaluation = _evaluate(ab_test)
+    _store_evaluation(ab_test, evaluation)
+
+    if ab_test.status == ABTestStatusModel.RUNNING and evaluation.decided:
+        ab_test.status = ABTestStatusModel.COMPLETED
+        ab_test.ended_at = datetime.utcnow()
+        ab_test.winner_variant = evaluation.winner
+
+    await db.commit()
+    await db.refresh(ab_test)
+
+    return ab_test
+
+
+@router.get("/abtest/{test_id}/evaluation", response_model=ABTestEvaluationResponse)
+async def get_ab_test_evaluation(
+    test_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    _current_user_id: str = Depends(get_current_user_id),
+):
+    """A/Bテストの現時点の評価（有意性・各バリアントが最良である確率・早期終了の判定）"""
+    ab_test = await _get_ab_test(db, test_id)
+
+    if not ab_test.variants:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="バリアントがありません",
+        )
+
+    return _evaluate(ab_test).to_dict()
+
+
+@router.post("/abtest/{test_id}/complete", response_model=ABTestResultResponse)
+async def complete_ab_test(
+    test_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    _current_user_id: str = Depends(get_current_user_id),
+):
+    """A/Bテストを完了し結果を取得"""
+    ab_test = await _get_ab_test(db, test_id)
+
     ab_test.status = ABTestStatusModel.COMPLETED
     ab_test.ended_at = datetime.utcnow()
 
-    # 勝者を決定（CTRが高い方）
-    winner = None
-    max_ctr = -1
-    for variant in ab_test.variants:
-        if variant.ctr and variant.ctr > max_ctr:
-            max_ctr = variant.ctr
-            winner = variant
-
-    if winner:
-        ab_test.winner_variant = winner.variant_name
-        ab_test.statistical_significance = 0.95  # 簡易実装
+    # 最終評価（現時点の逐次検定の境界で判定し、超えていなければ判定保留で終了）
+    evaluation = _evaluate(ab_test, final=True) if ab_test.variants else None
+    winner = leader = None
+    if evaluation:
+        _store_evaluation(ab_test, evaluation)
+        ab_test.winner_variant = evaluation.winner
+        winner = next((v for v in ab_test.variants if v.variant_name == evaluation.winner), None)
+        leader = next(v for v in evaluation.variants if v.variant_name == evaluation.leader)
 
     await db.commit()
     await db.refresh(ab_test)
 
     recommendation = "テストデータが不十分です"
     if winner:
-        recommendation = f"バリアント{winner.variant_name}が優位です。CTR: {winner.ctr:.2f}%"
+        recommendation = (
+            f"バリアント{winner.variant_name}が優位です。CTR: {winner.ctr or 0:.2f}%"
+            f"（p値: {evaluation.p_value:.4f}）"
+        )
+    elif leader and leader.impressions > 0:
+        recommendation = (
+            f"有意差は確認できませんでした。CTRが最も高いのはバリアント{leader.variant_name}"
+            f"（{leader.ctr:.2f}%、最良である確率: {leader.prob_best:.0%}）です"
+        )
 
     return ABTestResultResponse(
         test=ab_test,
         winner=winner,
-        statistical_significance=ab_test.statistical_significance or 0,
-        confidence_interval={"lower": 0.90, "upper": 0.99},
+        statistical_significance=_significance_level(ab_test, evaluation) or 0,
+        confidence_interval=evaluation.confidence_interval if evaluation else {"lower": 0.0, "upper": 0.0},
         recommendation=recommendation,
+        evaluation=evaluation.to_dict() if evaluation else None,
     )
 
 
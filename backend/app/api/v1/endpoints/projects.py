@@ -59,13 +59,15 @@ async def create_project(
     "",
     response_model=ProjectListResponse,
     summary="プロジェクト一覧取得",
-    description="プロジェクト一覧を取得します。ページネーション、フィルタに対応。",
+    description="プロジェクト一覧を取得します。ページネーション（カーソル対応）、フィルタに対応。",
 )
 async def get_projects(
     page: int = 1,
     limit: int = 20,
     client_id: Optional[UUID] = None,
     status: Optional[ProjectStatus] = None,
+    cursor: Optional[str] = None,
+    exact_count: bool = False,
     db: AsyncSession = Depends(get_db_session),
     current_user_id: str = Depends(get_current_user_id),
 ) -> ProjectListResponse:
@@ -77,21 +79,25 @@ async def get_projects(
         limit: 1ページあたりの件数（デフォルト: 20）
         client_id: クライアントIDフィルタ（オプション）
         status: ステータスフィルタ（オプション）
+        cursor: 前ページの next_cursor（指定時は page より優先）
+        exact_count: 正確な総件数を返すか（デフォルト: 推定値）
         db: データベースセッション
         current_user_id: 実行者のユーザーID
 
     Returns:
         ProjectListResponse: プロジェクト一覧データ
     """
-    projects, total = await ProjectService.get_projects(
-        db, page, limit, client_id, status
+    result = await ProjectService.get_projects(
+        db, page, limit, client_id, status, cursor=cursor, exact_count=exact_count
     )
 
     return ProjectListResponse(
-        data=[ProjectResponse.model_validate(project) for project in projects],
-        total=total,
+        data=[ProjectResponse.model_validate(project) for project in result.items],
+        total=result.total,
         page=page,
         page_size=limit,
+        next_cursor=result.next_cursor,
+        total_is_estimate=result.total_is_estimate,
     )
 
 
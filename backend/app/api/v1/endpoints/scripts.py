@@ -5,6 +5,7 @@
 """
 from uuid import UUID
 from fastapi import APIRouter, Depends, Path, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db_session, get_current_user_id_dev as get_current_user_id, get_current_user_role_dev as get_current_user_role
@@ -20,6 +21,7 @@ from app.schemas.expert_review import (
 )
 from app.services.script_service import ScriptService
 from app.services.expert_review_service import expert_review_service
+from app.core.sse import sse_broker
 
 router = APIRouter()
 
@@ -40,6 +42,24 @@ async def generate_script(
     return await ScriptService.generate_script(db, current_user_role, request)
 
 
+@router.post(
+    "/generate/stream",
+    response_class=StreamingResponse,
+    summary="台本生成（ストリーミング）",
+    description="台本の生成トークンをServer-Sent Eventsで配信します。完了時に台本を保存し、resultイベントで台本IDを返します。"
+                "切断時は GET /streams/{stream_id} に Last-Event-ID を付けて再接続できます。",
+)
+async def stream_generate_script(
+    request: ScriptGenerateRequest,
+    db: AsyncSession = Depends(get_db_session),
+    current_user_id: str = Depends(get_current_user_id),
+    current_user_role: str = Depends(get_current_user_role),
+) -> StreamingResponse:
+    """台本生成ストリーミングエンドポイント"""
+    stream_id = await ScriptService.stream_generate_script(db, current_user_role, request)
+    return sse_broker.response(stream_id)
+
+
 @router.get(
     "/{script_id}",
     response_model=ScriptResponse,
@@ -109,3 +129,28 @@ async def expert_review_script(
         pass
 
     return await expert_review_service.review_script(request, knowledge_context)
+
+
+@router.post(
+    "/expert-review/stream",
+    response_class=StreamingResponse,
+    summary="5人の専門家による台本添削（ストリーミング）",
+    description="各専門家の出力をServer-Sent Eventsで配信し、最後にresultイベントでレビュー結果全体を返します。"
+                "切断時は GET /streams/{stream_id} に Last-Event-ID を付けて再接続できます。",
+)
+async def stream_expert_review_script(
+    request: ExpertReviewRequest,
+    db: AsyncSession = Depends(get_db_session),
+    current_user_id: str = Depends(get_current_user_id),
+    current_user_role: str = Depends(get_current_user_role),
+) -> StreamingResponse:
+    """専門家レビューストリーミングエンドポイント"""
+    # 権限チェック
+    if current_user_role not in ["owner", "team"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="専門家レビューにはOwnerまたはTeamロールが必要です",
+        )
+
+    stream_id = expert_review_service.stream_review_script(request, None)
+    return sse_broker.response(stream_id)
@@ -0,0 +1,37 @@
+"""
+ストリーム再接続エンドポイント
+
+SSEストリーミング（台本生成・ナレッジチャット・専門家レビュー）の再接続API
+"""
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Header, Path, Query, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import get_current_user_role_dev as get_current_user_role
+from app.core.sse import sse_broker
+
+router = APIRouter()
+
+
+@router.get(
+    "/{stream_id}",
+    response_class=StreamingResponse,
+    summary="ストリーム再接続",
+    description="Last-Event-ID 以降のイベントを再送し、生成中であれば続きを配信します。",
+)
+async def resume_stream(
+    stream_id: UUID = Path(..., description="ストリームID"),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID", description="受信済みの最終イベントID"),
+    last_event_id_query: Optional[str] = Query(None, alias="last_event_id", description="受信済みの最終イベントID（ヘッダーを送れない場合）"),
+    current_user_role: str = Depends(get_current_user_role),
+) -> StreamingResponse:
+    """ストリーム再接続エンドポイント"""
+    if current_user_role not in ["owner", "team"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="ストリーム取得にはOwnerまたはTeamロールが必要です",
+        )
+
+    return sse_broker.response(str(stream_id), last_event_id or last_event_id_query)
@@ -28,7 +28,8 @@ from app.api.v1.endpoints import (
     auth, users, clients, master, knowledges, projects, videos,
     research, planning, scripts, metadata, thumbnails,
     audio, avatar, broll, publish, analytics, admin, dashboard, metrics,
-    cta, engagement, series, learning, dna, optimization, agent, youtube_oauth, health, monitoring, compound
+    cta, engagement, series, learning, dna, optimization, agent, youtube_oauth, health, monitoring, compound,
+    streams,
 )
 
 api_router.include_router(health.router, prefix="/health", tags=["Health"])
@@ -62,3 +63,4 @@ api_router.include_router(agent.router, prefix="/agent", tags=["Agent"])
 api_router.include_router(youtube_oauth.router, prefix="/youtube", tags=["YouTube OAuth"])
 api_router.include_router(monitoring.router, prefix="/monitoring", tags=["Monitoring"])
 api_router.include_router(compound.router, prefix="/compound", tags=["Compound Strategy"])
+api_router.include_router(streams.router, prefix="/streams", tags=["Streams"])
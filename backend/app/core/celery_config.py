@@ -2,10 +2,101 @@
 Celery設定モジュール
 
 エージェント自動実行のためのCelery/Redis設定
+
+キューと優先度:
+- agents.interactive: UIからの手動実行（run_agent_manual）。常に最高優先度
+- agents.llm: LLM呼び出しが中心のエージェント（コメント返信・競合分析など）
+- agents.io: 外部API取得・DB集計が中心のエージェント（トレンド監視・パフォーマンス追跡など）
+- celery: その他（ヘルスチェック等）
+
+Redisブローカーの優先度（0が最優先、PRIORITY_STEPSに丸められる）は TaskPriority から割り当てる
+ワーカーは agents.interactive を先頭にして購読し、手動実行がスケジュール実行より先に取り出されるようにする
 """
+from typing import Any, Dict, Optional
+
 from celery import Celery
 from celery.schedules import crontab
+from kombu import Exchange, Queue
+
 from app.core.config import settings
+from app.models.agent import AgentType, TaskPriority
+
+# キュー名
+QUEUE_INTERACTIVE = "agents.interactive"
+QUEUE_LLM = "agents.llm"
+QUEUE_IO = "agents.io"
+QUEUE_DEFAULT = "celery"
+
+# エージェント種別ごとのキュー（処理の重さの種類で分離）
+AGENT_QUEUES: Dict[AgentType, str] = {
+    AgentType.COMMENT_RESPONDER: QUEUE_LLM,
+    AgentType.COMPETITOR_ANALYZER: QUEUE_LLM,
+    AgentType.QA_CHECKER: QUEUE_LLM,
+    AgentType.TREND_MONITOR: QUEUE_IO,
+    AgentType.PERFORMANCE_TRACKER: QUEUE_IO,
+    AgentType.CONTENT_SCHEDULER: QUEUE_IO,
+    AgentType.KEYWORD_RESEARCHER: QUEUE_IO,
+}
+
+# Redisトランスポートの優先度段階（0が最優先）
+PRIORITY_STEPS = [0, 3, 6, 9]
+
+# TaskPriority -> ブローカー優先度
+BROKER_PRIORITIES: Dict[TaskPriority, int] = {
+    TaskPriority.URGENT: 0,
+    TaskPriority.HIGH: 3,
+    TaskPriority.NORMAL: 6,
+    TaskPriority.LOW: 9,
+}
+
+# 手動実行はスケジュール実行の優先度に関わらず先に処理する
+INTERACTIVE_PRIORITY = 0
+
+
+def broker_priority(priority: Optional[str]) -> int:
+    """TaskPriority（値または名前）をブローカー優先度に変換（不明な場合はNORMAL）"""
+    try:
+        task_priority = TaskPriority(priority) if priority else TaskPriority.NORMAL
+    except ValueError:
+        task_priority = TaskPriority.NORMAL
+    return BROKER_PRIORITIES[task_priority]
+
+
+def agent_queue(agent_type: Optional[str]) -> str:
+    """エージェント種別からキューを決定（不明な種別はI/Oキュー）"""
+    try:
+        return AGENT_QUEUES.get(AgentType(agent_type), QUEUE_IO)
+    except ValueError:
+        return QUEUE_IO
+
+
+# 再実行しても結果が変わらないエージェント（ワーカー喪失時に再配信してよい）
+# パフォーマンス追跡は (video_id, date) 単位のUPSERTで、同日の再実行は同じ値を書き込む
+IDEMPOTENT_AGENT_TYPES = {AgentType.PERFORMANCE_TRACKER}
+
+RUN_AGENT_TASKS = {
+    "app.tasks.agent_executor.run_agent",
+    "app.tasks.agent_executor.run_idempotent_agent",
+}
+
+
+def route_agent_task(name: str, args: Any, kwargs: Any, _options: Any, **_: Any):
+    """
+    エージェントタスクのルーティング（Celeryのルーター関数。task= はキーワードで渡されるが使わない）
+
+    apply_async で queue / priority が明示された場合はそちらが優先される
+    """
+    kwargs = kwargs or {}
+    agent_type = args[0] if args else kwargs.get("agent_type")
+
+    if name == "app.tasks.agent_executor.run_agent_manual":
+        return {"queue": QUEUE_INTERACTIVE, "priority": INTERACTIVE_PRIORITY}
+    if name in RUN_AGENT_TASKS:
+        return {
+            "queue": agent_queue(agent_type),
+            "priority": broker_priority(kwargs.get("priority")),
+        }
+    return None
 
 # Celeryアプリケーション初期化
 celery_app = Celery(
@@ -26,6 +117,22 @@ celery_app.conf.update(
     task_time_limit=600,  # 10分タイムアウト
     worker_prefetch_multiplier=1,
     worker_concurrency=4,
+    # 実行完了までのACK遅延（acks_late）は冪等なタスクにのみタスク単位で指定する
+    # （ワーカー喪失時に再配信されるため、コメント返信などを二重に実行しない）
+    # キューと優先度
+    task_queues=tuple(
+        Queue(name, Exchange(name), routing_key=name)
+        for name in (QUEUE_INTERACTIVE, QUEUE_LLM, QUEUE_IO, QUEUE_DEFAULT)
+    ),
+    task_default_queue=QUEUE_DEFAULT,
+    task_default_priority=BROKER_PRIORITIES[TaskPriority.NORMAL],
+    task_routes=(route_agent_task,),
+    broker_transport_options={
+        "priority_steps": PRIORITY_STEPS,
+        "sep": ":",
+        # 同じ優先度ではワーカーの -Q に並べた順（agents.interactive が先頭）で取り出す
+        "queue_order_strategy": "priority",
+    },
 )
 
 # スケジュール設定（エージェント自動実行）
@@ -51,6 +158,8 @@ celery_app.conf.beat_schedule = {
         "task": "app.tasks.agent_executor.run_agent",
         "schedule": crontab(hour=21, minute=30),
         "args": ["competitor_analyzer"],
+        # 同時刻のコメント返信より後回しにするバッチ分析
+        "kwargs": {"priority": TaskPriority.LOW.value},
     },
     # コメント返信エージェント（1日3回）
     "comment-responder-9am": {
@@ -70,7 +179,7 @@ celery_app.conf.beat_schedule = {
     },
     # パフォーマンス追跡（毎日0時）
     "performance-tracker-midnight": {
-        "task": "app.tasks.agent_executor.run_agent",
+        "task": "app.tasks.agent_executor.run_idempotent_agent",
         "schedule": crontab(hour=0, minute=0),
         "args": ["performance_tracker"],
     },
@@ -85,5 +194,6 @@ celery_app.conf.beat_schedule = {
         "task": "app.tasks.agent_executor.run_agent",
         "schedule": crontab(hour=9, minute=0, day_of_week=1),
         "args": ["keyword_researcher"],
+        "kwargs": {"priority": TaskPriority.LOW.value},
     },
 }
@@ -30,6 +30,15 @@ class Settings(BaseSettings):
     REDIS_URL: str = "redis://localhost:6379"
     REDIS_CACHE_TTL: int = 3600  # デフォルトキャッシュTTL（秒）
     REDIS_MAX_CONNECTIONS: int = 20
+    SSE_STREAM_TTL_SECONDS: int = 600  # SSEイベントの保持期間（再接続可能な時間）
+    SSE_STREAM_MAX_EVENTS: int = 20000  # 1ストリームあたりの最大イベント数
+    # CTAクリックのRedis Stream（リクエスト内ではXADDのみ、DB書き込みはバックグラウンドで一括実行）
+    CTA_CLICK_STREAM_MAX_LEN: int = 1_000_000  # 未処理クリックの最大保持件数（近似）
+    CTA_CLICK_BATCH_SIZE: int = 500  # 1回の書き込みで処理する最大件数
+    CTA_CLICK_BLOCK_MS: int = 1000  # 新着クリック待ちのブロック時間（ミリ秒）
+    CTA_CLICK_CLAIM_IDLE_MS: int = 60000  # この時間ACKされないクリックは再処理する（ミリ秒）
+    CTA_CLICK_MAX_DELIVERIES: int = 5  # この回数配信しても書き込めないクリックはデッドレターストリームへ移す
+    CTA_CLICK_CONSUMER_ENABLED: bool = True  # APIプロセス内でコンシューマーを起動するか
 
     # ===== 認証システム =====
     JWT_SECRET: str
@@ -48,10 +57,27 @@ class Settings(BaseSettings):
     # Gemini API
     GEMINI_API_KEY: str = ""
 
+    # LLM応答キャッシュ（同一プロンプト・同一パラメータの呼び出しを再利用）
+    LLM_RESPONSE_CACHE_ENABLED: bool = True
+    LLM_RESPONSE_CACHE_TTL_SECONDS: int = 86400
+    LLM_RESPONSE_CACHE_MAX_ENTRIES: int = 5000
+    LLM_RESPONSE_CACHE_CALL_SITES: str = (
+        "claude.generate_title,claude.generate_description,"
+        "claude.analyze_keywords,gemini.generate_keyword_ideas"
+    )  # キャッシュを有効にする呼び出し箇所（カンマ区切り）
+
+    # LLM呼び出しのリトライ（レート制限・過負荷・接続エラー時、指数バックオフ）
+    LLM_MAX_RETRIES: int = 2
+    LLM_RETRY_BACKOFF_SECONDS: float = 1.0
+
     # OpenAI API
     OPENAI_API_KEY: str = ""
     OPENAI_EMBEDDING_MODEL: str = "text-embedding-3-large"  # 1536次元
 
+    # Central DB（ナレッジベース: PostgreSQL + pgvector、MCPサーバーと共有）
+    CENTRAL_DB_URL: str = ""
+    CENTRAL_DB_EMBEDDING_MODEL: str = "text-embedding-3-small"  # 登録時（MCPサーバー）と同じモデル
+
     # HeyGen API
     HEYGEN_API_KEY: str = ""
 
@@ -62,6 +88,12 @@ class Settings(BaseSettings):
     YOUTUBE_API_KEY: str = ""
     SERP_API_KEY: str = ""
     SOCIAL_BLADE_API_KEY: str = ""
+    YOUTUBE_API_MAX_CONCURRENCY: int = 8  # YouTube Data APIの同時呼び出し数上限
+    SERP_API_MAX_CONCURRENCY: int = 4  # SerpAPIの同時呼び出し数上限
+    RESEARCH_CACHE_TTL_SECONDS: int = 1800  # YouTube検索・SerpAPI結果のキャッシュ期間
+    COMMENT_ANALYSIS_MAX_COMMENTS: int = 10000  # コメント分析で取得する最大件数
+    COMMENT_SENTIMENT_LEXICON_PATH: str = ""  # 感情辞書JSONのパス（空の場合は既定の辞書）
+    TREND_SNAPSHOT_RETENTION_DAYS: int = 90  # trend_snapshots の保持期間（古いものはトレンド監視の実行時に削除）
 
     # ===== 通知 =====
     SLACK_WEBHOOK_URL: str = ""  # Slack通知用Webhook URL
@@ -76,6 +108,11 @@ class Settings(BaseSettings):
         """CORS許可オリジンのリスト"""
         return [origin.strip() for origin in self.CORS_ORIGIN.split(",")]
 
+    @property
+    def llm_response_cache_call_sites(self) -> List[str]:
+        """LLM応答キャッシュを有効にする呼び出し箇所のリスト"""
+        return [site.strip() for site in self.LLM_RESPONSE_CACHE_CALL_SITES.split(",") if site.strip()]
+
     @property
     def debug(self) -> bool:
         """デバッグモードかどうか"""
@@ -6,6 +6,7 @@ SQLAlchemy 2.0 AsyncSessionを使用したPostgreSQL接続設定
 """
 import functools
 import logging
+import time
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator, Callable, TypeVar, Optional
 
@@ -14,8 +15,10 @@ try:
 except ImportError:
     from typing_extensions import ParamSpec
 
+from prometheus_client import Counter, Gauge, Histogram
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 logger = logging.getLogger(__name__)
 P = ParamSpec('P')
@@ -23,18 +26,24 @@ T = TypeVar('T')
 
 from app.core.config import settings
 
-# DATABASE_URLをasyncpg用に変換
-# postgresql:// -> postgresql+asyncpg://
-# sslmodeパラメータはasyncpgでは未対応なので除去
 import re
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
-database_url = settings.DATABASE_URL
-if database_url.startswith("postgresql://"):
-    database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
 
-# asyncpgでサポートされていないパラメータを除去
-parsed = urlparse(database_url)
-if parsed.query:
+
+def to_asyncpg_url(url: str) -> str:
+    """
+    PostgreSQLのURLをasyncpg用に変換
+
+    postgresql:// -> postgresql+asyncpg://
+    sslmodeパラメータはasyncpgでは未対応なので除去
+    """
+    if url.startswith("postgresql://"):
+        url = url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    # asyncpgでサポートされていないパラメータを除去
+    parsed = urlparse(url)
+    if not parsed.query:
+        return url
     # クエリパラメータを解析
     params = parse_qs(parsed.query, keep_blank_values=True)
     # asyncpg未対応パラメータを除去
@@ -44,7 +53,7 @@ if parsed.query:
     # 新しいクエリ文字列を構築（値がリストの場合は最初の値を使用）
     new_query = urlencode({k: v[0] if isinstance(v, list) else v for k, v in params.items()})
     # URLを再構築
-    database_url = urlunparse((
+    return urlunparse((
         parsed.scheme,
         parsed.netloc,
         parsed.path,
@@ -53,16 +62,59 @@ if parsed.query:
         parsed.fragment,
     ))
 
+
+database_url = to_asyncpg_url(settings.DATABASE_URL)
+
+# ========== 接続プールメトリクス ==========
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "接続プールからの接続取得待ち時間",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+DB_POOL_CHECKOUT_FAILURES = Counter(
+    "db_pool_checkout_failures",
+    "接続取得に失敗した回数（プール枯渇によるタイムアウトなど）",
+)
+DB_CONNECTION_RELEASED_SECONDS = Histogram(
+    "db_connection_released_seconds",
+    "外部API呼び出しのため接続をプールへ返却していた時間",
+    ["label"],
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+)
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """接続取得の待ち時間を計測する接続プール"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            DB_POOL_CHECKOUT_FAILURES.inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+
 # 非同期エンジンの作成
 engine = create_async_engine(
     database_url,
     echo=settings.NODE_ENV == "development",  # 開発環境のみSQLログ出力
     future=True,
+    poolclass=InstrumentedAsyncAdaptedQueuePool,
     pool_pre_ping=True,  # 接続プールのヘルスチェック
     pool_size=10,
     max_overflow=20,
 )
 
+Gauge("db_pool_size", "接続プールの常駐接続数").set_function(lambda: engine.pool.size())
+Gauge("db_pool_checked_out", "使用中の接続数").set_function(lambda: engine.pool.checkedout())
+Gauge("db_pool_overflow", "プールサイズを超えて作成された接続数").set_function(
+    lambda: engine.pool.overflow()
+)
+
 # 非同期セッションファクトリー
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -265,3 +317,37 @@ async def execute_in_transaction(
         await session.rollback()
         logger.error(f"Transaction failed after {len(results)} operations: {type(e).__name__}: {e}")
         raise
+
+
+@asynccontextmanager
+async def released_connection(session: AsyncSession, label: str = "external_call"):
+    """
+    外部API呼び出しの間、接続をプールへ返却するユニットオブワーク
+
+    LLM・TTSなど数秒かかる外部呼び出しの前にトランザクションを確定して
+    接続をプールへ戻し、ブロック後の最初のクエリで接続を再取得する
+    （expire_on_commit=False のため、読み込み済みのオブジェクトはそのまま使用可能）
+
+    ブロックに入る前の未コミットの変更はコミットされる点に注意
+
+    Usage:
+        knowledge = await db.get(Knowledge, knowledge_id)
+        async with released_connection(db, "knowledge_chat"):
+            ai_response = await claude_client.generate_text(prompt)
+        db.add(ChatSessionMessage(...))
+        await db.commit()
+
+    Args:
+        session: データベースセッション
+        label: メトリクス用のラベル（呼び出し箇所）
+
+    Yields:
+        None
+    """
+    if session.in_transaction():
+        await session.commit()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        DB_CONNECTION_RELEASED_SECONDS.labels(label=label).observe(time.perf_counter() - started)
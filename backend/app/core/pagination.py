@@ -0,0 +1,171 @@
+"""
+ページネーション共通処理
+
+一覧APIのページングと総件数の取得を共通化する
+
+- キーセット（カーソル）ページング: (並び順の列, id) の組で前ページ末尾より後ろの行を取得する。
+  OFFSETと違って読み飛ばしが発生しないため、どの深さのページでも同じコストで取得できる
+  （(並び順の列, id) の複合インデックスを使用）。並び順の列がNULLの行は降順の先頭に並び（PostgreSQLの既定）、
+  NULLの区間の中は id の順で進める
+- 総件数はデフォルトでプランナーの推定行数（EXPLAIN）を使い、推定が小さい場合のみ COUNT(*) で数える。
+  正確な件数は exact_count=True を指定した場合のみ取得する
+"""
+import base64
+import binascii
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Generic, List, Optional, Tuple, TypeVar
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, and_, func, or_, select, text, tuple_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+T = TypeVar("T")
+
+# 推定行数がこれ未満なら COUNT(*) で正確に数える（小さい結果は数えても安く、推定の誤差が目立つため）
+ESTIMATE_EXACT_THRESHOLD = 10_000
+
+
+@dataclass
+class Page(Generic[T]):
+    """1ページ分の結果"""
+
+    items: List[T]
+    total: int
+    total_is_estimate: bool
+    next_cursor: Optional[str]
+
+
+def encode_cursor(sort_value: Optional[datetime], row_id: UUID) -> str:
+    """ページ末尾の行からカーソル（不透明な文字列）を生成（並び順の値がNULLの行も可）"""
+    payload = json.dumps(
+        [sort_value.isoformat() if sort_value is not None else None, str(row_id)],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], UUID]:
+    """
+    カーソルを (並び順の値, id) に復元
+
+    Raises:
+        HTTPException: 不正なカーソル
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return (datetime.fromisoformat(sort_value) if sort_value is not None else None), UUID(row_id)
+    except (ValueError, TypeError, binascii.Error, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="不正なカーソルです",
+        )
+
+
+async def estimate_rows(db: AsyncSession, query: Select) -> Optional[int]:
+    """
+    プランナーの推定行数を取得（EXPLAIN、クエリは実行しない）
+
+    Returns:
+        Optional[int]: 推定行数（取得できない場合はNone）
+    """
+    try:
+        sql = str(query.order_by(None).compile(
+            dialect=postgresql.dialect(),
+            compile_kwargs={"literal_binds": True},
+        ))
+        # text() のバインドパラメータとして解釈されないようにコロンをエスケープ
+        result = await db.execute(text("EXPLAIN (FORMAT JSON) " + sql.replace(":", r"\:")))
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception as e:
+        logger.warning(f"Row estimate failed, falling back to COUNT(*): {e}")
+        return None
+
+
+async def count_rows(db: AsyncSession, query: Select, exact: bool = False) -> Tuple[int, bool]:
+    """
+    総件数を取得
+
+    Args:
+        db: データベースセッション
+        query: 一覧のクエリ（フィルタ適用済み、ページング前）
+        exact: 正確な件数を数えるか
+
+    Returns:
+        Tuple[int, bool]: (件数, 推定値か)
+    """
+    if not exact:
+        estimate = await estimate_rows(db, query)
+        if estimate is not None and estimate >= ESTIMATE_EXACT_THRESHOLD:
+            return estimate, True
+
+    result = await db.execute(select(func.count()).select_from(query.order_by(None).subquery()))
+    return result.scalar_one(), False
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    sort_column: Any,
+    id_column: Any,
+    limit: int,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+    exact_count: bool = False,
+) -> Page:
+    """
+    一覧クエリをページング（新しい順）
+
+    cursor 指定時はキーセットで取得し、offset は無視する。
+    cursor なしの場合は従来どおり offset から取得する（1ページ目・ページ番号指定の互換用）
+
+    Args:
+        db: データベースセッション
+        query: 一覧のクエリ（フィルタ適用済み、並び順・件数指定なし）
+        sort_column: 並び順の列（created_at など）
+        id_column: 同じ値の行の順序を決めるID列
+        limit: 1ページの件数
+        cursor: 前ページの next_cursor
+        offset: 読み飛ばす件数（cursor なしの場合のみ）
+        exact_count: 正確な総件数を数えるか
+
+    Returns:
+        Page: 1ページ分の結果と総件数・次ページのカーソル
+    """
+    total, is_estimate = await count_rows(db, query, exact=exact_count)
+
+    page_query = query.order_by(sort_column.desc(), id_column.desc())
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        if sort_value is None:
+            # NULLの区間の続き（残りのNULL行の後に、NULL以外の全行が続く）
+            page_query = page_query.where(or_(
+                and_(sort_column.is_(None), id_column < row_id),
+                sort_column.is_not(None),
+            ))
+        else:
+            # NULLの行は降順の先頭で取得済み（行値の比較でも除外される）
+            page_query = page_query.where(tuple_(sort_column, id_column) < tuple_(sort_value, row_id))
+    elif offset:
+        page_query = page_query.offset(offset)
+
+    # 1件多く取得して次ページの有無を判定
+    result = await db.execute(page_query.limit(limit + 1))
+    rows = list(result.scalars().all())
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+
+    return Page(items=rows, total=total, total_is_estimate=is_estimate, next_cursor=next_cursor)
@@ -0,0 +1,263 @@
+"""
+Server-Sent Events（SSE）ストリーミングモジュール
+
+LLMのトークンストリームをSSEでクライアントへ中継する
+
+- 生成処理はクライアント接続とは独立したバックグラウンドタスクで実行し、
+  切断されても最後まで生成・保存する
+- イベントは連番のイベントIDを付けてプロセス内に保持し、Redis Streamにも複製する
+- 再接続時は Last-Event-ID 以降のイベントを再送してから続きを配信する
+  （別ワーカーへの再接続はRedis Streamから再送）
+"""
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import redis.asyncio as redis
+from fastapi.responses import StreamingResponse
+
+from app.core.cache import get_redis
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 終端イベント（これを配信したらストリームを閉じる）
+DONE_EVENT = "done"
+ERROR_EVENT = "error"
+TERMINAL_EVENTS = {DONE_EVENT, ERROR_EVENT}
+
+# 無通信時にプロキシのタイムアウトを防ぐためのコメント送信間隔（秒）
+KEEPALIVE_INTERVAL_SECONDS = 15
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",  # nginxのバッファリングを無効化
+}
+
+Emit = Callable[[str, Any], Awaitable[None]]
+
+
+def format_sse(event: str, data: Any, event_id: Optional[int] = None) -> str:
+    """
+    SSEのワイヤーフォーマットに変換
+
+    Args:
+        event: イベント名
+        data: データ（JSONシリアライズ可能な値）
+        event_id: イベントID
+
+    Returns:
+        str: SSEメッセージ
+    """
+    payload = data if isinstance(data, str) else json.dumps(data, ensure_ascii=False, default=str)
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    for line in payload.split("\n"):
+        lines.append(f"data: {line}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _redis_key(stream_id: str) -> str:
+    return f"cs:sse:{stream_id}"
+
+
+class EventStream:
+    """1回の生成処理に対応するイベントログ"""
+
+    def __init__(self, stream_id: str):
+        self.stream_id = stream_id
+        self.events: List[Tuple[int, str, str]] = []
+        self.closed = False
+        self._condition = asyncio.Condition()
+        self._emit_lock = asyncio.Lock()
+        self._mirror_enabled = True
+
+    async def emit(self, event: str, data: Any) -> None:
+        """
+        イベントを追加し、購読者へ通知
+
+        Redis StreamのIDは単調増加でなければならないため、連番の採番からXADDまでを
+        ストリーム単位のロックで直列化する（並行して emit する生成処理があっても順序が保たれる）
+        """
+        payload = json.dumps(data, ensure_ascii=False, default=str)
+        async with self._emit_lock:
+            if self.closed:
+                return
+            async with self._condition:
+                seq = len(self.events) + 1
+                self.events.append((seq, event, payload))
+                if event in TERMINAL_EVENTS:
+                    self.closed = True
+                self._condition.notify_all()
+            await self._mirror(seq, event, payload)
+
+    async def _mirror(self, seq: int, event: str, payload: str) -> None:
+        """Redis Streamへ複製（失敗しても配信は継続）"""
+        if not self._mirror_enabled:
+            return
+        try:
+            client = await get_redis()
+            key = _redis_key(self.stream_id)
+            await client.xadd(
+                key,
+                {"event": event, "data": payload},
+                id=f"0-{seq}",
+                maxlen=settings.SSE_STREAM_MAX_EVENTS,
+                approximate=True,
+            )
+            if seq == 1 or event in TERMINAL_EVENTS:
+                await client.expire(key, settings.SSE_STREAM_TTL_SECONDS)
+        except redis.RedisError as e:
+            logger.warning(f"SSE mirror to Redis disabled for stream '{self.stream_id}': {e}")
+            self._mirror_enabled = False
+
+    async def wait_after(self, last_seq: int, timeout: float) -> List[Tuple[int, str, str]]:
+        """last_seqより後のイベントを待機して取得（タイムアウト時は空）"""
+        async with self._condition:
+            if len(self.events) <= last_seq and not self.closed:
+                try:
+                    await asyncio.wait_for(
+                        self._condition.wait_for(lambda: len(self.events) > last_seq or self.closed),
+                        timeout,
+                    )
+                except asyncio.TimeoutError:
+                    return []
+            return self.events[last_seq:]
+
+
+class EventStreamBroker:
+    """
+    SSEストリームの生成と購読を管理
+
+    Usage:
+        async def producer(emit):
+            async for token in claude_client.stream_text(prompt):
+                await emit("token", {"text": token})
+            await emit("result", {...})
+
+        stream_id = sse_broker.start(producer)
+        return sse_broker.response(stream_id)
+    """
+
+    def __init__(self):
+        self._streams: Dict[str, EventStream] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def start(self, producer: Callable[[Emit], Awaitable[None]]) -> str:
+        """
+        生成処理をバックグラウンドで開始
+
+        producer が正常終了すると done、例外を送出すると error イベントを追加する
+
+        Returns:
+            str: ストリームID
+        """
+        stream_id = str(uuid.uuid4())
+        stream = EventStream(stream_id)
+        self._streams[stream_id] = stream
+
+        async def run() -> None:
+            try:
+                await producer(stream.emit)
+                await stream.emit(DONE_EVENT, {"stream_id": stream_id})
+            except Exception as e:
+                logger.error(f"SSE producer failed for stream '{stream_id}': {e}")
+                await stream.emit(ERROR_EVENT, {"stream_id": stream_id, "message": str(e)})
+            finally:
+                self._tasks.pop(stream_id, None)
+                asyncio.get_running_loop().call_later(
+                    settings.SSE_STREAM_TTL_SECONDS, self._streams.pop, stream_id, None
+                )
+
+        self._tasks[stream_id] = asyncio.create_task(run())
+        return stream_id
+
+    async def subscribe(
+        self,
+        stream_id: str,
+        last_event_id: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """
+        ストリームを購読し、SSEメッセージを順に返す
+
+        Args:
+            stream_id: ストリームID
+            last_event_id: 受信済みの最終イベントID（再接続時）
+
+        Yields:
+            str: SSEメッセージ
+        """
+        last_seq = _parse_event_id(last_event_id)
+        yield format_sse("stream", {"stream_id": stream_id})
+
+        stream = self._streams.get(stream_id)
+        if stream is not None:
+            async for message in self._subscribe_local(stream, last_seq):
+                yield message
+        else:
+            async for message in self._subscribe_redis(stream_id, last_seq):
+                yield message
+
+    async def _subscribe_local(self, stream: EventStream, last_seq: int) -> AsyncIterator[str]:
+        while True:
+            events = await stream.wait_after(last_seq, KEEPALIVE_INTERVAL_SECONDS)
+            if not events:
+                if stream.closed:
+                    return
+                yield ": keep-alive\n\n"
+                continue
+            for seq, event, payload in events:
+                last_seq = seq
+                yield format_sse(event, payload, seq)
+                if event in TERMINAL_EVENTS:
+                    return
+
+    async def _subscribe_redis(self, stream_id: str, last_seq: int) -> AsyncIterator[str]:
+        """別ワーカーで生成中・生成済みのストリームをRedisから購読"""
+        key = _redis_key(stream_id)
+        try:
+            client = await get_redis()
+            if not await client.exists(key):
+                yield format_sse(ERROR_EVENT, {"stream_id": stream_id, "message": "stream not found"})
+                return
+            while True:
+                response = await client.xread(
+                    {key: f"0-{last_seq}"},
+                    block=KEEPALIVE_INTERVAL_SECONDS * 1000,
+                )
+                if not response:
+                    yield ": keep-alive\n\n"
+                    continue
+                for entry_id, fields in response[0][1]:
+                    last_seq = int(entry_id.split("-")[1])
+                    event = fields["event"]
+                    yield format_sse(event, fields["data"], last_seq)
+                    if event in TERMINAL_EVENTS:
+                        return
+        except redis.RedisError as e:
+            logger.warning(f"SSE subscribe from Redis failed for stream '{stream_id}': {e}")
+            yield format_sse(ERROR_EVENT, {"stream_id": stream_id, "message": "stream unavailable"})
+
+    def response(self, stream_id: str, last_event_id: Optional[str] = None) -> StreamingResponse:
+        """SSEレスポンスを作成"""
+        return StreamingResponse(
+            self.subscribe(stream_id, last_event_id),
+            media_type="text/event-stream",
+            headers={**SSE_HEADERS, "X-Stream-Id": stream_id},
+        )
+
+
+def _parse_event_id(last_event_id: Optional[str]) -> int:
+    try:
+        return max(int(last_event_id), 0) if last_event_id else 0
+    except ValueError:
+        return 0
+
+
+# シングルトンインスタンス
+sse_broker = EventStreamBroker()
@@ -19,6 +19,7 @@ from pydantic import ValidationError
 from prometheus_fastapi_instrumentator import Instrumentator
 
 from app.core.config import settings
+from app.services.external.llm_metrics import track_llm_usage
 
 
 # ========== セキュリティヘッダーミドルウェア ==========
@@ -73,8 +74,33 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         return response
 
 
+# ========== LLM利用量ログミドルウェア ==========
+
+class LLMUsageLoggingMiddleware:
+    """
+    リクエスト単位のLLM利用量（呼び出し数・トークン数・推定コスト）をログに出力するミドルウェア
+
+    ストリーミングレスポンスの送信中に行われる呼び出しも含めるため、純粋なASGIミドルウェアとして実装
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_llm_usage() as usage:
+            await self.app(scope, receive, send)
+
+        if usage.calls:
+            logger.info(f"LLM usage {scope['method']} {scope['path']}: {usage.format()}")
+
+
 from app.core.database import init_db, close_db
 from app.core.cache import close_redis, get_redis
+from app.services.cta_click_stream import cta_click_consumer
 from app.api.v1.router import api_router
 
 
@@ -125,10 +151,14 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"⚠️ Redis connection failed (caching disabled): {e}")
 
+    # CTAクリックストリームのコンシューマー
+    cta_click_consumer.start()
+
     yield
 
     # 終了時処理
     logger.info("🛑 Creator Studio AI Backend shutting down...")
+    await cta_click_consumer.stop()
     await close_redis()
     logger.info("✅ Redis connection closed")
     await close_db()
@@ -149,6 +179,9 @@ app = FastAPI(
 # セキュリティヘッダーミドルウェア（最初に追加 = 最後に実行）
 app.add_middleware(SecurityHeadersMiddleware)
 
+# LLM利用量ログミドルウェア
+app.add_middleware(LLMUsageLoggingMiddleware)
+
 # CORSミドルウェア設定
 app.add_middleware(
     CORSMiddleware,
@@ -8,7 +8,7 @@ from app.models.client import Client, ClientPlan
 from app.models.category import Category
 from app.models.tag import Tag
 from app.models.knowledge import Knowledge, KnowledgeType
-from app.models.chat_session import ChatSession, ChatSessionStatus
+from app.models.chat_session import ChatSession, ChatSessionStatus, ChatSessionMessage
 from app.models.project import (
     Project,
     ProjectStatus,
@@ -22,6 +22,7 @@ from app.models.research import Research, ResearchType
 from app.models.planning import (
     PlanningChatSession,
     PlanningSessionStatus,
+    PlanningChatMessage,
     AISuggestion,
     SuggestionType,
     ProjectSchedule,
@@ -48,10 +49,14 @@ from app.models.publish import (
 )
 from app.models.analytics import (
     VideoAnalytics,
+    VideoAnalyticsRollup,
+    ClientAnalyticsRollup,
+    AnalyticsRollupWatermark,
     ChannelAnalytics,
     AnalyticsReport,
     ReportType,
     ReportStatus,
+    RollupPeriod,
 )
 from app.models.admin import (
     SystemSetting,
@@ -75,6 +80,7 @@ from app.models.cta import (
     VideoCTAAssignment,
     UTMDefaultSettings,
     CTAClickLog,
+    CTADailyStat,
 )
 from app.models.engagement import (
     VideoType,
@@ -82,6 +88,7 @@ from app.models.engagement import (
     ShortToLongLink,
     EngagementMetrics,
     ShortVideoClip,
+    EngagementDailyStat,
 )
 from app.models.series import (
     SeriesStatus,
@@ -141,6 +148,7 @@ from app.models.agent import (
     CommentQueue,
     AgentLog,
     TrendAlert,
+    TrendSnapshot,
     CompetitorAlert,
 )
 from app.models.content_compound import (
@@ -161,6 +169,7 @@ __all__ = [
     "KnowledgeType",
     "ChatSession",
     "ChatSessionStatus",
+    "ChatSessionMessage",
     "Project",
     "ProjectStatus",
     "Video",
@@ -172,6 +181,7 @@ __all__ = [
     "ResearchType",
     "PlanningChatSession",
     "PlanningSessionStatus",
+    "PlanningChatMessage",
     "AISuggestion",
     "SuggestionType",
     "ProjectSchedule",
@@ -190,10 +200,14 @@ __all__ = [
     "PublishPlatform",
     "PublishStatus",
     "VideoAnalytics",
+    "VideoAnalyticsRollup",
+    "ClientAnalyticsRollup",
+    "AnalyticsRollupWatermark",
     "ChannelAnalytics",
     "AnalyticsReport",
     "ReportType",
     "ReportStatus",
+    "RollupPeriod",
     "SystemSetting",
     "ApiConnection",
     "ApiConnectionStatus",
@@ -211,11 +225,13 @@ __all__ = [
     "VideoCTAAssignment",
     "UTMDefaultSettings",
     "CTAClickLog",
+    "CTADailyStat",
     "VideoType",
     "EngagementStatus",
     "ShortToLongLink",
     "EngagementMetrics",
     "ShortVideoClip",
+    "EngagementDailyStat",
     "SeriesStatus",
     "SeriesType",
     "Series",
@@ -269,6 +285,7 @@ __all__ = [
     "CommentQueue",
     "AgentLog",
     "TrendAlert",
+    "TrendSnapshot",
     "CompetitorAlert",
     # Compound
     "LinkType",
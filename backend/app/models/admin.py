@@ -4,7 +4,7 @@
 システム設定、API連携、監査ログ
 """
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Enum as SQLAlchemyEnum, Boolean
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Enum as SQLAlchemyEnum, Boolean, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 import uuid
@@ -244,5 +244,11 @@ class AuditLog(Base):
     # リレーション
     user = relationship("User", backref="audit_logs")
 
+    # インデックス定義
+    __table_args__ = (
+        # 一覧のキーセットページング用（created_at DESC, id DESC）
+        Index("ix_audit_logs_created_at_id", "created_at", "id"),
+    )
+
     def __repr__(self) -> str:
         return f"<AuditLog(action={self.action}, resource_type={self.resource_type})>"
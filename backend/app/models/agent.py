@@ -18,6 +18,7 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     ForeignKey,
+    Index,
     Enum as SQLEnum,
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
@@ -181,6 +182,12 @@ class AgentTask(Base):
     agent = relationship("Agent", back_populates="tasks")
     schedule = relationship("AgentSchedule", back_populates="tasks")
 
+    __table_args__ = (
+        # 一覧のキーセットページング用（created_at DESC, id DESC）
+        Index("ix_agent_tasks_created_at_id", "created_at", "id"),
+        Index("ix_agent_tasks_agent_id_created_at_id", "agent_id", "created_at", "id"),
+    )
+
 
 class AgentSchedule(Base):
     """エージェントスケジュール"""
@@ -368,6 +375,34 @@ class TrendAlert(Base):
     detected_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
 
+    __table_args__ = (
+        # 未対応アラートの重複チェック用
+        Index("ix_trend_alerts_knowledge_id_keyword", "knowledge_id", "keyword"),
+    )
+
+
+class TrendSnapshot(Base):
+    """キーワードごとのトレンドスコアの時系列（前回実行との差分計算用）"""
+    __tablename__ = "trend_snapshots"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    knowledge_id = Column(UUID(as_uuid=True), ForeignKey("knowledges.id", ondelete="CASCADE"), nullable=True)
+    keyword = Column(String(255), nullable=False)
+
+    # スコア
+    score = Column(Float, nullable=False)
+    trends_score = Column(Float, nullable=False, default=0)
+    youtube_score = Column(Float, nullable=False, default=0)
+    delta = Column(Float, nullable=True)  # 前回スナップショットとの差分（初回はNULL）
+    importance = Column(String(20), nullable=True)  # high / medium / low（判定したスナップショットのみ）
+    importance_score = Column(Float, nullable=True)  # 重要度を判定した時点のスコア（再利用時は引き継ぐ）
+
+    captured_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_trend_snapshots_knowledge_id_keyword_captured_at", "knowledge_id", "keyword", "captured_at"),
+    )
+
 
 class CompetitorAlert(Base):
     """競合アラート"""
@@ -4,7 +4,7 @@
 動画分析、チャンネル分析、レポート管理
 """
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Text, Integer, Float, ForeignKey, Enum as SQLAlchemyEnum, Date
+from sqlalchemy import Column, String, DateTime, Text, Integer, Float, ForeignKey, Enum as SQLAlchemyEnum, Date, UniqueConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 import uuid
@@ -21,6 +21,13 @@ class ReportType(str, enum.Enum):
     CUSTOM = "custom"
 
 
+class RollupPeriod(str, enum.Enum):
+    """ロールアップ集計単位"""
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+
+
 class ReportStatus(str, enum.Enum):
     """レポートステータス"""
     PENDING = "pending"          # 待機中
@@ -135,14 +142,170 @@ class VideoAnalytics(Base):
         default=datetime.utcnow,
         comment="作成日時"
     )
+    updated_at = Column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        index=True,
+        comment="更新日時（ロールアップのウォーターマーク）"
+    )
 
     # リレーション
     video = relationship("Video", backref="video_analytics")
 
+    # 1動画1日1レコード（バルクUPSERTの衝突キー）
+    __table_args__ = (
+        UniqueConstraint("video_id", "date", name="uq_video_analytics_video_id_date"),
+    )
+
     def __repr__(self) -> str:
         return f"<VideoAnalytics(id={self.id}, video_id={self.video_id}, date={self.date})>"
 
 
+class VideoAnalyticsRollup(Base):
+    """動画分析ロールアップテーブル（日次/週次/月次の事前集計）"""
+    __tablename__ = "video_analytics_rollups"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        nullable=False,
+        comment="ロールアップID（UUID）"
+    )
+    period = Column(
+        SQLAlchemyEnum(RollupPeriod),
+        nullable=False,
+        comment="集計単位"
+    )
+    video_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("videos.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="動画ID（外部キー）"
+    )
+    client_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("clients.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+        comment="クライアントID（非正規化）"
+    )
+    date = Column(
+        Date,
+        nullable=False,
+        comment="集計期間の開始日"
+    )
+    views = Column(Integer, nullable=False, default=0, comment="視聴回数")
+    watch_time_minutes = Column(Float, nullable=False, default=0.0, comment="総視聴時間（分）")
+    likes = Column(Integer, nullable=False, default=0, comment="いいね数")
+    comments = Column(Integer, nullable=False, default=0, comment="コメント数")
+    shares = Column(Integer, nullable=False, default=0, comment="シェア数")
+    subscribers_gained = Column(Integer, nullable=False, default=0, comment="獲得登録者数")
+    subscribers_lost = Column(Integer, nullable=False, default=0, comment="解除登録者数")
+    impressions = Column(Integer, nullable=False, default=0, comment="インプレッション数")
+    ctr_sum = Column(Float, nullable=False, default=0.0, comment="CTR合計（平均算出用）")
+    sample_days = Column(Integer, nullable=False, default=0, comment="集計元の日次レコード数")
+    updated_at = Column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        comment="更新日時"
+    )
+
+    __table_args__ = (
+        UniqueConstraint("period", "video_id", "date", name="uq_video_analytics_rollups_period_video_date"),
+        Index("ix_video_analytics_rollups_date_brin", "date", postgresql_using="brin"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<VideoAnalyticsRollup(period={self.period}, video_id={self.video_id}, date={self.date})>"
+
+
+class ClientAnalyticsRollup(Base):
+    """クライアント分析ロールアップテーブル（日次/週次/月次の事前集計）"""
+    __tablename__ = "client_analytics_rollups"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        nullable=False,
+        comment="ロールアップID（UUID）"
+    )
+    period = Column(
+        SQLAlchemyEnum(RollupPeriod),
+        nullable=False,
+        comment="集計単位"
+    )
+    client_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("clients.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="クライアントID（外部キー）"
+    )
+    date = Column(
+        Date,
+        nullable=False,
+        comment="集計期間の開始日"
+    )
+    views = Column(Integer, nullable=False, default=0, comment="視聴回数")
+    watch_time_minutes = Column(Float, nullable=False, default=0.0, comment="総視聴時間（分）")
+    likes = Column(Integer, nullable=False, default=0, comment="いいね数")
+    comments = Column(Integer, nullable=False, default=0, comment="コメント数")
+    shares = Column(Integer, nullable=False, default=0, comment="シェア数")
+    subscribers_gained = Column(Integer, nullable=False, default=0, comment="獲得登録者数")
+    subscribers_lost = Column(Integer, nullable=False, default=0, comment="解除登録者数")
+    impressions = Column(Integer, nullable=False, default=0, comment="インプレッション数")
+    ctr_sum = Column(Float, nullable=False, default=0.0, comment="CTR合計（平均算出用）")
+    sample_days = Column(Integer, nullable=False, default=0, comment="集計元の日次レコード数")
+    video_count = Column(Integer, nullable=False, default=0, comment="データのある動画数")
+    updated_at = Column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        comment="更新日時"
+    )
+
+    __table_args__ = (
+        UniqueConstraint("period", "client_id", "date", name="uq_client_analytics_rollups_period_client_date"),
+        Index("ix_client_analytics_rollups_date_brin", "date", postgresql_using="brin"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<ClientAnalyticsRollup(period={self.period}, client_id={self.client_id}, date={self.date})>"
+
+
+class AnalyticsRollupWatermark(Base):
+    """ロールアップ処理済み位置（ウォーターマーク）テーブル"""
+    __tablename__ = "analytics_rollup_watermarks"
+
+    name = Column(
+        String(100),
+        primary_key=True,
+        nullable=False,
+        comment="ウォーターマーク名"
+    )
+    watermark = Column(
+        DateTime,
+        nullable=False,
+        comment="処理済みの最終更新日時"
+    )
+    updated_at = Column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        comment="更新日時"
+    )
+
+    def __repr__(self) -> str:
+        return f"<AnalyticsRollupWatermark(name={self.name}, watermark={self.watermark})>"
+
+
 class ChannelAnalytics(Base):
     """チャンネル分析テーブル"""
     __tablename__ = "channel_analytics"
@@ -5,7 +5,7 @@
 ヒアリングシートの代わりにチャット形式でナレッジを構築
 """
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Enum as SQLAlchemyEnum
+from sqlalchemy import Column, String, Text, DateTime, Integer, ForeignKey, Index, Enum as SQLAlchemyEnum
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 import uuid
@@ -56,7 +56,7 @@ class ChatSession(Base):
         JSONB,
         nullable=False,
         server_default='[]',
-        comment="メッセージ履歴（[{role: 'user'|'assistant', content: str, timestamp: str}]）"
+        comment="旧メッセージ履歴（chat_messagesへ移行済み・参照しない）"
     )
     status = Column(
         SQLAlchemyEnum(ChatSessionStatus),
@@ -84,3 +84,48 @@ class ChatSession(Base):
 
     def __repr__(self) -> str:
         return f"<ChatSession(id={self.id}, knowledge_id={self.knowledge_id}, step={self.current_step}, status={self.status})>"
+
+
+class ChatSessionMessage(Base):
+    """
+    チャットメッセージテーブル（追記専用）
+
+    1ターンごとに行を追加するだけで、セッション全体の履歴を書き換えない
+    """
+    __tablename__ = "chat_messages"
+    __table_args__ = (
+        Index("ix_chat_messages_session_id_created_at", "session_id", "created_at"),
+    )
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        nullable=False,
+        comment="メッセージID（UUID）"
+    )
+    session_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("chat_sessions.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="チャットセッションID（外部キー）"
+    )
+    role = Column(
+        String(20),
+        nullable=False,
+        comment="ロール（user/assistant）"
+    )
+    content = Column(
+        Text,
+        nullable=False,
+        comment="メッセージ内容"
+    )
+    created_at = Column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        comment="送信日時"
+    )
+
+    def __repr__(self) -> str:
+        return f"<ChatSessionMessage(id={self.id}, session_id={self.session_id}, role={self.role})>"
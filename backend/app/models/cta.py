@@ -4,7 +4,7 @@ CTA管理モデル
 CTAテンプレート、UTM設定、動画への割り当て
 """
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Enum as SQLAlchemyEnum, Boolean, Integer, Float
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Enum as SQLAlchemyEnum, Boolean, Integer, Float, Date, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 import uuid
@@ -286,9 +286,62 @@ class CTAClickLog(Base):
         nullable=True,
         comment="クリック時のUTMパラメータ"
     )
+    stream_entry_id = Column(
+        String(64),
+        nullable=True,
+        comment="クリックストリームのエントリID（再処理時の重複書き込み防止。直接書き込みはNULL）"
+    )
 
     # リレーション
     cta = relationship("CTATemplate", backref="click_logs")
 
+    __table_args__ = (
+        UniqueConstraint("stream_entry_id", name="uq_cta_click_logs_stream_entry_id"),
+    )
+
     def __repr__(self) -> str:
         return f"<CTAClickLog(cta_id={self.cta_id}, clicked_at={self.clicked_at})>"
+
+
+class CTADailyStat(Base):
+    """CTA日次集計テーブル（クリック取り込み時に加算して維持）"""
+    __tablename__ = "cta_daily_stats"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        nullable=False,
+        comment="集計ID（UUID）"
+    )
+    cta_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("cta_templates.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="CTA ID"
+    )
+    date = Column(
+        Date,
+        nullable=False,
+        comment="集計日（UTC）"
+    )
+    clicks = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="クリック数"
+    )
+    updated_at = Column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        comment="更新日時"
+    )
+
+    __table_args__ = (
+        UniqueConstraint("cta_id", "date", name="uq_cta_daily_stats_cta_id_date"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<CTADailyStat(cta_id={self.cta_id}, date={self.date}, clicks={self.clicks})>"
@@ -19,6 +19,7 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     ForeignKey,
+    Index,
     Enum as SQLAlchemyEnum,
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
@@ -108,6 +109,11 @@ class ContentDNA(Base):
     # Relationships
     elements = relationship("DNAElement", back_populates="content_dna", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # 一覧のキーセットページング用（created_at DESC, id DESC）
+        Index("ix_content_dnas_created_at_id", "created_at", "id"),
+    )
+
 
 # ============================================================
 # DNA Element Model
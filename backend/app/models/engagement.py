@@ -15,6 +15,8 @@ from sqlalchemy import (
     Integer,
     Float,
     Boolean,
+    Date,
+    UniqueConstraint,
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
@@ -329,3 +331,47 @@ class ShortVideoClip(Base):
 
     def __repr__(self) -> str:
         return f"<ShortVideoClip(id={self.id}, short={self.short_video_id}, source={self.source_video_id})>"
+
+
+class EngagementDailyStat(Base):
+    """エンゲージメント日次集計テーブル（指標の記録時に加算して維持）"""
+    __tablename__ = "engagement_daily_stats"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        nullable=False,
+        comment="集計ID（UUID）"
+    )
+    link_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("short_to_long_links.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="連携ID（外部キー）"
+    )
+    date = Column(
+        Date,
+        nullable=False,
+        comment="集計日"
+    )
+    short_views = Column(Integer, nullable=False, default=0, comment="ショート動画再生回数")
+    click_through_count = Column(Integer, nullable=False, default=0, comment="クリックスルー数")
+    conversion_count = Column(Integer, nullable=False, default=0, comment="コンバージョン数")
+    ctr_sum = Column(Float, nullable=False, default=0.0, comment="CTR合計（平均算出用）")
+    ctr_samples = Column(Integer, nullable=False, default=0, comment="CTRを算出できた記録数")
+    conversion_rate_sum = Column(Float, nullable=False, default=0.0, comment="コンバージョン率合計（平均算出用）")
+    conversion_rate_samples = Column(Integer, nullable=False, default=0, comment="コンバージョン率を算出できた記録数")
+    updated_at = Column(
+        DateTime,
+        nullable=False,
+        server_default=text("NOW()"),
+        comment="更新日時"
+    )
+
+    __table_args__ = (
+        UniqueConstraint("link_id", "date", name="uq_engagement_daily_stats_link_id_date"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<EngagementDailyStat(link_id={self.link_id}, date={self.date})>"
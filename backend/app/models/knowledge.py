@@ -127,6 +127,9 @@ class Knowledge(Base):
             postgresql_with={"m": 16, "ef_construction": 64},
             postgresql_ops={"embedding": "vector_cosine_ops"}
         ),
+        # 一覧のキーセットページング用（created_at DESC, id DESC）
+        Index("ix_knowledges_created_at_id", "created_at", "id"),
+        Index("ix_knowledges_client_id_created_at_id", "client_id", "created_at", "id"),
     )
 
     def __repr__(self) -> str:
@@ -19,6 +19,7 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     ForeignKey,
+    Index,
     Enum as SQLAlchemyEnum,
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
@@ -122,6 +123,11 @@ class PerformanceRecord(Base):
     created_at = Column(DateTime, default=datetime.utcnow, comment="作成日時")
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, comment="更新日時")
 
+    __table_args__ = (
+        # 一覧のキーセットページング用（recorded_at DESC, id DESC）
+        Index("ix_performance_records_recorded_at_id", "recorded_at", "id"),
+    )
+
 
 # ============================================================
 # Learning Insight Model
@@ -20,6 +20,7 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     ForeignKey,
+    Index,
     Enum as SQLAlchemyEnum,
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
@@ -190,6 +191,8 @@ class ABTest(Base):
     # 結果
     winner_variant = Column(String(10), nullable=True, comment="勝者バリアント（A/B）")
     statistical_significance = Column(Float, nullable=True, comment="統計的有意性")
+    evaluation = Column(JSONB, nullable=True, comment="最新の評価結果（逐次検定・ベイズ事後分布）")
+    evaluated_at = Column(DateTime, nullable=True, comment="評価日時")
 
     created_at = Column(DateTime, default=datetime.utcnow, comment="作成日時")
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, comment="更新日時")
@@ -197,6 +200,11 @@ class ABTest(Base):
     # Relationships
     variants = relationship("ABTestVariant", back_populates="ab_test", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # 一覧のキーセットページング用（created_at DESC, id DESC）
+        Index("ix_ab_tests_created_at_id", "created_at", "id"),
+    )
+
 
 class ABTestVariant(Base):
     """A/Bテストバリアント"""
@@ -4,7 +4,7 @@
 AI提案チャットセッションと提案データを管理
 """
 from datetime import datetime, date
-from sqlalchemy import Column, String, DateTime, Date, Float, Boolean, ForeignKey, Enum as SQLAlchemyEnum, Text
+from sqlalchemy import Column, String, DateTime, Date, Float, Boolean, ForeignKey, Index, Enum as SQLAlchemyEnum, Text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 import uuid
@@ -61,7 +61,7 @@ class PlanningChatSession(Base):
         JSONB,
         nullable=False,
         server_default='[]',
-        comment="メッセージ履歴（[{type: 'user'|'assistant', content: str, suggestions: [], created_at: str}]）"
+        comment="旧メッセージ履歴（planning_chat_messagesへ移行済み・参照しない）"
     )
     created_at = Column(
         DateTime,
@@ -86,6 +86,56 @@ class PlanningChatSession(Base):
         return f"<PlanningChatSession(id={self.id}, status={self.status})>"
 
 
+class PlanningChatMessage(Base):
+    """
+    企画チャットメッセージテーブル（追記専用）
+
+    1ターンごとに行を追加するだけで、セッション全体の履歴を書き換えない
+    """
+    __tablename__ = "planning_chat_messages"
+    __table_args__ = (
+        Index("ix_planning_chat_messages_session_id_created_at", "session_id", "created_at"),
+    )
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        nullable=False,
+        comment="メッセージID（UUID）"
+    )
+    session_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("planning_chat_sessions.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="セッションID（外部キー）"
+    )
+    role = Column(
+        String(20),
+        nullable=False,
+        comment="ロール（user/assistant）"
+    )
+    content = Column(
+        Text,
+        nullable=False,
+        comment="メッセージ内容"
+    )
+    suggestions = Column(
+        JSONB,
+        nullable=True,
+        comment="提案（[{id, title, description, type, tags, estimated_views, confidence}]）"
+    )
+    created_at = Column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        comment="送信日時"
+    )
+
+    def __repr__(self) -> str:
+        return f"<PlanningChatMessage(id={self.id}, session_id={self.session_id}, role={self.role})>"
+
+
 class AISuggestion(Base):
     """AI提案テーブル"""
     __tablename__ = "ai_suggestions"
@@ -4,7 +4,7 @@
 動画制作プロジェクトと各ステップの承認フローを管理
 """
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Enum as SQLAlchemyEnum, ForeignKey, Text
+from sqlalchemy import Column, String, DateTime, Enum as SQLAlchemyEnum, ForeignKey, Text, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 import uuid
@@ -112,6 +112,13 @@ class Project(Base):
     videos = relationship("Video", back_populates="project", cascade="all, delete-orphan")
     tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
 
+    # インデックス定義
+    __table_args__ = (
+        # 一覧のキーセットページング用（created_at DESC, id DESC）
+        Index("ix_projects_created_at_id", "created_at", "id"),
+        Index("ix_projects_client_id_created_at_id", "client_id", "created_at", "id"),
+    )
+
     def __repr__(self) -> str:
         return f"<Project(id={self.id}, name={self.name}, status={self.status})>"
 
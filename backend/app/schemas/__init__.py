@@ -187,6 +187,8 @@ from app.schemas.optimization import (
     ABTestVariantCreate,
     ABTestVariantUpdate,
     ABTestVariantResponse,
+    ABTestVariantEvaluation,
+    ABTestEvaluationResponse,
     ABTestCreate,
     ABTestUpdate,
     ABTestResponse,
@@ -421,6 +423,8 @@ __all__ = [
     "ABTestVariantCreate",
     "ABTestVariantUpdate",
     "ABTestVariantResponse",
+    "ABTestVariantEvaluation",
+    "ABTestEvaluationResponse",
     "ABTestCreate",
     "ABTestUpdate",
     "ABTestResponse",
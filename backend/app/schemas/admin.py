@@ -7,6 +7,7 @@ from datetime import datetime
 from typing import Optional, Any
 from uuid import UUID
 from pydantic import BaseModel, Field
+from app.schemas.pagination import CursorPageFields
 
 from app.models.admin import ApiConnectionStatus, AuditAction
 
@@ -115,7 +116,7 @@ class AuditLogResponse(BaseModel):
         from_attributes = True
 
 
-class AuditLogListResponse(BaseModel):
+class AuditLogListResponse(CursorPageFields):
     """監査ログ一覧レスポンス"""
     logs: list[AuditLogResponse]
     total: int
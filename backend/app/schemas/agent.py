@@ -8,6 +8,7 @@ from datetime import datetime
 from typing import Optional, List, Dict, Any
 from uuid import UUID
 from pydantic import BaseModel, Field
+from app.schemas.pagination import CursorPageFields
 
 from app.models.agent import (
     AgentType,
@@ -128,7 +129,7 @@ class AgentTaskResponse(AgentTaskBase):
         from_attributes = True
 
 
-class AgentTaskListResponse(BaseModel):
+class AgentTaskListResponse(CursorPageFields):
     """エージェントタスク一覧レスポンス"""
     tasks: List[AgentTaskResponse]
     total: int
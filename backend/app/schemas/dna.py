@@ -7,6 +7,7 @@ DNA Schemas
 from datetime import datetime
 from typing import Optional, List, Any, Dict
 from pydantic import BaseModel, Field
+from app.schemas.pagination import CursorPageFields
 from enum import Enum
 
 
@@ -102,7 +103,7 @@ class ContentDNAResponse(ContentDNABase):
         from_attributes = True
 
 
-class ContentDNAListResponse(BaseModel):
+class ContentDNAListResponse(CursorPageFields):
     """コンテンツDNAリストレスポンス"""
     dnas: List[ContentDNAResponse]
     total: int
@@ -7,6 +7,7 @@ from datetime import datetime
 from typing import Optional, Any
 from uuid import UUID
 from pydantic import BaseModel, Field
+from app.schemas.pagination import CursorPageFields
 
 from app.models.knowledge import KnowledgeType
 
@@ -55,7 +56,7 @@ class KnowledgeResponse(KnowledgeBase):
         from_attributes = True
 
 
-class KnowledgeListResponse(BaseModel):
+class KnowledgeListResponse(CursorPageFields):
     """ナレッジ一覧レスポンス"""
     data: list[KnowledgeResponse] = Field(..., description="ナレッジデータ")
     total: int = Field(..., description="総件数")
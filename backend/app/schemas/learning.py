@@ -7,6 +7,7 @@ Learning Schemas
 from datetime import datetime
 from typing import Optional, List, Any, Dict
 from pydantic import BaseModel, Field
+from app.schemas.pagination import CursorPageFields
 from enum import Enum
 
 
@@ -114,7 +115,7 @@ class PerformanceRecordResponse(PerformanceRecordBase):
         from_attributes = True
 
 
-class PerformanceRecordListResponse(BaseModel):
+class PerformanceRecordListResponse(CursorPageFields):
     """パフォーマンス記録リストレスポンス"""
     records: List[PerformanceRecordResponse]
     total: int
@@ -10,6 +10,7 @@ from uuid import UUID
 from enum import Enum
 
 from pydantic import BaseModel, Field
+from app.schemas.pagination import CursorPageFields
 
 
 # ============================================================
@@ -160,8 +161,8 @@ class ABTestVariantUpdate(BaseModel):
     """A/Bテストバリアント更新"""
     content: Optional[str] = None
     image_url: Optional[str] = None
-    impressions: Optional[int] = None
-    clicks: Optional[int] = None
+    impressions: Optional[int] = Field(None, ge=0, description="累計インプレッション数")
+    clicks: Optional[int] = Field(None, ge=0, description="累計クリック数")
     views: Optional[int] = None
     ctr: Optional[float] = None
     avg_view_duration: Optional[float] = None
@@ -202,8 +203,8 @@ class ABTestCreate(ABTestBase):
     """A/Bテスト作成"""
     duration_hours: int = 24
     traffic_split: float = 50.0
-    min_sample_size: int = 1000
-    confidence_level: float = 0.95
+    min_sample_size: int = Field(1000, ge=1, description="バリアントあたりの計画サンプルサイズ")
+    confidence_level: float = Field(0.95, gt=0, lt=1, description="信頼水準")
     variants: List[ABTestVariantCreate]
 
 
@@ -216,6 +217,33 @@ class ABTestUpdate(BaseModel):
     traffic_split: Optional[float] = None
 
 
+class ABTestVariantEvaluation(BaseModel):
+    """バリアントの評価結果"""
+    variant_name: str
+    impressions: int
+    clicks: int
+    ctr: float = Field(..., description="クリック率（%）")
+    prob_best: float = Field(..., description="最良である事後確率")
+    expected_loss: float = Field(..., description="選択した場合の期待損失（CTRのパーセントポイント）")
+    z_score: Optional[float] = Field(None, description="コントロールとのz値")
+    p_value: Optional[float] = Field(None, description="コントロールとの両側p値")
+
+
+class ABTestEvaluationResponse(BaseModel):
+    """A/Bテスト評価レスポンス"""
+    control: str
+    leader: str = Field(..., description="CTRが最も高いバリアント")
+    challenger: Optional[str] = Field(None, description="コントロールと比較したバリアント")
+    p_value: Optional[float] = Field(None, description="固定サンプルのp値（多重比較補正済み。逐次検定の判定は z_boundary で行う）")
+    z_boundary: Optional[float] = Field(None, description="現時点の逐次検定の境界")
+    information_fraction: float = Field(..., description="計画サンプルサイズに対する実績の割合")
+    confidence_interval: Dict[str, float] = Field(..., description="CTRの差の信頼区間（パーセントポイント）")
+    decided: bool = Field(..., description="テストを終了してよいか")
+    winner: Optional[str] = None
+    stop_reason: Optional[str] = Field(None, description="終了理由（significant/inconclusive）")
+    variants: List[ABTestVariantEvaluation] = []
+
+
 class ABTestResponse(ABTestBase):
     """A/Bテストレスポンス"""
     id: UUID
@@ -229,6 +257,8 @@ class ABTestResponse(ABTestBase):
     confidence_level: float
     winner_variant: Optional[str] = None
     statistical_significance: Optional[float] = None
+    evaluation: Optional[ABTestEvaluationResponse] = None
+    evaluated_at: Optional[datetime] = None
     variants: List[ABTestVariantResponse] = []
     created_at: datetime
     updated_at: datetime
@@ -237,7 +267,7 @@ class ABTestResponse(ABTestBase):
         from_attributes = True
 
 
-class ABTestListResponse(BaseModel):
+class ABTestListResponse(CursorPageFields):
     """A/Bテストリストレスポンス"""
     tests: List[ABTestResponse]
     total: int
@@ -247,9 +277,10 @@ class ABTestResultResponse(BaseModel):
     """A/Bテスト結果レスポンス"""
     test: ABTestResponse
     winner: Optional[ABTestVariantResponse] = None
-    statistical_significance: float
+    statistical_significance: float = Field(..., description="有意差を確認した信頼水準（有意差がない場合は0）")
     confidence_interval: Dict[str, float]
     recommendation: str
+    evaluation: Optional[ABTestEvaluationResponse] = None
 
 
 # ============================================================
@@ -0,0 +1,12 @@
+"""
+ページネーション共通スキーマ
+"""
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class CursorPageFields(BaseModel):
+    """キーセットページングの共通フィールド（一覧レスポンスに継承して使用）"""
+    next_cursor: Optional[str] = Field(None, description="次ページのカーソル（最終ページの場合はnull）")
+    total_is_estimate: bool = Field(False, description="totalが推定値か（exact_count=trueで正確な件数）")
@@ -7,6 +7,7 @@ from datetime import datetime
 from typing import Optional, Any
 from uuid import UUID
 from pydantic import BaseModel, Field
+from app.schemas.pagination import CursorPageFields
 
 from app.models.project import (
     ProjectStatus,
@@ -52,7 +53,7 @@ class ProjectResponse(ProjectBase):
         from_attributes = True
 
 
-class ProjectListResponse(BaseModel):
+class ProjectListResponse(CursorPageFields):
     """プロジェクト一覧レスポンス"""
     data: list[ProjectResponse]
     total: int = Field(..., description="総件数")
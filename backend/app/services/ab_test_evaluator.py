@@ -0,0 +1,260 @@
+"""
+A/Bテスト評価エンジン
+
+バリアントごとの累計（インプレッション数・クリック数）だけから、テストの有意性と勝者を判定する
+（十分統計量のみを使うため、指標が届くたびに生データを走査せず再評価できる）
+
+- 全バリアントをNumPy配列でまとめて計算
+- 頻度論: コントロールとの2標本比率のz検定（バリアントが3つ以上の場合はBonferroni補正）
+- ベイズ: Beta(1, 1) 事前分布のベータ二項事後分布から、各バリアントが最良である確率と期待損失を算出
+- 逐次検定: 指標が届くたびに何度でも評価する（連続モニタリング）ため、O'Brien-Fleming型の
+  ブラウン運動の境界 c / √t（c = Φ⁻¹(1 − α/4)、t = 実績 / 最小サンプルサイズ）を超えた時点で早期終了する。
+  |Z(t)| ≥ c / √t は |B(t)| ≥ c と同値で、反射原理により P(sup_{t≤1} |B(t)| ≥ c) ≤ 4(1 − Φ(c)) = α のため、
+  評価の回数・タイミングによらず第1種の過誤は α 以下に保たれる（t = 1 の境界は固定サンプルの z_{α/2} より大きい）
+"""
+import math
+from dataclasses import asdict, dataclass, field
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# 事後分布からのサンプル数（最良確率・期待損失のモンテカルロ推定）
+POSTERIOR_SAMPLES = 20_000
+
+# ベータ分布の事前パラメータ（一様分布）
+PRIOR_ALPHA = 1.0
+PRIOR_BETA = 1.0
+
+# テスト設定の既定値（ABTestモデルの既定値と同じ）
+DEFAULT_MIN_SAMPLE_SIZE = 1000
+DEFAULT_CONFIDENCE_LEVEL = 0.95
+
+# 終了理由
+STOP_SIGNIFICANT = "significant"
+STOP_INCONCLUSIVE = "inconclusive"
+
+_NORMAL = NormalDist()
+_ERFC = np.vectorize(math.erfc, otypes=[float])
+
+
+@dataclass
+class VariantEvaluation:
+    """バリアントの評価結果"""
+
+    variant_name: str
+    impressions: int
+    clicks: int
+    ctr: float
+    prob_best: float
+    expected_loss: float
+    z_score: Optional[float] = None
+    p_value: Optional[float] = None
+
+
+@dataclass
+class ABTestEvaluation:
+    """テストの評価結果"""
+
+    control: str
+    leader: str
+    challenger: Optional[str]
+    p_value: Optional[float]
+    z_boundary: Optional[float]
+    information_fraction: float
+    confidence_interval: Dict[str, float]
+    decided: bool
+    winner: Optional[str]
+    stop_reason: Optional[str]
+    variants: List[VariantEvaluation] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def sequential_boundary(alpha: float, fraction: float) -> Optional[float]:
+    """
+    連続モニタリングの逐次検定の境界（|z| がこれ以上で有意）
+
+    Args:
+        alpha: 有意水準（両側）
+        fraction: 情報量の割合 t（0 < t ≤ 1）
+
+    Returns:
+        Optional[float]: 境界 c / √t（t = 0 ではNone）
+    """
+    if fraction <= 0:
+        return None
+    return _NORMAL.inv_cdf(1 - alpha / 4) / math.sqrt(fraction)
+
+
+def _two_sided_p(z: np.ndarray) -> np.ndarray:
+    """標準正規分布の両側p値"""
+    return _ERFC(np.abs(z) / math.sqrt(2))
+
+
+def _posterior(
+    impressions: np.ndarray,
+    clicks: np.ndarray,
+    samples: int,
+    rng: Optional[np.random.Generator],
+) -> tuple:
+    """各バリアントが最良である確率と期待損失（CTRのパーセントポイント）"""
+    rng = rng or np.random.default_rng()
+    draws = rng.beta(
+        PRIOR_ALPHA + clicks,
+        PRIOR_BETA + impressions - clicks,
+        size=(samples, len(impressions)),
+    )
+    best = draws.argmax(axis=1)
+    prob_best = np.bincount(best, minlength=len(impressions)) / samples
+    expected_loss = (draws.max(axis=1)[:, None] - draws).mean(axis=0) * 100
+    return prob_best, expected_loss
+
+
+def evaluate(
+    names: Sequence[str],
+    impressions: Sequence[int],
+    clicks: Sequence[int],
+    control_index: int = 0,
+    confidence_level: float = DEFAULT_CONFIDENCE_LEVEL,
+    min_sample_size: int = DEFAULT_MIN_SAMPLE_SIZE,
+    final: bool = False,
+    samples: int = POSTERIOR_SAMPLES,
+    rng: Optional[np.random.Generator] = None,
+) -> ABTestEvaluation:
+    """
+    A/Bテストを評価
+
+    Args:
+        names: バリアント名
+        impressions: バリアントごとの累計インプレッション数
+        clicks: バリアントごとの累計クリック数
+        control_index: コントロールの位置
+        confidence_level: 信頼水準（0 < confidence_level < 1）
+        min_sample_size: バリアントあたりの計画サンプルサイズ（情報量の割合の分母、1以上）
+        final: 最終評価か（テスト終了時。現時点の境界を超えていなければ判定保留で終了とする）
+        samples: 事後分布のサンプル数
+        rng: 乱数生成器（テスト用）
+
+    Returns:
+        ABTestEvaluation: 評価結果
+
+    Raises:
+        ValueError: 信頼水準・計画サンプルサイズが範囲外
+    """
+    if not 0 < confidence_level < 1:
+        raise ValueError(f"confidence_level must be between 0 and 1 (exclusive): {confidence_level}")
+    if min_sample_size < 1:
+        raise ValueError(f"min_sample_size must be at least 1: {min_sample_size}")
+
+    n = np.asarray(impressions, dtype=np.float64)
+    c = np.minimum(np.asarray(clicks, dtype=np.float64), n)
+    k = len(n)
+    rate = np.divide(c, n, out=np.zeros(k), where=n > 0)
+
+    # コントロールとの2標本比率のz検定（プールした比率で標準誤差を計算）
+    n0, c0, p0 = n[control_index], c[control_index], rate[control_index]
+    pooled = np.divide(c + c0, n + n0, out=np.zeros(k), where=(n + n0) > 0)
+    se = np.sqrt(pooled * (1 - pooled) * (
+        np.divide(1, n, out=np.zeros(k), where=n > 0) + (1 / n0 if n0 > 0 else 0)
+    ))
+    z = np.divide(rate - p0, se, out=np.zeros(k), where=se > 0)
+    p_values = _two_sided_p(z)
+
+    treatments = [i for i in range(k) if i != control_index]
+    prob_best, expected_loss = _posterior(n, c, samples, rng)
+
+    variants = [
+        VariantEvaluation(
+            variant_name=names[i],
+            impressions=int(n[i]),
+            clicks=int(c[i]),
+            ctr=round(float(rate[i]) * 100, 4),
+            prob_best=round(float(prob_best[i]), 4),
+            expected_loss=round(float(expected_loss[i]), 4),
+            z_score=None if i == control_index else round(float(z[i]), 4),
+            p_value=None if i == control_index else round(float(p_values[i]), 6),
+        )
+        for i in range(k)
+    ]
+    leader = int(np.argmax(rate)) if n.sum() > 0 else control_index
+
+    if not treatments:
+        return ABTestEvaluation(
+            control=names[control_index], leader=names[leader], challenger=None,
+            p_value=None, z_boundary=None,
+            information_fraction=0.0, confidence_interval={"lower": 0.0, "upper": 0.0},
+            decided=False, winner=None, stop_reason=None, variants=variants,
+        )
+
+    # CTRが最も高い比較対象バリアントをコントロールと比較（多重比較はBonferroni補正）
+    challenger = max(treatments, key=lambda i: (rate[i], n[i]))
+    alpha = (1 - confidence_level) / len(treatments)
+    adjusted_p = min(1.0, float(p_values[challenger]) * len(treatments))
+
+    # 情報量の割合と逐次検定の境界
+    observed = min(n[challenger], n0)
+    fraction = min(1.0, observed / min_sample_size)
+    boundary = sequential_boundary(alpha, fraction)
+
+    # リフト（CTRの差、パーセントポイント）の信頼区間
+    diff = rate[challenger] - p0
+    unpooled_se = math.sqrt(
+        (rate[challenger] * (1 - rate[challenger]) / n[challenger] if n[challenger] > 0 else 0)
+        + (p0 * (1 - p0) / n0 if n0 > 0 else 0)
+    )
+    margin = _NORMAL.inv_cdf(1 - (1 - confidence_level) / 2) * unpooled_se
+    interval = {
+        "lower": round(float(diff - margin) * 100, 4),
+        "upper": round(float(diff + margin) * 100, 4),
+    }
+
+    decided, winner, stop_reason = False, None, None
+    if boundary is not None and abs(z[challenger]) >= boundary:
+        decided, stop_reason = True, STOP_SIGNIFICANT
+        winner = names[challenger] if z[challenger] > 0 else names[control_index]
+    elif (final or fraction >= 1.0) and observed > 0:
+        decided, stop_reason = True, STOP_INCONCLUSIVE
+
+    return ABTestEvaluation(
+        control=names[control_index],
+        leader=names[leader],
+        challenger=names[challenger],
+        p_value=round(adjusted_p, 6),
+        z_boundary=round(boundary, 4) if boundary is not None else None,
+        information_fraction=round(float(fraction), 4),
+        confidence_interval=interval,
+        decided=decided,
+        winner=winner,
+        stop_reason=stop_reason,
+        variants=variants,
+    )
+
+
+def evaluate_ab_test(ab_test: Any, final: bool = False, rng: Optional[np.random.Generator] = None) -> ABTestEvaluation:
+    """
+    ABTestモデル（variants読み込み済み）を評価
+
+    コントロールが指定されていない場合は最初のバリアント（名前順）をコントロールとする
+    （信頼水準・計画サンプルサイズが未設定の場合はモデルの既定値を使う）
+
+    Raises:
+        ValueError: 信頼水準・計画サンプルサイズが範囲外
+    """
+    variants = sorted(ab_test.variants, key=lambda v: v.variant_name)
+    control_index = next((i for i, v in enumerate(variants) if v.is_control), 0)
+    return evaluate(
+        names=[v.variant_name for v in variants],
+        impressions=[v.impressions or 0 for v in variants],
+        clicks=[v.clicks or 0 for v in variants],
+        control_index=control_index,
+        confidence_level=(
+            ab_test.confidence_level if ab_test.confidence_level is not None else DEFAULT_CONFIDENCE_LEVEL
+        ),
+        min_sample_size=(
+            ab_test.min_sample_size if ab_test.min_sample_size is not None else DEFAULT_MIN_SAMPLE_SIZE
+        ),
+        final=final,
+        rng=rng,
+    )
@@ -7,10 +7,11 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
+from app.core.pagination import paginate
 from app.models.admin import (
     SystemSetting,
     ApiConnection,
@@ -362,6 +363,8 @@ class AuditLogService:
         page_size: int = 50,
         action: Optional[AuditAction] = None,
         resource_type: Optional[str] = None,
+        cursor: Optional[str] = None,
+        exact_count: bool = False,
     ) -> AuditLogListResponse:
         """
         監査ログ一覧を取得
@@ -369,10 +372,12 @@ class AuditLogService:
         Args:
             db: データベースセッション
             current_user_role: 実行者のロール
-            page: ページ番号
+            page: ページ番号（cursor指定時は無視）
             page_size: ページサイズ
             action: アクションフィルター
             resource_type: リソース種別フィルター
+            cursor: 前ページの next_cursor（キーセットページング）
+            exact_count: 正確な総件数を数えるか（デフォルトは推定値）
 
         Returns:
             AuditLogListResponse: ログ一覧
@@ -384,29 +389,29 @@ class AuditLogService:
             )
 
         query = select(AuditLog)
-        count_query = select(func.count(AuditLog.id))
-
         if action:
             query = query.where(AuditLog.action == action)
-            count_query = count_query.where(AuditLog.action == action)
         if resource_type:
             query = query.where(AuditLog.resource_type == resource_type)
-            count_query = count_query.where(AuditLog.resource_type == resource_type)
-
-        query = query.order_by(AuditLog.created_at.desc())
-        query = query.offset((page - 1) * page_size).limit(page_size)
 
-        result = await db.execute(query)
-        logs = result.scalars().all()
-
-        count_result = await db.execute(count_query)
-        total = count_result.scalar()
+        result = await paginate(
+            db,
+            query,
+            sort_column=AuditLog.created_at,
+            id_column=AuditLog.id,
+            limit=page_size,
+            cursor=cursor,
+            offset=(page - 1) * page_size,
+            exact_count=exact_count,
+        )
 
         return AuditLogListResponse(
-            logs=[AuditLogResponse.model_validate(log) for log in logs],
-            total=total,
+            logs=[AuditLogResponse.model_validate(log) for log in result.items],
+            total=result.total,
             page=page,
             page_size=page_size,
+            next_cursor=result.next_cursor,
+            total_is_estimate=result.total_is_estimate,
         )
 
 
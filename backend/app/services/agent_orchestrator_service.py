@@ -194,6 +194,7 @@ class AgentOrchestratorService:
         agent_type: AgentType,
         knowledge_id: Optional[UUID] = None,
         input_data: Optional[Dict[str, Any]] = None,
+        priority: TaskPriority = TaskPriority.NORMAL,
     ) -> Dict[str, Any]:
         """エージェントを実行"""
         try:
@@ -219,6 +220,7 @@ class AgentOrchestratorService:
                 agent=agent,
                 name=f"{agent_type.value} execution",
                 input_data=input_data,
+                priority=priority,
             )
 
             # タスク開始
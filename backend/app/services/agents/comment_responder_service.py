@@ -2,9 +2,13 @@
 コメント返信エージェントサービス
 
 公開動画のコメントを取得し、AI返信を生成して承認キューに追加
+
+- 返信・センチメント・タグは動画ごとに Gemini のバッチ生成（generate_comment_replies）で
+  まとめて作成し、コメントごとの呼び出しを避ける
+- バッチで生成できなかったコメント（Gemini未設定・失敗時）は従来どおり1件ずつ Claude で生成
 """
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, timedelta
 from uuid import UUID
 
@@ -16,7 +20,7 @@ from app.models.agent import (
     CommentSentiment, ReplyStatus
 )
 from app.models.project import Video
-from app.services.external import youtube_api, claude_client
+from app.services.external import youtube_api, claude_client, gemini_client
 
 logger = logging.getLogger(__name__)
 
@@ -51,20 +55,27 @@ class CommentResponderService:
                 comments = await self._get_new_comments(video)
                 total_comments += len(comments)
 
-                for comment in comments:
-                    # 既に処理済みか確認
-                    if await self._is_already_processed(comment["comment_id"]):
-                        continue
+                # 未処理のコメントのみ、動画単位でまとめて返信を生成
+                pending = await self._filter_unprocessed(comments)
+                generated = await self._generate_replies_batch(video, pending)
 
-                    # 感情分析
-                    sentiment = await self._analyze_sentiment(comment["text"])
+                for comment, batch_result in zip(pending, generated):
+                    if batch_result:
+                        sentiment, reply_text = await self._reply_from_batch(
+                            video=video,
+                            comment=comment,
+                            batch_result=batch_result,
+                        )
+                    else:
+                        # 感情分析
+                        sentiment = await self._analyze_sentiment(comment["text"])
 
-                    # 返信生成
-                    reply_text = await self._generate_reply(
-                        video=video,
-                        comment=comment,
-                        sentiment=sentiment,
-                    )
+                        # 返信生成
+                        reply_text = await self._generate_reply(
+                            video=video,
+                            comment=comment,
+                            sentiment=sentiment,
+                        )
 
                     if reply_text:
                         # キューに追加
@@ -131,17 +142,80 @@ class CommentResponderService:
             logger.error(f"Failed to get comments for video {video.id}: {e}")
             return []
 
-    async def _is_already_processed(
+    async def _filter_unprocessed(
         self,
-        youtube_comment_id: str
-    ) -> bool:
-        """既に処理済みか確認"""
+        comments: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """承認キューに未登録のコメントのみ返す（1回のクエリで判定）"""
+        if not comments:
+            return []
+
         result = await self.db.execute(
-            select(CommentQueue).where(
-                CommentQueue.youtube_comment_id == youtube_comment_id
+            select(CommentQueue.youtube_comment_id).where(
+                CommentQueue.youtube_comment_id.in_([c["comment_id"] for c in comments])
             )
         )
-        return result.scalar_one_or_none() is not None
+        processed = set(result.scalars().all())
+        return [c for c in comments if c["comment_id"] not in processed]
+
+    async def _generate_replies_batch(
+        self,
+        video: Video,
+        comments: List[Dict[str, Any]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        動画のコメントへの返信・センチメント・タグをまとめて生成
+
+        Returns:
+            List[Optional[Dict]]: commentsと同じ順序の生成結果（生成できなかったコメントはNone）
+        """
+        if not comments or not gemini_client.is_available():
+            return [None] * len(comments)
+
+        video_context = {
+            "title": video.title or "",
+            "description": (video.video_metadata or {}).get("description", ""),
+        }
+        results = await gemini_client.generate_comment_replies(
+            [c.get("text", "") for c in comments],
+            video_context,
+        )
+        return [
+            r if r.get("reply") and not r.get("error") else None
+            for r in results
+        ]
+
+    async def _reply_from_batch(
+        self,
+        video: Video,
+        comment: Dict[str, Any],
+        batch_result: Dict[str, Any],
+    ) -> Tuple[CommentSentiment, str]:
+        """バッチ生成の結果から感情と返信文を決定（AI生成を使わないテンプレートがあれば優先）"""
+        if "質問" in (batch_result.get("tags") or []):
+            sentiment = CommentSentiment.QUESTION
+        else:
+            sentiment = {
+                "positive": CommentSentiment.POSITIVE,
+                "negative": CommentSentiment.NEGATIVE,
+            }.get(batch_result.get("sentiment"), CommentSentiment.NEUTRAL)
+
+        template = await self._find_matching_template(sentiment)
+        if template and not template.use_ai_generation:
+            return sentiment, self._render_template(template, video, comment)
+        return sentiment, batch_result["reply"]
+
+    def _render_template(
+        self,
+        template: CommentTemplate,
+        video: Video,
+        comment: Dict[str, Any],
+    ) -> str:
+        """テンプレートから返信を生成"""
+        reply = template.template_text
+        reply = reply.replace("{{author}}", comment.get("author", ""))
+        reply = reply.replace("{{video_title}}", video.title or "")
+        return reply
 
     async def _analyze_sentiment(
         self,
@@ -165,7 +239,8 @@ class CommentResponderService:
 - negative: 否定的、批判、不満
 - question: 質問、疑問"""
 
-            response = await claude_client.client.messages.create(
+            response = await claude_client.create_message(
+                "agent.comment_sentiment",
                 model="claude-sonnet-4-20250514",
                 max_tokens=20,
                 messages=[{"role": "user", "content": prompt}]
@@ -196,10 +271,7 @@ class CommentResponderService:
 
         if template and not template.use_ai_generation:
             # テンプレートから返信生成
-            reply = template.template_text
-            reply = reply.replace("{{author}}", comment.get("author", ""))
-            reply = reply.replace("{{video_title}}", video.title or "")
-            return reply
+            return self._render_template(template, video, comment)
 
         # AI生成
         if not claude_client.is_available():
@@ -228,7 +300,8 @@ class CommentResponderService:
 
 返信文のみを出力してください。"""
 
-            response = await claude_client.client.messages.create(
+            response = await claude_client.create_message(
+                "agent.comment_reply",
                 model="claude-sonnet-4-20250514",
                 max_tokens=200,
                 messages=[{"role": "user", "content": prompt}]
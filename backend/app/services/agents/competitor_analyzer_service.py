@@ -246,7 +246,8 @@ class CompetitorAnalyzerService:
 
 簡潔に、各100文字以内で回答してください。"""
 
-            response = await claude_client.client.messages.create(
+            response = await claude_client.create_message(
+                "agent.competitor_analysis",
                 model="claude-sonnet-4-20250514",
                 max_tokens=500,
                 messages=[{"role": "user", "content": prompt}]
@@ -2,22 +2,39 @@
 パフォーマンス追跡エージェントサービス
 
 公開済み動画のパフォーマンスを取得し、分析
+
+- YouTube Data API の videos.list で最大50件ずつ統計情報を一括取得
+- VideoAnalytics へ (video_id, date) 単位で INSERT ... ON CONFLICT によるバッチUPSERT
+- videos.list の統計は公開以来の累計のため、前日までの行の合計との差分（その日の増加分）を保存する
+  （ロールアップは日次の値をSUMで集計するため、累計を保存すると日数分だけ重複計上される）。
+  YouTube側の再集計で累計が減った日は負の差分を保存し、日次行の合計が常に最新の累計と一致するようにする
+- 本日分の統計が未取得（古い）動画のみを対象にインクリメンタル実行
 """
 import logging
-from typing import Optional, Dict, Any, List
-from datetime import datetime, timedelta
+import uuid
+from typing import Optional, Dict, Any, List, Tuple
+from datetime import datetime, date, timedelta
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import select, func, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.models.agent import Agent, AgentTask
-from app.models.project import Video
+from app.models.project import Video, VideoStatus
+from app.models.publish import Publication, PublishPlatform, PublishStatus
 from app.models.analytics import VideoAnalytics
+from app.services.analytics_rollup_service import AnalyticsRollupService
 from app.services.external import youtube_api
 
 logger = logging.getLogger(__name__)
 
+# 1回のINSERT文で書き込む最大行数
+UPSERT_BATCH_SIZE = 500
+
+# 統計を再取得するまでの日数（1 = 本日分が未取得なら再取得）
+DEFAULT_STALE_AFTER_DAYS = 1
+
 
 class PerformanceTrackerService:
     """パフォーマンス追跡エージェントサービス"""
@@ -33,32 +50,53 @@ class PerformanceTrackerService:
     ) -> Dict[str, Any]:
         """エージェントを実行"""
         try:
-            # 公開済み動画を取得
-            videos = await self._get_published_videos()
+            stale_after_days = int(
+                input_data.get("stale_after_days", DEFAULT_STALE_AFTER_DAYS)
+            )
+            today = datetime.utcnow().date()
+
+            # 統計が古い公開済み動画のみ取得
+            targets = await self._get_stale_videos(today, stale_after_days)
+            if not targets:
+                return {
+                    "videos_analyzed": 0,
+                    "videos_updated": 0,
+                    "performance_data": [],
+                }
+
+            # videos.list で50件ずつ一括取得
+            metrics_by_youtube_id = await youtube_api.get_videos_statistics(
+                [youtube_video_id for _, youtube_video_id, _ in targets]
+            )
 
-            videos_updated = 0
-            performance_data = []
+            previous_totals = await self._get_previous_totals(
+                [video_id for video_id, _, _ in targets], today
+            )
 
-            for video in videos:
-                if not video.youtube_video_id:
+            rows = []
+            performance_data = []
+            for video_id, youtube_video_id, title in targets:
+                metrics = metrics_by_youtube_id.get(youtube_video_id)
+                if not metrics:
                     continue
-
-                # YouTube APIからデータ取得（youtube_apiには直接動画取得がないので検索で代用）
-                # 実際の実装ではYouTube Analytics APIを使用
-                metrics = await self._get_video_metrics(video)
-
-                if metrics:
-                    await self._update_analytics(video, metrics)
-                    videos_updated += 1
-                    performance_data.append({
-                        "video_id": str(video.id),
-                        "title": video.title,
-                        "views": metrics.get("view_count", 0),
-                        "likes": metrics.get("like_count", 0),
-                    })
+                rows.append(self._build_analytics_row(
+                    video_id, today, metrics, previous_totals.get(video_id)
+                ))
+                performance_data.append({
+                    "video_id": str(video_id),
+                    "title": title,
+                    "views": metrics.get("view_count", 0),
+                    "likes": metrics.get("like_count", 0),
+                })
+
+            videos_updated = await self._upsert_analytics(rows)
+
+            # 新しい行をロールアップへインクリメンタルに反映
+            if videos_updated:
+                await AnalyticsRollupService(self.db).refresh()
 
             return {
-                "videos_analyzed": len(videos),
+                "videos_analyzed": len(targets),
                 "videos_updated": videos_updated,
                 "performance_data": performance_data,
             }
@@ -67,60 +105,129 @@ class PerformanceTrackerService:
             logger.error(f"Performance tracker execution failed: {e}")
             raise
 
-    async def _get_published_videos(self) -> List[Video]:
-        """公開済み動画を取得"""
+    async def _get_stale_videos(
+        self,
+        today: date,
+        stale_after_days: int = DEFAULT_STALE_AFTER_DAYS,
+    ) -> List[Tuple[UUID, str, Optional[str]]]:
+        """
+        統計が古い公開済み動画を取得
+
+        最新のVideoAnalytics.dateが (today - stale_after_days) 以前、
+        または未取得の動画のみ返す
+
+        Returns:
+            List[Tuple]: (動画ID, YouTube動画ID, タイトル)
+        """
+        threshold = today - timedelta(days=max(stale_after_days, 1) - 1)
+
+        latest = (
+            select(
+                VideoAnalytics.video_id,
+                func.max(VideoAnalytics.date).label("last_date"),
+            )
+            .group_by(VideoAnalytics.video_id)
+            .subquery()
+        )
+
         result = await self.db.execute(
-            select(Video).where(
-                Video.status == "published",
-                Video.youtube_video_id.isnot(None)
-            ).limit(50)
+            select(Video.id, Publication.platform_video_id, Video.title)
+            .join(Publication, Publication.video_id == Video.id)
+            .outerjoin(latest, latest.c.video_id == Video.id)
+            .where(
+                Video.status == VideoStatus.PUBLISHED,
+                Publication.platform == PublishPlatform.YOUTUBE,
+                Publication.status == PublishStatus.PUBLISHED,
+                Publication.platform_video_id.isnot(None),
+                or_(latest.c.last_date.is_(None), latest.c.last_date < threshold),
+            )
+            .distinct(Video.id)
+            .order_by(Video.id)
         )
-        return result.scalars().all()
+        return [tuple(row) for row in result.all()]
 
-    async def _get_video_metrics(
+    async def _get_previous_totals(
         self,
-        video: Video
-    ) -> Optional[Dict[str, Any]]:
-        """動画のメトリクスを取得"""
-        # 注: 実際のYouTube Analytics APIは別途実装が必要
-        # ここでは簡易版としてコメント取得の結果を使用
-        try:
-            # youtube_apiには個別動画取得がないため、
-            # 実際の実装ではYouTube Data APIのvideos.listを使用
-            return {
-                "view_count": 0,
-                "like_count": 0,
-                "comment_count": 0,
-                "updated_at": datetime.utcnow().isoformat(),
-            }
-        except Exception as e:
-            logger.error(f"Failed to get metrics for video {video.id}: {e}")
-            return None
+        video_ids: List[UUID],
+        today: date,
+    ) -> Dict[UUID, Tuple[int, int, int]]:
+        """
+        前日までの日次行の合計（= 前回取得時点の累計）を取得
+
+        同じ日に再実行しても本日分の行は含めないため、差分は冪等に再計算される
+
+        Returns:
+            Dict[UUID, Tuple]: 動画ID -> (視聴回数, 高評価数, コメント数)
+        """
+        if not video_ids:
+            return {}
 
-    async def _update_analytics(
-        self,
-        video: Video,
-        metrics: Dict[str, Any]
-    ):
-        """分析データを更新"""
-        # VideoAnalyticsレコードを更新または作成
         result = await self.db.execute(
-            select(VideoAnalytics).where(VideoAnalytics.video_id == video.id)
+            select(
+                VideoAnalytics.video_id,
+                func.coalesce(func.sum(VideoAnalytics.views), 0),
+                func.coalesce(func.sum(VideoAnalytics.likes), 0),
+                func.coalesce(func.sum(VideoAnalytics.comments), 0),
+            )
+            .where(VideoAnalytics.video_id.in_(video_ids), VideoAnalytics.date < today)
+            .group_by(VideoAnalytics.video_id)
         )
-        analytics = result.scalar_one_or_none()
-
-        if analytics:
-            analytics.view_count = metrics.get("view_count", 0)
-            analytics.like_count = metrics.get("like_count", 0)
-            analytics.comment_count = metrics.get("comment_count", 0)
-            analytics.updated_at = datetime.utcnow()
-        else:
-            analytics = VideoAnalytics(
-                video_id=video.id,
-                view_count=metrics.get("view_count", 0),
-                like_count=metrics.get("like_count", 0),
-                comment_count=metrics.get("comment_count", 0),
+        return {
+            video_id: (int(views), int(likes), int(comments))
+            for video_id, views, likes, comments in result.all()
+        }
+
+    def _build_analytics_row(
+        self,
+        video_id: UUID,
+        target_date: date,
+        metrics: Dict[str, Any],
+        previous: Optional[Tuple[int, int, int]] = None,
+    ) -> Dict[str, Any]:
+        """
+        VideoAnalyticsのUPSERT用行データを構築
+
+        累計値から前回までの合計を引いた増加分を保存する（初回は累計がそのまま初日の値になる）。
+        YouTube側の再集計で累計が減った場合は負の補正値をそのまま保存する
+        （0に切り上げると日次行の合計が累計を上回り、以降の増加分が過少に計上されるため）
+        """
+        prev_views, prev_likes, prev_comments = previous or (0, 0, 0)
+        return {
+            "id": uuid.uuid4(),
+            "video_id": video_id,
+            "date": target_date,
+            "views": metrics.get("view_count", 0) - prev_views,
+            "likes": metrics.get("like_count", 0) - prev_likes,
+            "comments": metrics.get("comment_count", 0) - prev_comments,
+            "created_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow(),
+        }
+
+    async def _upsert_analytics(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        分析データをバッチUPSERT
+
+        (video_id, date) が衝突した場合は統計値のみ更新する
+
+        Returns:
+            int: 書き込んだ行数
+        """
+        if not rows:
+            return 0
+
+        for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+            batch = rows[i:i + UPSERT_BATCH_SIZE]
+            stmt = pg_insert(VideoAnalytics).values(batch)
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_video_analytics_video_id_date",
+                set_={
+                    "views": stmt.excluded.views,
+                    "likes": stmt.excluded.likes,
+                    "comments": stmt.excluded.comments,
+                    "updated_at": stmt.excluded.updated_at,
+                },
             )
-            self.db.add(analytics)
+            await self.db.execute(stmt)
 
         await self.db.commit()
+        return len(rows)
@@ -99,7 +99,8 @@ class QACheckerService:
 回答形式:
 {{"hook_score": 80, "structure_score": 75, "target_score": 85, "cta_score": 70, "feedback": "改善点のコメント"}}"""
 
-            response = await claude_client.client.messages.create(
+            response = await claude_client.create_message(
+                "agent.qa_evaluation",
                 model="claude-sonnet-4-20250514",
                 max_tokens=300,
                 messages=[{"role": "user", "content": prompt}]
@@ -2,6 +2,8 @@
 トレンド監視エージェントサービス
 
 Google Trends + YouTube検索でトレンドを検出し、アラートを生成
+キーワードごとのスコアは trend_snapshots に時系列で保存し、前回との差分でLLM判定・アラートを制御する
+（保持期間 TREND_SNAPSHOT_RETENTION_DAYS を過ぎたスナップショットは実行ごとに削除する）
 """
 import logging
 from typing import Optional, Dict, Any, List
@@ -9,9 +11,11 @@ from datetime import datetime, timedelta
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, or_, select
 
-from app.models.agent import Agent, AgentTask, TrendAlert
+from app.core.config import settings
+
+from app.models.agent import Agent, AgentTask, TrendAlert, TrendSnapshot
 from app.models.knowledge import Knowledge
 from app.services.external.serp_api import serp_api
 from app.services.external.youtube_api import youtube_api
@@ -20,11 +24,20 @@ from app.services.external.ai_clients import claude_client
 logger = logging.getLogger(__name__)
 
 
+def _same_knowledge(column, knowledge_id: Optional[UUID]):
+    """ナレッジIDの一致条件（ナレッジ未設定のエージェントはNULL同士で一致させる）"""
+    if knowledge_id is None:
+        return column.is_(None)
+    return column == knowledge_id
+
+
 class TrendMonitorService:
     """トレンド監視エージェントサービス"""
 
     SCORE_THRESHOLD_HIGH = 70
     SCORE_THRESHOLD_MEDIUM = 50
+    # 重要度を判定した時点からのスコア変化がこれ未満なら重要度判定（LLM）を省略する
+    IMPORTANCE_DELTA_THRESHOLD = 10
 
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -35,7 +48,13 @@ class TrendMonitorService:
         task: AgentTask,
         input_data: Dict[str, Any],
     ) -> Dict[str, Any]:
-        """エージェントを実行"""
+        """
+        エージェントを実行
+
+        キーワードごとにスナップショットを保存して前回との差分を計算し、
+        差分が小さいキーワードは前回の重要度判定を再利用する（LLM呼び出しを省略）。
+        未対応のアラートがあるキーワードは新規作成せずに既存アラートを更新する
+        """
         try:
             # キーワード取得
             keywords = await self._get_monitoring_keywords(agent.knowledge_id)
@@ -44,41 +63,169 @@ class TrendMonitorService:
                 logger.warning("No keywords to monitor")
                 return {"alerts_created": 0, "keywords_checked": 0}
 
+            previous = await self._get_latest_snapshots(agent.knowledge_id, keywords)
+            open_alerts = await self._get_open_alerts(agent.knowledge_id, keywords)
+
             alerts_created = 0
-            trends_found = []
+            alerts_updated = 0
+            importance_reused = 0
+            detected = []
 
             for keyword in keywords:
                 # トレンドスコア計算
                 trend_data = await self._analyze_keyword_trend(keyword)
-
-                if trend_data and trend_data.get("score", 0) >= self.SCORE_THRESHOLD_MEDIUM:
-                    # AIで重要度判定
+                if not trend_data:
+                    continue
+
+                last = previous.get(keyword)
+                score = trend_data["score"]
+                trend_data["delta"] = score - last.score if last else None
+                trend_data["growth_rate"] = (
+                    (score - last.score) / last.score if last and last.score > 0 else None
+                )
+
+                snapshot = TrendSnapshot(
+                    knowledge_id=agent.knowledge_id,
+                    keyword=keyword,
+                    score=score,
+                    trends_score=trend_data.get("trends_score", 0),
+                    youtube_score=trend_data.get("youtube_score", 0),
+                    delta=trend_data["delta"],
+                )
+                self.db.add(snapshot)
+
+                if score < self.SCORE_THRESHOLD_MEDIUM:
+                    continue
+
+                # 重要度判定（判定時のスコアから大きく動いていなければ前回の判定を再利用）
+                if self._can_reuse_importance(last, score):
+                    importance = last.importance
+                    snapshot.importance_score = last.importance_score
+                    importance_reused += 1
+                else:
                     importance = await self._evaluate_importance(keyword, trend_data)
-                    trend_data["importance"] = importance
-
-                    # アラート作成
-                    alert = await self._create_alert(
+                    snapshot.importance_score = score
+                snapshot.importance = importance
+                trend_data["importance"] = importance
+
+                # アラート作成（未対応のアラートがあれば更新）
+                alert = open_alerts.get(keyword)
+                if alert:
+                    self._refresh_alert(alert, trend_data)
+                    alerts_updated += 1
+                else:
+                    alert = self._build_alert(
                         agent=agent,
                         keyword=keyword,
                         trend_data=trend_data,
                     )
+                    self.db.add(alert)
+                    open_alerts[keyword] = alert
                     alerts_created += 1
-                    trends_found.append({
-                        "keyword": keyword,
-                        "score": trend_data.get("score"),
-                        "alert_id": str(alert.id),
-                    })
+                detected.append((keyword, score, trend_data["delta"], alert))
+
+            snapshots_pruned = await self._prune_snapshots(
+                agent.knowledge_id,
+                keep_ids=[snapshot.id for snapshot in previous.values()],
+            )
+            await self.db.commit()
 
             return {
                 "alerts_created": alerts_created,
+                "alerts_updated": alerts_updated,
                 "keywords_checked": len(keywords),
-                "trends_found": trends_found,
+                "importance_evaluations_skipped": importance_reused,
+                "snapshots_pruned": snapshots_pruned,
+                "trends_found": [
+                    {
+                        "keyword": keyword,
+                        "score": score,
+                        "delta": delta,
+                        "alert_id": str(alert.id),
+                    }
+                    for keyword, score, delta, alert in detected
+                ],
             }
 
         except Exception as e:
             logger.error(f"Trend monitor execution failed: {e}")
             raise
 
+    def _can_reuse_importance(
+        self,
+        last: Optional[TrendSnapshot],
+        score: float,
+    ) -> bool:
+        """
+        前回スナップショットの重要度判定を再利用できるか
+
+        直前のスコアではなく、重要度を判定した時点のスコアと比べる
+        （少しずつ上昇し続けるキーワードも、累計の変化が閾値に達した時点で再判定する）
+        """
+        return (
+            last is not None
+            and last.importance is not None
+            and last.importance_score is not None
+            and abs(score - last.importance_score) < self.IMPORTANCE_DELTA_THRESHOLD
+        )
+
+    async def _get_latest_snapshots(
+        self,
+        knowledge_id: Optional[UUID],
+        keywords: List[str],
+    ) -> Dict[str, TrendSnapshot]:
+        """キーワードごとの最新スナップショットを取得"""
+        result = await self.db.execute(
+            select(TrendSnapshot)
+            .where(
+                _same_knowledge(TrendSnapshot.knowledge_id, knowledge_id),
+                TrendSnapshot.keyword.in_(keywords),
+            )
+            .order_by(TrendSnapshot.keyword, TrendSnapshot.captured_at.desc())
+            .distinct(TrendSnapshot.keyword)
+        )
+        return {snapshot.keyword: snapshot for snapshot in result.scalars().all()}
+
+    async def _prune_snapshots(
+        self,
+        knowledge_id: Optional[UUID],
+        keep_ids: List[UUID],
+    ) -> int:
+        """
+        保持期間を過ぎたスナップショットを削除
+
+        差分計算に使うため、キーワードごとの前回スナップショット（keep_ids）は残す
+        """
+        cutoff = datetime.utcnow() - timedelta(days=settings.TREND_SNAPSHOT_RETENTION_DAYS)
+        stmt = delete(TrendSnapshot).where(
+            _same_knowledge(TrendSnapshot.knowledge_id, knowledge_id),
+            TrendSnapshot.captured_at < cutoff,
+        )
+        if keep_ids:
+            stmt = stmt.where(TrendSnapshot.id.notin_(keep_ids))
+        result = await self.db.execute(stmt)
+        return result.rowcount or 0
+
+    async def _get_open_alerts(
+        self,
+        knowledge_id: Optional[UUID],
+        keywords: List[str],
+    ) -> Dict[str, TrendAlert]:
+        """キーワードごとの未対応（未アクション・有効期限内）のアラートを取得"""
+        now = datetime.utcnow()
+        result = await self.db.execute(
+            select(TrendAlert)
+            .where(
+                _same_knowledge(TrendAlert.knowledge_id, knowledge_id),
+                TrendAlert.keyword.in_(keywords),
+                TrendAlert.is_actioned == False,  # noqa: E712
+                or_(TrendAlert.expires_at.is_(None), TrendAlert.expires_at > now),
+            )
+            .order_by(TrendAlert.keyword, TrendAlert.detected_at.desc())
+            .distinct(TrendAlert.keyword)
+        )
+        return {alert.keyword: alert for alert in result.scalars().all()}
+
     async def _get_monitoring_keywords(
         self,
         knowledge_id: Optional[UUID]
@@ -137,7 +284,7 @@ class TrendMonitorService:
         self,
         keyword: str
     ) -> Optional[Dict[str, Any]]:
-        """キーワードのトレンドを分析"""
+        """キーワードのトレンドを分析（失敗時はNone）"""
         try:
             # Google Trends検索
             trends_data = await serp_api.search_google_trends(keyword)
@@ -155,9 +302,6 @@ class TrendMonitorService:
             # 総合スコア（トレンド40% + YouTube60%）
             total_score = (trends_score * 0.4) + (youtube_score * 0.6)
 
-            if total_score < self.SCORE_THRESHOLD_MEDIUM:
-                return None
-
             return {
                 "score": total_score,
                 "trends_score": trends_score,
@@ -230,7 +374,8 @@ class TrendMonitorService:
 YouTube動画制作の観点から、このトレンドを動画ネタとして活用する価値を評価してください。
 「high」「medium」「low」のいずれかで回答してください。理由は不要です。"""
 
-            response = await claude_client.client.messages.create(
+            response = await claude_client.create_message(
+                "agent.trend_importance",
                 model="claude-sonnet-4-20250514",
                 max_tokens=50,
                 messages=[{"role": "user", "content": prompt}]
@@ -245,49 +390,64 @@ YouTube動画制作の観点から、このトレンドを動画ネタとして
             logger.error(f"Importance evaluation failed: {e}")
             return "medium"
 
-    async def _create_alert(
+    def _alert_type(self, score: float) -> str:
+        """スコアからアラートタイプを決定"""
+        if score >= self.SCORE_THRESHOLD_HIGH:
+            return "keyword_spike"
+        return "rising_trend"
+
+    def _related_data(self, trend_data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "trends_score": trend_data.get("trends_score"),
+            "youtube_score": trend_data.get("youtube_score"),
+            "delta": trend_data.get("delta"),
+            "importance": trend_data.get("importance", "medium"),
+            "related_keywords": trend_data.get("related_keywords", []),
+            "top_videos": trend_data.get("top_videos", []),
+        }
+
+    def _build_alert(
         self,
         agent: Agent,
         keyword: str,
         trend_data: Dict[str, Any],
     ) -> TrendAlert:
         """トレンドアラートを作成"""
-        importance = trend_data.get("importance", "medium")
         score = trend_data.get("score", 0)
 
-        # アラートタイプ決定
-        if score >= self.SCORE_THRESHOLD_HIGH:
-            alert_type = "keyword_spike"
-        else:
-            alert_type = "rising_trend"
-
-        # 推奨アクション生成
-        suggested_actions = self._generate_suggested_actions(keyword, trend_data)
-
-        alert = TrendAlert(
+        return TrendAlert(
             agent_id=agent.id,
             knowledge_id=agent.knowledge_id,
             title=f"トレンド検出: {keyword}",
             description=f"キーワード「{keyword}」がトレンド上昇中です。スコア: {score:.1f}",
-            alert_type=alert_type,
+            alert_type=self._alert_type(score),
             source=trend_data.get("source", "unknown"),
             keyword=keyword,
             trend_score=score,
-            related_data={
-                "trends_score": trend_data.get("trends_score"),
-                "youtube_score": trend_data.get("youtube_score"),
-                "related_keywords": trend_data.get("related_keywords", []),
-                "top_videos": trend_data.get("top_videos", []),
-            },
-            suggested_actions=suggested_actions,
+            growth_rate=trend_data.get("growth_rate"),
+            related_data=self._related_data(trend_data),
+            suggested_actions=self._generate_suggested_actions(keyword, trend_data),
             expires_at=datetime.utcnow() + timedelta(days=7),
         )
 
-        self.db.add(alert)
-        await self.db.commit()
-        await self.db.refresh(alert)
-
-        return alert
+    def _refresh_alert(
+        self,
+        alert: TrendAlert,
+        trend_data: Dict[str, Any],
+    ) -> None:
+        """未対応のアラートを最新のスコアで更新（スコアが大きく上昇した場合は未読に戻す）"""
+        score = trend_data.get("score", 0)
+        delta = trend_data.get("delta")
+
+        alert.description = f"キーワード「{alert.keyword}」がトレンド上昇中です。スコア: {score:.1f}"
+        alert.alert_type = self._alert_type(score)
+        alert.trend_score = score
+        alert.growth_rate = trend_data.get("growth_rate")
+        alert.related_data = self._related_data(trend_data)
+        alert.suggested_actions = self._generate_suggested_actions(alert.keyword, trend_data)
+        alert.expires_at = datetime.utcnow() + timedelta(days=7)
+        if delta is not None and delta >= self.IMPORTANCE_DELTA_THRESHOLD:
+            alert.is_read = False
 
     def _generate_suggested_actions(
         self,
@@ -0,0 +1,447 @@
+"""
+分析ロールアップサービス
+
+VideoAnalyticsの生データから日次/週次/月次のロールアップを
+ウォーターマーク方式でインクリメンタルに維持し、ダッシュボード用の読み取りを提供
+
+- 前回処理以降に更新された (video_id, date) だけを対象に、影響のある集計期間のみ再集計
+  （updated_at はコミット前にアプリ側で付与されるため、ウォーターマークは WATERMARK_SAFETY_MARGIN だけ
+  手前に置き、直近の区間は次回も再集計する。再集計は期間全体の作り直しのため重複しても結果は変わらない）
+- 長期間の集計は「端数の日次 + 月次」に分割して読み取り、生データを走査しない
+"""
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import Date, and_, cast, func, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models.analytics import (
+    AnalyticsRollupWatermark,
+    ClientAnalyticsRollup,
+    RollupPeriod,
+    VideoAnalytics,
+    VideoAnalyticsRollup,
+)
+from app.models.project import Project, Video
+
+logger = logging.getLogger(__name__)
+
+VIDEO_ANALYTICS_WATERMARK = "video_analytics"
+
+# 並行トランザクションがこれより前の updated_at の行を後からコミットしても取りこぼさないための猶予
+WATERMARK_SAFETY_MARGIN = timedelta(minutes=10)
+
+# date_trunc に渡す単位
+PERIOD_TRUNC_UNITS = {
+    RollupPeriod.DAILY: "day",
+    RollupPeriod.WEEKLY: "week",
+    RollupPeriod.MONTHLY: "month",
+}
+
+# 生データ列 -> ロールアップ列（SUMで集計）
+# VideoAnalyticsの各行はその日の増加分であること（累計のスナップショットを書き込まない）
+SUM_COLUMNS = {
+    "views": "views",
+    "watch_time_minutes": "watch_time_minutes",
+    "likes": "likes",
+    "comments": "comments",
+    "shares": "shares",
+    "subscribers_gained": "subscribers_gained",
+    "subscribers_lost": "subscribers_lost",
+    "impressions": "impressions",
+    "ctr_sum": "ctr",
+}
+
+METRIC_COLUMNS = list(SUM_COLUMNS.keys()) + ["sample_days"]
+
+
+def _bucket(period: RollupPeriod, column):
+    """集計期間の開始日を返すSQL式"""
+    unit = PERIOD_TRUNC_UNITS[period]
+    return cast(func.date_trunc(literal_column(f"'{unit}'"), column), Date)
+
+
+def period_start(period: RollupPeriod, d: date) -> date:
+    """Python側で集計期間の開始日を求める（date_truncと同じ規則）"""
+    if period == RollupPeriod.WEEKLY:
+        return d - timedelta(days=d.weekday())
+    if period == RollupPeriod.MONTHLY:
+        return d.replace(day=1)
+    return d
+
+
+def split_range(date_from: date, date_to: date) -> List[Tuple[RollupPeriod, date, date]]:
+    """
+    期間を「先頭の端数日（日次）+ 完全な月（月次）+ 末尾の端数日（日次）」に分割
+
+    Returns:
+        List[Tuple]: (集計単位, 開始日, 終了日) のリスト（月次の日付は月初）
+    """
+    if date_from > date_to:
+        return []
+
+    first_full_month = period_start(RollupPeriod.MONTHLY, date_from)
+    if first_full_month < date_from:
+        first_full_month = _add_month(first_full_month)
+
+    next_month_after_to = _add_month(period_start(RollupPeriod.MONTHLY, date_to))
+    if next_month_after_to - timedelta(days=1) == date_to:
+        last_full_month = period_start(RollupPeriod.MONTHLY, date_to)
+    else:
+        last_full_month = _add_month(period_start(RollupPeriod.MONTHLY, date_to), -1)
+
+    if first_full_month > last_full_month:
+        return [(RollupPeriod.DAILY, date_from, date_to)]
+
+    segments: List[Tuple[RollupPeriod, date, date]] = []
+    if date_from < first_full_month:
+        segments.append((RollupPeriod.DAILY, date_from, first_full_month - timedelta(days=1)))
+    segments.append((RollupPeriod.MONTHLY, first_full_month, last_full_month))
+    tail_start = _add_month(last_full_month)
+    if tail_start <= date_to:
+        segments.append((RollupPeriod.DAILY, tail_start, date_to))
+    return segments
+
+
+def partial_buckets(period: RollupPeriod, date_from: date, date_to: date) -> List[Tuple[date, date, date]]:
+    """
+    期間の端にかかり、期間外の日を含む集計期間（週次・月次の先頭・末尾）
+
+    Returns:
+        List[Tuple]: (集計期間の開始日, 期間内の開始日, 期間内の終了日) のリスト
+    """
+    if period == RollupPeriod.DAILY or date_from > date_to:
+        return []
+
+    def bucket_end(start: date) -> date:
+        if period == RollupPeriod.WEEKLY:
+            return start + timedelta(days=6)
+        return _add_month(start) - timedelta(days=1)
+
+    edges = []
+    first = period_start(period, date_from)
+    if first < date_from or bucket_end(first) > date_to:
+        edges.append((first, date_from, min(bucket_end(first), date_to)))
+    last = period_start(period, date_to)
+    if last > first and bucket_end(last) > date_to:
+        edges.append((last, last, date_to))
+    return edges
+
+
+def series_period(date_from: date, date_to: date) -> RollupPeriod:
+    """推移グラフに使う集計単位を期間の長さから決定"""
+    days = (date_to - date_from).days + 1
+    if days <= 31:
+        return RollupPeriod.DAILY
+    if days <= 182:
+        return RollupPeriod.WEEKLY
+    return RollupPeriod.MONTHLY
+
+
+def next_watermark(since: datetime, until: datetime, now: datetime) -> datetime:
+    """
+    次回のウォーターマーク（処理した最大の updated_at と、現在時刻から猶予を引いた時刻の早い方）
+
+    猶予内の区間は次回も再集計し、後からコミットされた行を取りこぼさない
+    """
+    return max(since, min(until, now - WATERMARK_SAFETY_MARGIN))
+
+
+def _add_month(d: date, months: int = 1) -> date:
+    """月初日にmonthsヶ月を加算"""
+    month_index = d.year * 12 + (d.month - 1) + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+class AnalyticsRollupService:
+    """分析ロールアップサービス"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    # ========== インクリメンタル更新 ==========
+
+    async def refresh(self) -> int:
+        """
+        前回ウォーターマーク以降に更新されたVideoAnalyticsをロールアップへ反映
+
+        Returns:
+            int: 反映した (video_id, date) の件数
+        """
+        since = await self._get_watermark(VIDEO_ANALYTICS_WATERMARK)
+
+        result = await self.db.execute(
+            select(func.max(VideoAnalytics.updated_at), func.count())
+            .where(VideoAnalytics.updated_at > since)
+        )
+        until, changed = result.one()
+        if until is None:
+            return 0
+
+        for period in RollupPeriod:
+            await self._refresh_video_rollups(period, since, until)
+            await self._refresh_client_rollups(period, since, until)
+
+        await self._set_watermark(VIDEO_ANALYTICS_WATERMARK, next_watermark(since, until, datetime.utcnow()))
+        await self.db.commit()
+
+        logger.info(f"Analytics rollups refreshed: {changed} rows up to {until}")
+        return changed
+
+    def _dirty_rows(self, since: datetime, until: datetime):
+        """ウォーターマーク区間内に更新された生データ"""
+        changed = aliased(VideoAnalytics)
+        return changed, and_(changed.updated_at > since, changed.updated_at <= until)
+
+    async def _refresh_video_rollups(
+        self,
+        period: RollupPeriod,
+        since: datetime,
+        until: datetime,
+    ) -> None:
+        """影響を受けた (video_id, 期間) の動画ロールアップだけを再集計してUPSERT"""
+        changed, window = self._dirty_rows(since, until)
+        dirty = (
+            select(changed.video_id, _bucket(period, changed.date).label("bucket"))
+            .where(window)
+            .distinct()
+            .subquery()
+        )
+
+        va = VideoAnalytics
+        bucket = _bucket(period, va.date)
+        source = (
+            select(
+                func.gen_random_uuid(),
+                cast(period, VideoAnalyticsRollup.__table__.c.period.type),
+                va.video_id,
+                Project.client_id,
+                bucket,
+                *[func.coalesce(func.sum(getattr(va, raw)), 0) for raw in SUM_COLUMNS.values()],
+                func.count(),
+                func.now(),
+            )
+            .select_from(va)
+            .join(dirty, and_(dirty.c.video_id == va.video_id, dirty.c.bucket == bucket))
+            .join(Video, Video.id == va.video_id)
+            .join(Project, Project.id == Video.project_id)
+            .group_by(va.video_id, Project.client_id, bucket)
+        )
+
+        stmt = pg_insert(VideoAnalyticsRollup).from_select(
+            ["id", "period", "video_id", "client_id", "date", *METRIC_COLUMNS, "updated_at"],
+            source,
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_video_analytics_rollups_period_video_date",
+            set_={
+                **{col: stmt.excluded[col] for col in METRIC_COLUMNS},
+                "client_id": stmt.excluded.client_id,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        await self.db.execute(stmt)
+
+    async def _refresh_client_rollups(
+        self,
+        period: RollupPeriod,
+        since: datetime,
+        until: datetime,
+    ) -> None:
+        """影響を受けた (client_id, 期間) のクライアントロールアップを動画ロールアップから再集計"""
+        changed, window = self._dirty_rows(since, until)
+        dirty = (
+            select(Project.client_id, _bucket(period, changed.date).label("bucket"))
+            .select_from(changed)
+            .join(Video, Video.id == changed.video_id)
+            .join(Project, Project.id == Video.project_id)
+            .where(window)
+            .distinct()
+            .subquery()
+        )
+
+        vr = VideoAnalyticsRollup
+        source = (
+            select(
+                func.gen_random_uuid(),
+                cast(period, ClientAnalyticsRollup.__table__.c.period.type),
+                vr.client_id,
+                vr.date,
+                *[func.coalesce(func.sum(getattr(vr, col)), 0) for col in METRIC_COLUMNS],
+                func.count(),
+                func.now(),
+            )
+            .select_from(vr)
+            .join(dirty, and_(dirty.c.client_id == vr.client_id, dirty.c.bucket == vr.date))
+            .where(vr.period == period)
+            .group_by(vr.client_id, vr.date)
+        )
+
+        stmt = pg_insert(ClientAnalyticsRollup).from_select(
+            ["id", "period", "client_id", "date", *METRIC_COLUMNS, "video_count", "updated_at"],
+            source,
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_client_analytics_rollups_period_client_date",
+            set_={
+                **{col: stmt.excluded[col] for col in METRIC_COLUMNS},
+                "video_count": stmt.excluded.video_count,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        await self.db.execute(stmt)
+
+    async def _get_watermark(self, name: str) -> datetime:
+        """ウォーターマークを取得（未登録の場合は最小日時）"""
+        result = await self.db.execute(
+            select(AnalyticsRollupWatermark.watermark)
+            .where(AnalyticsRollupWatermark.name == name)
+        )
+        return result.scalar_one_or_none() or datetime(1970, 1, 1)
+
+    async def _set_watermark(self, name: str, value: datetime) -> None:
+        """ウォーターマークを更新"""
+        stmt = pg_insert(AnalyticsRollupWatermark).values(
+            name=name,
+            watermark=value,
+            updated_at=datetime.utcnow(),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["name"],
+            set_={"watermark": stmt.excluded.watermark, "updated_at": stmt.excluded.updated_at},
+        )
+        await self.db.execute(stmt)
+
+    # ========== 読み取り ==========
+
+    def _range_condition(self, model, date_from: date, date_to: date):
+        """期間分割に従ったロールアップ行の抽出条件"""
+        return or_(*[
+            and_(model.period == period, model.date >= start, model.date <= end)
+            for period, start, end in split_range(date_from, date_to)
+        ])
+
+    async def get_client_totals(
+        self,
+        client_id: UUID,
+        date_from: date,
+        date_to: date,
+    ) -> Dict[str, Any]:
+        """
+        クライアントの期間合計を取得
+
+        Returns:
+            Dict: 指標名 -> 合計値（ctr_average を含む）
+        """
+        cr = ClientAnalyticsRollup
+        result = await self.db.execute(
+            select(*[func.coalesce(func.sum(getattr(cr, col)), 0).label(col) for col in METRIC_COLUMNS])
+            .where(cr.client_id == client_id, self._range_condition(cr, date_from, date_to))
+        )
+        totals = dict(result.one()._mapping)
+        totals["ctr_average"] = (
+            totals["ctr_sum"] / totals["sample_days"] if totals["sample_days"] else 0.0
+        )
+        return totals
+
+    async def get_client_series(
+        self,
+        client_id: UUID,
+        date_from: date,
+        date_to: date,
+        period: Optional[RollupPeriod] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        クライアントの推移（集計期間ごとの行）を取得
+
+        期間の端にかかる週・月は、日次ロールアップから期間内の日だけを集計する
+        （先頭の行の日付は date_from）
+
+        Args:
+            period: 集計単位（未指定の場合は期間の長さから決定）
+        """
+        period = period or series_period(date_from, date_to)
+        cr = ClientAnalyticsRollup
+        result = await self.db.execute(
+            select(cr.date, *[getattr(cr, col) for col in METRIC_COLUMNS])
+            .where(
+                cr.client_id == client_id,
+                cr.period == period,
+                cr.date >= period_start(period, date_from),
+                cr.date <= date_to,
+            )
+            .order_by(cr.date)
+        )
+        series = {row.date: dict(row._mapping) for row in result.all()}
+
+        for bucket, start, end in partial_buckets(period, date_from, date_to):
+            result = await self.db.execute(
+                select(
+                    func.count().label("days"),
+                    *[func.coalesce(func.sum(getattr(cr, col)), 0).label(col) for col in METRIC_COLUMNS],
+                )
+                .where(
+                    cr.client_id == client_id,
+                    cr.period == RollupPeriod.DAILY,
+                    cr.date >= start,
+                    cr.date <= end,
+                )
+            )
+            clipped = dict(result.one()._mapping)
+            series.pop(bucket, None)
+            if clipped.pop("days"):
+                series[start] = {"date": start, **clipped}
+
+        return [series[d] for d in sorted(series)]
+
+    async def get_top_videos(
+        self,
+        client_id: UUID,
+        date_from: date,
+        date_to: date,
+        limit: int = 5,
+    ) -> List[Dict[str, Any]]:
+        """期間内の視聴回数上位動画を取得"""
+        vr = VideoAnalyticsRollup
+        views = func.sum(vr.views).label("views")
+        result = await self.db.execute(
+            select(
+                vr.video_id,
+                Video.title,
+                views,
+                func.sum(vr.likes).label("likes"),
+                func.sum(vr.comments).label("comments"),
+                func.sum(vr.shares).label("shares"),
+            )
+            .join(Video, Video.id == vr.video_id)
+            .where(vr.client_id == client_id, self._range_condition(vr, date_from, date_to))
+            .group_by(vr.video_id, Video.title)
+            .order_by(views.desc())
+            .limit(limit)
+        )
+        return [dict(row._mapping) for row in result.all()]
+
+    async def get_views_by_weekday(
+        self,
+        client_id: UUID,
+        date_from: date,
+        date_to: date,
+    ) -> Dict[int, float]:
+        """曜日別の平均視聴回数（日次ロールアップから算出、0=日曜）"""
+        cr = ClientAnalyticsRollup
+        dow = func.extract("dow", cr.date)
+        result = await self.db.execute(
+            select(dow.label("dow"), func.avg(cr.views).label("average_views"))
+            .where(
+                cr.client_id == client_id,
+                cr.period == RollupPeriod.DAILY,
+                cr.date >= date_from,
+                cr.date <= date_to,
+            )
+            .group_by(dow)
+        )
+        return {int(row.dow): float(row.average_views or 0) for row in result.all()}
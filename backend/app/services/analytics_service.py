@@ -7,11 +7,11 @@ from datetime import datetime, date, timedelta
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
-from app.models import Video, Client
+from app.models import Video, Client, Project
 from app.models.analytics import (
     VideoAnalytics,
     ChannelAnalytics,
@@ -30,6 +30,34 @@ from app.schemas.analytics import (
     ReportGenerateResponse,
 )
 from app.core.cache import cached
+from app.services.analytics_rollup_service import AnalyticsRollupService
+
+# PostgreSQL extract(dow) の曜日（0=日曜）
+WEEKDAY_NAMES = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+
+
+def _percent_change(current: float, base: float, delta: bool = False) -> float:
+    """
+    変化率（%）を計算
+
+    Args:
+        current: 今期の値（delta=Trueの場合は増減量）
+        base: 基準値
+        delta: currentが増減量の場合True
+    """
+    if not base:
+        return 0.0
+    change = current if delta else current - base
+    return round(change / base * 100, 1)
+
+
+def _engagement_rate(metrics: dict) -> float:
+    """エンゲージメント率（%）=（いいね+コメント+シェア）/ 視聴回数"""
+    views = metrics.get("views") or 0
+    if not views:
+        return 0.0
+    interactions = (metrics.get("likes") or 0) + (metrics.get("comments") or 0) + (metrics.get("shares") or 0)
+    return round(interactions / views * 100, 2)
 
 
 class AnalyticsService:
@@ -139,7 +167,7 @@ class AnalyticsService:
         """
         チャンネル概要を取得
 
-        YouTube Analytics API連携想定（現在はスタブ実装）
+        日次/週次/月次ロールアップから集計（生データは走査しない）
 
         Args:
             db: データベースセッション
@@ -163,29 +191,80 @@ class AnalyticsService:
         if not date_from:
             date_from = date_to - timedelta(days=30)
 
-        # スタブ：サンプルデータを返す
+        client_uuid = UUID(client_id) if isinstance(client_id, str) else client_id
+        rollups = AnalyticsRollupService(db)
+
+        # 事前集計済みロールアップから取得（生データは走査しない）
+        totals = await rollups.get_client_totals(client_uuid, date_from, date_to)
+        series = await rollups.get_client_series(client_uuid, date_from, date_to)
+        top_videos = await rollups.get_top_videos(client_uuid, date_from, date_to, limit=5)
+        channel = await AnalyticsService._get_channel_snapshot(db, client_uuid, date_from, date_to)
+
+        total_videos = await db.scalar(
+            select(func.count(Video.id))
+            .join(Project, Project.id == Video.project_id)
+            .where(Project.client_id == client_uuid)
+        )
+
         return ChannelOverviewResponse(
-            client_id=UUID(client_id) if isinstance(client_id, str) else client_id,
+            client_id=client_uuid,
             date_from=date_from,
             date_to=date_to,
-            total_views=125600,
-            total_watch_time_minutes=378420.5,
-            subscribers=45230,
-            subscribers_change=1250,
-            total_videos=85,
-            average_ctr=5.2,
-            estimated_revenue=12500.50,
+            total_views=int(totals["views"]),
+            total_watch_time_minutes=float(totals["watch_time_minutes"]),
+            subscribers=channel["subscribers"],
+            subscribers_change=int(totals["subscribers_gained"] - totals["subscribers_lost"]),
+            total_videos=total_videos or 0,
+            average_ctr=round(float(totals["ctr_average"]), 2),
+            estimated_revenue=channel["revenue"],
             top_videos=[
-                {"video_id": "video1", "title": "Top Video 1", "views": 25000},
-                {"video_id": "video2", "title": "Top Video 2", "views": 18500},
-                {"video_id": "video3", "title": "Top Video 3", "views": 15200},
+                {"video_id": str(v["video_id"]), "title": v["title"], "views": int(v["views"] or 0)}
+                for v in top_videos
             ],
             daily_stats=[
-                {"date": str(date_from + timedelta(days=i)), "views": 4000 + i * 100}
-                for i in range(7)
+                {"date": str(row["date"]), "views": int(row["views"])}
+                for row in series
             ],
         )
 
+    @staticmethod
+    async def _get_channel_snapshot(
+        db: AsyncSession,
+        client_id: UUID,
+        date_from: date,
+        date_to: date,
+    ) -> dict:
+        """
+        ChannelAnalyticsから期間末時点の登録者数と期間内の収益を取得
+
+        ChannelAnalyticsは1クライアント1日1行のため、期間が1年でも数百行で済む
+        """
+        subscribers = await db.scalar(
+            select(ChannelAnalytics.subscribers)
+            .where(ChannelAnalytics.client_id == client_id, ChannelAnalytics.date <= date_to)
+            .order_by(ChannelAnalytics.date.desc())
+            .limit(1)
+        )
+        subscribers_before = await db.scalar(
+            select(ChannelAnalytics.subscribers)
+            .where(ChannelAnalytics.client_id == client_id, ChannelAnalytics.date < date_from)
+            .order_by(ChannelAnalytics.date.desc())
+            .limit(1)
+        )
+        revenue = await db.scalar(
+            select(func.coalesce(func.sum(ChannelAnalytics.revenue), 0.0))
+            .where(
+                ChannelAnalytics.client_id == client_id,
+                ChannelAnalytics.date >= date_from,
+                ChannelAnalytics.date <= date_to,
+            )
+        )
+        return {
+            "subscribers": subscribers or 0,
+            "subscribers_before": subscribers_before or 0,
+            "revenue": float(revenue or 0.0),
+        }
+
     @staticmethod
     @cached(
         "analytics:performance",
@@ -224,48 +303,62 @@ class AnalyticsService:
         if not date_from:
             date_from = date_to - timedelta(days=30)
 
-        # スタブ：サンプルデータを返す
+        client_uuid = UUID(client_id) if isinstance(client_id, str) else client_id
+        rollups = AnalyticsRollupService(db)
+
+        # 比較用の直前期間（同じ日数）
+        period_days = (date_to - date_from).days + 1
+        previous_to = date_from - timedelta(days=1)
+        previous_from = previous_to - timedelta(days=period_days - 1)
+
+        totals = await rollups.get_client_totals(client_uuid, date_from, date_to)
+        previous = await rollups.get_client_totals(client_uuid, previous_from, previous_to)
+        top_videos = await rollups.get_top_videos(client_uuid, date_from, date_to, limit=10)
+        channel = await AnalyticsService._get_channel_snapshot(db, client_uuid, date_from, date_to)
+
+        views = int(totals["views"])
+        previous_views = int(previous["views"])
+        gained = int(totals["subscribers_gained"])
+        lost = int(totals["subscribers_lost"])
+        net_growth = gained - lost
+        subscribers_base = channel["subscribers_before"] or (channel["subscribers"] - net_growth)
+
         return PerformanceReportResponse(
-            client_id=UUID(client_id) if isinstance(client_id, str) else client_id,
+            client_id=client_uuid,
             date_from=date_from,
             date_to=date_to,
             summary={
-                "total_views": 125600,
-                "view_change_percent": 15.3,
-                "total_subscribers": 45230,
-                "subscriber_change_percent": 2.8,
-                "average_engagement_rate": 6.5,
+                "total_views": views,
+                "view_change_percent": _percent_change(views, previous_views),
+                "total_subscribers": channel["subscribers"],
+                "subscriber_change_percent": _percent_change(net_growth, subscribers_base, delta=True),
+                "average_engagement_rate": _engagement_rate(totals),
             },
             video_performance=[
                 {
-                    "video_id": "video1",
-                    "title": "Best Performing Video",
-                    "views": 25000,
-                    "engagement_rate": 8.2,
-                },
-                {
-                    "video_id": "video2",
-                    "title": "Second Best Video",
-                    "views": 18500,
-                    "engagement_rate": 7.1,
-                },
+                    "video_id": str(v["video_id"]),
+                    "title": v["title"],
+                    "views": int(v["views"] or 0),
+                    "engagement_rate": _engagement_rate(v),
+                }
+                for v in top_videos
             ],
             growth_metrics={
-                "subscribers_gained": 1250,
-                "subscribers_lost": 120,
-                "net_growth": 1130,
-                "growth_rate": 2.5,
+                "subscribers_gained": gained,
+                "subscribers_lost": lost,
+                "net_growth": net_growth,
+                "growth_rate": _percent_change(net_growth, subscribers_base, delta=True),
             },
             engagement_metrics={
-                "total_likes": 8920,
-                "total_comments": 1560,
-                "total_shares": 780,
-                "average_watch_time": 4.5,
+                "total_likes": int(totals["likes"]),
+                "total_comments": int(totals["comments"]),
+                "total_shares": int(totals["shares"]),
+                "average_watch_time": round(float(totals["watch_time_minutes"]) / views, 2) if views else 0.0,
             },
             comparison={
-                "previous_period_views": 109000,
-                "views_change": 16600,
-                "views_change_percent": 15.2,
+                "previous_period_views": previous_views,
+                "views_change": views - previous_views,
+                "views_change_percent": _percent_change(views, previous_views),
             },
         )
 
@@ -307,33 +400,50 @@ class AnalyticsService:
         if not date_from:
             date_from = date_to - timedelta(days=30)
 
-        # スタブ：サンプルデータを返す
+        client_uuid = UUID(client_id) if isinstance(client_id, str) else client_id
+        rollups = AnalyticsRollupService(db)
+
+        series = await rollups.get_client_series(client_uuid, date_from, date_to)
+        weekday_views = await rollups.get_views_by_weekday(client_uuid, date_from, date_to)
+        channel = await AnalyticsService._get_channel_snapshot(db, client_uuid, date_from, date_to)
+
+        view_trend = []
+        subscriber_trend = []
+        engagement_trend = []
+        previous_views: Optional[int] = None
+        subscriber_count = channel["subscribers_before"]
+        for row in series:
+            views = int(row["views"])
+            if previous_views is None or views == previous_views:
+                trend = "stable"
+            else:
+                trend = "up" if views > previous_views else "down"
+            previous_views = views
+            view_trend.append({"date": str(row["date"]), "views": views, "trend": trend})
+
+            change = int(row["subscribers_gained"] - row["subscribers_lost"])
+            subscriber_count += change
+            subscriber_trend.append({"date": str(row["date"]), "count": subscriber_count, "change": change})
+
+            engagement_trend.append({"date": str(row["date"]), "rate": _engagement_rate(row)})
+
+        best_performing_time = None
+        if weekday_views:
+            best_dow = max(weekday_views, key=weekday_views.get)
+            best_performing_time = {
+                "day_of_week": WEEKDAY_NAMES[best_dow],
+                "average_views": round(weekday_views[best_dow]),
+            }
+
         return TrendAnalysisResponse(
-            client_id=UUID(client_id) if isinstance(client_id, str) else client_id,
+            client_id=client_uuid,
             date_from=date_from,
             date_to=date_to,
-            view_trend=[
-                {"date": str(date_from + timedelta(days=i)), "views": 4000 + i * 100, "trend": "up"}
-                for i in range(7)
-            ],
-            subscriber_trend=[
-                {"date": str(date_from + timedelta(days=i)), "count": 45000 + i * 40, "change": 40}
-                for i in range(7)
-            ],
-            engagement_trend=[
-                {"date": str(date_from + timedelta(days=i)), "rate": 5.5 + i * 0.1}
-                for i in range(7)
-            ],
-            best_performing_time={
-                "day_of_week": "Saturday",
-                "hour": 18,
-                "average_views": 6500,
-            },
-            content_performance=[
-                {"category": "Tutorial", "average_views": 8500, "engagement_rate": 7.2},
-                {"category": "Vlog", "average_views": 6200, "engagement_rate": 5.8},
-                {"category": "Review", "average_views": 5800, "engagement_rate": 6.1},
-            ],
+            view_trend=view_trend,
+            subscriber_trend=subscriber_trend,
+            engagement_trend=engagement_trend,
+            best_performing_time=best_performing_time,
+            content_performance=None,
         )
 
 
@@ -1,19 +1,61 @@
 """
 Central DB連携サービス
 
-Central DBとの連携によるナレッジ管理・RAG検索
+Central DB（PostgreSQL + pgvector の knowledge_base）との連携によるナレッジ管理・RAG検索
 - ナレッジの追加・検索
 - カテゴリ管理
 - 台本生成へのナレッジ注入
 """
 
+import json
 import logging
 import httpx
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.core.config import settings
+from app.core.database import to_asyncpg_url
+
 logger = logging.getLogger(__name__)
 
+KNOWLEDGE_COLUMNS = "kb.id, kb.title, kb.content, kb.summary, kb.category, kb.subcategory, kb.tags, kb.source"
+
+# クエリベクトルはテキストで渡してSQL側でvector型に変換する（asyncpgへの型登録が不要）
+QUERY_VECTOR_CTE = "WITH q AS (SELECT CAST(CAST(:embedding AS text) AS vector) AS embedding)"
+
+# カテゴリ横断検索: クエリのEmbedding1つから、カテゴリごとの上位k件を1回のSQLで取得
+MULTI_CATEGORY_SEARCH_SQL = text(f"""
+    {QUERY_VECTOR_CTE}
+    SELECT r.category AS requested_category,
+           k.*,
+           1 - k.distance AS similarity
+    FROM q
+    CROSS JOIN unnest(CAST(:categories AS text[]), CAST(:limits AS int[]))
+         WITH ORDINALITY AS r(category, k_limit, ord)
+    CROSS JOIN LATERAL (
+        SELECT {KNOWLEDGE_COLUMNS},
+               kb.embedding <=> q.embedding AS distance
+        FROM knowledge_base kb
+        WHERE kb.embedding IS NOT NULL AND kb.category = r.category
+        ORDER BY kb.embedding <=> q.embedding
+        LIMIT r.k_limit
+    ) k
+    ORDER BY r.ord, k.distance
+""")
+
+SEARCH_SQL = text(f"""
+    {QUERY_VECTOR_CTE}
+    SELECT {KNOWLEDGE_COLUMNS},
+           1 - (kb.embedding <=> q.embedding) AS similarity
+    FROM knowledge_base kb, q
+    WHERE kb.embedding IS NOT NULL
+    ORDER BY kb.embedding <=> q.embedding
+    LIMIT :limit
+""")
+
 
 # ============================================================
 # Central DB カテゴリ定義
@@ -37,18 +79,22 @@ class CentralDBService:
     """
     Central DB連携サービス
 
-    MCP経由でCentral DBにアクセスし、ナレッジの追加・検索を行う
+    Central DB（knowledge_base テーブル、pgvector）を直接検索し、ナレッジの追加・検索を行う
     """
 
-    def __init__(self, mcp_endpoint: Optional[str] = None):
+    def __init__(self, mcp_endpoint: Optional[str] = None, database_url: Optional[str] = None):
         """
         初期化
 
         Args:
             mcp_endpoint: MCP サーバーエンドポイント（内部連携用）
+            database_url: Central DBのURL（省略時は CENTRAL_DB_URL）
         """
         self.mcp_endpoint = mcp_endpoint
+        self.database_url = database_url if database_url is not None else settings.CENTRAL_DB_URL
         self._client: Optional[httpx.AsyncClient] = None
+        self._engine: Optional[AsyncEngine] = None
+        self._openai = None
 
     @property
     def client(self) -> httpx.AsyncClient:
@@ -57,6 +103,54 @@ class CentralDBService:
             self._client = httpx.AsyncClient(timeout=30.0)
         return self._client
 
+    @property
+    def engine(self) -> AsyncEngine:
+        """Central DBのエンジン（遅延初期化）"""
+        if self._engine is None:
+            self._engine = create_async_engine(
+                to_asyncpg_url(self.database_url),
+                pool_pre_ping=True,
+                pool_size=5,
+                max_overflow=5,
+            )
+        return self._engine
+
+    def is_available(self) -> bool:
+        """Central DBが設定されているか"""
+        return bool(self.database_url)
+
+    async def _embed(self, query: str) -> Optional[List[float]]:
+        """検索クエリのEmbeddingを生成（登録時と同じモデルを使用）"""
+        if not settings.OPENAI_API_KEY:
+            return None
+        if self._openai is None:
+            from openai import AsyncOpenAI
+            self._openai = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+
+        try:
+            response = await self._openai.embeddings.create(
+                model=settings.CENTRAL_DB_EMBEDDING_MODEL,
+                input=query[:8000],
+            )
+            return response.data[0].embedding
+        except Exception as e:
+            logger.error(f"Central DB embedding failed: {e}")
+            return None
+
+    @staticmethod
+    def _to_result(row: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": str(row["id"]),
+            "title": row["title"],
+            "content": row["content"] or "",
+            "summary": row["summary"],
+            "category": row["category"],
+            "subcategory": row["subcategory"],
+            "tags": row["tags"] or [],
+            "source": row["source"],
+            "similarity": round(float(row["similarity"]), 4),
+        }
+
     # ============================================================
     # ナレッジ管理
     # ============================================================
@@ -125,21 +219,72 @@ class CentralDBService:
             limit: 取得件数
 
         Returns:
-            検索結果リスト
-        """
-        logger.info(f"Searching Central DB: {query}")
-
-        # モック検索結果
-        # 実際のMCP連携では search_knowledge ツールを使用
-        return [
-            {
-                "id": "mock_1",
-                "title": f"検索結果: {query}",
-                "content": "関連するナレッジコンテンツ...",
-                "category": category or "content",
-                "relevance_score": 0.85,
-            }
-        ]
+            検索結果リスト（類似度の高い順）
+        """
+        if category:
+            results = await self.search_knowledge_by_categories(query, {category: limit})
+            return results.get(category, [])
+
+        if not self.is_available():
+            return []
+
+        embedding = await self._embed(query)
+        if embedding is None:
+            return []
+
+        try:
+            async with self.engine.connect() as conn:
+                result = await conn.execute(
+                    SEARCH_SQL,
+                    {"embedding": json.dumps(embedding), "limit": limit},
+                )
+                return [self._to_result(row) for row in result.mappings()]
+        except Exception as e:
+            logger.error(f"Central DB search failed: {e}")
+            return []
+
+    async def search_knowledge_by_categories(
+        self,
+        query: str,
+        limits: Dict[str, int],
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        複数カテゴリをまとめてRAG検索
+
+        クエリのEmbeddingは1回だけ生成し、カテゴリごとの上位k件を
+        LATERAL JOINの1クエリで取得する
+
+        Args:
+            query: 検索クエリ
+            limits: カテゴリ -> 取得件数
+
+        Returns:
+            カテゴリ -> 検索結果リスト（類似度の高い順）
+        """
+        results: Dict[str, List[Dict[str, Any]]] = {category: [] for category in limits}
+        if not limits or not self.is_available():
+            return results
+
+        embedding = await self._embed(query)
+        if embedding is None:
+            return results
+
+        try:
+            async with self.engine.connect() as conn:
+                rows = await conn.execute(
+                    MULTI_CATEGORY_SEARCH_SQL,
+                    {
+                        "embedding": json.dumps(embedding),
+                        "categories": list(limits),
+                        "limits": list(limits.values()),
+                    },
+                )
+                for row in rows.mappings():
+                    results[row["requested_category"]].append(self._to_result(row))
+        except Exception as e:
+            logger.error(f"Central DB multi-category search failed: {e}")
+
+        return results
 
     async def list_categories(self) -> Dict[str, int]:
         """
@@ -201,50 +346,42 @@ class CentralDBService:
         """
         context_parts = []
 
-        # トピックに関連するナレッジを検索
-        relevant_knowledge = await self.search_knowledge(
-            query=topic,
-            category=CentralDBCategory.CONTENT,
-            limit=3,
-        )
+        # 全カテゴリを1回のEmbedding生成・1回のSQLで検索
+        limits = {
+            CentralDBCategory.CONTENT: 3,
+            CentralDBCategory.METHODS: 2,
+            CentralDBCategory.QUESTIONS: 3,
+        }
+        query = topic
+        if target_audience:
+            limits[CentralDBCategory.CLIENTS] = 2
+            query = f"{topic} {target_audience}"
 
+        results = await self.search_knowledge_by_categories(query, limits)
+
+        # トピックに関連するナレッジ
+        relevant_knowledge = results[CentralDBCategory.CONTENT]
         if relevant_knowledge:
             context_parts.append("【関連コンテンツナレッジ】")
             for k in relevant_knowledge:
                 context_parts.append(f"- {k.get('title', '')}: {k.get('content', '')[:200]}...")
 
-        # メソッド/フレームワークを検索
-        method_knowledge = await self.search_knowledge(
-            query=f"{topic} 手法 フレームワーク",
-            category=CentralDBCategory.METHODS,
-            limit=2,
-        )
-
+        # メソッド/フレームワーク
+        method_knowledge = results[CentralDBCategory.METHODS]
         if method_knowledge:
             context_parts.append("\n【関連メソッド】")
             for k in method_knowledge:
                 context_parts.append(f"- {k.get('title', '')}")
 
         # ターゲット視聴者に関するナレッジ
-        if target_audience:
-            audience_knowledge = await self.search_knowledge(
-                query=target_audience,
-                category=CentralDBCategory.CLIENTS,
-                limit=2,
-            )
-
-            if audience_knowledge:
-                context_parts.append("\n【ターゲット情報】")
-                for k in audience_knowledge:
-                    context_parts.append(f"- {k.get('content', '')[:200]}...")
-
-        # 質問パターンを取得
-        question_knowledge = await self.search_knowledge(
-            query=topic,
-            category=CentralDBCategory.QUESTIONS,
-            limit=3,
-        )
-
+        audience_knowledge = results.get(CentralDBCategory.CLIENTS)
+        if audience_knowledge:
+            context_parts.append("\n【ターゲット情報】")
+            for k in audience_knowledge:
+                context_parts.append(f"- {k.get('content', '')[:200]}...")
+
+        # 質問パターン
+        question_knowledge = results[CentralDBCategory.QUESTIONS]
         if question_knowledge:
             context_parts.append("\n【よくある質問パターン】")
             for k in question_knowledge:
@@ -614,10 +751,13 @@ class CentralDBService:
     # ============================================================
 
     async def close(self) -> None:
-        """クライアントをクローズ"""
+        """クライアント・DB接続をクローズ"""
         if self._client:
             await self._client.aclose()
             self._client = None
+        if self._engine:
+            await self._engine.dispose()
+            self._engine = None
 
 
 # シングルトンインスタンス
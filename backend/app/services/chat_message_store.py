@@ -0,0 +1,112 @@
+"""
+チャットメッセージストア
+
+追記専用のメッセージテーブル（chat_messages / planning_chat_messages）への
+書き込みと、(session_id, created_at) インデックスを使ったウィンドウ取得を提供
+
+- 1ターン分のメッセージをINSERTするだけで、履歴全体を書き換えない
+- 直近N件・指定メッセージより前のN件をインデックス範囲スキャンで取得
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple, Type
+from uuid import UUID
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.chat_session import ChatSessionMessage
+from app.models.planning import PlanningChatMessage
+
+# AI応答生成時に参照する会話履歴の件数
+CHAT_HISTORY_WINDOW = 10
+
+
+class ChatMessageStore:
+    """追記専用チャットメッセージストア"""
+
+    def __init__(self, model: Type):
+        self.model = model
+
+    async def append(
+        self,
+        db: AsyncSession,
+        session_id: UUID,
+        messages: List[Dict[str, Any]],
+    ) -> List[Any]:
+        """
+        メッセージを追記（commitは呼び出し側で行う）
+
+        同一ターン内の順序を保つため、created_at未指定のメッセージには
+        1マイクロ秒ずつずらした送信日時を付与する
+
+        Args:
+            db: データベースセッション
+            session_id: セッションID
+            messages: メッセージ（role, content と任意の id, created_at, モデル固有列）
+
+        Returns:
+            List: 追加したメッセージ行
+        """
+        now = datetime.utcnow()
+        rows = []
+        for i, message in enumerate(messages):
+            values = dict(message)
+            values.setdefault("created_at", now + timedelta(microseconds=i))
+            row = self.model(session_id=session_id, **values)
+            db.add(row)
+            rows.append(row)
+        await db.flush()
+        return rows
+
+    async def fetch_window(
+        self,
+        db: AsyncSession,
+        session_id: UUID,
+        limit: Optional[int] = None,
+        before_id: Optional[UUID] = None,
+    ) -> Tuple[List[Any], bool]:
+        """
+        メッセージを時系列順でウィンドウ取得
+
+        Args:
+            db: データベースセッション
+            session_id: セッションID
+            limit: 取得件数（Noneの場合は全件）
+            before_id: このメッセージより前のみ取得
+
+        Returns:
+            Tuple: (古い順のメッセージ行, さらに古いメッセージがあるか)
+        """
+        model = self.model
+        query = select(model).where(model.session_id == session_id)
+
+        if before_id is not None:
+            anchor = await db.execute(
+                select(model.created_at, model.id).where(
+                    model.session_id == session_id,
+                    model.id == before_id,
+                )
+            )
+            anchor_row = anchor.first()
+            if anchor_row is None:
+                return [], False
+            query = query.where(
+                tuple_(model.created_at, model.id) < tuple_(anchor_row.created_at, anchor_row.id)
+            )
+
+        query = query.order_by(model.created_at.desc(), model.id.desc())
+        if limit is not None:
+            query = query.limit(limit + 1)
+
+        result = await db.execute(query)
+        rows = list(result.scalars().all())
+
+        has_more = limit is not None and len(rows) > limit
+        if has_more:
+            rows = rows[:limit]
+        rows.reverse()
+        return rows, has_more
+
+
+knowledge_chat_store = ChatMessageStore(ChatSessionMessage)
+planning_chat_store = ChatMessageStore(PlanningChatMessage)
@@ -0,0 +1,370 @@
+"""
+コメント分析エンジン
+
+動画コメントのキーワード抽出・感情分析（日本語対応）
+
+- コメントはページ単位のストリーミングで取得し、全件を1パスで処理（ページごとにスレッドで実行し、
+  その間に次ページを先読みする）
+- 形態素解析（Janome、純Python）で名詞・形容詞の基本形をトークン化
+  （Janome未導入の環境では文字種の切れ目による簡易分割にフォールバック）
+- トークン -> コメントの転置インデックスを構築し、頻度・文脈サンプル・キーワードの感情を同時に算出
+- 感情スコアは辞書（語幹 -> 重み）と否定表現の検出で計算。辞書はJSONファイルで差し替え可能
+"""
+import asyncio
+import json
+import logging
+import re
+import threading
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.external.youtube_api import youtube_api
+
+logger = logging.getLogger(__name__)
+
+# 感情の判定閾値（スコアの絶対値がこれ以上で positive / negative）
+SENTIMENT_THRESHOLD = 0.5
+
+# 否定表現を探す範囲（語の直後の文字数。句読点・記号・空白より後は見ない）
+NEGATION_WINDOW = 4
+_CLAUSE_BREAK = re.compile(r"[\s、。,.!?…・「」『』()\[\]]")
+
+# 文脈サンプルの件数と文字数
+CONTEXT_SAMPLE_SIZE = 2
+CONTEXT_SAMPLE_CHARS = 100
+
+# キーワードとして数えない語
+STOPWORDS = frozenset({
+    "こと", "もの", "これ", "それ", "あれ", "どれ", "ここ", "そこ", "ところ", "ため",
+    "よう", "さん", "ちゃん", "みたい", "感じ", "自分", "今回", "本当", "ほんと",
+})
+
+# 既定の感情辞書（語幹 -> 重み）。活用形に一致させるため語幹で登録する
+DEFAULT_POSITIVE_TERMS: Dict[str, float] = {
+    "最高": 2.0,
+    "素晴らし": 2.0,
+    "わかりやす": 1.5,
+    "分かりやす": 1.5,
+    "役に立": 1.5,
+    "感動": 1.5,
+    "ありがと": 1.0,
+    "有難": 1.0,
+    "参考にな": 1.0,
+    "勉強にな": 1.0,
+    "面白": 1.0,
+    "おもしろ": 1.0,
+    "良か": 1.0,
+    "良い": 1.0,
+    "すご": 1.0,
+    "凄": 1.0,
+    "助か": 1.0,
+    "好き": 1.0,
+    "楽し": 1.0,
+    "納得": 1.0,
+    "丁寧": 1.0,
+}
+DEFAULT_NEGATIVE_TERMS: Dict[str, float] = {
+    "最悪": 2.0,
+    "わからな": 1.5,
+    "分からな": 1.5,
+    "わかりにく": 1.5,
+    "分かりにく": 1.5,
+    "つまらな": 1.5,
+    "残念": 1.5,
+    "嫌い": 1.5,
+    "退屈": 1.5,
+    "不快": 1.5,
+    "聞き取れな": 1.0,
+    "聞き取りづら": 1.0,
+    "聞きづら": 1.0,
+    "悪い": 1.0,
+    "微妙": 1.0,
+    "間違": 1.0,
+    "長すぎ": 1.0,
+    "古い": 0.5,
+}
+# 1文字の「ず」は「ずっと」等に一致するため、複数文字の形だけを登録する
+DEFAULT_NEGATORS: Tuple[str, ...] = ("ない", "なかった", "ません", "ずに")
+
+
+# ============================================================
+# 感情辞書
+# ============================================================
+
+@dataclass
+class SentimentLexicon:
+    """感情辞書（語幹 -> 重み、否定表現）"""
+
+    positive: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_POSITIVE_TERMS))
+    negative: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_NEGATIVE_TERMS))
+    negators: Tuple[str, ...] = DEFAULT_NEGATORS
+
+    def __post_init__(self):
+        # 長い語を先に照合し、重なった短い語は数えない（「わかりにく」中の「わか」等）
+        terms = [(t, w) for t, w in self.positive.items()] + [(t, -w) for t, w in self.negative.items()]
+        self._terms = sorted(terms, key=lambda tw: len(tw[0]), reverse=True)
+
+    @classmethod
+    def from_file(cls, path: str) -> "SentimentLexicon":
+        """
+        JSONファイルから辞書を読み込む
+
+        形式: {"positive": {"語幹": 重み}, "negative": {...}, "negators": [...]}
+        指定のないセクションは既定値を使う
+        """
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(
+            positive={normalize_text(k): float(v) for k, v in data.get("positive", DEFAULT_POSITIVE_TERMS).items()},
+            negative={normalize_text(k): float(v) for k, v in data.get("negative", DEFAULT_NEGATIVE_TERMS).items()},
+            negators=tuple(data.get("negators", DEFAULT_NEGATORS)),
+        )
+
+    def score(self, text: str) -> float:
+        """
+        テキストの感情スコア（正: ポジティブ、負: ネガティブ）
+
+        語の直後（同じ文節内）に否定表現がある場合は符号を反転する（「わかりやすくない」など）
+        """
+        covered = bytearray(len(text))
+        total = 0.0
+        for term, weight in self._terms:
+            start = text.find(term)
+            while start != -1:
+                end = start + len(term)
+                if not any(covered[start:end]):
+                    covered[start:end] = b"\x01" * len(term)
+                    tail = _CLAUSE_BREAK.split(text[end:end + NEGATION_WINDOW], maxsplit=1)[0]
+                    total += -weight if any(n in tail for n in self.negators) else weight
+                start = text.find(term, end)
+        return total
+
+    @staticmethod
+    def label(score: float) -> str:
+        if score >= SENTIMENT_THRESHOLD:
+            return "positive"
+        if score <= -SENTIMENT_THRESHOLD:
+            return "negative"
+        return "neutral"
+
+
+# ============================================================
+# トークナイザー
+# ============================================================
+
+def normalize_text(text: str) -> str:
+    """全角英数・半角カナを正規化し、英字は小文字にする"""
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+# 簡易分割: 漢字列・カタカナ列・英数字語
+_SCRIPT_RUN = re.compile(r"[一-龯々〆ヶ]{2,}|[ァ-ヴー]{2,}|[a-z][a-z0-9+#.]+")
+
+
+class JapaneseTokenizer:
+    """
+    キーワード抽出用のトークナイザー
+
+    Janome が利用可能なら形態素解析で名詞・形容詞の基本形を抽出し、
+    利用できなければ文字種の切れ目で分割する
+    """
+
+    # 抽出対象の品詞と、除外する品詞細分類
+    KEEP_POS = ("名詞", "形容詞")
+    SKIP_POS_DETAIL = ("非自立", "代名詞", "数", "接尾", "副詞可能")
+
+    def __init__(self):
+        self._janome = None
+        try:
+            from janome.tokenizer import Tokenizer
+            self._janome = Tokenizer()
+        except ImportError:
+            logger.info("janome is not installed; falling back to script-run tokenization")
+
+    @property
+    def uses_morphological_analysis(self) -> bool:
+        return self._janome is not None
+
+    def tokenize(self, text: str) -> List[str]:
+        """正規化済みテキストをトークン化"""
+        if self._janome is None:
+            tokens = _SCRIPT_RUN.findall(text)
+        else:
+            tokens = []
+            for token in self._janome.tokenize(text):
+                pos = token.part_of_speech.split(",")
+                if pos[0] not in self.KEEP_POS or pos[1] in self.SKIP_POS_DETAIL:
+                    continue
+                base = token.base_form if token.base_form != "*" else token.surface
+                tokens.append(base)
+        return [t for t in tokens if len(t) >= 2 and t not in STOPWORDS]
+
+
+_tokenizer: Optional[JapaneseTokenizer] = None
+_tokenizer_lock = threading.Lock()
+_lexicon: Optional[SentimentLexicon] = None
+
+
+def get_tokenizer() -> JapaneseTokenizer:
+    """
+    トークナイザーを取得（辞書の読み込みが重いため1度だけ生成）
+
+    生成に数秒かかるため、イベントループからは asyncio.to_thread 経由で呼ぶ
+    """
+    global _tokenizer
+    if _tokenizer is None:
+        with _tokenizer_lock:
+            if _tokenizer is None:
+                _tokenizer = JapaneseTokenizer()
+    return _tokenizer
+
+
+def get_lexicon() -> SentimentLexicon:
+    """感情辞書を取得（COMMENT_SENTIMENT_LEXICON_PATH 指定時はファイルから読み込む）"""
+    global _lexicon
+    if _lexicon is None:
+        path = settings.COMMENT_SENTIMENT_LEXICON_PATH
+        _lexicon = SentimentLexicon.from_file(path) if path else SentimentLexicon()
+    return _lexicon
+
+
+# ============================================================
+# 転置インデックス
+# ============================================================
+
+@dataclass
+class KeywordStat:
+    """キーワードの集計結果"""
+
+    keyword: str
+    frequency: int
+    sentiment: str
+    context_samples: List[str]
+
+
+class CommentIndex:
+    """
+    コメントの転置インデックス
+
+    コメント追加時にトークン化と感情スコアを1度だけ計算し、
+    トークン -> コメント番号のポスティングと出現頻度を蓄積する
+    """
+
+    def __init__(self, tokenizer: JapaneseTokenizer, lexicon: SentimentLexicon):
+        self.tokenizer = tokenizer
+        self.lexicon = lexicon
+        self.comment_ids: List[str] = []
+        self.snippets: List[str] = []
+        self.scores: List[float] = []
+        self.postings: Dict[str, List[int]] = {}
+        self.frequency: Counter = Counter()
+
+    @property
+    def size(self) -> int:
+        return len(self.comment_ids)
+
+    def add(self, comment_id: str, text: str) -> None:
+        """コメントを1件追加"""
+        normalized = normalize_text(text)
+        ordinal = len(self.comment_ids)
+        self.comment_ids.append(comment_id)
+        self.snippets.append(text[:CONTEXT_SAMPLE_CHARS])
+        self.scores.append(self.lexicon.score(normalized))
+
+        tokens = self.tokenizer.tokenize(normalized)
+        self.frequency.update(tokens)
+        for token in set(tokens):
+            self.postings.setdefault(token, []).append(ordinal)
+
+    def add_many(self, comments: Iterable[Dict[str, Any]]) -> None:
+        """コメント（{"comment_id", "text"}）をまとめて追加"""
+        for comment in comments:
+            self.add(comment.get("comment_id", ""), comment.get("text", ""))
+
+    def top_keywords(self, limit: int) -> List[KeywordStat]:
+        """頻出キーワード（感情はキーワードを含むコメントの平均スコアで判定）"""
+        results = []
+        for keyword, frequency in self.frequency.most_common(limit):
+            ordinals = self.postings[keyword]
+            mean_score = sum(self.scores[i] for i in ordinals) / len(ordinals)
+            results.append(KeywordStat(
+                keyword=keyword,
+                frequency=frequency,
+                sentiment=self.lexicon.label(mean_score),
+                context_samples=[self.snippets[i] for i in ordinals[:CONTEXT_SAMPLE_SIZE]],
+            ))
+        return results
+
+    def sentiment_summary(self, positive_samples: int = 3, negative_samples: int = 2) -> Dict[str, Any]:
+        """
+        感情の比率と代表コメント（スコアの絶対値が大きい順）
+
+        Returns:
+            Dict: {"positive_ratio", "negative_ratio", "neutral_ratio",
+                   "sample_positive", "sample_negative"}
+        """
+        labels = [self.lexicon.label(s) for s in self.scores]
+        counts = Counter(labels)
+        total = len(labels)
+
+        def samples(label: str, count: int, reverse: bool) -> List[str]:
+            ordinals = sorted(
+                (i for i, lbl in enumerate(labels) if lbl == label),
+                key=lambda i: self.scores[i],
+                reverse=reverse,
+            )
+            return [self.snippets[i] for i in ordinals[:count]]
+
+        return {
+            "positive_ratio": round(counts["positive"] / total, 2) if total else 0,
+            "negative_ratio": round(counts["negative"] / total, 2) if total else 0,
+            "neutral_ratio": round(counts["neutral"] / total, 2) if total else 0,
+            "sample_positive": samples("positive", positive_samples, reverse=True),
+            "sample_negative": samples("negative", negative_samples, reverse=False),
+        }
+
+
+async def analyze_video_comments(
+    video_id: str,
+    max_comments: Optional[int] = None,
+) -> Optional[CommentIndex]:
+    """
+    動画のコメントを全件ストリーミング取得してインデックスを構築
+
+    Args:
+        video_id: 動画ID
+        max_comments: 最大件数（省略時は COMMENT_ANALYSIS_MAX_COMMENTS）
+
+    Returns:
+        Optional[CommentIndex]: インデックス（コメントが取得できなかった場合はNone）
+    """
+    limit = max_comments or settings.COMMENT_ANALYSIS_MAX_COMMENTS
+    pages = youtube_api.iter_video_comment_pages(video_id, max_comments=limit)
+
+    # 初回のトークナイザー生成と1ページ目の取得を並行させる
+    tokenizer_task = asyncio.ensure_future(asyncio.to_thread(get_tokenizer))
+    next_page = asyncio.ensure_future(_next_page(pages))
+    try:
+        index = CommentIndex(await tokenizer_task, get_lexicon())
+        while (page := await next_page) is not None:
+            # トークン化（CPU処理）をスレッドで行う間に次ページを先読みする
+            next_page = asyncio.ensure_future(_next_page(pages))
+            await asyncio.to_thread(index.add_many, page)
+    finally:
+        if not next_page.done():
+            next_page.cancel()
+            await asyncio.gather(next_page, return_exceptions=True)
+        await pages.aclose()
+
+    return index if index.size else None
+
+
+async def _next_page(pages: AsyncIterator[List[Dict[str, Any]]]) -> Optional[List[Dict[str, Any]]]:
+    """次のページを取得（終端ではNone）"""
+    try:
+        return await pages.__anext__()
+    except StopAsyncIteration:
+        return None
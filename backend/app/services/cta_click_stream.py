@@ -0,0 +1,374 @@
+"""
+CTAクリックのストリーム取り込み
+
+クリック記録をリクエスト処理から切り離し、Redis Stream経由で一括書き込みする
+
+- リクエスト内ではCTAの存在確認（Redisセット）とXADDのみを行う
+  （DBアクセスはセットの再構築時のみ。再構築は1リクエストだけが行う）
+- バックグラウンドのコンシューマーがコンシューマーグループで読み出し、
+  クリックログを一括INSERTし、conversion_count はCTAごとに集計した差分で1回ずつ更新する
+  （人気CTAの1行にクリックごとの行ロックが集中しない）
+- 書き込みをコミットしてからACKする。ACKされずに残ったクリックは
+  CTA_CLICK_CLAIM_IDLE_MS 経過後に別のコンシューマー（または自分）が引き取って再処理する
+- クリックログはエントリIDで一意にし、再処理時に既に書き込んだクリックは集計に加えない
+- CTA_CLICK_MAX_DELIVERIES 回配信しても書き込めないクリックはデッドレターストリームへ移す
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import redis.asyncio as redis
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import get_redis
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.cta import CTAClickLog, CTATemplate
+from app.models.project import Video
+from app.services.daily_stats_service import DailyStatsService
+
+logger = logging.getLogger(__name__)
+
+STREAM_KEY = "cs:cta:clicks"
+CONSUMER_GROUP = "cta-click-writers"
+
+# 書き込めなかったクリックの退避先（元のエントリIDと配信回数を付けて保存）
+DEAD_LETTER_KEY = "cs:cta:clicks:dead"
+
+# 存在するCTA IDのセット（CTAの作成・削除時に破棄し、次のクリックでDBから再構築）
+CTA_IDS_KEY = "cs:cta:ids"
+CTA_IDS_TTL_SECONDS = 300
+# CTAが0件でもセットを残すための番兵（UUIDと衝突しない）
+CTA_IDS_SENTINEL = "-"
+# セットの再構築中のロック（他のリクエストはCTA単体の検索で判定する）
+CTA_IDS_LOCK_KEY = "cs:cta:ids:lock"
+CTA_IDS_LOCK_TTL_SECONDS = 10
+
+# 列の長さ制限（cta_click_logs）
+IP_ADDRESS_MAX_LENGTH = 50
+USER_AGENT_MAX_LENGTH = 500
+
+# 読み出しエラー時の再試行間隔（秒）
+RETRY_INTERVAL_SECONDS = 5
+
+StreamEntry = Tuple[str, Optional[Dict[str, str]]]
+
+
+# ============================================================
+# 書き込み側（リクエスト処理）
+# ============================================================
+
+async def cta_exists(client: redis.Redis, db: AsyncSession, cta_id: str) -> bool:
+    """
+    CTAが存在するか（Redisセットで判定し、セットがない場合のみDBから再構築）
+
+    セットには番兵を含めるため、CTAが0件の場合や存在しないIDもDBを引かずに判定できる。
+    セットの失効直後は1リクエストだけが全件を読み込んで再構築し、
+    他のリクエストはCTA単体の主キー検索で判定する
+
+    Raises:
+        redis.RedisError: Redisに接続できない
+    """
+    async with client.pipeline(transaction=False) as pipe:
+        pipe.exists(CTA_IDS_KEY)
+        pipe.sismember(CTA_IDS_KEY, cta_id)
+        exists, member = await pipe.execute()
+    if exists:
+        return bool(member)
+
+    if not await client.set(CTA_IDS_LOCK_KEY, "1", nx=True, ex=CTA_IDS_LOCK_TTL_SECONDS):
+        result = await db.execute(select(CTATemplate.id).where(CTATemplate.id == UUID(cta_id)))
+        return result.scalar_one_or_none() is not None
+
+    try:
+        result = await db.execute(select(CTATemplate.id))
+        ids = [str(row_id) for row_id in result.scalars().all()]
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.delete(CTA_IDS_KEY)
+            pipe.sadd(CTA_IDS_KEY, CTA_IDS_SENTINEL, *ids)
+            pipe.expire(CTA_IDS_KEY, CTA_IDS_TTL_SECONDS)
+            await pipe.execute()
+    finally:
+        await client.delete(CTA_IDS_LOCK_KEY)
+    return cta_id in ids
+
+
+async def invalidate_cta_ids() -> None:
+    """CTA IDのセットを破棄（CTAの作成・削除時）"""
+    try:
+        client = await get_redis()
+        await client.delete(CTA_IDS_KEY)
+    except redis.RedisError as e:
+        logger.warning(f"Failed to invalidate CTA id set: {e}")
+
+
+async def publish_click(
+    client: redis.Redis,
+    cta_id: str,
+    video_id: Optional[str] = None,
+    ip_address: Optional[str] = None,
+    user_agent: Optional[str] = None,
+    referrer: Optional[str] = None,
+    utm_params: Optional[dict] = None,
+) -> str:
+    """
+    クリックをストリームに追加
+
+    Returns:
+        str: ストリームのエントリID
+
+    Raises:
+        redis.RedisError: Redisに接続できない
+    """
+    fields = {
+        "cta_id": cta_id,
+        "video_id": video_id or "",
+        "clicked_at": datetime.utcnow().isoformat(),
+        "ip_address": (ip_address or "")[:IP_ADDRESS_MAX_LENGTH],
+        "user_agent": (user_agent or "")[:USER_AGENT_MAX_LENGTH],
+        "referrer": referrer or "",
+        "utm_params": json.dumps(utm_params, ensure_ascii=False) if utm_params else "",
+    }
+    return await client.xadd(
+        STREAM_KEY,
+        fields,
+        maxlen=settings.CTA_CLICK_STREAM_MAX_LEN,
+        approximate=True,
+    )
+
+
+# ============================================================
+# 読み出し側（バックグラウンド）
+# ============================================================
+
+def parse_click(fields: Optional[Dict[str, str]], entry_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """ストリームのエントリをクリックログの値に変換（不正なエントリはNone）"""
+    if not fields:
+        return None
+    try:
+        video_id = fields.get("video_id")
+        utm_params = fields.get("utm_params")
+        return {
+            "stream_entry_id": entry_id,
+            "cta_id": UUID(fields["cta_id"]),
+            "video_id": UUID(video_id) if video_id else None,
+            "clicked_at": datetime.fromisoformat(fields["clicked_at"]),
+            "ip_address": fields.get("ip_address") or None,
+            "user_agent": fields.get("user_agent") or None,
+            "referrer": fields.get("referrer") or None,
+            "utm_params": json.loads(utm_params) if utm_params else None,
+        }
+    except (KeyError, ValueError, TypeError) as e:
+        logger.warning(f"Dropping malformed CTA click entry: {e}")
+        return None
+
+
+async def write_clicks(db: AsyncSession, clicks: Sequence[Dict[str, Any]]) -> int:
+    """
+    クリックログを一括INSERTし、CTAごとの差分で conversion_count と日次集計を更新
+
+    削除済みのCTAへのクリックは破棄し、存在しない動画IDはNULLにする。
+    エントリIDが書き込み済みのクリック（コミット後・ACK前に中断したバッチの再処理）は
+    INSERTされず、集計にも加えない
+
+    Returns:
+        int: 書き込んだクリック数
+    """
+    if not clicks:
+        return 0
+
+    cta_ids = {c["cta_id"] for c in clicks}
+    result = await db.execute(select(CTATemplate.id).where(CTATemplate.id.in_(cta_ids)))
+    existing_ctas = set(result.scalars().all())
+
+    video_ids = {c["video_id"] for c in clicks if c["video_id"]}
+    existing_videos = set()
+    if video_ids:
+        result = await db.execute(select(Video.id).where(Video.id.in_(video_ids)))
+        existing_videos = set(result.scalars().all())
+
+    rows = [
+        {**c, "video_id": c["video_id"] if c["video_id"] in existing_videos else None}
+        for c in clicks
+        if c["cta_id"] in existing_ctas
+    ]
+    if not rows:
+        return 0
+
+    stmt = (
+        pg_insert(CTAClickLog)
+        .values(rows)
+        .on_conflict_do_nothing(constraint="uq_cta_click_logs_stream_entry_id")
+        .returning(CTAClickLog.cta_id, CTAClickLog.clicked_at)
+    )
+    result = await db.execute(stmt)
+    inserted = result.mappings().all()
+    if not inserted:
+        return 0
+
+    # 複数コンシューマー間のデッドロックを避けるためID順に更新
+    deltas = Counter(row["cta_id"] for row in inserted)
+    table = CTATemplate.__table__
+    await db.execute(
+        update(table)
+        .where(table.c.id == bindparam("cta_id"))
+        .values(conversion_count=table.c.conversion_count + bindparam("delta")),
+        [{"cta_id": cta_id, "delta": delta} for cta_id, delta in sorted(deltas.items())],
+    )
+    await DailyStatsService.add_cta_clicks(db, DailyStatsService.count_cta_clicks(inserted))
+    await db.commit()
+    return len(inserted)
+
+
+class CTAClickConsumer:
+    """
+    クリックストリームのコンシューマー
+
+    アプリケーション起動時に start()、終了時に stop() を呼び出す
+    （複数プロセスで起動した場合は同じコンシューマーグループで分担する）
+    """
+
+    def __init__(self, name: Optional[str] = None):
+        self.name = name or f"{socket.gethostname()}-{os.getpid()}"
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """バックグラウンドで読み出しを開始"""
+        if not settings.CTA_CLICK_CONSUMER_ENABLED or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """読み出しを停止（処理中のバッチはACKされず、再起動後に再処理される）"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                client = await get_redis()
+                await self._ensure_group(client)
+                while True:
+                    entries = await self._claim_stale(client) or await self._read_new(client)
+                    if entries:
+                        await self.process(client, entries)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"CTA click consumer error, retrying in {RETRY_INTERVAL_SECONDS}s: {e}")
+                await asyncio.sleep(RETRY_INTERVAL_SECONDS)
+
+    async def _ensure_group(self, client: redis.Redis) -> None:
+        try:
+            await client.xgroup_create(STREAM_KEY, CONSUMER_GROUP, id="0", mkstream=True)
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def _claim_stale(self, client: redis.Redis) -> List[StreamEntry]:
+        """ACKされないまま残っているクリックを引き取る（配信回数が上限に達したものは退避）"""
+        result = await client.xautoclaim(
+            STREAM_KEY,
+            CONSUMER_GROUP,
+            self.name,
+            min_idle_time=settings.CTA_CLICK_CLAIM_IDLE_MS,
+            start_id="0-0",
+            count=settings.CTA_CLICK_BATCH_SIZE,
+        )
+        entries = result[1] if result else []
+        if not entries:
+            return []
+        return await self._dead_letter_exhausted(client, entries)
+
+    async def _dead_letter_exhausted(self, client: redis.Redis, entries: Sequence[StreamEntry]) -> List[StreamEntry]:
+        """
+        配信回数（XPENDING）が CTA_CLICK_MAX_DELIVERIES に達したエントリをデッドレターストリームへ移す
+
+        書き込みのたびに失敗するバッチが引き取り・失敗を繰り返して後続を塞がないようにする
+
+        Returns:
+            List[StreamEntry]: 処理を続けるエントリ
+        """
+        pending = await client.xpending_range(
+            STREAM_KEY,
+            CONSUMER_GROUP,
+            min=entries[0][0],
+            max=entries[-1][0],
+            count=len(entries),
+            consumername=self.name,
+        )
+        deliveries = {p["message_id"]: p["times_delivered"] for p in pending}
+        exhausted = [
+            (entry_id, fields) for entry_id, fields in entries
+            if deliveries.get(entry_id, 0) >= settings.CTA_CLICK_MAX_DELIVERIES
+        ]
+        if not exhausted:
+            return list(entries)
+
+        exhausted_ids = [entry_id for entry_id, _ in exhausted]
+        async with client.pipeline(transaction=True) as pipe:
+            for entry_id, fields in exhausted:
+                pipe.xadd(
+                    DEAD_LETTER_KEY,
+                    {**(fields or {}), "source_id": entry_id, "deliveries": deliveries[entry_id]},
+                    maxlen=settings.CTA_CLICK_STREAM_MAX_LEN,
+                    approximate=True,
+                )
+            pipe.xack(STREAM_KEY, CONSUMER_GROUP, *exhausted_ids)
+            pipe.xdel(STREAM_KEY, *exhausted_ids)
+            await pipe.execute()
+        logger.error(
+            f"CTA clicks: moved {len(exhausted_ids)} entries to {DEAD_LETTER_KEY} "
+            f"after {settings.CTA_CLICK_MAX_DELIVERIES} deliveries"
+        )
+        moved = set(exhausted_ids)
+        return [entry for entry in entries if entry[0] not in moved]
+
+    async def _read_new(self, client: redis.Redis) -> List[StreamEntry]:
+        result = await client.xreadgroup(
+            CONSUMER_GROUP,
+            self.name,
+            {STREAM_KEY: ">"},
+            count=settings.CTA_CLICK_BATCH_SIZE,
+            block=settings.CTA_CLICK_BLOCK_MS,
+        )
+        return result[0][1] if result else []
+
+    async def process(self, client: redis.Redis, entries: Sequence[StreamEntry]) -> int:
+        """
+        1バッチ分のクリックを書き込んでACK
+
+        Returns:
+            int: 書き込んだクリック数
+        """
+        clicks = [
+            click for click in (parse_click(fields, entry_id) for entry_id, fields in entries) if click
+        ]
+        async with AsyncSessionLocal() as db:
+            written = await write_clicks(db, clicks)
+
+        entry_ids = [entry_id for entry_id, _ in entries]
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.xack(STREAM_KEY, CONSUMER_GROUP, *entry_ids)
+            pipe.xdel(STREAM_KEY, *entry_ids)
+            await pipe.execute()
+        if written != len(entries):
+            logger.info(f"CTA clicks: wrote {written} of {len(entries)} entries (rest dropped or already written)")
+        return written
+
+
+cta_click_consumer = CTAClickConsumer()
@@ -8,11 +8,13 @@ from datetime import datetime, timedelta
 from typing import Optional, List, Tuple
 from uuid import UUID
 import httpx
+import redis.asyncio as redis
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_
 from sqlalchemy.orm import selectinload
 
+from app.core.cache import get_redis
 from app.models.cta import CTATemplate, VideoCTAAssignment, UTMDefaultSettings, CTAClickLog, CTAType, CTAPlacement
 from app.schemas.cta import (
     CTACreate, CTAUpdate, CTAResponse, CTAStats, CTAListResponse,
@@ -20,6 +22,8 @@ from app.schemas.cta import (
     UTMDefaultSettingsBase, UTMDefaultSettingsResponse,
     CTADetailStats, CTADailyStats, GeneratedDescriptionWithCTA
 )
+from app.services.cta_click_stream import cta_exists, invalidate_cta_ids, publish_click
+from app.services.daily_stats_service import DailyStatsService
 
 logger = logging.getLogger(__name__)
 
@@ -38,20 +42,25 @@ class CTAService:
         )
         ctas = result.scalars().all()
 
-        # 統計計算
-        total_ctas = len(ctas)
-        active_ctas = len([c for c in ctas if c.is_active])
-        total_clicks = sum(c.conversion_count for c in ctas)
-        avg_ctr = sum(c.ctr or 0 for c in ctas) / total_ctas if total_ctas > 0 else 0
+        # 統計計算（DB側で集計）
+        stats_result = await self.db.execute(
+            select(
+                func.count(),
+                func.count().filter(CTATemplate.is_active == True),
+                func.coalesce(func.sum(CTATemplate.conversion_count), 0),
+                func.coalesce(func.avg(func.coalesce(CTATemplate.ctr, 0)), 0),
+            )
+        )
+        total_ctas, active_ctas, total_clicks, avg_ctr = stats_result.one()
 
         return CTAListResponse(
             ctas=[self._to_response(cta) for cta in ctas],
-            total=total_ctas,
+            total=len(ctas),
             stats=CTAStats(
                 total_ctas=total_ctas,
                 active_ctas=active_ctas,
                 total_clicks=total_clicks,
-                avg_ctr=round(avg_ctr, 2)
+                avg_ctr=round(float(avg_ctr), 2)
             )
         )
 
@@ -87,6 +96,8 @@ class CTAService:
         await self.db.commit()
         await self.db.refresh(cta)
 
+        await invalidate_cta_ids()
+
         logger.info(f"CTA created: {cta.id} - {cta.name}")
         return self._to_response(cta)
 
@@ -135,6 +146,7 @@ class CTAService:
 
         await self.db.delete(cta)
         await self.db.commit()
+        await invalidate_cta_ids()
 
         logger.info(f"CTA deleted: {cta_id}")
         return True
@@ -268,7 +280,35 @@ class CTAService:
     async def record_click(self, cta_id: str, video_id: Optional[str] = None,
                           ip_address: Optional[str] = None, user_agent: Optional[str] = None,
                           referrer: Optional[str] = None, utm_params: Optional[dict] = None) -> bool:
-        """CTAクリックを記録."""
+        """
+        CTAクリックを記録.
+
+        クリックはRedis Streamに追加するだけで、DBへの書き込みは
+        バックグラウンドのコンシューマーがまとめて行う（cta_click_stream）。
+        Redisに接続できない場合はDBへ直接書き込む.
+        """
+        try:
+            UUID(cta_id)
+            if video_id:
+                UUID(video_id)
+        except ValueError:
+            return False
+
+        try:
+            client = await get_redis()
+            if not await cta_exists(client, self.db, cta_id):
+                return False
+            await publish_click(client, cta_id, video_id, ip_address, user_agent, referrer, utm_params)
+            return True
+        except redis.RedisError as e:
+            logger.warning(f"CTA click stream unavailable, writing directly: {e}")
+
+        return await self._write_click(cta_id, video_id, ip_address, user_agent, referrer, utm_params)
+
+    async def _write_click(self, cta_id: str, video_id: Optional[str],
+                           ip_address: Optional[str], user_agent: Optional[str],
+                           referrer: Optional[str], utm_params: Optional[dict]) -> bool:
+        """CTAクリックをDBへ直接記録（Redis障害時のフォールバック）."""
         result = await self.db.execute(
             select(CTATemplate).where(CTATemplate.id == UUID(cta_id))
         )
@@ -287,8 +327,9 @@ class CTAService:
         )
         self.db.add(click_log)
 
-        # コンバージョン数更新
+        # コンバージョン数・日次集計更新
         cta.conversion_count += 1
+        await DailyStatsService.add_cta_clicks(self.db, {(cta.id, datetime.utcnow().date()): 1})
 
         await self.db.commit()
 
@@ -304,29 +345,17 @@ class CTAService:
         if not cta:
             return None
 
-        # 日別クリック数取得
-        start_date = datetime.utcnow() - timedelta(days=days)
-        click_result = await self.db.execute(
-            select(
-                func.date(CTAClickLog.clicked_at).label('date'),
-                func.count(CTAClickLog.id).label('clicks')
-            ).where(
-                and_(
-                    CTAClickLog.cta_id == UUID(cta_id),
-                    CTAClickLog.clicked_at >= start_date
-                )
-            ).group_by(func.date(CTAClickLog.clicked_at))
-            .order_by(func.date(CTAClickLog.clicked_at))
-        )
-        daily_clicks = click_result.all()
+        # 日別クリック数取得（日次集計から）
+        start_date = (datetime.utcnow() - timedelta(days=days)).date()
+        daily_clicks = await DailyStatsService.get_cta_daily_clicks(self.db, cta.id, start_date)
 
         return CTADetailStats(
             cta_id=cta_id,
             clicks=cta.conversion_count,
             ctr=cta.ctr or 0,
             daily_clicks=[
-                CTADailyStats(date=str(row.date), clicks=row.clicks)
-                for row in daily_clicks
+                CTADailyStats(date=str(day), clicks=clicks)
+                for day, clicks in daily_clicks
             ]
         )
 
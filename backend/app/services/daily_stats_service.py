@@ -0,0 +1,154 @@
+"""
+日次集計サービス
+
+CTAクリックとショート→長尺連携の指標を (対象ID, 日付) 単位の日次カウンターに
+取り込み時点で加算し、統計APIは生データではなく日次カウンターを読む
+
+- 加算は INSERT ... ON CONFLICT DO UPDATE（既存値 + 差分）で行い、同じ行への同時加算でも値を失わない
+- 複数の行を更新する場合はキー順に処理してデッドロックを避ける
+- 統計の読み取りは期間の日数分（または 対象数 × 日数）の行のみ
+"""
+from collections import Counter
+from datetime import date
+from typing import Dict, List, Mapping, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.cta import CTADailyStat
+from app.models.engagement import EngagementDailyStat
+
+# エンゲージメントの加算対象の列
+ENGAGEMENT_COUNTER_COLUMNS = (
+    "short_views",
+    "click_through_count",
+    "conversion_count",
+    "ctr_sum",
+    "ctr_samples",
+    "conversion_rate_sum",
+    "conversion_rate_samples",
+)
+
+
+class DailyStatsService:
+    """日次集計サービス"""
+
+    # ========== CTA ==========
+
+    @staticmethod
+    async def add_cta_clicks(db: AsyncSession, clicks: Mapping[Tuple[UUID, date], int]) -> None:
+        """
+        CTAの日次クリック数に加算（commitは呼び出し側で行う）
+
+        Args:
+            db: データベースセッション
+            clicks: (CTA ID, 日付) -> クリック数
+        """
+        if not clicks:
+            return
+
+        stmt = pg_insert(CTADailyStat).values([
+            {"cta_id": cta_id, "date": day, "clicks": count}
+            for (cta_id, day), count in sorted(clicks.items())
+        ])
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_cta_daily_stats_cta_id_date",
+            set_={
+                "clicks": CTADailyStat.clicks + stmt.excluded.clicks,
+                "updated_at": func.now(),
+            },
+        )
+        await db.execute(stmt)
+
+    @staticmethod
+    def count_cta_clicks(rows: List[Dict]) -> Counter:
+        """クリックログの値（cta_id, clicked_at）を (CTA ID, 日付) ごとに数える"""
+        return Counter((row["cta_id"], row["clicked_at"].date()) for row in rows)
+
+    @staticmethod
+    async def get_cta_daily_clicks(
+        db: AsyncSession,
+        cta_id: UUID,
+        since: date,
+    ) -> List[Tuple[date, int]]:
+        """
+        CTAの日別クリック数を取得
+
+        Returns:
+            List[Tuple[date, int]]: (日付, クリック数) の日付順リスト
+        """
+        result = await db.execute(
+            select(CTADailyStat.date, CTADailyStat.clicks)
+            .where(CTADailyStat.cta_id == cta_id, CTADailyStat.date >= since)
+            .order_by(CTADailyStat.date)
+        )
+        return [(row.date, row.clicks) for row in result.all()]
+
+    # ========== ショート→長尺連携 ==========
+
+    @staticmethod
+    async def add_engagement_metrics(
+        db: AsyncSession,
+        link_id: UUID,
+        day: date,
+        short_views: int,
+        click_through_count: int,
+        conversion_count: int,
+        click_through_rate: Optional[float] = None,
+        conversion_rate: Optional[float] = None,
+    ) -> None:
+        """
+        連携の日次指標に加算（commitは呼び出し側で行う）
+
+        CTR・コンバージョン率は平均を求められるよう合計と件数で保持する
+        """
+        values = {
+            "short_views": short_views,
+            "click_through_count": click_through_count,
+            "conversion_count": conversion_count,
+            "ctr_sum": click_through_rate or 0.0,
+            "ctr_samples": 1 if click_through_rate is not None else 0,
+            "conversion_rate_sum": conversion_rate or 0.0,
+            "conversion_rate_samples": 1 if conversion_rate is not None else 0,
+        }
+        stmt = pg_insert(EngagementDailyStat).values(link_id=link_id, date=day, **values)
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_engagement_daily_stats_link_id_date",
+            set_={
+                **{
+                    column: getattr(EngagementDailyStat, column) + getattr(stmt.excluded, column)
+                    for column in ENGAGEMENT_COUNTER_COLUMNS
+                },
+                "updated_at": func.now(),
+            },
+        )
+        await db.execute(stmt)
+
+    @staticmethod
+    async def get_engagement_totals(db: AsyncSession) -> Dict[str, float]:
+        """
+        全連携の累計（日次集計から算出）
+
+        Returns:
+            Dict: {"total_clicks", "total_conversions", "avg_ctr", "avg_conversion_rate"}
+        """
+        s = EngagementDailyStat
+        result = await db.execute(
+            select(
+                func.coalesce(func.sum(s.click_through_count), 0),
+                func.coalesce(func.sum(s.conversion_count), 0),
+                func.coalesce(func.sum(s.ctr_sum), 0.0),
+                func.coalesce(func.sum(s.ctr_samples), 0),
+                func.coalesce(func.sum(s.conversion_rate_sum), 0.0),
+                func.coalesce(func.sum(s.conversion_rate_samples), 0),
+            )
+        )
+        clicks, conversions, ctr_sum, ctr_samples, conv_sum, conv_samples = result.one()
+        return {
+            "total_clicks": int(clicks),
+            "total_conversions": int(conversions),
+            "avg_ctr": ctr_sum / ctr_samples if ctr_samples else 0.0,
+            "avg_conversion_rate": conv_sum / conv_samples if conv_samples else 0.0,
+        }
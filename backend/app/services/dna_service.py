@@ -27,6 +27,7 @@ from app.models.dna import (
     TemplateStatus,
 )
 from app.services.external.ai_clients import claude_client, gemini_client
+from app.services.external.provider_router import provider_router
 
 logger = logging.getLogger(__name__)
 
@@ -196,20 +197,20 @@ class DNAExtractionService:
         )
 
         try:
+            # Claude/Geminiをルーター経由で呼び出し（呼び出し側は released_connection で接続を返却できる）
+            operations = {}
             if use_claude and claude_client.is_available():
-                message = claude_client.client.messages.create(
-                    model="claude-sonnet-4-20250514",
-                    max_tokens=4096,
-                    messages=[{"role": "user", "content": prompt}],
-                )
-                response_text = message.content[0].text
-            elif gemini_client.is_available():
-                response = gemini_client.model.generate_content(prompt)
-                response_text = response.text
-            else:
+                operations["claude"] = lambda: claude_client.generate_text(prompt, max_tokens=4096)
+            if gemini_client.is_available():
+                operations["gemini"] = lambda: gemini_client.generate_text(prompt)
+            if not operations:
                 logger.warning("No AI client available for DNA extraction")
                 return self._get_fallback_dna()
 
+            response_text = await provider_router.call("dna.extract", operations)
+            if not response_text:
+                return self._get_fallback_dna()
+
             # JSONを抽出
             dna_data = self._parse_json_response(response_text)
             return dna_data
@@ -368,14 +369,15 @@ class DNAExtractionService:
 
         try:
             if claude_client.is_available():
-                message = claude_client.client.messages.create(
+                message = await claude_client.create_message(
+                    "dna.channel_profile",
                     model="claude-sonnet-4-20250514",
                     max_tokens=4096,
                     messages=[{"role": "user", "content": prompt}],
                 )
                 response_text = message.content[0].text
             elif gemini_client.is_available():
-                response = gemini_client.model.generate_content(prompt)
+                response = await gemini_client.generate_content(prompt, "dna.channel_profile")
                 response_text = response.text
             else:
                 response_text = "{}"
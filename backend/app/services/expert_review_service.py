@@ -9,7 +9,7 @@ import uuid
 import json
 import asyncio
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator, Tuple
 
 from app.schemas.expert_review import (
     ExpertType,
@@ -32,6 +32,7 @@ from app.schemas.expert_review import (
     AvatarPositionType,
     TimelineWarningType,
 )
+from app.core.sse import sse_broker, Emit
 from app.services.external.ai_clients import claude_client, gemini_client
 
 logger = logging.getLogger(__name__)
@@ -201,6 +202,7 @@ class ExpertReviewService:
     async def review_script(
         request: ExpertReviewRequest,
         knowledge_context: Optional[str] = None,
+        emit: Optional[Emit] = None,
     ) -> ExpertReviewResponse:
         """
         台本を5人の専門家がレビュー
@@ -208,6 +210,7 @@ class ExpertReviewService:
         Args:
             request: レビューリクエスト
             knowledge_context: ナレッジコンテキスト
+            emit: SSEイベント送信関数（指定時は各専門家の出力をストリーミング）
 
         Returns:
             ExpertReviewResponse: レビュー結果
@@ -225,7 +228,8 @@ class ExpertReviewService:
         # 5人の専門家による並列レビュー
         expert_feedbacks = await ExpertReviewService._run_expert_reviews(
             full_script,
-            knowledge_context or "ナレッジDB未設定"
+            knowledge_context or "ナレッジDB未設定",
+            emit,
         )
 
         # 改善版台本をマージ
@@ -307,25 +311,50 @@ class ExpertReviewService:
             processing_time_ms=processing_time_ms
         )
 
+    @staticmethod
+    def stream_review_script(
+        request: ExpertReviewRequest,
+        knowledge_context: Optional[str] = None,
+    ) -> str:
+        """
+        専門家レビューをストリーミング実行（SSE）
+
+        イベント:
+            token: 専門家ごとの生成テキスト断片 {"expert_type", "text"}
+            expert: 専門家ごとのフィードバック（完了順）
+            result: ExpertReviewResponse 全体
+
+        Returns:
+            str: ストリームID
+        """
+        async def producer(emit: Emit) -> None:
+            response = await ExpertReviewService.review_script(request, knowledge_context, emit)
+            await emit("result", response.model_dump(mode="json"))
+
+        return sse_broker.start(producer)
+
     @staticmethod
     async def _run_expert_reviews(
         full_script: str,
-        knowledge_context: str
+        knowledge_context: str,
+        emit: Optional[Emit] = None,
     ) -> List[ExpertFeedbackResponse]:
         """5人の専門家による並列レビュー実行"""
 
-        # 各専門家のタスクを作成
-        tasks = []
-        for expert_type in ExpertType:
-            config = EXPERT_CONFIG[expert_type]
-            tasks.append(
-                ExpertReviewService._review_by_expert(
-                    expert_type,
-                    full_script,
-                    knowledge_context,
-                    config
-                )
+        async def review(expert_type: ExpertType) -> ExpertFeedbackResponse:
+            feedback = await ExpertReviewService._review_by_expert(
+                expert_type,
+                full_script,
+                knowledge_context,
+                EXPERT_CONFIG[expert_type],
+                emit,
             )
+            if emit:
+                await emit("expert", feedback.model_dump(mode="json"))
+            return feedback
+
+        # 各専門家のタスクを作成
+        tasks = [review(expert_type) for expert_type in ExpertType]
 
         # 並列実行
         results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -337,14 +366,17 @@ class ExpertReviewService:
                 expert_type = list(ExpertType)[i]
                 logger.error(f"専門家{expert_type}のレビューエラー: {result}")
                 # フォールバックとして低スコアを返す
-                feedbacks.append(ExpertFeedbackResponse(
+                fallback = ExpertFeedbackResponse(
                     expert_type=expert_type,
                     score=50,
                     original_text=full_script[:200],
                     revised_text=full_script[:200],
                     improvement_reason="AI処理エラーのため評価できませんでした",
                     suggestions=["後ほど再試行してください"]
-                ))
+                )
+                if emit:
+                    await emit("expert", fallback.model_dump(mode="json"))
+                feedbacks.append(fallback)
             else:
                 feedbacks.append(result)
 
@@ -355,17 +387,17 @@ class ExpertReviewService:
         expert_type: ExpertType,
         full_script: str,
         knowledge_context: str,
-        config: Dict[str, Any]
+        config: Dict[str, Any],
+        emit: Optional[Emit] = None,
     ) -> ExpertFeedbackResponse:
-        """個別の専門家によるレビュー"""
+        """個別の専門家によるレビュー（emit指定時は生成テキストをストリーミング）"""
 
-        prompt_template = config["prompt_template"]
         ai_model = config["ai_model"]
+        call_site = f"expert_review.{expert_type.value}"
 
-        # プロンプト生成
-        prompt = prompt_template.format(
-            section_content=full_script[:3000],  # 長すぎる場合は制限
-            knowledge_context=knowledge_context[:1000] if "{knowledge_context}" in prompt_template else ""
+        # プロンプト生成（専門家ごとに固定のシステムプロンプトはキャッシュ対象）
+        system_prompt, user_prompt = ExpertReviewService._build_expert_prompts(
+            config["prompt_template"], full_script, knowledge_context
         )
 
         try:
@@ -374,22 +406,49 @@ class ExpertReviewService:
                 if not claude_client.is_available():
                     raise ValueError("Claude API is not available")
 
-                message = claude_client.client.messages.create(
-                    model="claude-sonnet-4-20250514",
-                    max_tokens=2048,
-                    messages=[{"role": "user", "content": prompt}]
-                )
-                response_text = message.content[0].text
+                if emit:
+                    response_text = await ExpertReviewService._stream_expert_text(
+                        claude_client.stream_text(
+                            user_prompt,
+                            system=system_prompt,
+                            max_tokens=2048,
+                            cache_system=True,
+                            call_site=call_site,
+                        ),
+                        expert_type,
+                        emit,
+                    )
+                else:
+                    response_text = await claude_client.generate_text(
+                        user_prompt,
+                        system=system_prompt,
+                        max_tokens=2048,
+                        cache_system=True,
+                        call_site=call_site,
+                    )
 
             elif ai_model == "gemini":
                 if not gemini_client.is_available():
                     raise ValueError("Gemini API is not available")
 
-                response = gemini_client.model.generate_content(prompt)
-                response_text = response.text
+                if emit:
+                    response_text = await ExpertReviewService._stream_expert_text(
+                        gemini_client.stream_text(
+                            user_prompt, system=system_prompt, call_site=call_site
+                        ),
+                        expert_type,
+                        emit,
+                    )
+                else:
+                    response_text = await gemini_client.generate_text(
+                        user_prompt, system=system_prompt, call_site=call_site
+                    )
             else:
                 raise ValueError(f"Unknown AI model: {ai_model}")
 
+            if not response_text:
+                raise ValueError(f"{ai_model} returned no response")
+
             # JSON解析
             # JSONブロックを抽出（```json ... ``` の場合に対応）
             import re
@@ -415,6 +474,44 @@ class ExpertReviewService:
             logger.error(f"{expert_type}のレビューエラー: {e}")
             raise
 
+    @staticmethod
+    def _build_expert_prompts(
+        prompt_template: str,
+        full_script: str,
+        knowledge_context: str,
+    ) -> Tuple[str, str]:
+        """
+        専門家テンプレートを固定部分（システム）と可変部分（ユーザー）に分割
+
+        テンプレート中の台本・ナレッジの差し込み位置はユーザーメッセージへの参照に置き換え、
+        システムプロンプトが専門家ごとに常に同一になるようにする
+
+        Returns:
+            Tuple[str, str]: (システムプロンプト, ユーザープロンプト)
+        """
+        uses_knowledge = "{knowledge_context}" in prompt_template
+        system_prompt = prompt_template.format(
+            section_content="（ユーザーメッセージの【分析対象】を参照）",
+            knowledge_context="（ユーザーメッセージの【ナレッジDB情報】を参照）",
+        )
+        user_prompt = f"【分析対象】\n{full_script[:3000]}"  # 長すぎる場合は制限
+        if uses_knowledge:
+            user_prompt += f"\n\n【ナレッジDB情報】\n{knowledge_context[:1000]}"
+        return system_prompt, user_prompt
+
+    @staticmethod
+    async def _stream_expert_text(
+        source: AsyncIterator[str],
+        expert_type: ExpertType,
+        emit: Emit,
+    ) -> str:
+        """専門家の生成テキストを中継しつつ全文を返す"""
+        parts = []
+        async for text in source:
+            parts.append(text)
+            await emit("token", {"expert_type": expert_type.value, "text": text})
+        return "".join(parts)
+
     @staticmethod
     async def _merge_expert_revisions(
         sections: List,
@@ -588,7 +685,8 @@ class ExpertReviewService:
 
 必ずJSON配列で出力してください。"""
 
-            message = claude_client.client.messages.create(
+            message = await claude_client.create_message(
+                "expert_review.persona_reactions",
                 model="claude-sonnet-4-20250514",
                 max_tokens=1024,
                 messages=[{"role": "user", "content": prompt}]
@@ -3,10 +3,28 @@ AI生成サービスクライアント
 
 Claude API / Gemini API を使用した台本・コンテンツ生成
 """
-from typing import Optional, Dict, Any, List
+import asyncio
+import json
+from contextlib import AsyncExitStack
+from typing import Optional, Dict, Any, List, AsyncIterator, Literal, Tuple
 from enum import Enum
 
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
 from app.core.config import settings
+from app.services.external.llm_metrics import (
+    anthropic_usage,
+    call_with_retries,
+    gemini_usage,
+    instrumented_call,
+    observe_llm_call,
+    record_cache_hit,
+)
+from app.services.external.llm_response_cache import llm_response_cache, make_cache_key
+from app.services.external.prompt_cache import (
+    cacheable_system,
+    record_anthropic_usage,
+)
 
 
 class AIProvider(str, Enum):
@@ -15,55 +33,255 @@ class AIProvider(str, Enum):
     GEMINI = "gemini"
 
 
+# コメント返信の構造化出力
+COMMENT_TAG_CATEGORIES = ["質問", "感想", "提案", "技術的な問題", "賞賛", "批判", "その他"]
+COMMENT_REPLY_BATCH_SIZE = 20
+COMMENT_REPLY_BATCH_CONCURRENCY = 4
+
+_COMMENT_REPLY_PROPERTIES: Dict[str, Any] = {
+    "reply": {"type": "string"},
+    "sentiment": {"type": "string", "enum": ["positive", "negative", "neutral"]},
+    "tags": {"type": "array", "items": {"type": "string"}},
+}
+COMMENT_REPLY_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": _COMMENT_REPLY_PROPERTIES,
+    "required": ["reply", "sentiment", "tags"],
+}
+COMMENT_REPLY_BATCH_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"index": {"type": "integer"}, **_COMMENT_REPLY_PROPERTIES},
+                "required": ["index", "reply", "sentiment", "tags"],
+            },
+        },
+    },
+    "required": ["results"],
+}
+
+
+class CommentReplyOutput(BaseModel):
+    """コメント返信の構造化出力（スキーマ検証用）"""
+    reply: str = Field(..., min_length=1)
+    sentiment: Literal["positive", "negative", "neutral"]
+    tags: List[str] = Field(default_factory=list)
+
+    @field_validator("reply")
+    @classmethod
+    def strip_reply(cls, value: str) -> str:
+        value = value.strip()
+        if not value:
+            raise ValueError("reply is empty")
+        return value
+
+    @field_validator("sentiment", mode="before")
+    @classmethod
+    def normalize_sentiment(cls, value: Any) -> Any:
+        return value.strip().lower() if isinstance(value, str) else value
+
+    @field_validator("tags")
+    @classmethod
+    def strip_tags(cls, value: List[str]) -> List[str]:
+        return [tag.strip() for tag in value if tag and tag.strip()]
+
+
+class CommentReplyBatchItem(CommentReplyOutput):
+    """バッチ版の1件分（コメント番号付き）"""
+    index: int
+
+
 class ClaudeClient:
     """Claude API クライアント"""
 
     def __init__(self):
         """初期化"""
         self.api_key = settings.ANTHROPIC_API_KEY
-        self._client = None
+        self._async_client = None
 
     @property
-    def client(self):
-        """遅延初期化されたAPIクライアント"""
-        if self._client is None and self.api_key:
+    def async_client(self):
+        """遅延初期化された非同期APIクライアント"""
+        if self._async_client is None and self.api_key:
             import anthropic
-            self._client = anthropic.Anthropic(api_key=self.api_key)
-        return self._client
+            # リトライは instrumented_call / call_with_retries で行い回数を計測するため、SDK側では行わない
+            self._async_client = anthropic.AsyncAnthropic(api_key=self.api_key, max_retries=0)
+        return self._async_client
 
     def is_available(self) -> bool:
         """APIが利用可能かどうか"""
         return bool(self.api_key)
 
-    async def generate_script(
+    async def create_message(self, call_site: str, **params: Any) -> Any:
+        """
+        Messages APIを計測・リトライ付きで呼び出す（Claude呼び出しの共通入口）
+
+        Args:
+            call_site: 呼び出し箇所（メトリクスの集計単位）
+            **params: messages.create のパラメータ
+
+        Returns:
+            Message: APIレスポンス
+        """
+        return await instrumented_call(
+            AIProvider.CLAUDE.value,
+            params["model"],
+            call_site,
+            lambda: self.async_client.messages.create(**params),
+            anthropic_usage,
+        )
+
+    async def _complete_cached(
         self,
+        call_site: str,
         prompt: str,
-        title: Optional[str] = None,
-        target_duration: int = 180,
-        style: str = "educational",
-        knowledge_context: Optional[str] = None,
-    ) -> Dict[str, Any]:
+        max_tokens: int,
+        bypass_cache: bool = False,
+        model: str = "claude-sonnet-4-20250514",
+    ) -> Tuple[str, str]:
         """
-        台本を生成
+        応答キャッシュを通してテキストを生成
 
         Args:
-            prompt: 台本生成プロンプト
-            title: 動画タイトル
-            target_duration: 目標再生時間（秒）
-            style: 台本スタイル
-            knowledge_context: ナレッジDB からのコンテキスト
+            call_site: 呼び出し箇所（キャッシュの有効化・集計単位）
+            prompt: プロンプト
+            max_tokens: 最大トークン数
+            bypass_cache: キャッシュを読まずに再生成するか
+            model: モデル名
 
         Returns:
-            Dict: 生成結果
+            Tuple[str, str]: (応答テキスト, キャッシュキー)
+        """
+        key = make_cache_key(AIProvider.CLAUDE.value, model, prompt, {"max_tokens": max_tokens})
+        cached = await llm_response_cache.get(key, call_site, bypass=bypass_cache)
+        if cached is not None:
+            record_cache_hit(AIProvider.CLAUDE.value, model, call_site)
+            return cached, key
+
+        message = await self.create_message(
+            call_site,
+            model=model,
+            max_tokens=max_tokens,
+            messages=[
+                {"role": "user", "content": prompt}
+            ]
+        )
+        text = message.content[0].text
+        await llm_response_cache.set(key, call_site, text)
+        return text, key
+
+    async def generate_text(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: Optional[float] = None,
+        model: str = "claude-sonnet-4-20250514",
+        cache_system: bool = False,
+        call_site: str = "claude.generate_text",
+    ) -> Optional[str]:
+        """
+        テキストを生成（stream_textの非ストリーミング版）
+
+        Args:
+            cache_system: システムプロンプトをプロバイダー側でキャッシュさせるか
+            call_site: キャッシュトークン数の集計単位
+
+        Returns:
+            Optional[str]: 生成テキスト（エラー時はNone）
         """
         if not self.is_available():
-            return {"error": "Claude API is not available", "content": None}
+            return None
 
         try:
-            # 文字数目安を計算（1分あたり約300文字）
-            target_chars = int(target_duration / 60 * 300)
+            params = self._build_params(prompt, system, max_tokens, temperature, model, cache_system)
+
+            # 非同期クライアントでイベントループをブロックしない
+            message = await self.create_message(call_site, **params)
+            if cache_system:
+                record_anthropic_usage(call_site, message.usage)
+            return message.content[0].text
 
-            system_prompt = f"""あなたはYouTube動画の台本を作成するプロの脚本家です。
+        except Exception as e:
+            print(f"Claude API Error: {e}")
+            return None
+
+    async def stream_text(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: Optional[float] = None,
+        model: str = "claude-sonnet-4-20250514",
+        cache_system: bool = False,
+        call_site: str = "claude.stream_text",
+    ) -> AsyncIterator[str]:
+        """
+        テキストをストリーミング生成
+
+        Args:
+            prompt: ユーザープロンプト
+            system: システムプロンプト
+            max_tokens: 最大トークン数
+            temperature: 温度
+            model: モデル名
+            cache_system: システムプロンプトをプロバイダー側でキャッシュさせるか
+            call_site: キャッシュトークン数の集計単位
+
+        Yields:
+            str: 生成されたテキスト断片
+        """
+        params = self._build_params(prompt, system, max_tokens, temperature, model, cache_system)
+
+        async with observe_llm_call(AIProvider.CLAUDE.value, model, call_site) as record:
+            async with AsyncExitStack() as stack:
+                # SDKのリトライは無効のため、接続確立（429/529等）はここでリトライする
+                stream = await call_with_retries(
+                    record,
+                    lambda: stack.enter_async_context(self.async_client.messages.stream(**params)),
+                )
+                async for text in stream.text_stream:
+                    yield text
+                final_message = await stream.get_final_message()
+            record.set_usage(anthropic_usage(final_message))
+            if cache_system:
+                record_anthropic_usage(call_site, final_message.usage)
+
+    @staticmethod
+    def _build_params(
+        prompt: str,
+        system: Optional[str],
+        max_tokens: int,
+        temperature: Optional[float],
+        model: str,
+        cache_system: bool = False,
+    ) -> Dict[str, Any]:
+        """Messages APIのパラメータを構築（cache_system指定時はcache_controlを付与）"""
+        params: Dict[str, Any] = {
+            "model": model,
+            "max_tokens": max_tokens,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        if system:
+            params["system"] = cacheable_system(system) if cache_system else system
+        if temperature is not None:
+            params["temperature"] = temperature
+        return params
+
+    def build_script_system_prompt(
+        self,
+        target_duration: int = 180,
+        style: str = "educational",
+        knowledge_context: Optional[str] = None,
+    ) -> str:
+        """台本生成のシステムプロンプトを構築"""
+        # 文字数目安を計算（1分あたり約300文字）
+        target_chars = int(target_duration / 60 * 300)
+
+        system_prompt = f"""あなたはYouTube動画の台本を作成するプロの脚本家です。
 以下の要件に従って、視聴者を惹きつける台本を作成してください。
 
 【要件】
@@ -86,19 +304,73 @@ class ClaudeClient:
 （締めの言葉とCTA）
 ```
 """
-            if knowledge_context:
-                system_prompt += f"\n【参考情報（ナレッジ）】\n{knowledge_context}\n"
+        if knowledge_context:
+            system_prompt += f"\n【参考情報（ナレッジ）】\n{knowledge_context}\n"
+        return system_prompt
+
+    async def stream_script(
+        self,
+        prompt: str,
+        title: Optional[str] = None,
+        target_duration: int = 180,
+        style: str = "educational",
+        knowledge_context: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """
+        台本をストリーミング生成（generate_scriptと同じプロンプト）
+
+        Yields:
+            str: 生成されたテキスト断片
+        """
+        system_prompt = self.build_script_system_prompt(target_duration, style, knowledge_context)
+        user_prompt = f"タイトル: {title or '未定'}\n\n{prompt}"
+        async for text in self.stream_text(
+            user_prompt,
+            system=system_prompt,
+            cache_system=True,
+            call_site="claude.generate_script",
+        ):
+            yield text
+
+    async def generate_script(
+        self,
+        prompt: str,
+        title: Optional[str] = None,
+        target_duration: int = 180,
+        style: str = "educational",
+        knowledge_context: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        台本を生成
+
+        Args:
+            prompt: 台本生成プロンプト
+            title: 動画タイトル
+            target_duration: 目標再生時間（秒）
+            style: 台本スタイル
+            knowledge_context: ナレッジDB からのコンテキスト
+
+        Returns:
+            Dict: 生成結果
+        """
+        if not self.is_available():
+            return {"error": "Claude API is not available", "content": None}
 
+        try:
+            system_prompt = self.build_script_system_prompt(target_duration, style, knowledge_context)
             user_prompt = f"タイトル: {title or '未定'}\n\n{prompt}"
 
-            message = self.client.messages.create(
+            # システムプロンプトはスタイル・尺・ナレッジが同じ限り同一のためキャッシュさせる
+            message = await self.create_message(
+                "claude.generate_script",
                 model="claude-sonnet-4-20250514",
                 max_tokens=4096,
-                system=system_prompt,
+                system=cacheable_system(system_prompt),
                 messages=[
                     {"role": "user", "content": user_prompt}
                 ]
             )
+            record_anthropic_usage("claude.generate_script", message.usage)
 
             content = message.content[0].text
             word_count = len(content)
@@ -122,6 +394,7 @@ class ClaudeClient:
         keywords: List[str],
         style: str = "engaging",
         count: int = 5,
+        bypass_cache: bool = False,
     ) -> Dict[str, Any]:
         """
         タイトル候補を生成
@@ -131,6 +404,7 @@ class ClaudeClient:
             keywords: キーワードリスト
             style: タイトルスタイル
             count: 生成数
+            bypass_cache: 応答キャッシュを使わずに再生成するか
 
         Returns:
             Dict: タイトル候補リスト
@@ -161,17 +435,13 @@ class ClaudeClient:
 各タイトルを1行ずつ出力してください。番号は不要です。
 """
 
-            message = self.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=1024,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
+            text, _ = await self._complete_cached(
+                "claude.generate_title", prompt, 1024, bypass_cache
             )
 
             titles = [
                 line.strip()
-                for line in message.content[0].text.strip().split("\n")
+                for line in text.strip().split("\n")
                 if line.strip()
             ][:count]
 
@@ -192,6 +462,7 @@ class ClaudeClient:
         keywords: Optional[List[str]] = None,
         include_timestamps: bool = True,
         include_links: bool = True,
+        bypass_cache: bool = False,
     ) -> Dict[str, Any]:
         """
         説明文を生成
@@ -202,6 +473,7 @@ class ClaudeClient:
             keywords: キーワードリスト
             include_timestamps: タイムスタンプを含めるか
             include_links: リンクを含めるか
+            bypass_cache: 応答キャッシュを使わずに再生成するか
 
         Returns:
             Dict: 説明文と関連情報
@@ -243,16 +515,10 @@ class ClaudeClient:
 #ハッシュタグ1 #ハッシュタグ2
 """
 
-            message = self.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=2048,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
+            description, _ = await self._complete_cached(
+                "claude.generate_description", prompt, 2048, bypass_cache
             )
 
-            description = message.content[0].text
-
             # ハッシュタグを抽出
             import re
             hashtags = re.findall(r'#\w+', description)
@@ -313,7 +579,8 @@ recommendations: このトレンドを活用するための具体的な提案（
 JSON形式で出力してください。
 """
 
-            message = self.client.messages.create(
+            message = await self.create_message(
+                "claude.analyze_trend",
                 model="claude-sonnet-4-20250514",
                 max_tokens=2048,
                 messages=[
@@ -377,7 +644,8 @@ summary: 総合サマリー（200文字程度）
 JSON形式で出力してください。
 """
 
-            message = self.client.messages.create(
+            message = await self.create_message(
+                "claude.analyze_competitor",
                 model="claude-sonnet-4-20250514",
                 max_tokens=2048,
                 messages=[
@@ -434,7 +702,8 @@ recommendations: 改善のための具体的提案（3-5個）
 JSON形式で出力してください。
 """
 
-            message = self.client.messages.create(
+            message = await self.create_message(
+                "claude.analyze_performance",
                 model="claude-sonnet-4-20250514",
                 max_tokens=2048,
                 messages=[
@@ -497,7 +766,8 @@ improvements: 改善提案（3-5個の具体的な修正案）
 JSON形式で出力してください。
 """
 
-            message = self.client.messages.create(
+            message = await self.create_message(
+                "claude.evaluate_script_quality",
                 model="claude-sonnet-4-20250514",
                 max_tokens=2048,
                 messages=[
@@ -517,6 +787,7 @@ JSON形式で出力してください。
         self,
         keywords: list,
         context: str,
+        bypass_cache: bool = False,
     ) -> Dict[str, Any]:
         """
         キーワード分析（キーワードリサーチ用）
@@ -524,6 +795,7 @@ JSON形式で出力してください。
         Args:
             keywords: 分析対象のキーワードリスト
             context: コンテキスト情報（チャンネル方向性、ターゲット層等）
+            bypass_cache: 応答キャッシュを使わずに再分析するか
 
         Returns:
             Dict: {
@@ -557,16 +829,17 @@ grouped: テーマ名: [キーワードリスト] の形式でグループ化
 JSON形式で出力してください。
 """
 
-            message = self.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=2048,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
+            text, cache_key = await self._complete_cached(
+                "claude.analyze_keywords", prompt, 2048, bypass_cache
             )
 
             import json
-            result = json.loads(message.content[0].text)
+            try:
+                result = json.loads(text)
+            except json.JSONDecodeError:
+                # パースできない応答は再利用しない
+                await llm_response_cache.invalidate(cache_key)
+                raise
             return result
 
         except Exception as e:
@@ -577,6 +850,8 @@ JSON形式で出力してください。
 class GeminiClient:
     """Gemini API クライアント"""
 
+    MODEL_NAME = "gemini-1.5-flash"
+
     def __init__(self):
         """初期化"""
         self.api_key = settings.GEMINI_API_KEY
@@ -588,42 +863,168 @@ class GeminiClient:
         if self._model is None and self.api_key:
             import google.generativeai as genai
             genai.configure(api_key=self.api_key)
-            self._model = genai.GenerativeModel('gemini-1.5-flash')
+            self._model = genai.GenerativeModel(self.MODEL_NAME)
         return self._model
 
     def is_available(self) -> bool:
         """APIが利用可能かどうか"""
         return bool(self.api_key)
 
-    async def generate_script(
+    async def generate_content(
+        self,
+        contents: Any,
+        call_site: str,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        generate_content を計測・リトライ付きで呼び出す（Gemini呼び出しの共通入口）
+
+        Args:
+            contents: プロンプト
+            call_site: 呼び出し箇所（メトリクスの集計単位）
+            **kwargs: generate_content_async のパラメータ
+
+        Returns:
+            GenerateContentResponse: APIレスポンス
+        """
+        return await instrumented_call(
+            AIProvider.GEMINI.value,
+            self.MODEL_NAME,
+            call_site,
+            lambda: self.model.generate_content_async(contents, **kwargs),
+            gemini_usage,
+        )
+
+    async def _complete_cached(
         self,
+        call_site: str,
         prompt: str,
-        title: Optional[str] = None,
-        target_duration: int = 180,
-        style: str = "educational",
-        knowledge_context: Optional[str] = None,
-    ) -> Dict[str, Any]:
+        bypass_cache: bool = False,
+    ) -> Tuple[str, str]:
         """
-        台本を生成
+        応答キャッシュを通してテキストを生成
 
         Args:
-            prompt: 台本生成プロンプト
-            title: 動画タイトル
-            target_duration: 目標再生時間（秒）
-            style: 台本スタイル
-            knowledge_context: ナレッジDB からのコンテキスト
+            call_site: 呼び出し箇所（キャッシュの有効化・集計単位）
+            prompt: プロンプト
+            bypass_cache: キャッシュを読まずに再生成するか
 
         Returns:
-            Dict: 生成結果
+            Tuple[str, str]: (応答テキスト, キャッシュキー)
+        """
+        key = make_cache_key(AIProvider.GEMINI.value, self.MODEL_NAME, prompt)
+        cached = await llm_response_cache.get(key, call_site, bypass=bypass_cache)
+        if cached is not None:
+            record_cache_hit(AIProvider.GEMINI.value, self.MODEL_NAME, call_site)
+            return cached, key
+
+        response = await self.generate_content(prompt, call_site)
+        text = response.text
+        await llm_response_cache.set(key, call_site, text)
+        return text, key
+
+    @staticmethod
+    def _with_system(prompt: str, system: Optional[str]) -> str:
+        """システムプロンプトを本文の前に連結"""
+        return f"{system}\n\n{prompt}" if system else prompt
+
+    async def generate_text(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        system: Optional[str] = None,
+        call_site: str = "gemini.generate_text",
+    ) -> Optional[str]:
+        """
+        テキストを生成（stream_textの非ストリーミング版）
+
+        Args:
+            system: システムプロンプト
+            call_site: 呼び出し箇所（メトリクスの集計単位）
+
+        Returns:
+            Optional[str]: 生成テキスト（エラー時はNone）
         """
         if not self.is_available():
-            return {"error": "Gemini API is not available", "content": None}
+            return None
 
         try:
-            # 文字数目安を計算（1分あたり約300文字）
-            target_chars = int(target_duration / 60 * 300)
+            generation_config: Dict[str, Any] = {}
+            if max_tokens is not None:
+                generation_config["max_output_tokens"] = max_tokens
+            if temperature is not None:
+                generation_config["temperature"] = temperature
+
+            response = await self.generate_content(
+                self._with_system(prompt, system),
+                call_site,
+                generation_config=generation_config or None,
+            )
+            return response.text
+
+        except Exception as e:
+            print(f"Gemini API Error: {e}")
+            return None
+
+    async def stream_text(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        system: Optional[str] = None,
+        call_site: str = "gemini.stream_text",
+    ) -> AsyncIterator[str]:
+        """
+        テキストをストリーミング生成
+
+        Args:
+            prompt: プロンプト
+            max_tokens: 最大トークン数
+            temperature: 温度
+            system: システムプロンプト
+            call_site: 呼び出し箇所（メトリクスの集計単位）
+
+        Yields:
+            str: 生成されたテキスト断片
+        """
+        generation_config: Dict[str, Any] = {}
+        if max_tokens is not None:
+            generation_config["max_output_tokens"] = max_tokens
+        if temperature is not None:
+            generation_config["temperature"] = temperature
+
+        async with observe_llm_call(AIProvider.GEMINI.value, self.MODEL_NAME, call_site) as record:
+            response = await call_with_retries(
+                record,
+                lambda: self.model.generate_content_async(
+                    self._with_system(prompt, system),
+                    generation_config=generation_config or None,
+                    stream=True,
+                ),
+            )
+            last_chunk = None
+            async for chunk in response:
+                if getattr(chunk, "usage_metadata", None):
+                    last_chunk = chunk
+                if chunk.text:
+                    yield chunk.text
+            if last_chunk is not None:
+                record.set_usage(gemini_usage(last_chunk))
+
+    def build_script_prompt(
+        self,
+        prompt: str,
+        title: Optional[str] = None,
+        target_duration: int = 180,
+        style: str = "educational",
+        knowledge_context: Optional[str] = None,
+    ) -> str:
+        """台本生成プロンプトを構築"""
+        # 文字数目安を計算（1分あたり約300文字）
+        target_chars = int(target_duration / 60 * 300)
 
-            full_prompt = f"""あなたはYouTube動画の台本を作成するプロの脚本家です。
+        full_prompt = f"""あなたはYouTube動画の台本を作成するプロの脚本家です。
 以下の要件に従って、視聴者を惹きつける台本を作成してください。
 
 【タイトル】
@@ -640,10 +1041,10 @@ class GeminiClient:
 - 明確なポイントと具体例
 - 行動を促すエンディング
 """
-            if knowledge_context:
-                full_prompt += f"\n【参考情報（ナレッジ）】\n{knowledge_context}\n"
+        if knowledge_context:
+            full_prompt += f"\n【参考情報（ナレッジ）】\n{knowledge_context}\n"
 
-            full_prompt += """
+        full_prompt += """
 【出力形式】
 ```
 【オープニング】
@@ -656,8 +1057,54 @@ class GeminiClient:
 （締めの言葉とCTA）
 ```
 """
+        return full_prompt
+
+    async def stream_script(
+        self,
+        prompt: str,
+        title: Optional[str] = None,
+        target_duration: int = 180,
+        style: str = "educational",
+        knowledge_context: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """
+        台本をストリーミング生成（generate_scriptと同じプロンプト）
+
+        Yields:
+            str: 生成されたテキスト断片
+        """
+        full_prompt = self.build_script_prompt(prompt, title, target_duration, style, knowledge_context)
+        async for text in self.stream_text(full_prompt):
+            yield text
 
-            response = self.model.generate_content(full_prompt)
+    async def generate_script(
+        self,
+        prompt: str,
+        title: Optional[str] = None,
+        target_duration: int = 180,
+        style: str = "educational",
+        knowledge_context: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        台本を生成
+
+        Args:
+            prompt: 台本生成プロンプト
+            title: 動画タイトル
+            target_duration: 目標再生時間（秒）
+            style: 台本スタイル
+            knowledge_context: ナレッジDB からのコンテキスト
+
+        Returns:
+            Dict: 生成結果
+        """
+        if not self.is_available():
+            return {"error": "Gemini API is not available", "content": None}
+
+        try:
+            full_prompt = self.build_script_prompt(prompt, title, target_duration, style, knowledge_context)
+
+            response = await self.generate_content(full_prompt, "gemini.generate_script")
             content = response.text
             word_count = len(content)
             estimated_duration = int(word_count / 300 * 60)
@@ -719,7 +1166,7 @@ class GeminiClient:
 各タイトルを1行ずつ出力してください。番号は不要です。
 """
 
-            response = self.model.generate_content(prompt)
+            response = await self.generate_content(prompt, "gemini.generate_title")
             titles = [
                 line.strip()
                 for line in response.text.strip().split("\n")
@@ -780,7 +1227,7 @@ class GeminiClient:
 - ハッシュタグを最後に追加
 """
 
-            response = self.model.generate_content(prompt)
+            response = await self.generate_content(prompt, "gemini.generate_description")
             description = response.text
 
             # ハッシュタグを抽出
@@ -797,6 +1244,36 @@ class GeminiClient:
             print(f"Gemini API Error: {e}")
             return {"error": str(e), "description": None}
 
+    def _comment_reply_instructions(self, video_context: dict, tone: str) -> str:
+        """返信・センチメント・タグを1回で生成する指示（単体・バッチ共通）"""
+        video_title = video_context.get("title", "")
+        video_description = video_context.get("description", "")
+        categories = "、".join(COMMENT_TAG_CATEGORIES)
+
+        return f"""あなたはYouTubeチャンネルのコミュニティマネージャーです。
+視聴者のコメントについて、返信文・センチメント・タグをまとめて作成してください。
+
+【動画情報】
+タイトル: {video_title}
+説明: {video_description[:200]}...
+
+【返信のトーン】
+{tone}
+
+【返信文の要件】
+- 視聴者に感謝の気持ちを伝える
+- コメントの内容に具体的に応える
+- エンゲージメントを高める質問や提案を含める
+- 自然で人間らしい表現
+- 100文字以内
+
+【センチメント】
+positive, negative, neutral のいずれか
+
+【タグ】
+該当するカテゴリ（{categories}）を1つ以上
+"""
+
     async def generate_comment_reply(
         self,
         comment: str,
@@ -806,6 +1283,8 @@ class GeminiClient:
         """
         コメントへの返信文を生成
 
+        返信文・センチメント・タグを構造化出力の1回の呼び出しで生成し、スキーマ検証する
+
         Args:
             comment: コメント本文
             video_context: 動画のコンテキスト情報
@@ -818,71 +1297,122 @@ class GeminiClient:
             return {"error": "Gemini API is not available", "reply": None}
 
         try:
-            video_title = video_context.get("title", "")
-            video_description = video_context.get("description", "")
-
-            prompt = f"""あなたはYouTubeチャンネルのコミュニティマネージャーです。
-視聴者のコメントに対して、適切で親しみやすい返信を作成してください。
-
-【動画情報】
-タイトル: {video_title}
-説明: {video_description[:200]}...
-
+            prompt = f"""{self._comment_reply_instructions(video_context, tone)}
 【コメント】
 {comment}
 
-【返信のトーン】
-{tone}
-
-【要件】
-- 視聴者に感謝の気持ちを伝える
-- コメントの内容に具体的に応える
-- エンゲージメントを高める質問や提案を含める
-- 自然で人間らしい表現
-- 100文字以内
-
-返信文のみを出力してください。
+JSON形式（reply, sentiment, tags）で出力してください。
 """
 
-            response = self.model.generate_content(prompt)
-            reply_text = response.text.strip()
-
-            # センチメント分析用プロンプト
-            sentiment_prompt = f"""以下のコメントのセンチメントを分析してください。
-
-【コメント】
-{comment}
+            response = await self.generate_content(
+                prompt,
+                "gemini.generate_comment_reply",
+                generation_config={
+                    "response_mime_type": "application/json",
+                    "response_schema": COMMENT_REPLY_SCHEMA,
+                },
+            )
+            result = CommentReplyOutput.model_validate_json(response.text)
 
-positive, negative, neutral のいずれかで答えてください。1単語のみ出力してください。
-"""
+            return {
+                **result.model_dump(),
+                "provider": AIProvider.GEMINI.value,
+            }
 
-            sentiment_response = self.model.generate_content(sentiment_prompt)
-            sentiment = sentiment_response.text.strip().lower()
+        except Exception as e:
+            print(f"Gemini API Error: {e}")
+            return {"error": str(e), "reply": None}
 
-            # タグ抽出用プロンプト
-            tags_prompt = f"""以下のコメントから、関連するトピックやカテゴリを抽出してください。
+    async def generate_comment_replies(
+        self,
+        comments: List[str],
+        video_context: dict,
+        tone: str = "friendly",
+        batch_size: int = COMMENT_REPLY_BATCH_SIZE,
+    ) -> List[Dict[str, Any]]:
+        """
+        複数コメントへの返信文をまとめて生成（バッチ版）
 
-【コメント】
-{comment}
+        batch_size件ごとに1回の構造化出力呼び出しで処理し、バッチは並行実行する
+        バッチ応答に含まれなかった・検証に失敗したコメントは単体呼び出しで補完する
+        （同時実行数はバッチと共通。呼び出し自体が失敗したバッチ（429など）は
+        同じAPIへ単体で再送せず、エラーを返して呼び出し側のフォールバックに委ねる）
 
-カテゴリ例: 質問、感想、提案、技術的な問題、賞賛、批判、その他
+        Args:
+            comments: コメント本文のリスト
+            video_context: 動画のコンテキスト情報
+            tone: 返信のトーン
 
-該当するカテゴリをカンマ区切りで出力してください。
-"""
+        Returns:
+            List[Dict]: commentsと同じ順序の {"reply", "sentiment", "tags"}
+        """
+        if not self.is_available():
+            return [{"error": "Gemini API is not available", "reply": None} for _ in comments]
 
-            tags_response = self.model.generate_content(tags_prompt)
-            tags = [tag.strip() for tag in tags_response.text.strip().split(",")]
+        instructions = self._comment_reply_instructions(video_context, tone)
+        semaphore = asyncio.Semaphore(COMMENT_REPLY_BATCH_CONCURRENCY)
 
-            return {
-                "reply": reply_text,
-                "sentiment": sentiment if sentiment in ["positive", "negative", "neutral"] else "neutral",
-                "tags": tags,
-                "provider": AIProvider.GEMINI.value,
-            }
+        async def run_batch(offset: int, batch: List[str]) -> Optional[Dict[int, Dict[str, Any]]]:
+            numbered = "\n".join(f"[{i}] {text}" for i, text in enumerate(batch))
+            prompt = f"""{instructions}
+【コメント一覧】（[番号] コメント）
+{numbered}
 
-        except Exception as e:
-            print(f"Gemini API Error: {e}")
-            return {"error": str(e), "reply": None}
+各コメントについて index（上記の番号）, reply, sentiment, tags を results 配列にJSON形式で出力してください。
+"""
+            async with semaphore:
+                try:
+                    response = await self.generate_content(
+                        prompt,
+                        "gemini.generate_comment_replies",
+                        generation_config={
+                            "response_mime_type": "application/json",
+                            "response_schema": COMMENT_REPLY_BATCH_SCHEMA,
+                        },
+                    )
+                    items = json.loads(response.text).get("results", [])
+                except Exception as e:
+                    print(f"Gemini API Error: {e}")
+                    failed.update(dict.fromkeys(range(offset, offset + len(batch)), str(e)))
+                    return None
+
+            results: Dict[int, Dict[str, Any]] = {}
+            for item in items:
+                try:
+                    parsed = CommentReplyBatchItem.model_validate(item)
+                except ValidationError:
+                    continue
+                if 0 <= parsed.index < len(batch) and offset + parsed.index not in results:
+                    results[offset + parsed.index] = {
+                        **parsed.model_dump(exclude={"index"}),
+                        "provider": AIProvider.GEMINI.value,
+                    }
+            return results
+
+        async def run_single(index: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.generate_comment_reply(comments[index], video_context, tone)
+
+        failed: Dict[int, str] = {}
+        batches = [
+            run_batch(offset, comments[offset:offset + batch_size])
+            for offset in range(0, len(comments), batch_size)
+        ]
+        merged: Dict[int, Dict[str, Any]] = {}
+        for results in await asyncio.gather(*batches):
+            merged.update(results or {})
+
+        # 失敗したバッチのコメントは単体で再送しない
+        for i, error in failed.items():
+            merged[i] = {"error": error, "reply": None}
+
+        # バッチ応答から欠けたコメントは単体で生成
+        missing = [i for i in range(len(comments)) if i not in merged]
+        if missing:
+            singles = await asyncio.gather(*(run_single(i) for i in missing))
+            merged.update(zip(missing, singles))
+
+        return [merged[i] for i in range(len(comments))]
 
     async def generate_planning_suggestions(
         self,
@@ -934,7 +1464,7 @@ positive, negative, neutral のいずれかで答えてください。1単語の
 企画2: ...
 """
 
-            response = self.model.generate_content(prompt)
+            response = await self.generate_content(prompt, "gemini.generate_planning_suggestions")
             content = response.text
 
             # 企画を解析
@@ -1026,7 +1556,7 @@ positive, negative, neutral のいずれかで答えてください。1単語の
 改善案2: ...
 """
 
-            response = self.model.generate_content(prompt)
+            response = await self.generate_content(prompt, "gemini.suggest_improvements")
             content_text = response.text
 
             # 改善案を解析
@@ -1075,6 +1605,7 @@ positive, negative, neutral のいずれかで答えてください。1単語の
         self,
         seed_keywords: list,
         category: str,
+        bypass_cache: bool = False,
     ) -> Dict[str, Any]:
         """
         関連キーワードアイデアを生成
@@ -1082,6 +1613,7 @@ positive, negative, neutral のいずれかで答えてください。1単語の
         Args:
             seed_keywords: シードキーワードリスト
             category: カテゴリ (ビジネス、教育、エンタメ、等)
+            bypass_cache: 応答キャッシュを使わずに再生成するか
 
         Returns:
             Dict: {"keywords": list, "long_tail": list, "trending": list}
@@ -1125,8 +1657,9 @@ positive, negative, neutral のいずれかで答えてください。1単語の
 ...
 """
 
-            response = self.model.generate_content(prompt)
-            content_text = response.text
+            content_text, _ = await self._complete_cached(
+                "gemini.generate_keyword_ideas", prompt, bypass_cache
+            )
 
             # キーワードを抽出
             import re
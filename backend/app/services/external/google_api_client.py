@@ -0,0 +1,155 @@
+"""
+Google API クライアント共通基盤
+
+googleapiclient の build() はディスカバリドキュメントの取得・パースを毎回行い、
+.execute() はイベントループをブロックするため、以下を提供する
+
+- ディスカバリドキュメントのプロセス内キャッシュ（パース済みdictを再利用）
+- アクセストークン単位のサービスオブジェクト再利用（TTL付きLRU）
+- スレッドプールで .execute() を実行する非同期ラッパー
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import DISCOVERY_URI, build_from_document
+from googleapiclient.http import build_http
+
+logger = logging.getLogger(__name__)
+
+# サービスオブジェクトキャッシュの上限（アクセストークン数）
+SERVICE_CACHE_MAX_SIZE = 256
+
+# アクセストークンの有効期限（1時間）より短く保持
+SERVICE_CACHE_TTL_SECONDS = 55 * 60
+
+
+@lru_cache(maxsize=None)
+def get_discovery_document(service_name: str, version: str) -> Dict[str, Any]:
+    """
+    ディスカバリドキュメントを取得（プロセス内で1回だけパース）
+
+    ライブラリ同梱の静的ドキュメントを優先し、無い場合のみネットワークから取得する
+
+    Args:
+        service_name: API名（例: "youtubeAnalytics"）
+        version: APIバージョン（例: "v2"）
+
+    Returns:
+        Dict: パース済みディスカバリドキュメント
+    """
+    content = discovery_cache.get_static_doc(service_name, version)
+    if content is None:
+        http = build_http()
+        uri = DISCOVERY_URI.format(api=service_name, apiVersion=version)
+        _, content = http.request(uri)
+        logger.info(f"Fetched discovery document: {service_name} {version}")
+    return json.loads(content)
+
+
+class _ServiceCache:
+    """(API名, バージョン, 認証情報) -> サービスオブジェクト のTTL付きLRUキャッシュ"""
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._items: "OrderedDict[Tuple[str, str, str], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[Any]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            created_at, service = item
+            if time.monotonic() - created_at > self.ttl_seconds:
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return service
+
+    def set(self, key: Tuple[str, str, str], service: Any) -> None:
+        with self._lock:
+            self._items[key] = (time.monotonic(), service)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+_service_cache = _ServiceCache(SERVICE_CACHE_MAX_SIZE, SERVICE_CACHE_TTL_SECONDS)
+
+
+def get_service(
+    service_name: str,
+    version: str,
+    access_token: Optional[str] = None,
+    developer_key: Optional[str] = None,
+):
+    """
+    キャッシュ済みのサービスオブジェクトを取得（無ければ構築）
+
+    Args:
+        service_name: API名
+        version: APIバージョン
+        access_token: OAuthアクセストークン
+        developer_key: APIキー（access_token未指定時）
+
+    Returns:
+        Resource: googleapiclient のサービスオブジェクト
+    """
+    key = (service_name, version, access_token or f"key:{developer_key or ''}")
+    service = _service_cache.get(key)
+    if service is not None:
+        return service
+
+    document = get_discovery_document(service_name, version)
+    if access_token:
+        service = build_from_document(document, credentials=Credentials(token=access_token))
+    else:
+        service = build_from_document(document, developerKey=developer_key)
+
+    _service_cache.set(key, service)
+    return service
+
+
+def clear_service_cache() -> None:
+    """サービスオブジェクトキャッシュをクリア（トークン失効時など）"""
+    _service_cache.clear()
+
+
+def _fresh_http(request):
+    """
+    リクエストごとの新しいHTTPオブジェクトを作成
+
+    httplib2.Http はスレッドセーフではないため、共有サービスオブジェクトを
+    複数スレッドから使う場合は実行ごとにHTTPを分ける
+    """
+    credentials = getattr(request.http, "credentials", None)
+    if credentials is not None:
+        return AuthorizedHttp(credentials, http=build_http())
+    return build_http()
+
+
+async def execute_async(request) -> Dict[str, Any]:
+    """
+    googleapiclient のリクエストをスレッドプールで実行
+
+    Args:
+        request: HttpRequest（例: service.reports().query(...)）
+
+    Returns:
+        Dict: APIレスポンス
+    """
+    return await asyncio.to_thread(request.execute, http=_fresh_http(request))
@@ -0,0 +1,343 @@
+"""
+LLM呼び出しの計測
+
+全てのLLM呼び出しを共通のラッパーに通し、プロバイダー・モデル・呼び出し箇所ごとに
+以下をPrometheus（/metrics）に記録する
+
+- レイテンシ（リトライ込み）と結果（success / error / cancelled）
+- 入力・出力・キャッシュ読み込み・キャッシュ書き込みのトークン数
+- 推定コスト（USD、MODEL_PRICINGの単価で算出）
+- リトライ回数、エラー種別、応答キャッシュのヒット数
+
+HTTPリクエスト単位の集計は track_llm_usage() で行い、リクエスト終了時にログへ出力する
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, Optional, Tuple, TypeVar
+
+from prometheus_client import Counter, Histogram
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+T = TypeVar("T")
+
+LLM_REQUEST_DURATION = Histogram(
+    "llm_request_duration_seconds",
+    "LLM呼び出しのレイテンシ（リトライ込み）",
+    ["provider", "model", "call_site", "outcome"],  # outcome: success / error / cancelled
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120, 300),
+)
+LLM_TOKENS = Counter(
+    "llm_tokens",
+    "LLM呼び出しのトークン数",
+    ["provider", "model", "call_site", "kind"],  # kind: input / output / cache_read / cache_write
+)
+LLM_COST = Counter(
+    "llm_cost_usd",
+    "LLM呼び出しの推定コスト（USD）",
+    ["provider", "model", "call_site"],
+)
+LLM_RETRIES = Counter(
+    "llm_retries",
+    "LLM呼び出しのリトライ回数",
+    ["provider", "model", "call_site"],
+)
+LLM_ERRORS = Counter(
+    "llm_errors",
+    "LLM呼び出しのエラー数（リトライ後も失敗したもの）",
+    ["provider", "model", "call_site", "error_type"],
+)
+LLM_CACHE_HITS = Counter(
+    "llm_cache_hits",
+    "応答キャッシュのヒットでLLM呼び出しを省略した回数",
+    ["provider", "model", "call_site"],
+)
+
+# 100万トークンあたりの単価（USD）: (input, output, cache_read, cache_write)
+# モデル名の前方一致で解決する（長いキーを優先）
+MODEL_PRICING: Dict[str, Tuple[float, float, float, float]] = {
+    "claude-sonnet-4": (3.0, 15.0, 0.30, 3.75),
+    "claude-3-5-sonnet": (3.0, 15.0, 0.30, 3.75),
+    "claude-3-5-haiku": (0.80, 4.0, 0.08, 1.0),
+    "gemini-1.5-flash": (0.075, 0.30, 0.01875, 0.0),
+    "gemini-1.5-pro": (1.25, 5.0, 0.3125, 0.0),
+}
+
+# リトライ対象のHTTPステータス（レート制限・一時的な障害・過負荷）
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+RETRYABLE_ERROR_NAMES = {
+    "APIConnectionError",
+    "APITimeoutError",
+    "ServiceUnavailable",
+    "DeadlineExceeded",
+    "ResourceExhausted",
+    "InternalServerError",
+}
+
+
+@dataclass
+class TokenUsage:
+    """1回の呼び出しのトークン数"""
+
+    input: int = 0
+    output: int = 0
+    cache_read: int = 0
+    cache_write: int = 0
+
+
+@dataclass
+class LLMUsageSummary:
+    """リクエスト単位のLLM利用量の集計"""
+
+    calls: int = 0
+    errors: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+    cost_by_call_site: Dict[str, float] = field(default_factory=dict)
+
+    def add(self, call_site: str, usage: TokenUsage, cost: float, success: bool) -> None:
+        self.calls += 1
+        if not success:
+            self.errors += 1
+        self.input_tokens += usage.input + usage.cache_read + usage.cache_write
+        self.output_tokens += usage.output
+        self.cost_usd += cost
+        self.cost_by_call_site[call_site] = self.cost_by_call_site.get(call_site, 0.0) + cost
+
+    def format(self) -> str:
+        """ログ出力用の要約"""
+        sites = ", ".join(
+            f"{site}=${cost:.4f}"
+            for site, cost in sorted(self.cost_by_call_site.items(), key=lambda kv: -kv[1])
+        )
+        return (
+            f"calls={self.calls} errors={self.errors} "
+            f"tokens_in={self.input_tokens} tokens_out={self.output_tokens} "
+            f"cost=${self.cost_usd:.4f} [{sites}]"
+        )
+
+
+_current_usage: ContextVar[Optional[LLMUsageSummary]] = ContextVar("llm_usage_summary", default=None)
+
+
+@contextmanager
+def track_llm_usage() -> Iterator[LLMUsageSummary]:
+    """
+    このコンテキスト内（子タスクを含む）のLLM呼び出しを集計
+
+    Usage:
+        with track_llm_usage() as usage:
+            await handler()
+        logger.info(usage.format())
+    """
+    summary = LLMUsageSummary()
+    token = _current_usage.set(summary)
+    try:
+        yield summary
+    finally:
+        _current_usage.reset(token)
+
+
+def resolve_pricing(model: str) -> Optional[Tuple[float, float, float, float]]:
+    """モデル名から単価を解決（前方一致、"models/" 接頭辞は無視）"""
+    name = model.split("/")[-1]
+    for prefix in sorted(MODEL_PRICING, key=len, reverse=True):
+        if name.startswith(prefix):
+            return MODEL_PRICING[prefix]
+    return None
+
+
+def estimate_cost(model: str, usage: TokenUsage) -> float:
+    """推定コスト（USD）。単価未登録のモデルは0"""
+    pricing = resolve_pricing(model)
+    if pricing is None:
+        return 0.0
+    input_price, output_price, cache_read_price, cache_write_price = pricing
+    return (
+        usage.input * input_price
+        + usage.output * output_price
+        + usage.cache_read * cache_read_price
+        + usage.cache_write * cache_write_price
+    ) / 1_000_000
+
+
+def _token_count(source: Any, name: str) -> int:
+    """トークン数の属性を取得（未設定・数値以外は0）"""
+    value = getattr(source, name, None)
+    return value if isinstance(value, int) else 0
+
+
+def anthropic_usage(message: Any) -> TokenUsage:
+    """Anthropicのレスポンスからトークン数を取得"""
+    usage = getattr(message, "usage", None)
+    return TokenUsage(
+        input=_token_count(usage, "input_tokens"),
+        output=_token_count(usage, "output_tokens"),
+        cache_read=_token_count(usage, "cache_read_input_tokens"),
+        cache_write=_token_count(usage, "cache_creation_input_tokens"),
+    )
+
+
+def gemini_usage(response: Any) -> TokenUsage:
+    """Geminiのレスポンスからトークン数を取得"""
+    metadata = getattr(response, "usage_metadata", None)
+    prompt = _token_count(metadata, "prompt_token_count")
+    cached = _token_count(metadata, "cached_content_token_count")
+    return TokenUsage(
+        input=max(prompt - cached, 0),
+        output=_token_count(metadata, "candidates_token_count"),
+        cache_read=cached,
+    )
+
+
+def is_retryable(error: BaseException) -> bool:
+    """一時的な障害としてリトライすべきエラーか"""
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    if isinstance(status, int) and status in RETRYABLE_STATUS_CODES:
+        return True
+    return type(error).__name__ in RETRYABLE_ERROR_NAMES
+
+
+class LLMCallRecord:
+    """observe_llm_call 内で1回の呼び出しの結果を記録するオブジェクト"""
+
+    def __init__(self, provider: str, model: str, call_site: str):
+        self.provider = provider
+        self.model = model
+        self.call_site = call_site
+        self.usage = TokenUsage()
+
+    @property
+    def labels(self) -> Dict[str, str]:
+        return {"provider": self.provider, "model": self.model, "call_site": self.call_site}
+
+    def set_usage(self, usage: TokenUsage) -> None:
+        self.usage = usage
+
+    def retry(self) -> None:
+        LLM_RETRIES.labels(**self.labels).inc()
+
+
+@asynccontextmanager
+async def observe_llm_call(provider: str, model: str, call_site: str) -> AsyncIterator[LLMCallRecord]:
+    """
+    LLM呼び出しを計測（ストリーミングなど instrumented_call を使えない箇所用）
+
+    Usage:
+        async with observe_llm_call("claude", model, "claude.stream_text") as record:
+            ...
+            record.set_usage(anthropic_usage(final_message))
+    """
+    record = LLMCallRecord(provider, model, call_site)
+    started = time.monotonic()
+    outcome = "error"
+    try:
+        yield record
+        outcome = "success"
+    except (asyncio.CancelledError, GeneratorExit):
+        # 呼び出し側の中断（ストリーミングの途中終了など）はエラーとして数えない
+        outcome = "cancelled"
+        raise
+    except Exception as e:
+        LLM_ERRORS.labels(**record.labels, error_type=type(e).__name__).inc()
+        raise
+    finally:
+        _finish(record, time.monotonic() - started, outcome)
+
+
+def _finish(record: LLMCallRecord, elapsed: float, outcome: str) -> None:
+    LLM_REQUEST_DURATION.labels(**record.labels, outcome=outcome).observe(elapsed)
+
+    usage = record.usage
+    for kind, value in (
+        ("input", usage.input),
+        ("output", usage.output),
+        ("cache_read", usage.cache_read),
+        ("cache_write", usage.cache_write),
+    ):
+        if value:
+            LLM_TOKENS.labels(**record.labels, kind=kind).inc(value)
+
+    cost = estimate_cost(record.model, usage)
+    if cost:
+        LLM_COST.labels(**record.labels).inc(cost)
+
+    summary = _current_usage.get()
+    if summary is not None:
+        summary.add(record.call_site, usage, cost, outcome != "error")
+
+
+async def instrumented_call(
+    provider: str,
+    model: str,
+    call_site: str,
+    operation: Callable[[], Awaitable[T]],
+    usage: Callable[[T], TokenUsage],
+    max_retries: Optional[int] = None,
+) -> T:
+    """
+    LLM呼び出しを計測・リトライ付きで実行
+
+    一時的な障害（レート制限・過負荷・接続エラー）は指数バックオフでリトライする
+
+    Args:
+        provider: プロバイダー名（claude / gemini）
+        model: モデル名
+        call_site: 呼び出し箇所
+        operation: 呼び出し関数
+        usage: レスポンスからトークン数を取り出す関数
+        max_retries: 最大リトライ回数（省略時は設定値）
+
+    Returns:
+        T: レスポンス（リトライ後も失敗した場合は例外を送出）
+    """
+    async with observe_llm_call(provider, model, call_site) as record:
+        result = await call_with_retries(record, operation, max_retries)
+        record.set_usage(usage(result))
+        return result
+
+
+async def call_with_retries(
+    record: LLMCallRecord,
+    operation: Callable[[], Awaitable[T]],
+    max_retries: Optional[int] = None,
+) -> T:
+    """
+    一時的な障害（レート制限・過負荷・接続エラー）を指数バックオフでリトライしながら実行
+
+    ストリーミングでは最初のトークンを受け取る前の接続確立にのみ使う
+    （出力の途中で再試行すると断片が重複するため）
+
+    Args:
+        record: observe_llm_call の記録オブジェクト（リトライ回数を記録）
+        operation: 呼び出し関数
+        max_retries: 最大リトライ回数（省略時は設定値）
+    """
+    retries = settings.LLM_MAX_RETRIES if max_retries is None else max_retries
+    attempt = 0
+    while True:
+        try:
+            return await operation()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if attempt >= retries or not is_retryable(e):
+                raise
+            record.retry()
+            delay = settings.LLM_RETRY_BACKOFF_SECONDS * (2 ** attempt)
+            logger.warning(
+                f"{record.provider} call retry {attempt + 1}/{retries} ({record.call_site}): {e}"
+            )
+            attempt += 1
+            await asyncio.sleep(delay)
+
+
+def record_cache_hit(provider: str, model: str, call_site: str) -> None:
+    """応答キャッシュのヒットを記録"""
+    LLM_CACHE_HITS.labels(provider=provider, model=model, call_site=call_site).inc()
@@ -0,0 +1,166 @@
+"""
+LLM応答キャッシュ
+
+同一のプロバイダー・モデル・プロンプト・生成パラメータによる呼び出しの応答を
+Redisに保存して再利用する（完全一致のみ）
+
+- キーは (provider, model, 正規化したプロンプト, パラメータ) のSHA-256
+- TTL付きで保存し、索引（sorted set）で件数を上限以下に保つ（最終参照が古い順に削除）
+- 呼び出し箇所ごとに設定で有効化し、呼び出し単位で読み込みをバイパスできる
+- ヒット/ミスはPrometheusカウンターに記録
+"""
+import hashlib
+import json
+import logging
+import re
+import time
+from typing import Any, Dict, Optional
+
+import redis.asyncio as redis
+from prometheus_client import Counter
+
+from app.core.cache import get_redis
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+INDEX_KEY = "cs:llm:index"
+KEY_PREFIX = "cs:llm:resp:"
+
+LLM_CACHE_REQUESTS = Counter(
+    "llm_response_cache_requests",
+    "LLM応答キャッシュの参照回数",
+    ["call_site", "result"],  # result: hit / miss / bypass
+)
+
+
+def normalize_prompt(prompt: str) -> str:
+    """改行コードと行末・前後の空白の差を吸収"""
+    lines = prompt.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(line.rstrip() for line in lines)).strip()
+
+
+def make_cache_key(
+    provider: str,
+    model: str,
+    prompt: str,
+    params: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    キャッシュキーを生成
+
+    Args:
+        provider: プロバイダー（claude/gemini）
+        model: モデル名
+        prompt: プロンプト
+        params: 生成パラメータ（max_tokens, temperature など）
+
+    Returns:
+        str: キャッシュキー
+    """
+    payload = json.dumps(
+        {
+            "provider": provider,
+            "model": model,
+            "prompt": normalize_prompt(prompt),
+            "params": params or {},
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+        default=str,
+    )
+    return KEY_PREFIX + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    LLM応答キャッシュ
+
+    Usage:
+        key = make_cache_key("claude", model, prompt, {"max_tokens": 1024})
+        text = await llm_response_cache.get(key, "claude.generate_title")
+        if text is None:
+            text = await call_api(...)
+            await llm_response_cache.set(key, "claude.generate_title", text)
+    """
+
+    def is_enabled(self, call_site: str) -> bool:
+        """呼び出し箇所でキャッシュが有効か"""
+        return (
+            settings.LLM_RESPONSE_CACHE_ENABLED
+            and call_site in settings.llm_response_cache_call_sites
+        )
+
+    async def get(self, key: str, call_site: str, bypass: bool = False) -> Optional[str]:
+        """
+        キャッシュ済みの応答を取得
+
+        Args:
+            key: キャッシュキー
+            call_site: 呼び出し箇所（例: "claude.generate_title"）
+            bypass: Trueの場合は読み込まずに再生成させる（結果は set で上書き）
+
+        Returns:
+            Optional[str]: 応答テキスト（未キャッシュ・無効時はNone）
+        """
+        if not self.is_enabled(call_site):
+            return None
+        if bypass:
+            LLM_CACHE_REQUESTS.labels(call_site=call_site, result="bypass").inc()
+            return None
+
+        try:
+            client = await get_redis()
+            value = await client.get(key)
+            if value is not None:
+                # 最終参照時刻を更新（上限超過時の削除順に使用）
+                await client.zadd(INDEX_KEY, {key: time.time()})
+        except redis.RedisError as e:
+            logger.warning(f"LLM response cache get failed: {e}")
+            value = None
+
+        LLM_CACHE_REQUESTS.labels(
+            call_site=call_site, result="hit" if value is not None else "miss"
+        ).inc()
+        return value
+
+    async def set(self, key: str, call_site: str, value: str) -> None:
+        """
+        応答を保存し、上限を超えた分を最終参照が古い順に削除
+
+        Args:
+            key: キャッシュキー
+            call_site: 呼び出し箇所
+            value: 応答テキスト
+        """
+        if not self.is_enabled(call_site) or not value:
+            return
+
+        try:
+            client = await get_redis()
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.setex(key, settings.LLM_RESPONSE_CACHE_TTL_SECONDS, value)
+                pipe.zadd(INDEX_KEY, {key: time.time()})
+                pipe.zcard(INDEX_KEY)
+                results = await pipe.execute()
+
+            overflow = results[-1] - settings.LLM_RESPONSE_CACHE_MAX_ENTRIES
+            if overflow > 0:
+                evicted = await client.zpopmin(INDEX_KEY, overflow)
+                if evicted:
+                    await client.delete(*[member for member, _ in evicted])
+        except redis.RedisError as e:
+            logger.warning(f"LLM response cache set failed: {e}")
+
+    async def invalidate(self, key: str) -> None:
+        """応答を削除（パースできない応答を保存してしまった場合など）"""
+        try:
+            client = await get_redis()
+            await client.delete(key)
+            await client.zrem(INDEX_KEY, key)
+        except redis.RedisError as e:
+            logger.warning(f"LLM response cache invalidate failed: {e}")
+
+
+# シングルトンインスタンス
+llm_response_cache = LLMResponseCache()
@@ -0,0 +1,59 @@
+"""
+プロバイダー側プロンプトキャッシュ
+
+呼び出しごとに変わらない大きなシステムプロンプト（RAG抽出、専門家レビュー、台本生成）を
+プロバイダー側でキャッシュさせ、入力トークンの再処理を省く
+
+- Anthropic: システムプロンプトに cache_control（ephemeral）を付与
+  （約5分のTTL内に同じプレフィックスで呼ばれると cache_read として課金・処理される）
+- Gemini: 使用中のモデル（gemini-1.5-flash）の CachedContent は最小32,768トークンで、
+  現在のシステムプロンプトはいずれも届かないためキャッシュしない（システムプロンプトは本文の前に連結）
+- キャッシュ読み込み・書き込み・非キャッシュの入力トークン数をPrometheusに記録
+"""
+import logging
+from typing import Any, Dict, List
+
+from prometheus_client import Counter
+
+logger = logging.getLogger(__name__)
+
+PROMPT_CACHE_TOKENS = Counter(
+    "llm_prompt_cache_tokens",
+    "プロンプトキャッシュの入力トークン数",
+    ["provider", "call_site", "kind"],  # kind: cache_read / cache_write / uncached
+)
+
+
+def cacheable_system(system: str) -> List[Dict[str, Any]]:
+    """Anthropicのシステムプロンプトをキャッシュ対象のブロックに変換"""
+    return [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+
+
+def record_anthropic_usage(call_site: str, usage: Any) -> Dict[str, int]:
+    """
+    Anthropicのusageからキャッシュトークン数を記録
+
+    Args:
+        call_site: 呼び出し箇所
+        usage: レスポンスの usage
+
+    Returns:
+        Dict: {"cache_read", "cache_write", "uncached"} のトークン数
+    """
+    counts = {
+        "cache_read": getattr(usage, "cache_read_input_tokens", None) or 0,
+        "cache_write": getattr(usage, "cache_creation_input_tokens", None) or 0,
+        "uncached": getattr(usage, "input_tokens", None) or 0,
+    }
+    _record("claude", call_site, counts)
+    return counts
+
+
+def _record(provider: str, call_site: str, counts: Dict[str, int]) -> None:
+    for kind, value in counts.items():
+        if value:
+            PROMPT_CACHE_TOKENS.labels(provider=provider, call_site=call_site, kind=kind).inc(value)
+    logger.debug(
+        f"Prompt cache usage ({provider}/{call_site}): "
+        f"read={counts['cache_read']} write={counts['cache_write']} uncached={counts['uncached']}"
+    )
@@ -0,0 +1,342 @@
+"""
+AIプロバイダールーター
+
+Claude / Gemini の呼び分けを一箇所にまとめ、障害時のテールレイテンシを抑える
+
+- プロバイダーごとのサーキットブレーカー（直近のエラー率・低速呼び出し率で遮断）
+- ヘッジ: 優先プロバイダーが p95 レイテンシ以内に応答しなければ次点を並行起動し、
+  先に有効な応答を返した方を採用
+- 呼び出し箇所ごとの設定（優先順・ヘッジ有無・タイムアウト）は ROUTE_POLICIES に集約
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+
+from prometheus_client import Counter
+
+logger = logging.getLogger(__name__)
+T = TypeVar("T")
+
+ROUTER_CALLS = Counter(
+    "llm_router_calls",
+    "プロバイダールーター経由の呼び出し結果",
+    ["call_site", "provider", "outcome"],  # outcome: success / error / timeout / rejected / cancelled
+)
+ROUTER_SKIPPED = Counter(
+    "llm_router_circuit_skips",
+    "サーキットブレーカーが開いていたためスキップした回数",
+    ["call_site", "provider"],
+)
+ROUTER_HEDGES = Counter(
+    "llm_router_hedges",
+    "ヘッジ（次点プロバイダーの並行起動）の回数",
+    ["call_site"],
+)
+
+
+@dataclass(frozen=True)
+class RoutePolicy:
+    """呼び出し箇所ごとのルーティング設定"""
+
+    providers: Tuple[str, ...] = ("claude", "gemini")  # 優先順
+    hedge: bool = False
+    timeout_seconds: float = 60.0
+
+
+# 呼び出し箇所ごとの設定（ここが唯一の設定箇所）
+ROUTE_POLICIES: Dict[str, RoutePolicy] = {
+    "knowledge.chat": RoutePolicy(hedge=True, timeout_seconds=30.0),
+    "metadata.title": RoutePolicy(hedge=True, timeout_seconds=30.0),
+    "metadata.description": RoutePolicy(hedge=True, timeout_seconds=45.0),
+    "dna.extract": RoutePolicy(hedge=False, timeout_seconds=90.0),
+}
+
+DEFAULT_POLICY = RoutePolicy()
+
+
+class CircuitBreaker:
+    """
+    プロバイダー単位のサーキットブレーカー
+
+    - closed: 通常。直近ウィンドウの失敗率（エラー・タイムアウト・低速呼び出し）が閾値以上で open
+    - open: クールダウン中は呼び出さない
+    - half_open: クールダウン後に1件だけ試行し、成功で closed、失敗で再び open
+    """
+
+    WINDOW_SECONDS = 60.0
+    WINDOW_SIZE = 50
+    MIN_CALLS = 5
+    FAILURE_RATE_THRESHOLD = 0.5
+    SLOW_CALL_SECONDS = 20.0
+    COOLDOWN_SECONDS = 30.0
+
+    # ヘッジ遅延の算出に使う成功時レイテンシのサンプル数
+    LATENCY_SAMPLES = 100
+    DEFAULT_HEDGE_DELAY_SECONDS = 5.0
+    MIN_HEDGE_DELAY_SECONDS = 0.5
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = "closed"
+        self._outcomes: Deque[Tuple[float, bool]] = deque(maxlen=self.WINDOW_SIZE)
+        self._latencies: Deque[float] = deque(maxlen=self.LATENCY_SAMPLES)
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        """呼び出してよいか（half_open では試行を1件に限定）"""
+        if self.state == "closed":
+            return True
+        if self.state == "open":
+            if time.monotonic() - self._opened_at < self.COOLDOWN_SECONDS:
+                return False
+            self.state = "half_open"
+            self._probe_in_flight = False
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record(self, success: bool, latency: float) -> None:
+        """
+        呼び出し結果を記録
+
+        open 中に完了した呼び出し（遮断前に開始したもの）はクールダウンを延長しない
+        """
+        ok = success and latency < self.SLOW_CALL_SECONDS
+        if success:
+            self._latencies.append(latency)
+
+        if self.state == "open":
+            return
+        if self.state == "half_open":
+            self._probe_in_flight = False
+            if ok:
+                self.state = "closed"
+                self._outcomes.clear()
+            else:
+                self._open()
+            return
+
+        now = time.monotonic()
+        self._outcomes.append((now, ok))
+        recent = [o for t, o in self._outcomes if now - t <= self.WINDOW_SECONDS]
+        if len(recent) >= self.MIN_CALLS:
+            failure_rate = recent.count(False) / len(recent)
+            if failure_rate >= self.FAILURE_RATE_THRESHOLD:
+                self._open()
+
+    def release(self) -> None:
+        """結果を記録せずに試行枠を返却（キャンセル時）"""
+        if self.state == "half_open":
+            self._probe_in_flight = False
+
+    def _open(self) -> None:
+        if self.state == "open":
+            return
+        logger.warning(f"Circuit breaker opened for provider '{self.name}'")
+        self.state = "open"
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+
+    def hedge_delay(self, timeout_seconds: float) -> float:
+        """ヘッジまでの待ち時間（成功時レイテンシのp95）"""
+        if len(self._latencies) < self.MIN_CALLS:
+            delay = self.DEFAULT_HEDGE_DELAY_SECONDS
+        else:
+            ordered = sorted(self._latencies)
+            delay = ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+        return min(max(delay, self.MIN_HEDGE_DELAY_SECONDS), timeout_seconds)
+
+
+def _is_accepted(result: Any) -> bool:
+    """有効な応答か（None・空・エラー辞書は無効）"""
+    if not result:
+        return False
+    if isinstance(result, dict) and result.get("error"):
+        return False
+    return True
+
+
+def _is_client_error(result: Any) -> bool:
+    """
+    クライアントが例外を握りつぶして返したエラー結果か
+
+    各クライアントはAPIエラー時に None または {"error": ...} を返すため、
+    有効だが条件を満たさない応答（rejected）と区別して error として記録する
+    """
+    return result is None or (isinstance(result, dict) and bool(result.get("error")))
+
+
+class ProviderRouter:
+    """
+    プロバイダールーター
+
+    Usage:
+        result = await provider_router.call(
+            "metadata.title",
+            {
+                "claude": lambda: claude_client.generate_title(...),
+                "gemini": lambda: gemini_client.generate_title(...),
+            },
+            accept=lambda r: bool(r.get("titles")),
+        )
+        if result is None:
+            ...  # 全プロバイダー失敗時のフォールバック
+    """
+
+    def __init__(self):
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        if provider not in self.breakers:
+            self.breakers[provider] = CircuitBreaker(provider)
+        return self.breakers[provider]
+
+    async def call(
+        self,
+        call_site: str,
+        operations: Dict[str, Callable[[], Awaitable[T]]],
+        accept: Callable[[T], bool] = _is_accepted,
+    ) -> Optional[T]:
+        """
+        呼び出し箇所の設定に従ってプロバイダーを呼び出す
+
+        Args:
+            call_site: 呼び出し箇所（ROUTE_POLICIES のキー）
+            operations: プロバイダー名 -> 呼び出し関数（利用可能なプロバイダーのみ渡す）
+            accept: 応答が有効かの判定
+
+        Returns:
+            Optional[T]: 最初に得られた有効な応答（全て失敗した場合はNone）
+        """
+        policy = ROUTE_POLICIES.get(call_site, DEFAULT_POLICY)
+        candidates = []
+        for provider in policy.providers:
+            if provider not in operations:
+                continue
+            if self.breaker(provider).allow():
+                candidates.append(provider)
+            else:
+                ROUTER_SKIPPED.labels(call_site=call_site, provider=provider).inc()
+
+        if not candidates:
+            return None
+        if policy.hedge and len(candidates) > 1:
+            return await self._call_hedged(call_site, policy, candidates, operations, accept)
+        return await self._call_sequential(call_site, policy, candidates, operations, accept)
+
+    async def _call_sequential(
+        self,
+        call_site: str,
+        policy: RoutePolicy,
+        candidates: List[str],
+        operations: Dict[str, Callable[[], Awaitable[T]]],
+        accept: Callable[[T], bool],
+    ) -> Optional[T]:
+        for index, provider in enumerate(candidates):
+            ok, result = await self._attempt(call_site, policy, provider, operations[provider], accept)
+            if ok:
+                self._release(candidates[index + 1:])
+                return result
+        return None
+
+    async def _call_hedged(
+        self,
+        call_site: str,
+        policy: RoutePolicy,
+        candidates: List[str],
+        operations: Dict[str, Callable[[], Awaitable[T]]],
+        accept: Callable[[T], bool],
+    ) -> Optional[T]:
+        pending: Dict[asyncio.Task, str] = {}
+        queue = list(candidates)
+
+        def launch() -> None:
+            provider = queue.pop(0)
+            task = asyncio.create_task(
+                self._attempt(call_site, policy, provider, operations[provider], accept)
+            )
+            pending[task] = provider
+
+        launch()
+        try:
+            while pending:
+                # 次点が残っていれば、先行プロバイダーのp95までで打ち切って次点を起動
+                timeout = None
+                if queue:
+                    leader = next(iter(pending.values()))
+                    timeout = self.breaker(leader).hedge_delay(policy.timeout_seconds)
+
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    ROUTER_HEDGES.labels(call_site=call_site).inc()
+                    launch()
+                    continue
+
+                for task in done:
+                    pending.pop(task)
+                    ok, result = task.result()
+                    if ok:
+                        return result
+                # 失敗した場合は待たずに次点を起動
+                if queue and not pending:
+                    launch()
+            return None
+        finally:
+            for task, provider in pending.items():
+                task.cancel()
+                self.breaker(provider).release()
+                ROUTER_CALLS.labels(call_site=call_site, provider=provider, outcome="cancelled").inc()
+            self._release(queue)
+
+    def _release(self, providers: List[str]) -> None:
+        """allow() 済みで呼び出さなかったプロバイダーの試行枠を返却"""
+        for provider in providers:
+            self.breaker(provider).release()
+
+    async def _attempt(
+        self,
+        call_site: str,
+        policy: RoutePolicy,
+        provider: str,
+        operation: Callable[[], Awaitable[T]],
+        accept: Callable[[T], bool],
+    ) -> Tuple[bool, Optional[T]]:
+        """1プロバイダーを呼び出し、結果をブレーカーとメトリクスに記録"""
+        breaker = self.breaker(provider)
+        started = time.monotonic()
+        try:
+            result = await asyncio.wait_for(operation(), policy.timeout_seconds)
+        except asyncio.TimeoutError:
+            breaker.record(False, time.monotonic() - started)
+            ROUTER_CALLS.labels(call_site=call_site, provider=provider, outcome="timeout").inc()
+            logger.warning(f"{provider} timed out after {policy.timeout_seconds}s ({call_site})")
+            return False, None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            breaker.record(False, time.monotonic() - started)
+            ROUTER_CALLS.labels(call_site=call_site, provider=provider, outcome="error").inc()
+            logger.warning(f"{provider} failed ({call_site}): {e}")
+            return False, None
+
+        latency = time.monotonic() - started
+        if _is_client_error(result) or not accept(result):
+            breaker.record(False, latency)
+            outcome = "error" if _is_client_error(result) else "rejected"
+            ROUTER_CALLS.labels(call_site=call_site, provider=provider, outcome=outcome).inc()
+            return False, None
+
+        breaker.record(True, latency)
+        ROUTER_CALLS.labels(call_site=call_site, provider=provider, outcome="success").inc()
+        return True, result
+
+
+# シングルトンインスタンス
+provider_router = ProviderRouter()
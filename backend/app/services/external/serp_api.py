@@ -2,12 +2,14 @@
 SerpAPI クライアント
 
 Google検索トレンド、ニュース検索を提供
+（同時実行数の制限・同一リクエストの合流・TTLキャッシュは serp_upstream で行う）
 """
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 import httpx
 
 from app.core.config import settings
+from app.services.external.upstream import serp_upstream
 
 
 class SerpAPIClient:
@@ -51,6 +53,14 @@ class SerpAPIClient:
         if not self.is_available():
             return []
 
+        return await serp_upstream.call(
+            "google_trends",
+            {"q": query, "location": location, "language": language},
+            lambda: self._search_google_trends(query),
+        )
+
+    async def _search_google_trends(self, query: str) -> List[Dict[str, Any]]:
+        """Google Trendsの関連キーワードを取得（上流呼び出し）"""
         try:
             params = {
                 "engine": "google_trends",
@@ -113,6 +123,20 @@ class SerpAPIClient:
         if not self.is_available():
             return []
 
+        return await serp_upstream.call(
+            "google",
+            {"q": query, "num": num_results, "location": location, "language": language},
+            lambda: self._search_google(query, num_results, location, language),
+        )
+
+    async def _search_google(
+        self,
+        query: str,
+        num_results: int,
+        location: str,
+        language: str,
+    ) -> List[Dict[str, Any]]:
+        """Google検索（上流呼び出し）"""
         try:
             params = {
                 "engine": "google",
@@ -165,6 +189,19 @@ class SerpAPIClient:
         if not self.is_available():
             return []
 
+        return await serp_upstream.call(
+            "google_news",
+            {"q": query, "topic": topic, "num": num_results},
+            lambda: self._search_google_news(query, topic, num_results),
+        )
+
+    async def _search_google_news(
+        self,
+        query: Optional[str],
+        topic: Optional[str],
+        num_results: int,
+    ) -> List[Dict[str, Any]]:
+        """Googleニュース検索（上流呼び出し）"""
         try:
             params = {
                 "engine": "google_news",
@@ -219,6 +256,14 @@ class SerpAPIClient:
         if not self.is_available():
             return []
 
+        return await serp_upstream.call(
+            "youtube",
+            {"q": query, "num": num_results},
+            lambda: self._get_youtube_search(query, num_results),
+        )
+
+    async def _get_youtube_search(self, query: str, num_results: int) -> List[Dict[str, Any]]:
+        """YouTube検索（上流呼び出し）"""
         try:
             params = {
                 "engine": "youtube",
@@ -0,0 +1,136 @@
+"""
+外部API呼び出しの共通制御
+
+リサーチ系の外部API（YouTube Data API・SerpAPI）への呼び出しを束ねる
+
+- API単位の同時実行数の上限（並行ファンアウト時もクォータ・レート制限を超えない）
+- 同一リクエストの合流: 同じパラメータの呼び出しが実行中なら、上流への呼び出しを共有する
+- TTLキャッシュ: 空でない結果をRedisに保持し、期限内は上流を呼ばない
+"""
+import asyncio
+import hashlib
+import json
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Tuple, TypeVar
+
+from prometheus_client import Counter
+
+from app.core.cache import cache
+from app.core.config import settings
+
+T = TypeVar("T")
+
+# (同時実行数のセマフォ, キャッシュキー -> 実行中の呼び出し)
+_LoopState = Tuple[asyncio.Semaphore, Dict[str, asyncio.Task]]
+
+UPSTREAM_REQUESTS = Counter(
+    "upstream_api_requests",
+    "外部API呼び出しの処理結果",
+    ["api", "operation", "result"],  # result: hit / coalesced / miss
+)
+
+
+def _has_results(result: Any) -> bool:
+    """キャッシュしてよい結果か（エラー時の空リスト・空辞書は保持しない）"""
+    return bool(result)
+
+
+class UpstreamAPI:
+    """
+    外部API1つ分の呼び出し制御
+
+    Usage:
+        return await serp_upstream.call(
+            "google_trends",
+            {"q": query},
+            lambda: self._search_google_trends(query),
+        )
+    """
+
+    def __init__(self, name: str, max_concurrency: int, ttl_seconds: int):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.ttl_seconds = ttl_seconds
+        # Celeryタスクは実行ごとにイベントループを作るため、セマフォと実行中の呼び出しはループ単位で持つ
+        self._loop_state: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._loop_state.get(loop)
+        if state is None:
+            state = (asyncio.Semaphore(self.max_concurrency), {})
+            self._loop_state[loop] = state
+        return state
+
+    def cache_key(self, operation: str, params: Dict[str, Any]) -> str:
+        """操作名とパラメータからキャッシュキーを生成"""
+        payload = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+        return f"upstream:{self.name}:{operation}:{digest}"
+
+    async def call(
+        self,
+        operation: str,
+        params: Dict[str, Any],
+        fetch: Callable[[], Awaitable[T]],
+        cacheable: Callable[[T], bool] = _has_results,
+    ) -> T:
+        """
+        キャッシュ・合流・同時実行数制限を通して外部APIを呼び出す
+
+        Args:
+            operation: 操作名（キャッシュキー・メトリクスの単位）
+            params: 結果を決めるパラメータ（APIキーは含めない）
+            fetch: 上流を呼び出す関数
+            cacheable: 結果をキャッシュしてよいかの判定
+
+        Returns:
+            T: 呼び出し結果
+        """
+        key = self.cache_key(operation, params)
+
+        cached = await cache.get(key)
+        if cached is not None:
+            UPSTREAM_REQUESTS.labels(api=self.name, operation=operation, result="hit").inc()
+            return cached
+
+        semaphore, inflight = self._state()
+        task = inflight.get(key)
+        if task is not None:
+            UPSTREAM_REQUESTS.labels(api=self.name, operation=operation, result="coalesced").inc()
+        else:
+            UPSTREAM_REQUESTS.labels(api=self.name, operation=operation, result="miss").inc()
+            task = asyncio.ensure_future(self._fetch(key, semaphore, fetch, cacheable))
+            inflight[key] = task
+            task.add_done_callback(lambda _: inflight.pop(key, None))
+
+        # 呼び出し元の1つがキャンセルされても、合流している他の呼び出しは継続させる
+        return await asyncio.shield(task)
+
+    async def _fetch(
+        self,
+        key: str,
+        semaphore: asyncio.Semaphore,
+        fetch: Callable[[], Awaitable[T]],
+        cacheable: Callable[[T], bool],
+    ) -> T:
+        async with semaphore:
+            result = await fetch()
+        if cacheable(result):
+            await cache.set(key, result, self.ttl_seconds)
+        return result
+
+
+# シングルトンインスタンス
+youtube_upstream = UpstreamAPI(
+    "youtube",
+    settings.YOUTUBE_API_MAX_CONCURRENCY,
+    settings.RESEARCH_CACHE_TTL_SECONDS,
+)
+serp_upstream = UpstreamAPI(
+    "serpapi",
+    settings.SERP_API_MAX_CONCURRENCY,
+    settings.RESEARCH_CACHE_TTL_SECONDS,
+)
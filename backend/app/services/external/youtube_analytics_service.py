@@ -5,14 +5,15 @@ YouTube Analytics API連携サービス
 - チャンネル分析データ取得
 - 動画パフォーマンスデータ取得
 - リテンション曲線データ取得
+- ダッシュボード用データの並列一括取得
 """
+import asyncio
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
 from app.core.config import settings
+from app.services.external.google_api_client import get_service, execute_async
 
 
 class YouTubeAnalyticsService:
@@ -25,7 +26,10 @@ class YouTubeAnalyticsService:
 
     def _build_client(self, access_token: str):
         """
-        YouTube Analytics APIクライアントを構築
+        YouTube Analytics APIクライアントを取得
+
+        ディスカバリドキュメントはプロセス内でキャッシュされ、
+        同じアクセストークンのクライアントは再利用される
 
         Args:
             access_token: アクセストークン
@@ -33,8 +37,7 @@ class YouTubeAnalyticsService:
         Returns:
             Resource: YouTube Analytics APIクライアント
         """
-        credentials = Credentials(token=access_token)
-        return build("youtubeAnalytics", "v2", credentials=credentials)
+        return get_service("youtubeAnalytics", "v2", access_token=access_token)
 
     async def get_channel_analytics(
         self,
@@ -74,14 +77,14 @@ class YouTubeAnalyticsService:
             analytics = self._build_client(access_token)
 
             # チャンネル分析データを取得
-            response = analytics.reports().query(
+            response = await execute_async(analytics.reports().query(
                 ids=f"channel=={channel_id}",
                 startDate=start_date,
                 endDate=end_date,
                 metrics=",".join(metrics),
                 dimensions="day",
                 sort="day",
-            ).execute()
+            ))
 
             # レスポンスを整形
             column_headers = [header["name"] for header in response.get("columnHeaders", [])]
@@ -135,7 +138,7 @@ class YouTubeAnalyticsService:
             analytics = self._build_client(access_token)
 
             # 動画分析データを取得
-            response = analytics.reports().query(
+            response = await execute_async(analytics.reports().query(
                 ids="channel==MINE",
                 startDate=start_date,
                 endDate=end_date,
@@ -143,7 +146,7 @@ class YouTubeAnalyticsService:
                 dimensions="day",
                 filters=f"video=={video_id}",
                 sort="day",
-            ).execute()
+            ))
 
             # レスポンスを整形
             column_headers = [header["name"] for header in response.get("columnHeaders", [])]
@@ -187,7 +190,7 @@ class YouTubeAnalyticsService:
             analytics = self._build_client(access_token)
 
             # リテンション曲線データを取得
-            response = analytics.reports().query(
+            response = await execute_async(analytics.reports().query(
                 ids="channel==MINE",
                 startDate="2024-01-01",
                 endDate=datetime.now().strftime("%Y-%m-%d"),
@@ -195,7 +198,7 @@ class YouTubeAnalyticsService:
                 dimensions="elapsedVideoTimeRatio",
                 filters=f"video=={video_id}",
                 sort="elapsedVideoTimeRatio",
-            ).execute()
+            ))
 
             # レスポンスを整形
             column_headers = [header["name"] for header in response.get("columnHeaders", [])]
@@ -241,14 +244,14 @@ class YouTubeAnalyticsService:
             analytics = self._build_client(access_token)
 
             # トラフィックソース分析
-            response = analytics.reports().query(
+            response = await execute_async(analytics.reports().query(
                 ids=f"channel=={channel_id}",
                 startDate=start_date,
                 endDate=end_date,
                 metrics="views,estimatedMinutesWatched",
                 dimensions="insightTrafficSourceType",
                 sort="-views",
-            ).execute()
+            ))
 
             # レスポンスを整形
             column_headers = [header["name"] for header in response.get("columnHeaders", [])]
@@ -296,14 +299,14 @@ class YouTubeAnalyticsService:
             analytics = self._build_client(access_token)
 
             # 性別・年齢層別の分析
-            response = analytics.reports().query(
+            response = await execute_async(analytics.reports().query(
                 ids=f"channel=={channel_id}",
                 startDate=start_date,
                 endDate=end_date,
                 metrics="viewerPercentage",
                 dimensions="ageGroup,gender",
                 sort="-viewerPercentage",
-            ).execute()
+            ))
 
             # レスポンスを整形
             column_headers = [header["name"] for header in response.get("columnHeaders", [])]
@@ -353,7 +356,7 @@ class YouTubeAnalyticsService:
             analytics = self._build_client(access_token)
 
             # 人気動画取得
-            response = analytics.reports().query(
+            response = await execute_async(analytics.reports().query(
                 ids=f"channel=={channel_id}",
                 startDate=start_date,
                 endDate=end_date,
@@ -361,7 +364,7 @@ class YouTubeAnalyticsService:
                 dimensions="video",
                 sort="-views",
                 maxResults=max_results,
-            ).execute()
+            ))
 
             # レスポンスを整形
             column_headers = [header["name"] for header in response.get("columnHeaders", [])]
@@ -381,6 +384,74 @@ class YouTubeAnalyticsService:
             print(f"Unexpected error: {e}")
             return None
 
+    async def get_channel_dashboard(
+        self,
+        access_token: str,
+        channel_id: str,
+        start_date: str,
+        end_date: str,
+        retention_video_id: Optional[str] = None,
+        max_top_videos: int = 10,
+    ) -> Dict[str, Any]:
+        """
+        チャンネルダッシュボード用データを並列一括取得
+
+        分析・トラフィックソース・視聴者属性・人気動画・リテンションを同時に取得する
+        （クライアントは1回だけ構築され、各レポートはスレッドプールで並列実行）
+
+        Args:
+            access_token: アクセストークン
+            channel_id: チャンネルID
+            start_date: 開始日（YYYY-MM-DD）
+            end_date: 終了日（YYYY-MM-DD）
+            retention_video_id: リテンション取得対象の動画ID（未指定の場合は人気1位の動画）
+            max_top_videos: 人気動画の最大取得件数
+
+        Returns:
+            Dict: analytics, traffic_sources, demographics, top_videos, retention
+        """
+        # クライアントを先に構築してキャッシュに載せる（各タスクで再利用）
+        self._build_client(access_token)
+
+        async def top_videos_and_retention():
+            # リテンションは動画単位のため、未指定の場合は人気1位の動画で取得
+            # （人気動画の取得を待つのはこのタスクだけで、他のレポートとは並列に進む）
+            top_videos = await self.get_top_videos(
+                access_token, channel_id, start_date, end_date, max_top_videos
+            )
+            if not top_videos:
+                return top_videos, None
+            return top_videos, await self.get_audience_retention(
+                access_token, top_videos[0].get("video")
+            )
+
+        top_task = (
+            asyncio.gather(
+                self.get_top_videos(access_token, channel_id, start_date, end_date, max_top_videos),
+                self.get_audience_retention(access_token, retention_video_id),
+            )
+            if retention_video_id
+            else top_videos_and_retention()
+        )
+
+        analytics, traffic_sources, demographics, (top_videos, retention) = await asyncio.gather(
+            self.get_channel_analytics(access_token, channel_id, start_date, end_date),
+            self.get_traffic_sources(access_token, channel_id, start_date, end_date),
+            self.get_demographics(access_token, channel_id, start_date, end_date),
+            top_task,
+        )
+
+        return {
+            "channel_id": channel_id,
+            "start_date": start_date,
+            "end_date": end_date,
+            "analytics": analytics,
+            "traffic_sources": traffic_sources,
+            "demographics": demographics,
+            "top_videos": top_videos,
+            "retention": retention,
+        }
+
 
 # シングルトンインスタンス
 youtube_analytics_service = YouTubeAnalyticsService()
@@ -2,13 +2,36 @@
 YouTube Data API v3 クライアント
 
 YouTube Data API v3を使用した競合調査・人気動画取得機能
+
+googleapiclient の execute() は同期I/Oのため、スレッドで実行してイベントループを塞がない
+（httplib2.Http はスレッドセーフでないため、スレッドごとに別インスタンスを使う）
+検索系の呼び出しは youtube_upstream を通し、同時実行数の制限・合流・TTLキャッシュを行う
 """
+import asyncio
+import threading
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator
+
+import httplib2
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
 from app.core.config import settings
+from app.services.external.upstream import youtube_upstream
+
+# videos.list の id パラメータに指定できる最大件数
+VIDEOS_LIST_MAX_IDS = 50
+
+_thread_local = threading.local()
+
+
+def _thread_http() -> httplib2.Http:
+    """実行スレッド専用のHTTPクライアント"""
+    http = getattr(_thread_local, "http", None)
+    if http is None:
+        http = httplib2.Http(timeout=30)
+        _thread_local.http = http
+    return http
 
 
 class YouTubeAPIClient:
@@ -30,6 +53,11 @@ class YouTubeAPIClient:
         """APIが利用可能かどうか"""
         return bool(self.api_key)
 
+    @staticmethod
+    async def _execute(request: Any) -> Dict[str, Any]:
+        """APIリクエストをスレッドで実行"""
+        return await asyncio.to_thread(lambda: request.execute(http=_thread_http()))
+
     async def search_channels(
         self,
         query: str,
@@ -48,15 +76,23 @@ class YouTubeAPIClient:
         if not self.is_available():
             return []
 
+        return await youtube_upstream.call(
+            "search_channels",
+            {"q": query, "max_results": max_results},
+            lambda: self._search_channels(query, max_results),
+        )
+
+    async def _search_channels(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        """チャンネル検索（上流呼び出し）"""
         try:
             # チャンネル検索
-            search_response = self.client.search().list(
+            search_response = await self._execute(self.client.search().list(
                 q=query,
                 part="snippet",
                 type="channel",
                 maxResults=max_results,
                 order="relevance",
-            ).execute()
+            ))
 
             channel_ids = [
                 item["snippet"]["channelId"]
@@ -67,10 +103,10 @@ class YouTubeAPIClient:
                 return []
 
             # チャンネル詳細情報取得
-            channels_response = self.client.channels().list(
+            channels_response = await self._execute(self.client.channels().list(
                 part="snippet,statistics,contentDetails",
                 id=",".join(channel_ids),
-            ).execute()
+            ))
 
             results = []
             for channel in channels_response.get("items", []):
@@ -115,15 +151,23 @@ class YouTubeAPIClient:
         if not self.is_available():
             return []
 
+        return await youtube_upstream.call(
+            "channel_videos",
+            {"channel_id": channel_id, "max_results": max_results},
+            lambda: self._get_channel_videos(channel_id, max_results),
+        )
+
+    async def _get_channel_videos(self, channel_id: str, max_results: int) -> List[Dict[str, Any]]:
+        """チャンネルの最新動画取得（上流呼び出し）"""
         try:
             # チャンネルの動画検索
-            search_response = self.client.search().list(
+            search_response = await self._execute(self.client.search().list(
                 channelId=channel_id,
                 part="snippet",
                 type="video",
                 maxResults=max_results,
                 order="date",
-            ).execute()
+            ))
 
             video_ids = [
                 item["id"]["videoId"]
@@ -134,10 +178,10 @@ class YouTubeAPIClient:
                 return []
 
             # 動画詳細情報取得
-            videos_response = self.client.videos().list(
+            videos_response = await self._execute(self.client.videos().list(
                 part="snippet,statistics",
                 id=",".join(video_ids),
-            ).execute()
+            ))
 
             results = []
             for video in videos_response.get("items", []):
@@ -186,6 +230,25 @@ class YouTubeAPIClient:
         if not self.is_available():
             return []
 
+        return await youtube_upstream.call(
+            "popular_videos",
+            {
+                "q": query,
+                "category_id": category_id,
+                "max_results": max_results,
+                "region_code": region_code,
+            },
+            lambda: self._search_popular_videos(query, category_id, max_results, region_code),
+        )
+
+    async def _search_popular_videos(
+        self,
+        query: Optional[str],
+        category_id: Optional[str],
+        max_results: int,
+        region_code: str,
+    ) -> List[Dict[str, Any]]:
+        """人気動画検索（上流呼び出し）"""
         try:
             params = {
                 "part": "snippet",
@@ -201,7 +264,7 @@ class YouTubeAPIClient:
             if category_id:
                 params["videoCategoryId"] = category_id
 
-            search_response = self.client.search().list(**params).execute()
+            search_response = await self._execute(self.client.search().list(**params))
 
             video_ids = [
                 item["id"]["videoId"]
@@ -212,10 +275,10 @@ class YouTubeAPIClient:
                 return []
 
             # 動画詳細情報取得
-            videos_response = self.client.videos().list(
+            videos_response = await self._execute(self.client.videos().list(
                 part="snippet,statistics,contentDetails",
                 id=",".join(video_ids),
-            ).execute()
+            ))
 
             results = []
             for video in videos_response.get("items", []):
@@ -244,6 +307,66 @@ class YouTubeAPIClient:
             print(f"Unexpected error: {e}")
             return []
 
+    async def get_videos_statistics(
+        self,
+        video_ids: List[str],
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        複数動画の統計情報を一括取得
+
+        videos.listは1リクエストで最大50件のIDを受け付けるため、
+        50件ずつに分割して取得する（1リクエスト = 1 unit）
+
+        Args:
+            video_ids: YouTube動画IDリスト
+
+        Returns:
+            Dict[str, Dict]: 動画ID -> 統計情報
+        """
+        if not self.is_available() or not video_ids:
+            return {}
+
+        results: Dict[str, Dict[str, Any]] = {}
+        unique_ids = list(dict.fromkeys(video_ids))
+
+        for i in range(0, len(unique_ids), VIDEOS_LIST_MAX_IDS):
+            chunk = unique_ids[i:i + VIDEOS_LIST_MAX_IDS]
+            try:
+                videos_response = await self._execute(self.client.videos().list(
+                    part="statistics",
+                    id=",".join(chunk),
+                    maxResults=len(chunk),
+                ))
+            except HttpError as e:
+                print(f"YouTube API Error: {e}")
+                continue
+            except Exception as e:
+                print(f"Unexpected error: {e}")
+                continue
+
+            for video in videos_response.get("items", []):
+                statistics = video.get("statistics", {})
+                results[video["id"]] = {
+                    "view_count": int(statistics.get("viewCount", 0)),
+                    "like_count": int(statistics.get("likeCount", 0)),
+                    "comment_count": int(statistics.get("commentCount", 0)),
+                }
+
+        return results
+
+    @staticmethod
+    def _parse_comment_thread(item: Dict[str, Any]) -> Dict[str, Any]:
+        """commentThreadsのアイテムをコメント辞書に変換"""
+        comment = item["snippet"]["topLevelComment"]["snippet"]
+        return {
+            "comment_id": item["id"],
+            "text": comment.get("textDisplay", ""),
+            "author": comment.get("authorDisplayName", ""),
+            "author_channel_id": comment.get("authorChannelId", {}).get("value"),
+            "like_count": comment.get("likeCount", 0),
+            "published_at": comment.get("publishedAt"),
+        }
+
     async def get_video_comments(
         self,
         video_id: str,
@@ -263,27 +386,15 @@ class YouTubeAPIClient:
             return []
 
         try:
-            comments_response = self.client.commentThreads().list(
+            comments_response = await self._execute(self.client.commentThreads().list(
                 part="snippet",
                 videoId=video_id,
                 maxResults=max_results,
                 order="relevance",
                 textFormat="plainText",
-            ).execute()
+            ))
 
-            results = []
-            for item in comments_response.get("items", []):
-                comment = item["snippet"]["topLevelComment"]["snippet"]
-                results.append({
-                    "comment_id": item["id"],
-                    "text": comment.get("textDisplay", ""),
-                    "author": comment.get("authorDisplayName", ""),
-                    "author_channel_id": comment.get("authorChannelId", {}).get("value"),
-                    "like_count": comment.get("likeCount", 0),
-                    "published_at": comment.get("publishedAt"),
-                })
-
-            return results
+            return [self._parse_comment_thread(item) for item in comments_response.get("items", [])]
 
         except HttpError as e:
             # コメントが無効な動画の場合
@@ -295,6 +406,61 @@ class YouTubeAPIClient:
             print(f"Unexpected error: {e}")
             return []
 
+    async def iter_video_comment_pages(
+        self,
+        video_id: str,
+        max_comments: Optional[int] = None,
+        page_size: int = 100,
+        order: str = "relevance",
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        動画のコメントをページ単位で全件取得（nextPageTokenを辿る）
+
+        全件をメモリに溜めずにページごとに処理するためのジェネレーター
+
+        Args:
+            video_id: 動画ID
+            max_comments: 最大取得件数（Noneの場合は全件）
+            page_size: 1ページの件数（最大100）
+            order: 並び順（relevance / time）
+
+        Yields:
+            List[Dict]: 1ページ分のコメントリスト
+        """
+        if not self.is_available():
+            return
+
+        fetched = 0
+        page_token = None
+        while max_comments is None or fetched < max_comments:
+            size = page_size if max_comments is None else min(page_size, max_comments - fetched)
+            try:
+                response = await self._execute(self.client.commentThreads().list(
+                    part="snippet",
+                    videoId=video_id,
+                    maxResults=size,
+                    order=order,
+                    textFormat="plainText",
+                    pageToken=page_token,
+                ))
+            except HttpError as e:
+                # コメントが無効な動画の場合
+                if "commentsDisabled" not in str(e):
+                    print(f"YouTube API Error: {e}")
+                return
+            except Exception as e:
+                print(f"Unexpected error: {e}")
+                return
+
+            page = [self._parse_comment_thread(item) for item in response.get("items", [])]
+            if page:
+                fetched += len(page)
+                yield page
+
+            page_token = response.get("nextPageToken")
+            if not page_token or not page:
+                return
+
 
 # シングルトンインスタンス
 youtube_api = YouTubeAPIClient()
@@ -12,10 +12,10 @@ from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import Flow
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
 from app.core.config import settings
+from app.services.external.google_api_client import get_service, execute_async
 
 
 class YouTubeOAuthService:
@@ -207,11 +207,10 @@ class YouTubeOAuthService:
             bool: トークンが有効かどうか
         """
         try:
-            credentials = Credentials(token=access_token)
-            youtube = build("youtube", "v3", credentials=credentials)
+            youtube = get_service("youtube", "v3", access_token=access_token)
 
             # チャンネル情報を取得してトークンを検証
-            youtube.channels().list(part="snippet", mine=True).execute()
+            await execute_async(youtube.channels().list(part="snippet", mine=True))
 
             return True
         except HttpError:
@@ -234,14 +233,13 @@ class YouTubeOAuthService:
                 - thumbnail_url: サムネイルURL
         """
         try:
-            credentials = Credentials(token=access_token)
-            youtube = build("youtube", "v3", credentials=credentials)
+            youtube = get_service("youtube", "v3", access_token=access_token)
 
             # チャンネル情報を取得
-            response = youtube.channels().list(
+            response = await execute_async(youtube.channels().list(
                 part="snippet,statistics",
                 mine=True,
-            ).execute()
+            ))
 
             if not response.get("items"):
                 return None
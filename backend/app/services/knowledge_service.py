@@ -3,15 +3,19 @@
 
 ナレッジ管理のビジネスロジック
 """
+import asyncio
 from datetime import datetime
 from typing import Optional
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, update
 from fastapi import HTTPException, status
 
+from app.core.database import AsyncSessionLocal, released_connection
+from app.core.pagination import Page, paginate
+from app.core.sse import sse_broker, Emit
 from app.models.knowledge import Knowledge
-from app.models.chat_session import ChatSession, ChatSessionStatus
+from app.models.chat_session import ChatSession, ChatSessionStatus, ChatSessionMessage
 from app.models.client import Client
 from app.models.user import UserRole
 from app.schemas.knowledge import (
@@ -28,6 +32,15 @@ from app.schemas.knowledge import (
     RAGHearingResponse,
 )
 from app.services.external import claude_client, gemini_client
+from app.services.external.provider_router import provider_router
+from app.services.chat_message_store import knowledge_chat_store, CHAT_HISTORY_WINDOW
+from app.services.rag_extraction import (
+    RAG_MAX_CONCURRENCY,
+    get_cached_chunk_result,
+    merge_chunk_results,
+    set_cached_chunk_result,
+    split_into_chunks,
+)
 import json
 
 
@@ -95,22 +108,26 @@ class KnowledgeService:
         page: int = 1,
         limit: int = 20,
         client_id: Optional[UUID] = None,
-    ) -> tuple[list[Knowledge], int]:
+        cursor: Optional[str] = None,
+        exact_count: bool = False,
+    ) -> Page[Knowledge]:
         """
         ナレッジ一覧を取得
 
         Args:
             db: データベースセッション
             current_user_role: 実行者のロール
-            page: ページ番号
+            page: ページ番号（cursor指定時は無視）
             limit: 1ページあたりの件数
             client_id: クライアントIDフィルタ
+            cursor: 前ページの next_cursor（キーセットページング）
+            exact_count: 正確な総件数を数えるか（デフォルトは推定値）
 
         Returns:
-            tuple[list[Knowledge], int]: (ナレッジリスト, 総件数)
+            Page[Knowledge]: ナレッジリスト、総件数、次ページのカーソル
 
         Raises:
-            HTTPException: 権限不足
+            HTTPException: 権限不足、不正なカーソル
         """
         # 権限チェック（Owner/Teamのみ実行可能）
         if current_user_role not in [UserRole.OWNER.value, UserRole.TEAM.value]:
@@ -124,22 +141,16 @@ class KnowledgeService:
         if client_id:
             query = query.where(Knowledge.client_id == client_id)
 
-        # 総件数取得
-        count_query = select(func.count()).select_from(Knowledge)
-        if client_id:
-            count_query = count_query.where(Knowledge.client_id == client_id)
-        total_result = await db.execute(count_query)
-        total = total_result.scalar_one()
-
-        # ページネーション
-        offset = (page - 1) * limit
-        query = query.offset(offset).limit(limit).order_by(Knowledge.created_at.desc())
-
-        # データ取得
-        result = await db.execute(query)
-        knowledges = result.scalars().all()
-
-        return list(knowledges), total
+        return await paginate(
+            db,
+            query,
+            sort_column=Knowledge.created_at,
+            id_column=Knowledge.id,
+            limit=limit,
+            cursor=cursor,
+            offset=(page - 1) * limit,
+            exact_count=exact_count,
+        )
 
     @staticmethod
     async def get_knowledge_by_id(
@@ -279,8 +290,8 @@ class KnowledgeService:
                 client_id=knowledge.client_id,
                 knowledge_id=knowledge_id,
                 current_step=1,
-                messages=[],
                 status=ChatSessionStatus.IN_PROGRESS,
+                messages=[],
             )
             db.add(chat_session)
             await db.commit()
@@ -326,51 +337,163 @@ class KnowledgeService:
         result = await db.execute(select(Knowledge).where(Knowledge.id == knowledge_id))
         knowledge = result.scalar_one_or_none()
 
-        # ユーザーメッセージを追加
-        user_message = {
-            "role": "user",
-            "content": message_data.content,
-            "timestamp": datetime.utcnow().isoformat(),
-        }
-
-        # AI応答を生成
-        ai_response = await KnowledgeService._generate_ai_response(
-            chat_session, knowledge, message_data.content
+        # 直近の会話履歴のみ取得
+        recent_messages, _ = await knowledge_chat_store.fetch_window(
+            db, chat_session.id, limit=CHAT_HISTORY_WINDOW
         )
 
-        assistant_message = {
-            "role": "assistant",
-            "content": ai_response,
-            "timestamp": datetime.utcnow().isoformat(),
-        }
-
-        # messagesがNoneの場合は空リストで初期化
-        if chat_session.messages is None:
-            chat_session.messages = []
+        # AI応答を生成（生成中は接続をプールへ返却）
+        async with released_connection(db, "knowledge_chat"):
+            ai_response = await KnowledgeService._generate_ai_response(
+                chat_session, knowledge, message_data.content, recent_messages
+            )
 
-        # 新しいメッセージリストを作成（SQLAlchemyがJSONBの変更を検知するため）
-        new_messages = list(chat_session.messages)
-        new_messages.append(user_message)
-        new_messages.append(assistant_message)
-        chat_session.messages = new_messages
+        # ユーザーメッセージとAI応答を追記
+        await knowledge_chat_store.append(
+            db,
+            chat_session.id,
+            [
+                {"role": "user", "content": message_data.content},
+                {"role": "assistant", "content": ai_response},
+            ],
+        )
 
         # updated_atを更新
         chat_session.updated_at = datetime.utcnow()
 
-        # SQLAlchemyにJSONBフィールドの変更を通知
-        from sqlalchemy.orm.attributes import flag_modified
-        flag_modified(chat_session, "messages")
-
         await db.commit()
         await db.refresh(chat_session)
 
         return chat_session
 
+    @staticmethod
+    async def get_chat_messages(
+        db: AsyncSession,
+        chat_session_id: UUID,
+        limit: Optional[int] = None,
+    ) -> list[ChatMessage]:
+        """
+        チャットセッションのメッセージ履歴を取得
+
+        Args:
+            db: データベースセッション
+            chat_session_id: チャットセッションID
+            limit: 直近何件を取得するか（Noneの場合は全件）
+
+        Returns:
+            list[ChatMessage]: 古い順のメッセージ
+        """
+        rows, _ = await knowledge_chat_store.fetch_window(db, chat_session_id, limit=limit)
+        return [
+            ChatMessage(
+                role=row.role,
+                content=row.content,
+                timestamp=row.created_at.isoformat(),
+            )
+            for row in rows
+        ]
+
+    @staticmethod
+    async def stream_chat_message(
+        db: AsyncSession,
+        knowledge_id: UUID,
+        message_data: ChatMessageRequest,
+        current_user_role: str,
+    ) -> str:
+        """
+        チャットメッセージを送信し、AI応答をストリーミング（SSE）
+
+        応答の生成と保存はクライアント接続と独立したバックグラウンドタスクで実行し、
+        ストリーム完了時にユーザーメッセージとAI応答を追記する
+
+        イベント:
+            token: 生成されたテキスト断片 {"text": str}
+            result: 保存したAI応答 {"session_id", "message": ChatMessage}
+
+        Args:
+            db: データベースセッション
+            knowledge_id: ナレッジID
+            message_data: メッセージデータ
+            current_user_role: 実行者のロール
+
+        Returns:
+            str: ストリームID
+        """
+        if current_user_role not in [UserRole.OWNER.value, UserRole.TEAM.value]:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="チャットメッセージ送信にはOwnerまたはTeamロールが必要です",
+            )
+
+        chat_session = await KnowledgeService.get_chat_session(
+            db, knowledge_id, current_user_role
+        )
+        result = await db.execute(select(Knowledge).where(Knowledge.id == knowledge_id))
+        knowledge = result.scalar_one_or_none()
+        recent_messages, _ = await knowledge_chat_store.fetch_window(
+            db, chat_session.id, limit=CHAT_HISTORY_WINDOW
+        )
+
+        full_prompt, current_section = KnowledgeService._build_chat_prompt(
+            chat_session, knowledge, message_data.content, recent_messages
+        )
+        chat_session_id = chat_session.id
+
+        async def producer(emit: Emit) -> None:
+            parts = []
+            for client in (claude_client, gemini_client):
+                if not client.is_available():
+                    continue
+                try:
+                    async for text in client.stream_text(full_prompt, max_tokens=1000, temperature=0.7):
+                        parts.append(text)
+                        await emit("token", {"text": text})
+                except Exception as e:
+                    # 途中まで配信済みの場合は不完全な応答を保存しない
+                    if parts:
+                        raise
+                    print(f"Chat stream error: {e}")
+                if parts:
+                    break
+
+            ai_response = "".join(parts)
+            if not ai_response:
+                ai_response = KnowledgeService._fallback_chat_response(current_section, message_data.content)
+                await emit("token", {"text": ai_response})
+
+            async with AsyncSessionLocal() as session:
+                _, assistant_row = await knowledge_chat_store.append(
+                    session,
+                    chat_session_id,
+                    [
+                        {"role": "user", "content": message_data.content},
+                        {"role": "assistant", "content": ai_response},
+                    ],
+                )
+                await session.execute(
+                    update(ChatSession)
+                    .where(ChatSession.id == chat_session_id)
+                    .values(updated_at=datetime.utcnow())
+                )
+                await session.commit()
+
+            await emit("result", {
+                "session_id": str(chat_session_id),
+                "message": ChatMessage(
+                    role=assistant_row.role,
+                    content=assistant_row.content,
+                    timestamp=assistant_row.created_at.isoformat(),
+                ).model_dump(),
+            })
+
+        return sse_broker.start(producer)
+
     @staticmethod
     async def _generate_ai_response(
         chat_session: ChatSession,
         knowledge: Optional[Knowledge],
         user_message: str,
+        recent_messages: Optional[list[ChatSessionMessage]] = None,
     ) -> str:
         """
         AI応答を生成
@@ -381,10 +504,50 @@ class KnowledgeService:
             chat_session: チャットセッション
             knowledge: ナレッジ情報
             user_message: ユーザーメッセージ
+            recent_messages: 直近の会話履歴（古い順）
 
         Returns:
             str: AI応答テキスト
         """
+        full_prompt, current_section = KnowledgeService._build_chat_prompt(
+            chat_session, knowledge, user_message, recent_messages
+        )
+
+        # Claude/Geminiをルーター経由で呼び出し（障害時は遮断・ヘッジ）
+        operations = {}
+        if claude_client.is_available():
+            operations["claude"] = lambda: claude_client.generate_text(
+                prompt=full_prompt,
+                max_tokens=1000,
+                temperature=0.7,
+            )
+        if gemini_client.is_available():
+            operations["gemini"] = lambda: gemini_client.generate_text(
+                prompt=full_prompt,
+                max_tokens=1000,
+                temperature=0.7,
+            )
+
+        response = await provider_router.call("knowledge.chat", operations)
+        if response:
+            return response
+
+        # フォールバック: スタブ応答
+        return KnowledgeService._fallback_chat_response(current_section, user_message)
+
+    @staticmethod
+    def _build_chat_prompt(
+        chat_session: ChatSession,
+        knowledge: Optional[Knowledge],
+        user_message: str,
+        recent_messages: Optional[list[ChatSessionMessage]] = None,
+    ) -> tuple[str, str]:
+        """
+        チャット応答用のプロンプトを構築
+
+        Returns:
+            tuple[str, str]: (プロンプト, 現在のセクション名)
+        """
         # 8セクションの説明
         section_descriptions = {
             1: "メインターゲット像（年齢、性別、職業、悩み、ゴール）",
@@ -415,40 +578,17 @@ class KnowledgeService:
 
         # 会話履歴を構築
         conversation_history = ""
-        if chat_session.messages:
-            for msg in chat_session.messages[-10:]:  # 直近10件のみ
-                role = "ユーザー" if msg["role"] == "user" else "アシスタント"
-                conversation_history += f"{role}: {msg['content']}\n"
+        for msg in recent_messages or []:
+            role = "ユーザー" if msg.role == "user" else "アシスタント"
+            conversation_history += f"{role}: {msg.content}\n"
 
         full_prompt = f"{system_prompt}\n\n会話履歴:\n{conversation_history}\nユーザー: {user_message}\n\n上記に基づいて、適切な応答を生成してください。"
 
-        # Claude APIが利用可能な場合
-        if claude_client.is_available():
-            try:
-                response = await claude_client.generate_text(
-                    prompt=full_prompt,
-                    max_tokens=1000,
-                    temperature=0.7,
-                )
-                if response:
-                    return response
-            except Exception as e:
-                print(f"Claude API error: {e}")
-
-        # Gemini APIが利用可能な場合
-        if gemini_client.is_available():
-            try:
-                response = await gemini_client.generate_text(
-                    prompt=full_prompt,
-                    max_tokens=1000,
-                    temperature=0.7,
-                )
-                if response:
-                    return response
-            except Exception as e:
-                print(f"Gemini API error: {e}")
+        return full_prompt, current_section
 
-        # フォールバック: スタブ応答
+    @staticmethod
+    def _fallback_chat_response(current_section: str, user_message: str) -> str:
+        """AI APIが利用できない場合のスタブ応答"""
         return f"""「{current_section}」についてお聞かせいただきありがとうございます。
 
 {user_message}というお話ですね。
@@ -531,23 +671,8 @@ class KnowledgeService:
         "concept_story",
     ]
 
-    @staticmethod
-    async def analyze_rag_content(
-        content: str,
-        file_name: Optional[str] = None,
-    ) -> RAGAnalysisResponse:
-        """
-        アップロードされたコンテンツをRAG解析
-
-        Args:
-            content: 解析するテキストコンテンツ
-            file_name: 元ファイル名（オプション）
-
-        Returns:
-            RAGAnalysisResponse: 解析結果
-        """
-        # システムプロンプト
-        system_prompt = """あなたはビジネスナレッジ抽出の専門家です。
+    # RAG解析のシステムプロンプト（チャンク解析で共通）
+    RAG_SYSTEM_PROMPT = """あなたはビジネスナレッジ抽出の専門家です。
 提供されたドキュメントから、以下の8セクションに該当する情報を抽出してください。
 
 【抽出セクション】
@@ -627,114 +752,165 @@ JSON形式で出力してください。
 4. 抽象的な記述は具体化の確認が必要としてマーク
 5. JSONのみを出力し、説明文は含めない"""
 
-        user_prompt = f"""以下のドキュメントからナレッジ情報を抽出してください。
+    @staticmethod
+    async def analyze_rag_content(
+        content: str,
+        file_name: Optional[str] = None,
+    ) -> RAGAnalysisResponse:
+        """
+        アップロードされたコンテンツをRAG解析
+
+        ドキュメントを重複付きチャンクに分割して並行に解析し（map）、
+        信頼度で重み付けして1つの結果に統合する（reduce）
+        チャンク単位の結果は内容ハッシュでキャッシュし、再アップロード時は
+        変更のあったチャンクのみ再解析する
+
+        Args:
+            content: 解析するテキストコンテンツ
+            file_name: 元ファイル名（オプション）
+
+        Returns:
+            RAGAnalysisResponse: 解析結果
+        """
+        chunks = split_into_chunks(content)
+        if not chunks:
+            return KnowledgeService._create_empty_rag_response()
+
+        semaphore = asyncio.Semaphore(RAG_MAX_CONCURRENCY)
+
+        async def analyze(index: int, chunk: str) -> Optional[dict]:
+            async with semaphore:
+                return await KnowledgeService._analyze_rag_chunk(chunk, index, len(chunks))
+
+        results = await asyncio.gather(*(analyze(i, chunk) for i, chunk in enumerate(chunks)))
+        results = [r for r in results if r is not None]
+
+        # フォールバック: 空の解析結果
+        if not results:
+            return KnowledgeService._create_empty_rag_response()
+
+        return KnowledgeService._build_rag_response(merge_chunk_results(results))
+
+    @staticmethod
+    async def _analyze_rag_chunk(chunk: str, index: int, total: int) -> Optional[dict]:
+        """
+        1チャンクを解析（キャッシュ優先、Claude→Geminiの順で試行）
+
+        Returns:
+            Optional[dict]: 解析結果（全て失敗した場合はNone）
+        """
+        cached = await get_cached_chunk_result(chunk)
+        if cached is not None:
+            return cached
+
+        part = f"（全{total}分割中の{index + 1}番目）" if total > 1 else ""
+        user_prompt = f"""以下のドキュメント{part}からナレッジ情報を抽出してください。
 
 【ドキュメント内容】
-{content[:15000]}"""  # 最大15000文字まで
+{chunk}"""
+
+        data = None
 
         # Claude APIで解析
         if claude_client.is_available():
             try:
                 response = await KnowledgeService._call_claude_for_rag(
-                    system_prompt, user_prompt
+                    KnowledgeService.RAG_SYSTEM_PROMPT, user_prompt
                 )
                 if response:
-                    return KnowledgeService._parse_rag_response(response)
+                    data = KnowledgeService._parse_rag_json(response)
             except Exception as e:
                 print(f"Claude RAG analysis error: {e}")
 
         # Gemini APIでフォールバック
-        if gemini_client.is_available():
+        if data is None and gemini_client.is_available():
             try:
                 response = await KnowledgeService._call_gemini_for_rag(
-                    system_prompt + "\n\n" + user_prompt
+                    KnowledgeService.RAG_SYSTEM_PROMPT, user_prompt
                 )
                 if response:
-                    return KnowledgeService._parse_rag_response(response)
+                    data = KnowledgeService._parse_rag_json(response)
             except Exception as e:
                 print(f"Gemini RAG analysis error: {e}")
 
-        # フォールバック: 空の解析結果
-        return KnowledgeService._create_empty_rag_response()
+        if data is not None:
+            await set_cached_chunk_result(chunk, data)
+        return data
 
     @staticmethod
     async def _call_claude_for_rag(system_prompt: str, user_prompt: str) -> Optional[str]:
-        """Claude APIを使用してRAG解析"""
+        """Claude APIを使用してRAG解析（システムプロンプトはチャンク間でキャッシュ）"""
         if not claude_client.is_available():
             return None
 
-        try:
-            message = claude_client.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=4096,
-                system=system_prompt,
-                messages=[{"role": "user", "content": user_prompt}]
-            )
-            return message.content[0].text
-        except Exception as e:
-            print(f"Claude API call error: {e}")
-            return None
+        return await claude_client.generate_text(
+            user_prompt,
+            system=system_prompt,
+            max_tokens=4096,
+            cache_system=True,
+            call_site="knowledge.rag_extraction",
+        )
 
     @staticmethod
-    async def _call_gemini_for_rag(prompt: str) -> Optional[str]:
+    async def _call_gemini_for_rag(system_prompt: str, user_prompt: str) -> Optional[str]:
         """Gemini APIを使用してRAG解析"""
         if not gemini_client.is_available():
             return None
 
-        try:
-            response = gemini_client.model.generate_content(prompt)
-            return response.text
-        except Exception as e:
-            print(f"Gemini API call error: {e}")
-            return None
+        return await gemini_client.generate_text(
+            user_prompt,
+            system=system_prompt,
+            call_site="knowledge.rag_extraction",
+        )
 
     @staticmethod
-    def _parse_rag_response(response: str) -> RAGAnalysisResponse:
-        """RAG解析レスポンスをパース"""
-        try:
-            # JSON部分を抽出
-            json_start = response.find("{")
-            json_end = response.rfind("}") + 1
-            if json_start == -1 or json_end == 0:
-                return KnowledgeService._create_empty_rag_response()
-
-            json_str = response[json_start:json_end]
-            data = json.loads(json_str)
-
-            extracted = data.get("extracted_data", {})
-            confidence = data.get("confidence", 0.0)
-            needs_confirmation = data.get("needs_confirmation", [])
-
-            # 不足フィールドを計算
-            missing_fields = KnowledgeService._calculate_missing_fields(extracted)
-
-            # 抽出済みフィールド数を計算
-            total_fields = 0
-            extracted_fields = 0
-            for step, fields in KnowledgeService.FIELD_LABELS.items():
-                if step in KnowledgeService.REQUIRED_STEPS:
-                    total_fields += len(fields)
-                    step_data = extracted.get(step, {}) or {}
-                    for field in fields:
-                        if step_data.get(field):
-                            extracted_fields += 1
-
-            return RAGAnalysisResponse(
-                extracted_data=RAGExtractedData(**{
-                    k: v for k, v in extracted.items() if v is not None
-                }),
-                missing_fields=missing_fields,
-                needs_confirmation=[
-                    RAGNeedsConfirmation(**nc) for nc in needs_confirmation
-                ],
-                confidence=min(max(confidence, 0.0), 1.0),
-                total_fields=total_fields,
-                extracted_fields=extracted_fields,
-            )
+    def _parse_rag_json(response: str) -> Optional[dict]:
+        """RAG解析レスポンスからJSON部分を取り出す（失敗時はNone）"""
+        json_start = response.find("{")
+        json_end = response.rfind("}") + 1
+        if json_start == -1 or json_end == 0:
+            return None
 
+        try:
+            data = json.loads(response[json_start:json_end])
         except json.JSONDecodeError as e:
             print(f"JSON parse error: {e}")
-            return KnowledgeService._create_empty_rag_response()
+            return None
+        return data if isinstance(data, dict) else None
+
+    @staticmethod
+    def _build_rag_response(data: dict) -> RAGAnalysisResponse:
+        """解析結果（extracted_data, confidence, needs_confirmation）からレスポンスを構築"""
+        extracted = data.get("extracted_data", {}) or {}
+        confidence = data.get("confidence", 0.0)
+        needs_confirmation = data.get("needs_confirmation", [])
+
+        # 不足フィールドを計算
+        missing_fields = KnowledgeService._calculate_missing_fields(extracted)
+
+        # 抽出済みフィールド数を計算
+        total_fields = 0
+        extracted_fields = 0
+        for step, fields in KnowledgeService.FIELD_LABELS.items():
+            if step in KnowledgeService.REQUIRED_STEPS:
+                total_fields += len(fields)
+                step_data = extracted.get(step, {}) or {}
+                for field in fields:
+                    if step_data.get(field):
+                        extracted_fields += 1
+
+        return RAGAnalysisResponse(
+            extracted_data=RAGExtractedData(**{
+                k: v for k, v in extracted.items() if v is not None
+            }),
+            missing_fields=missing_fields,
+            needs_confirmation=[
+                RAGNeedsConfirmation(**nc) for nc in needs_confirmation
+            ],
+            confidence=min(max(confidence, 0.0), 1.0),
+            total_fields=total_fields,
+            extracted_fields=extracted_fields,
+        )
 
     @staticmethod
     def _calculate_missing_fields(extracted: dict) -> list[RAGMissingField]:
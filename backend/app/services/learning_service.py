@@ -9,13 +9,14 @@
 
 import logging
 import json
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, timedelta
 from uuid import UUID
 from collections import defaultdict
 
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, func, and_, update
 
 from app.models.learning import (
     PerformanceRecord,
@@ -28,18 +29,67 @@ from app.models.learning import (
     InsightType,
 )
 from app.services.external.ai_clients import claude_client, gemini_client
+from app.services.performance_digest import (
+    PerformanceDigestBuilder,
+    NUMERIC_COLUMNS,
+    CATEGORICAL_COLUMNS,
+    STREAM_CHUNK_SIZE,
+)
 
 logger = logging.getLogger(__name__)
 
 
+# ============================================================
+# スコアリング設定
+# ============================================================
+
+# ベースラインが無い場合の既定値
+DEFAULT_BASELINE_STATS: Dict[str, float] = {
+    "avg_views": 1000,
+    "avg_likes": 50,
+    "avg_comments": 10,
+    "avg_ctr": 5.0,
+    "avg_view_percentage": 30.0,
+}
+
+# スコアリングに使う列
+SCORE_COLUMNS = ["views", "likes", "comments", "ctr", "avg_view_percentage"]
+
+# ベースライン統計キー -> 列
+BASELINE_COLUMNS = {
+    "avg_views": "views",
+    "avg_likes": "likes",
+    "avg_comments": "comments",
+    "avg_ctr": "ctr",
+    "avg_view_percentage": "avg_view_percentage",
+}
+
+# ベースライン算出に使う直近件数とパーセンタイル（中央値）
+BASELINE_WINDOW = 200
+BASELINE_PERCENTILE = 50.0
+
+# determine_performance_level と同じ閾値（昇順）
+PERFORMANCE_LEVEL_THRESHOLDS = [30, 45, 65, 80]
+PERFORMANCE_LEVELS_ASCENDING = [
+    PerformanceLevel.LOW,
+    PerformanceLevel.BELOW_AVERAGE,
+    PerformanceLevel.AVERAGE,
+    PerformanceLevel.HIGH,
+    PerformanceLevel.EXCEPTIONAL,
+]
+
+
 # ============================================================
 # 分析プロンプト
 # ============================================================
 
 PATTERN_ANALYSIS_PROMPT = """あなたはYouTube動画パフォーマンス分析の専門家です。
-以下のパフォーマンスデータから成功パターンを特定してください。
+以下のパフォーマンスデータの統計サマリーから成功パターンを特定してください。
+サマリーには全体分布、動画タイプ/カテゴリ/動画長/投稿タイミング別の分布、
+タイトル特徴の有無によるスコア比較、スコア上位10%と下位10%の特徴、
+スコアと各特徴量の相関係数、頻出タグの平均スコアが含まれます。
 
-【パフォーマンスデータ】
+【パフォーマンスデータ（統計サマリー）】
 {performance_data}
 
 【分析観点】
@@ -137,49 +187,12 @@ class LearningService:
         Returns:
             スコア（0-100）
         """
-        if not baseline_stats:
-            baseline_stats = {
-                "avg_views": 1000,
-                "avg_likes": 50,
-                "avg_comments": 10,
-                "avg_ctr": 5.0,
-                "avg_view_percentage": 30.0,
-            }
-
-        # 各指標のスコアを計算
-        scores = []
-
-        # 再生回数スコア
-        if record.views > 0:
-            view_score = min(100, (record.views / baseline_stats["avg_views"]) * 50)
-            scores.append(view_score * 0.3)  # 30%ウェイト
-
-        # いいね率スコア
-        if record.views > 0:
-            like_rate = (record.likes / record.views) * 100
-            baseline_like_rate = (baseline_stats["avg_likes"] / baseline_stats["avg_views"]) * 100
-            like_score = min(100, (like_rate / baseline_like_rate) * 50)
-            scores.append(like_score * 0.2)  # 20%ウェイト
-
-        # コメント率スコア
-        if record.views > 0:
-            comment_rate = (record.comments / record.views) * 100
-            baseline_comment_rate = (baseline_stats["avg_comments"] / baseline_stats["avg_views"]) * 100
-            if baseline_comment_rate > 0:
-                comment_score = min(100, (comment_rate / baseline_comment_rate) * 50)
-                scores.append(comment_score * 0.15)  # 15%ウェイト
-
-        # CTRスコア
-        if record.ctr and baseline_stats["avg_ctr"] > 0:
-            ctr_score = min(100, (record.ctr / baseline_stats["avg_ctr"]) * 50)
-            scores.append(ctr_score * 0.2)  # 20%ウェイト
-
-        # 視聴維持率スコア
-        if record.avg_view_percentage and baseline_stats["avg_view_percentage"] > 0:
-            retention_score = min(100, (record.avg_view_percentage / baseline_stats["avg_view_percentage"]) * 50)
-            scores.append(retention_score * 0.15)  # 15%ウェイト
-
-        return sum(scores) if scores else 50.0
+        columns = {
+            name: np.array([getattr(record, name) or 0], dtype=np.float64)
+            for name in SCORE_COLUMNS
+        }
+        scores = self.score_batch(columns, baseline_stats or DEFAULT_BASELINE_STATS)
+        return float(scores[0])
 
     def determine_performance_level(self, score: float) -> PerformanceLevel:
         """スコアからパフォーマンスレベルを決定"""
@@ -194,6 +207,195 @@ class LearningService:
         else:
             return PerformanceLevel.LOW
 
+    # ============================================================
+    # バッチスコアリング（ベクトル化）
+    # ============================================================
+
+    def score_batch(
+        self,
+        columns: Dict[str, np.ndarray],
+        baseline_stats: Dict[str, float],
+    ) -> np.ndarray:
+        """
+        列指向の記録配列をまとめてスコアリング
+
+        calculate_performance_score と同じ重み・上限で、全記録を1回の演算で計算する
+
+        Args:
+            columns: 列名 -> 配列（views, likes, comments, ctr, avg_view_percentage）
+            baseline_stats: ベースライン統計
+
+        Returns:
+            np.ndarray: スコア（0-100）
+        """
+        views = columns["views"]
+        likes = columns["likes"]
+        comments = columns["comments"]
+        ctr = columns["ctr"]
+        retention = columns["avg_view_percentage"]
+
+        avg_views = baseline_stats["avg_views"]
+        has_views = views > 0
+        safe_views = np.where(has_views, views, 1.0)
+
+        total = np.zeros_like(views, dtype=np.float64)
+        has_any = np.zeros_like(views, dtype=bool)
+
+        def add(mask: np.ndarray, component: np.ndarray, weight: float) -> None:
+            nonlocal total, has_any
+            total = total + np.where(mask, np.minimum(100.0, component) * weight, 0.0)
+            has_any = has_any | mask
+
+        if avg_views > 0:
+            # 再生回数スコア（30%）
+            add(has_views, views / avg_views * 50, 0.3)
+
+            # いいね率スコア（20%）
+            baseline_like_rate = baseline_stats["avg_likes"] / avg_views * 100
+            if baseline_like_rate > 0:
+                like_rate = likes / safe_views * 100
+                add(has_views, like_rate / baseline_like_rate * 50, 0.2)
+
+            # コメント率スコア（15%）
+            baseline_comment_rate = baseline_stats["avg_comments"] / avg_views * 100
+            if baseline_comment_rate > 0:
+                comment_rate = comments / safe_views * 100
+                add(has_views, comment_rate / baseline_comment_rate * 50, 0.15)
+
+        # CTRスコア（20%）
+        if baseline_stats["avg_ctr"] > 0:
+            add(ctr > 0, ctr / baseline_stats["avg_ctr"] * 50, 0.2)
+
+        # 視聴維持率スコア（15%）
+        if baseline_stats["avg_view_percentage"] > 0:
+            add(retention > 0, retention / baseline_stats["avg_view_percentage"] * 50, 0.15)
+
+        return np.where(has_any, total, 50.0)
+
+    def classify_batch(self, scores: np.ndarray) -> List[PerformanceLevel]:
+        """
+        スコア配列をパフォーマンスレベルへ一括分類
+
+        determine_performance_level と同じ閾値を np.digitize で適用する
+        """
+        indices = np.digitize(scores, PERFORMANCE_LEVEL_THRESHOLDS)
+        return [PERFORMANCE_LEVELS_ASCENDING[i] for i in indices]
+
+    def compute_baselines(
+        self,
+        columns: Dict[str, np.ndarray],
+        window: Optional[int] = BASELINE_WINDOW,
+        percentile: float = BASELINE_PERCENTILE,
+    ) -> Dict[str, float]:
+        """
+        チャンネルの実績からベースライン統計を算出
+
+        直近window件（記録日時の昇順で末尾）のパーセンタイル（既定は中央値）を使う。
+        0件の指標は既定値にフォールバックする
+
+        Args:
+            columns: 列名 -> 配列（記録日時の昇順）
+            window: 直近何件を対象にするか（Noneの場合は全件）
+            percentile: 使用するパーセンタイル（50 = 中央値）
+
+        Returns:
+            Dict: ベースライン統計（calculate_performance_scoreと同じキー）
+        """
+        baselines = dict(DEFAULT_BASELINE_STATS)
+        for key, column in BASELINE_COLUMNS.items():
+            values = columns[column]
+            if window:
+                values = values[-window:]
+            values = values[values > 0]
+            if values.size:
+                baselines[key] = float(np.percentile(values, percentile))
+        return baselines
+
+    async def load_score_columns(
+        self,
+        db: AsyncSession,
+        knowledge_id: Optional[UUID],
+    ) -> Tuple[List[UUID], Dict[str, np.ndarray]]:
+        """
+        スコアリングに必要な列だけを取得して列指向の配列に変換
+
+        ORMオブジェクトは生成せず、記録日時の昇順で返す
+
+        Returns:
+            Tuple: (記録IDリスト, 列名 -> 配列)
+        """
+        query = (
+            select(PerformanceRecord.id, *[getattr(PerformanceRecord, name) for name in SCORE_COLUMNS])
+            .order_by(PerformanceRecord.recorded_at, PerformanceRecord.id)
+        )
+        if knowledge_id:
+            query = query.where(PerformanceRecord.knowledge_id == knowledge_id)
+        else:
+            query = query.where(PerformanceRecord.knowledge_id.is_(None))
+
+        result = await db.execute(query)
+        rows = result.all()
+
+        ids = [row[0] for row in rows]
+        if rows:
+            matrix = np.array([row[1:] for row in rows], dtype=np.float64)
+            matrix = np.nan_to_num(matrix, nan=0.0)
+        else:
+            matrix = np.zeros((0, len(SCORE_COLUMNS)), dtype=np.float64)
+        columns = {name: matrix[:, i] for i, name in enumerate(SCORE_COLUMNS)}
+        return ids, columns
+
+    async def rescore_knowledge(
+        self,
+        db: AsyncSession,
+        knowledge_id: Optional[UUID],
+        baseline_stats: Optional[Dict[str, float]] = None,
+        window: Optional[int] = BASELINE_WINDOW,
+    ) -> Dict[str, Any]:
+        """
+        チャンネル（ナレッジ）の全記録を一括で再スコアリング
+
+        1. 必要な列だけを列指向の配列として読み込む
+        2. チャンネル実績からベースラインを算出（指定がある場合はそれを使用）
+        3. 全記録をベクトル演算でスコアリング・分類
+        4. 主キー指定のバルクUPDATEで書き戻す
+
+        Args:
+            db: データベースセッション
+            knowledge_id: ナレッジID
+            baseline_stats: ベースライン統計（未指定の場合はデータから算出）
+            window: ベースライン算出に使う直近件数
+
+        Returns:
+            Dict: 再スコアリング件数、使用したベースライン、レベル分布
+        """
+        ids, columns = await self.load_score_columns(db, knowledge_id)
+        if not ids:
+            return {"records_scored": 0, "baseline_stats": baseline_stats, "level_distribution": {}}
+
+        baselines = baseline_stats or self.compute_baselines(columns, window=window)
+        scores = np.round(self.score_batch(columns, baselines), 2)
+        levels = self.classify_batch(scores)
+
+        await db.execute(
+            update(PerformanceRecord),
+            [
+                {"id": record_id, "performance_score": float(score), "performance_level": level}
+                for record_id, score, level in zip(ids, scores, levels)
+            ],
+        )
+        await db.commit()
+
+        distribution: Dict[str, int] = defaultdict(int)
+        for level in levels:
+            distribution[level.value] += 1
+
+        return {
+            "records_scored": len(ids),
+            "baseline_stats": baselines,
+            "level_distribution": dict(distribution),
+        }
+
     # ============================================================
     # パターン分析
     # ============================================================
@@ -215,23 +417,22 @@ class LearningService:
         Returns:
             分析結果
         """
-        # パフォーマンス記録を取得
-        query = select(PerformanceRecord)
+        # 件数のみ先に確認
+        count_query = select(func.count(PerformanceRecord.id))
         if knowledge_id:
-            query = query.where(PerformanceRecord.knowledge_id == knowledge_id)
-
-        result = await db.execute(query)
-        records = result.scalars().all()
+            count_query = count_query.where(PerformanceRecord.knowledge_id == knowledge_id)
+        sample_size = (await db.execute(count_query)).scalar() or 0
 
-        if len(records) < min_sample_size:
+        if sample_size < min_sample_size:
             return {
                 "status": "insufficient_data",
-                "sample_size": len(records),
+                "sample_size": sample_size,
                 "min_required": min_sample_size,
             }
 
-        # データを準備
-        performance_data = self._prepare_performance_data(records)
+        # 固定サイズの統計サマリーを構築
+        digest = await self.build_performance_digest(db, knowledge_id)
+        performance_data = self._prepare_performance_data(digest)
 
         # AIで分析
         analysis_result = await self._analyze_with_ai(performance_data)
@@ -242,30 +443,51 @@ class LearningService:
 
         return analysis_result
 
-    def _prepare_performance_data(self, records: List[PerformanceRecord]) -> str:
-        """パフォーマンスデータをAI分析用に準備"""
-        data = []
-        for record in records:
-            data.append({
-                "video_type": record.video_type,
-                "views": record.views,
-                "likes": record.likes,
-                "comments": record.comments,
-                "ctr": record.ctr,
-                "avg_view_percentage": record.avg_view_percentage,
-                "performance_level": record.performance_level.value if record.performance_level else None,
-                "performance_score": record.performance_score,
-                "title_length": record.title_length,
-                "has_number_in_title": record.has_number_in_title,
-                "has_question_in_title": record.has_question_in_title,
-                "has_emoji_in_title": record.has_emoji_in_title,
-                "video_length_seconds": record.video_length_seconds,
-                "publish_day_of_week": record.publish_day_of_week,
-                "publish_hour": record.publish_hour,
-                "tags": record.tags,
-            })
+    async def build_performance_digest(
+        self,
+        db: AsyncSession,
+        knowledge_id: Optional[UUID] = None,
+    ) -> Dict[str, Any]:
+        """
+        パフォーマンス記録をストリーミングで集計し、固定サイズのダイジェストを構築
+
+        サーバーサイドカーソルで必要な列だけをチャンク単位で取得するため、
+        ORMオブジェクトを全件メモリに載せない。
+        performance_score が未計算の記録は、チャンネル実績のベースラインで補完する
+
+        Args:
+            db: データベースセッション
+            knowledge_id: ナレッジID（特定チャンネルに限定）
+
+        Returns:
+            Dict: 統計サマリー（件数に依存しないサイズ）
+        """
+        query = (
+            select(
+                *[getattr(PerformanceRecord, name) for name in NUMERIC_COLUMNS],
+                *[getattr(PerformanceRecord, name) for name in CATEGORICAL_COLUMNS],
+                PerformanceRecord.tags,
+            )
+            .order_by(PerformanceRecord.recorded_at, PerformanceRecord.id)
+            .execution_options(yield_per=STREAM_CHUNK_SIZE)
+        )
+        if knowledge_id:
+            query = query.where(PerformanceRecord.knowledge_id == knowledge_id)
+
+        builder = PerformanceDigestBuilder()
+        result = await db.stream(query)
+        async for rows in result.partitions(STREAM_CHUNK_SIZE):
+            builder.add_rows(rows)
+
+        columns = builder.columns()
+        score_columns = {name: np.nan_to_num(columns[name]) for name in SCORE_COLUMNS}
+        fill_scores = self.score_batch(score_columns, self.compute_baselines(score_columns))
+
+        return builder.build(fill_scores=fill_scores)
 
-        return json.dumps(data[:50], ensure_ascii=False, default=str)  # 最大50件
+    def _prepare_performance_data(self, digest: Dict[str, Any]) -> str:
+        """統計サマリーをAI分析用に準備"""
+        return json.dumps(digest, ensure_ascii=False, default=str)
 
     async def _analyze_with_ai(self, performance_data: str) -> Dict[str, Any]:
         """AIでパターン分析"""
@@ -273,14 +495,15 @@ class LearningService:
 
         try:
             if claude_client.is_available():
-                message = claude_client.client.messages.create(
+                message = await claude_client.create_message(
+                    "learning.pattern_analysis",
                     model="claude-sonnet-4-20250514",
                     max_tokens=4096,
                     messages=[{"role": "user", "content": prompt}],
                 )
                 response_text = message.content[0].text
             elif gemini_client.is_available():
-                response = gemini_client.model.generate_content(prompt)
+                response = await gemini_client.generate_content(prompt, "learning.pattern_analysis")
                 response_text = response.text
             else:
                 return {"status": "no_ai_available"}
@@ -415,14 +638,15 @@ class LearningService:
 
         try:
             if claude_client.is_available():
-                message = claude_client.client.messages.create(
+                message = await claude_client.create_message(
+                    "learning.recommendations",
                     model="claude-sonnet-4-20250514",
                     max_tokens=2048,
                     messages=[{"role": "user", "content": prompt}],
                 )
                 response_text = message.content[0].text
             elif gemini_client.is_available():
-                response = gemini_client.model.generate_content(prompt)
+                response = await gemini_client.generate_content(prompt, "learning.recommendations")
                 response_text = response.text
             else:
                 return []
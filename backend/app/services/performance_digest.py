@@ -0,0 +1,339 @@
+"""
+パフォーマンス記録のダイジェスト（事前集計）
+
+パターン分析AIへ渡す入力を、記録件数に依存しない固定サイズの統計サマリーにする
+
+- サーバーサイドカーソルで必要な列だけをチャンク単位でストリーミング
+- 数値列はNumPy配列、カテゴリ列は整数コードとして蓄積（ORMオブジェクトは生成しない）
+- カテゴリ別・動画長別・投稿タイミング別の分布、上位/下位10%の特徴、相関係数を算出
+- 各セクションは上限件数で打ち切るため、ダイジェストのサイズは一定
+"""
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# ストリーミング時に1回で取得する行数
+STREAM_CHUNK_SIZE = 1000
+
+# 数値として蓄積する列
+NUMERIC_COLUMNS = [
+    "performance_score",
+    "views",
+    "likes",
+    "comments",
+    "ctr",
+    "avg_view_percentage",
+    "title_length",
+    "video_length_seconds",
+    "publish_day_of_week",
+    "publish_hour",
+    "has_number_in_title",
+    "has_question_in_title",
+    "has_emoji_in_title",
+]
+
+# 整数コードとして蓄積するカテゴリ列
+CATEGORICAL_COLUMNS = ["video_type", "category"]
+
+# 動画長の区分（秒）: (ラベル, 下限, 上限)
+DURATION_BUCKETS: List[Tuple[str, float, float]] = [
+    ("~60秒", 0, 60),
+    ("1~5分", 60, 300),
+    ("5~10分", 300, 600),
+    ("10~20分", 600, 1200),
+    ("20分~", 1200, float("inf")),
+]
+
+# タイトル文字数の区分: (ラベル, 下限, 上限)
+TITLE_LENGTH_BUCKETS: List[Tuple[str, float, float]] = [
+    ("~20文字", 0, 20),
+    ("20~30文字", 20, 30),
+    ("30~40文字", 30, 40),
+    ("40文字~", 40, float("inf")),
+]
+
+# 投稿時間帯の区分（時）: (ラベル, 下限, 上限)
+HOUR_BUCKETS: List[Tuple[str, float, float]] = [
+    ("0~6時", 0, 6),
+    ("6~12時", 6, 12),
+    ("12~18時", 12, 18),
+    ("18~24時", 18, 24),
+]
+
+WEEKDAY_LABELS = ["月", "火", "水", "木", "金", "土", "日"]
+
+# スコアとの相関を算出する特徴量
+CORRELATION_FEATURES = [
+    "title_length",
+    "video_length_seconds",
+    "publish_hour",
+    "has_number_in_title",
+    "has_question_in_title",
+    "has_emoji_in_title",
+    "ctr",
+    "avg_view_percentage",
+]
+
+# 各セクションの上限件数
+MAX_CATEGORIES = 10
+MAX_TAGS = 15
+MIN_TAG_COUNT = 3
+MIN_GROUP_SIZE = 3
+
+
+def _round(value: Optional[float], digits: int = 2) -> Optional[float]:
+    if value is None or not np.isfinite(value):
+        return None
+    return round(float(value), digits)
+
+
+class PerformanceDigestBuilder:
+    """
+    パフォーマンス記録をチャンク単位で受け取り、固定サイズのダイジェストを構築
+
+    add_rows() で行を追加し、build() でダイジェストを生成する。
+    行は NUMERIC_COLUMNS, CATEGORICAL_COLUMNS, tags の順に並んだタプル
+    """
+
+    def __init__(self):
+        self._chunks: List[np.ndarray] = []
+        self._codes: Dict[str, Dict[str, int]] = {name: {} for name in CATEGORICAL_COLUMNS}
+        self._code_chunks: List[np.ndarray] = []
+        self._tags: List[List[str]] = []
+
+    @property
+    def sample_size(self) -> int:
+        return sum(len(chunk) for chunk in self._chunks)
+
+    def add_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        """行のチャンクを列指向の配列として蓄積"""
+        if not rows:
+            return
+
+        n_numeric = len(NUMERIC_COLUMNS)
+        numeric = np.array(
+            [[np.nan if v is None else float(v) for v in row[:n_numeric]] for row in rows],
+            dtype=np.float64,
+        )
+        codes = np.array(
+            [
+                [self._encode(name, row[n_numeric + i]) for i, name in enumerate(CATEGORICAL_COLUMNS)]
+                for row in rows
+            ],
+            dtype=np.int32,
+        )
+        self._chunks.append(numeric)
+        self._code_chunks.append(codes)
+        self._tags.extend(list(row[-1] or []) for row in rows)
+
+    def _encode(self, name: str, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        mapping = self._codes[name]
+        if value not in mapping:
+            mapping[value] = len(mapping)
+        return mapping[value]
+
+    def build(self, fill_scores: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        """
+        ダイジェストを構築
+
+        Args:
+            fill_scores: performance_score が未計算の行を補う配列（省略時は除外）
+
+        Returns:
+            Dict: 固定サイズの統計サマリー
+        """
+        columns = self.columns()
+        if fill_scores is not None:
+            scores = columns["performance_score"]
+            columns["performance_score"] = np.where(np.isnan(scores), fill_scores, scores)
+
+        score = columns["performance_score"]
+        codes = np.concatenate(self._code_chunks) if self._code_chunks else np.zeros((0, 2), dtype=np.int32)
+
+        return {
+            "sample_size": int(score.size),
+            "overall": {
+                name: self._describe(columns[name])
+                for name in ["performance_score", "views", "ctr", "avg_view_percentage"]
+            },
+            "by_video_type": self._by_category(score, codes[:, 0], "video_type"),
+            "by_category": self._by_category(score, codes[:, 1], "category"),
+            "by_duration": self._by_buckets(score, columns["video_length_seconds"], DURATION_BUCKETS),
+            "by_title_length": self._by_buckets(score, columns["title_length"], TITLE_LENGTH_BUCKETS),
+            "by_publish_hour": self._by_buckets(score, columns["publish_hour"], HOUR_BUCKETS),
+            "by_weekday": self._by_weekday(score, columns["publish_day_of_week"]),
+            "title_features": {
+                name: self._by_flag(score, columns[name])
+                for name in ["has_number_in_title", "has_question_in_title", "has_emoji_in_title"]
+            },
+            "deciles": self._deciles(columns),
+            "correlations": self._correlations(columns),
+            "tags": self._tag_stats(score),
+        }
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """蓄積済みの数値列を列名 -> 配列で返す"""
+        if self._chunks:
+            matrix = np.concatenate(self._chunks)
+        else:
+            matrix = np.zeros((0, len(NUMERIC_COLUMNS)), dtype=np.float64)
+        return {name: matrix[:, i] for i, name in enumerate(NUMERIC_COLUMNS)}
+
+    # ============================================================
+    # 集計ヘルパー
+    # ============================================================
+
+    def _describe(self, values: np.ndarray) -> Dict[str, Any]:
+        """平均・中央値・10/90パーセンタイル"""
+        values = values[~np.isnan(values)]
+        if not values.size:
+            return {"count": 0}
+        p10, p50, p90 = np.percentile(values, [10, 50, 90])
+        return {
+            "count": int(values.size),
+            "mean": _round(values.mean()),
+            "p10": _round(p10),
+            "median": _round(p50),
+            "p90": _round(p90),
+        }
+
+    def _group_stats(self, score: np.ndarray, mask: np.ndarray) -> Dict[str, Any]:
+        values = score[mask & ~np.isnan(score)]
+        return {
+            "count": int(values.size),
+            "avg_score": _round(values.mean()) if values.size else None,
+            "median_score": _round(np.median(values)) if values.size else None,
+        }
+
+    def _by_category(self, score: np.ndarray, codes: np.ndarray, name: str) -> List[Dict[str, Any]]:
+        """カテゴリ別の分布（件数上位MAX_CATEGORIES件）"""
+        labels = {code: label for label, code in self._codes[name].items()}
+        counts = np.bincount(codes[codes >= 0], minlength=len(labels))
+        top_codes = np.argsort(-counts, kind="stable")[:MAX_CATEGORIES]
+        return [
+            {"value": labels[int(code)], **self._group_stats(score, codes == code)}
+            for code in top_codes
+            if counts[code] > 0
+        ]
+
+    def _by_buckets(
+        self,
+        score: np.ndarray,
+        values: np.ndarray,
+        buckets: List[Tuple[str, float, float]],
+    ) -> List[Dict[str, Any]]:
+        """区分別の分布"""
+        return [
+            {"bucket": label, **self._group_stats(score, (values >= low) & (values < high))}
+            for label, low, high in buckets
+        ]
+
+    def _by_weekday(self, score: np.ndarray, weekday: np.ndarray) -> List[Dict[str, Any]]:
+        """曜日別の分布"""
+        return [
+            {"weekday": label, **self._group_stats(score, weekday == i)}
+            for i, label in enumerate(WEEKDAY_LABELS)
+        ]
+
+    def _by_flag(self, score: np.ndarray, flag: np.ndarray) -> Dict[str, Any]:
+        """タイトル特徴の有無によるスコア比較"""
+        return {
+            "with": self._group_stats(score, flag == 1),
+            "without": self._group_stats(score, flag == 0),
+        }
+
+    def _profile(self, columns: Dict[str, np.ndarray], mask: np.ndarray) -> Dict[str, Any]:
+        """記録群の特徴プロファイル"""
+        def mean(name: str) -> Optional[float]:
+            values = columns[name][mask]
+            values = values[~np.isnan(values)]
+            return _round(values.mean()) if values.size else None
+
+        weekday = columns["publish_day_of_week"][mask]
+        weekday = weekday[~np.isnan(weekday)].astype(int)
+        hour = columns["publish_hour"][mask]
+        hour = hour[~np.isnan(hour)].astype(int)
+
+        return {
+            "count": int(mask.sum()),
+            "avg_score": mean("performance_score"),
+            "avg_views": mean("views"),
+            "avg_ctr": mean("ctr"),
+            "avg_view_percentage": mean("avg_view_percentage"),
+            "avg_title_length": mean("title_length"),
+            "avg_video_length_seconds": mean("video_length_seconds"),
+            "number_in_title_rate": mean("has_number_in_title"),
+            "question_in_title_rate": mean("has_question_in_title"),
+            "emoji_in_title_rate": mean("has_emoji_in_title"),
+            "most_common_weekday": (
+                WEEKDAY_LABELS[int(np.bincount(weekday, minlength=7).argmax())]
+                if weekday.size and weekday.min() >= 0 and weekday.max() < 7 else None
+            ),
+            "most_common_hour": int(np.bincount(hour).argmax()) if hour.size and hour.min() >= 0 else None,
+        }
+
+    def _deciles(self, columns: Dict[str, np.ndarray]) -> Dict[str, Any]:
+        """スコア上位10%と下位10%の特徴比較"""
+        score = columns["performance_score"]
+        valid = ~np.isnan(score)
+        if valid.sum() < MIN_GROUP_SIZE:
+            return {}
+        low, high = np.percentile(score[valid], [10, 90])
+        top = valid & (score >= high)
+        bottom = valid & (score <= low)
+        return {
+            "top_10_percent": {
+                **self._profile(columns, top),
+                "top_tags": self._top_tags(top),
+            },
+            "bottom_10_percent": {
+                **self._profile(columns, bottom),
+                "top_tags": self._top_tags(bottom),
+            },
+        }
+
+    def _correlations(self, columns: Dict[str, np.ndarray]) -> Dict[str, Optional[float]]:
+        """スコアと各特徴量のピアソン相関係数"""
+        score = columns["performance_score"]
+        result: Dict[str, Optional[float]] = {}
+        for name in CORRELATION_FEATURES:
+            feature = columns[name]
+            mask = ~np.isnan(score) & ~np.isnan(feature)
+            x, y = feature[mask], score[mask]
+            if x.size < MIN_GROUP_SIZE or x.std() == 0 or y.std() == 0:
+                result[name] = None
+                continue
+            result[name] = _round(np.corrcoef(x, y)[0, 1], 3)
+        return result
+
+    def _top_tags(self, mask: np.ndarray, limit: int = 5) -> List[str]:
+        counter: Counter = Counter()
+        for tags, selected in zip(self._tags, mask):
+            if selected:
+                counter.update(tags)
+        return [tag for tag, _ in counter.most_common(limit)]
+
+    def _tag_stats(self, score: np.ndarray) -> List[Dict[str, Any]]:
+        """頻出タグごとの件数と平均スコア（上位MAX_TAGS件）"""
+        counts: Counter = Counter()
+        totals: Dict[str, float] = defaultdict(float)
+        scored: Counter = Counter()
+        for tags, value in zip(self._tags, score):
+            for tag in set(tags):
+                counts[tag] += 1
+                if not np.isnan(value):
+                    totals[tag] += value
+                    scored[tag] += 1
+
+        return [
+            {
+                "tag": tag,
+                "count": count,
+                "avg_score": _round(totals[tag] / scored[tag]) if scored[tag] else None,
+            }
+            for tag, count in counts.most_common(MAX_TAGS)
+            if count >= MIN_TAG_COUNT
+        ]
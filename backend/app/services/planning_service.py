@@ -59,6 +59,7 @@ from app.schemas.planning import (
     TypeStats,
     MonthStats,
 )
+from app.services.chat_message_store import planning_chat_store
 
 
 class PlanningService:
@@ -514,14 +515,12 @@ class PlanningService:
                 detail="チャットセッションが見つかりません",
             )
 
-        # ユーザーメッセージを追加
-        user_message_id = uuid4()
+        # ユーザーメッセージ
         user_message = {
-            "message_id": str(user_message_id),
-            "type": "user",
+            "id": uuid4(),
+            "role": "user",
             "content": request.content,
             "suggestions": [],
-            "created_at": datetime.utcnow().isoformat(),
         }
 
         # TODO: AI応答生成（Claude/Gemini API連携）
@@ -555,8 +554,8 @@ class PlanningService:
             db.add(suggestion)
 
         assistant_message = {
-            "message_id": str(assistant_message_id),
-            "type": "assistant",
+            "id": assistant_message_id,
+            "role": "assistant",
             "content": f"「{request.content}」についての企画案を考えました！ナレッジを参照すると、ターゲット層に合った以下の企画が効果的です。",
             "suggestions": [
                 {
@@ -570,14 +569,12 @@ class PlanningService:
                 }
                 for s in stub_suggestions
             ],
-            "created_at": datetime.utcnow().isoformat(),
         }
 
-        # メッセージ履歴を更新
-        messages = list(session.messages) if session.messages else []
-        messages.append(user_message)
-        messages.append(assistant_message)
-        session.messages = messages
+        # メッセージを追記
+        _, assistant_row = await planning_chat_store.append(
+            db, session_id, [user_message, assistant_message]
+        )
         session.updated_at = datetime.utcnow()
 
         await db.commit()
@@ -598,7 +595,7 @@ class PlanningService:
                 )
                 for s in stub_suggestions
             ],
-            created_at=datetime.utcnow(),
+            created_at=assistant_row.created_at,
         )
 
     @staticmethod
@@ -635,30 +632,25 @@ class PlanningService:
                 detail="チャットセッションが見つかりません",
             )
 
-        messages = session.messages if session.messages else []
-
-        # beforeでフィルタ
+        # beforeが存在しないメッセージIDの場合は空の履歴を返す
+        before_id = None
         if before:
-            filtered = []
-            found = False
-            for msg in reversed(messages):
-                if found:
-                    filtered.insert(0, msg)
-                if msg.get("message_id") == before:
-                    found = True
-            messages = filtered
-
-        # limitで制限
-        has_more = len(messages) > limit
-        messages = messages[-limit:]
+            try:
+                before_id = UUID(before)
+            except ValueError:
+                return ChatHistoryResponse(session_id=session_id, messages=[], has_more=False)
+
+        messages, has_more = await planning_chat_store.fetch_window(
+            db, session_id, limit=limit, before_id=before_id
+        )
 
         return ChatHistoryResponse(
             session_id=session_id,
             messages=[
                 ChatMessageItem(
-                    message_id=UUID(msg["message_id"]),
-                    type=msg["type"],
-                    content=msg["content"],
+                    message_id=msg.id,
+                    type=msg.role,
+                    content=msg.content,
                     suggestions=[
                         AISuggestionItem(
                             id=UUID(s["id"]),
@@ -669,9 +661,9 @@ class PlanningService:
                             estimated_views=s.get("estimated_views"),
                             confidence=s.get("confidence"),
                         )
-                        for s in msg.get("suggestions", [])
+                        for s in (msg.suggestions or [])
                     ],
-                    created_at=datetime.fromisoformat(msg["created_at"]),
+                    created_at=msg.created_at,
                 )
                 for msg in messages
             ],
@@ -11,6 +11,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
+from app.core.database import released_connection
 from app.models import Video, Script
 from app.models.production import (
     AudioGeneration,
@@ -86,46 +87,47 @@ class AudioService:
         gen_status = GenerationStatus.COMPLETED
         message = "音声の生成が完了しました"
 
-        # MiniMax Audio APIが利用可能な場合
+        # MiniMax Audio APIが利用可能な場合（生成・アップロード中は接続をプールへ返却）
         if minimax_audio.is_available() and final_text:
-            try:
-                result = await minimax_audio.text_to_speech(
-                    text=final_text,
-                    voice_id=voice_id,
-                    speed=request.speed or 1.0,
-                    pitch=request.pitch or 0.0,
-                    output_format="mp3",
-                    model="speech-02-hd",
-                    emotion="neutral",
-                )
+            async with released_connection(db, "audio_generation"):
+                try:
+                    result = await minimax_audio.text_to_speech(
+                        text=final_text,
+                        voice_id=voice_id,
+                        speed=request.speed or 1.0,
+                        pitch=request.pitch or 0.0,
+                        output_format="mp3",
+                        model="speech-02-hd",
+                        emotion="neutral",
+                    )
 
-                if "error" not in result:
-                    # API成功 - base64データを受け取る
-                    audio_data_base64 = result.get("audio_data", "")
-                    if audio_data_base64:
-                        # Google Cloud Storageにアップロードして公開URLを取得
-                        try:
-                            filename = f"audio_{request.video_id}_{voice_id}.mp3"
-                            audio_url = await gcs_service.upload_from_base64(
-                                base64_data=audio_data_base64,
-                                filename=filename,
-                                content_type="audio/mpeg",
-                            )
-                        except Exception as e:
-                            print(f"Failed to upload audio to GCS: {e}")
-                            # フォールバック: data URLとして保存（本番では推奨しない）
-                            audio_url = f"data:audio/mp3;base64,{audio_data_base64[:100]}..."
-
-                    duration = result.get("duration", 0) or duration
-                    gen_status = GenerationStatus.COMPLETED
-                    message = "MiniMax Audioによる音声生成が完了しました"
-                else:
-                    # APIエラー - スタブにフォールバック
-                    print(f"MiniMax Audio error: {result.get('error')}")
+                    if "error" not in result:
+                        # API成功 - base64データを受け取る
+                        audio_data_base64 = result.get("audio_data", "")
+                        if audio_data_base64:
+                            # Google Cloud Storageにアップロードして公開URLを取得
+                            try:
+                                filename = f"audio_{request.video_id}_{voice_id}.mp3"
+                                audio_url = await gcs_service.upload_from_base64(
+                                    base64_data=audio_data_base64,
+                                    filename=filename,
+                                    content_type="audio/mpeg",
+                                )
+                            except Exception as e:
+                                print(f"Failed to upload audio to GCS: {e}")
+                                # フォールバック: data URLとして保存（本番では推奨しない）
+                                audio_url = f"data:audio/mp3;base64,{audio_data_base64[:100]}..."
+
+                        duration = result.get("duration", 0) or duration
+                        gen_status = GenerationStatus.COMPLETED
+                        message = "MiniMax Audioによる音声生成が完了しました"
+                    else:
+                        # APIエラー - スタブにフォールバック
+                        print(f"MiniMax Audio error: {result.get('error')}")
+                        message = "音声の生成が完了しました（フォールバック）"
+                except Exception as e:
+                    print(f"MiniMax Audio exception: {e}")
                     message = "音声の生成が完了しました（フォールバック）"
-            except Exception as e:
-                print(f"MiniMax Audio exception: {e}")
-                message = "音声の生成が完了しました（フォールバック）"
 
         # 音声生成レコード作成
         audio = AudioGeneration(
@@ -6,11 +6,12 @@
 from datetime import datetime
 from typing import Optional
 from uuid import UUID
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 from fastapi import HTTPException, status
 
+from app.core.pagination import Page, paginate
 from app.models import (
     Project,
     ProjectStatus,
@@ -68,20 +69,24 @@ class ProjectService:
         page: int = 1,
         limit: int = 20,
         client_id: Optional[UUID] = None,
-        status: Optional[ProjectStatus] = None
-    ) -> tuple[list[Project], int]:
+        status: Optional[ProjectStatus] = None,
+        cursor: Optional[str] = None,
+        exact_count: bool = False,
+    ) -> Page[Project]:
         """
         プロジェクト一覧取得
 
         Args:
             db: データベースセッション
-            page: ページ番号（1始まり）
+            page: ページ番号（1始まり、cursor指定時は無視）
             limit: 1ページあたりの件数
             client_id: フィルタ用クライアントID
             status: フィルタ用ステータス
+            cursor: 前ページの next_cursor（キーセットページング）
+            exact_count: 正確な総件数を数えるか（デフォルトは推定値）
 
         Returns:
-            (プロジェクトリスト, 総件数)のタプル
+            Page: プロジェクトリスト、総件数、次ページのカーソル
         """
         # ベースクエリ
         query = select(Project)
@@ -94,20 +99,16 @@ class ProjectService:
         if status:
             query = query.where(Project.status == status)
 
-        # 総件数取得
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await db.execute(count_query)
-        total = total_result.scalar_one()
-
-        # ページネーション
-        offset = (page - 1) * limit
-        query = query.order_by(Project.created_at.desc()).offset(offset).limit(limit)
-
-        # データ取得
-        result = await db.execute(query)
-        projects = result.scalars().all()
-
-        return list(projects), total
+        return await paginate(
+            db,
+            query,
+            sort_column=Project.created_at,
+            id_column=Project.id,
+            limit=limit,
+            cursor=cursor,
+            offset=(page - 1) * limit,
+            exact_count=exact_count,
+        )
 
     @staticmethod
     async def get_project_by_id(
@@ -0,0 +1,238 @@
+"""
+RAG解析のチャンク分割・結果統合モジュール
+
+長いドキュメントを map-reduce で解析するための部品を提供
+
+- チャンク境界は内容から決める（文・行の区切りのハッシュで切る）ため、
+  一部を編集したドキュメントでも編集箇所以外のチャンクは同じ内容になる
+- チャンク単位の抽出結果は内容ハッシュをキーにキャッシュする
+- 各チャンクの抽出結果を信頼度で重み付けして1つの結果に統合する
+"""
+import hashlib
+import json
+import re
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.cache import cache
+
+# チャンクサイズ（文字数）
+RAG_CHUNK_MIN_SIZE = 4000
+RAG_CHUNK_MAX_SIZE = 10000
+
+# 前チャンク末尾から引き継ぐ文字数（区切りをまたぐ記述の取りこぼし防止）
+RAG_CHUNK_OVERLAP = 600
+
+# 区切り位置を決めるハッシュの法（大きいほどチャンクが長くなる）
+RAG_BOUNDARY_MODULUS = 8
+
+# 同時に解析するチャンク数
+RAG_MAX_CONCURRENCY = 4
+
+# チャンク解析結果のキャッシュ（プロンプト変更時はバージョンを上げる）
+RAG_CHUNK_CACHE_TTL = 7 * 24 * 60 * 60
+RAG_PROMPT_VERSION = "v1"
+
+# 次点の候補がこの比率以上の重みを持つ場合は確認対象にする
+RAG_CONFLICT_RATIO = 0.6
+
+# チャンクが信頼度を返さなかった場合の既定値
+RAG_DEFAULT_CONFIDENCE = 0.5
+
+_UNIT_PATTERN = re.compile(r"[^。！？!?\n]*(?:[。！？!?]+|\n+|$)")
+
+
+def _split_units(content: str) -> List[str]:
+    """文・行単位に分割（長すぎる単位は最大サイズで切る）"""
+    units = []
+    for match in _UNIT_PATTERN.finditer(content):
+        unit = match.group(0)
+        if not unit:
+            continue
+        while len(unit) > RAG_CHUNK_MAX_SIZE:
+            units.append(unit[:RAG_CHUNK_MAX_SIZE])
+            unit = unit[RAG_CHUNK_MAX_SIZE:]
+        if unit:
+            units.append(unit)
+    return units
+
+
+def _is_boundary(unit: str) -> bool:
+    return zlib.crc32(unit.encode("utf-8")) % RAG_BOUNDARY_MODULUS == 0
+
+
+def split_into_chunks(content: str) -> List[str]:
+    """
+    ドキュメントを重複付きのチャンクに分割
+
+    最小サイズを超えた後、ハッシュが条件を満たす文の直後で区切る
+    （最大サイズを超える場合は強制的に区切る）
+
+    Args:
+        content: ドキュメント全文
+
+    Returns:
+        List[str]: チャンク（2番目以降は前チャンクの末尾を先頭に含む）
+    """
+    if len(content) <= RAG_CHUNK_MAX_SIZE:
+        return [content] if content.strip() else []
+
+    bodies: List[List[str]] = []
+    current: List[str] = []
+    size = 0
+    for unit in _split_units(content):
+        if current and size + len(unit) > RAG_CHUNK_MAX_SIZE:
+            bodies.append(current)
+            current, size = [], 0
+        current.append(unit)
+        size += len(unit)
+        if size >= RAG_CHUNK_MIN_SIZE and _is_boundary(unit):
+            bodies.append(current)
+            current, size = [], 0
+    if current:
+        bodies.append(current)
+
+    chunks = []
+    previous: List[str] = []
+    for body in bodies:
+        overlap: List[str] = []
+        overlap_size = 0
+        for unit in reversed(previous):
+            if overlap_size + len(unit) > RAG_CHUNK_OVERLAP:
+                break
+            overlap.insert(0, unit)
+            overlap_size += len(unit)
+        chunks.append("".join(overlap + body))
+        previous = body
+    return chunks
+
+
+def chunk_cache_key(chunk: str) -> str:
+    """チャンク内容のハッシュからキャッシュキーを生成"""
+    digest = hashlib.sha256(f"{RAG_PROMPT_VERSION}\n{chunk}".encode("utf-8")).hexdigest()
+    return f"rag:chunk:{digest}"
+
+
+async def get_cached_chunk_result(chunk: str) -> Optional[Dict[str, Any]]:
+    """キャッシュ済みのチャンク解析結果を取得"""
+    return await cache.get(chunk_cache_key(chunk))
+
+
+async def set_cached_chunk_result(chunk: str, result: Dict[str, Any]) -> None:
+    """チャンク解析結果をキャッシュ"""
+    await cache.set(chunk_cache_key(chunk), result, ttl=RAG_CHUNK_CACHE_TTL)
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def _normalize(value: Any) -> str:
+    """同一値判定用の正規化（空白・大文字小文字の差を無視）"""
+    if isinstance(value, str):
+        return re.sub(r"\s+", "", value).lower()
+    return json.dumps(value, ensure_ascii=False, sort_keys=True)
+
+
+def _display(value: Any) -> str:
+    return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+
+
+def _chunk_confidence(result: Dict[str, Any]) -> float:
+    try:
+        confidence = float(result.get("confidence", RAG_DEFAULT_CONFIDENCE))
+    except (TypeError, ValueError):
+        confidence = RAG_DEFAULT_CONFIDENCE
+    return min(max(confidence, 0.0), 1.0)
+
+
+def merge_chunk_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    チャンクごとの抽出結果を信頼度で重み付けして統合
+
+    - フィールドごとに正規化した値で候補をまとめ、チャンク信頼度の合計が最大の値を採用
+      （同点の場合はより具体的な＝長い値、次に先頭側のチャンクを優先）
+    - 次点の候補が RAG_CONFLICT_RATIO 以上の重みを持つ場合は needs_confirmation に追加
+    - 全体の信頼度は抽出フィールド数で重み付けしたチャンク信頼度の平均
+
+    Args:
+        results: チャンクごとの解析結果（extracted_data, confidence, needs_confirmation）
+
+    Returns:
+        Dict: 統合した解析結果（単一チャンク解析と同じ形式）
+    """
+    # (step, field) -> 正規化値 -> [重み合計, 値, 最初のチャンク番号]
+    candidates: Dict[Tuple[str, str], Dict[str, List[Any]]] = {}
+    steps: List[str] = []
+    weighted_confidence = 0.0
+    field_count = 0
+    confidences = []
+
+    for index, result in enumerate(results):
+        confidence = _chunk_confidence(result)
+        confidences.append(confidence)
+        extracted = result.get("extracted_data") or {}
+        chunk_fields = 0
+        for step, step_data in extracted.items():
+            if step not in steps:
+                steps.append(step)
+            if not isinstance(step_data, dict):
+                continue
+            for field, value in step_data.items():
+                if isinstance(value, str):
+                    value = value.strip()
+                if _is_empty(value):
+                    continue
+                chunk_fields += 1
+                groups = candidates.setdefault((step, field), {})
+                group = groups.setdefault(_normalize(value), [0.0, value, index])
+                group[0] += confidence
+                if len(_display(value)) > len(_display(group[1])):
+                    group[1] = value
+        weighted_confidence += confidence * chunk_fields
+        field_count += chunk_fields
+
+    merged: Dict[str, Optional[Dict[str, Any]]] = {step: None for step in steps}
+    needs_confirmation: List[Dict[str, Any]] = []
+    confirmed_keys = set()
+
+    for (step, field), groups in candidates.items():
+        ranked = sorted(
+            groups.values(),
+            key=lambda g: (-g[0], -len(_display(g[1])), g[2]),
+        )
+        best_weight, best_value, _ = ranked[0]
+        merged[step] = merged[step] or {}
+        merged[step][field] = best_value
+
+        rivals = [g for g in ranked[1:] if g[0] >= best_weight * RAG_CONFLICT_RATIO]
+        if rivals:
+            confirmed_keys.add((step, field))
+            needs_confirmation.append({
+                "step": step,
+                "field": field,
+                "value": _display(best_value),
+                "reason": "ドキュメント内の複数箇所で異なる内容が抽出されました（他の候補: "
+                + " / ".join(_display(g[1]) for g in rivals[:3])
+                + "）",
+            })
+
+    # チャンク単位の確認事項は採用したフィールドのものだけ重複なく残す
+    for result in results:
+        for item in result.get("needs_confirmation") or []:
+            key = (item.get("step"), item.get("field"))
+            if key in confirmed_keys or key not in candidates:
+                continue
+            confirmed_keys.add(key)
+            needs_confirmation.append(item)
+
+    if field_count:
+        confidence = weighted_confidence / field_count
+    else:
+        confidence = sum(confidences) / len(confidences) if confidences else 0.0
+
+    return {
+        "extracted_data": merged,
+        "confidence": confidence,
+        "needs_confirmation": needs_confirmation,
+    }
@@ -6,6 +6,7 @@
 - Social Blade API連携
 - コメント分析
 """
+import asyncio
 from datetime import datetime, timedelta
 from typing import Optional, List
 from sqlalchemy import select
@@ -17,6 +18,7 @@ from app.models.user import UserRole
 from app.services.external.youtube_api import youtube_api
 from app.services.external.serp_api import serp_api
 from app.services.external.social_blade_api import social_blade_api
+from app.services.comment_analytics import analyze_video_comments
 from app.schemas.research import (
     # 競合調査系
     VideoSummary,
@@ -87,13 +89,14 @@ class ResearchService:
             channels = await youtube_api.search_channels(query, max_results=limit)
 
             if channels:
-                result_channels = []
-                for ch in channels:
-                    # 各チャンネルの最新動画を取得
-                    recent_videos_data = await youtube_api.get_channel_videos(
-                        ch["channel_id"], max_results=3
-                    )
+                # 各チャンネルの最新動画を並行取得（同時実行数は youtube_upstream で制限）
+                channel_videos = await asyncio.gather(*(
+                    youtube_api.get_channel_videos(ch["channel_id"], max_results=3)
+                    for ch in channels
+                ))
 
+                result_channels = []
+                for ch, recent_videos_data in zip(channels, channel_videos):
                     recent_videos = [
                         VideoSummary(
                             video_id=v["video_id"],
@@ -232,13 +235,21 @@ class ResearchService:
             trends_data = await serp_api.search_google_trends(query)
 
             if trends_data:
+                trends = trends_data[:limit]
+
+                # 急上昇キーワードの関連キーワードを並行取得（同時実行数は serp_upstream で制限）
+                rising = [t["keyword"] for t in trends if t.get("trend_direction") == "up"]
+                rising_related = await asyncio.gather(*(
+                    serp_api.search_google_trends(keyword) for keyword in rising
+                ))
+                related_by_keyword = dict(zip(rising, rising_related))
+
                 result_trends = []
-                for trend in trends_data[:limit]:
+                for trend in trends:
                     # 関連キーワードを取得
                     related = []
                     if trend.get("trend_direction") == "up":
-                        # 急上昇キーワードの場合、追加の検索を行う
-                        related_data = await serp_api.search_google_trends(trend["keyword"])
+                        related_data = related_by_keyword.get(trend["keyword"], [])
                         related = [r["keyword"] for r in related_data[:3] if r["keyword"] != trend["keyword"]]
 
                     result_trends.append(
@@ -399,51 +410,21 @@ class ResearchService:
         """
         コメント感情分析を取得
 
-        YouTube Comments API連携 + 簡易感情分析
+        YouTube Comments API連携 + 辞書ベースの感情分析（否定表現に対応）
         """
         ResearchService._check_research_permission(current_user_role, "コメント感情分析")
 
-        # YouTube APIが利用可能な場合、実際のコメントを取得して分析
+        # YouTube APIが利用可能な場合、コメントを全件取得して分析
         if youtube_api.is_available():
-            comments = await youtube_api.get_video_comments(video_id, max_results=100)
+            index = await analyze_video_comments(video_id)
 
-            if comments:
-                # 簡易感情分析（ポジティブ/ネガティブワードによる分類）
-                positive_words = ["最高", "素晴らしい", "わかりやすい", "ありがとう", "参考", "いい", "良い", "すごい"]
-                negative_words = ["わからない", "つまらない", "悪い", "残念", "改善", "聞き取れない"]
-
-                positive_comments = []
-                negative_comments = []
-                neutral_count = 0
-
-                for comment in comments:
-                    text = comment["text"]
-                    is_positive = any(w in text for w in positive_words)
-                    is_negative = any(w in text for w in negative_words)
-
-                    if is_positive and not is_negative:
-                        positive_comments.append(text)
-                    elif is_negative and not is_positive:
-                        negative_comments.append(text)
-                    else:
-                        neutral_count += 1
-
-                total = len(comments)
-                pos_count = len(positive_comments)
-                neg_count = len(negative_comments)
-
-                sentiment = CommentSentiment(
-                    video_id=video_id,
-                    positive_ratio=round(pos_count / total, 2) if total > 0 else 0,
-                    negative_ratio=round(neg_count / total, 2) if total > 0 else 0,
-                    neutral_ratio=round(neutral_count / total, 2) if total > 0 else 0,
-                    sample_positive=positive_comments[:3],
-                    sample_negative=negative_comments[:2],
-                )
+            if index:
+                summary = index.sentiment_summary()
+                sentiment = CommentSentiment(video_id=video_id, **summary)
 
                 return CommentSentimentResponse(
                     sentiment=sentiment,
-                    total_comments_analyzed=total,
+                    total_comments_analyzed=index.size,
                     analyzed_at=datetime.utcnow().isoformat(),
                 )
 
@@ -480,37 +461,23 @@ class ResearchService:
         """
         コメントキーワード抽出
 
-        YouTube Comments API連携 + 簡易キーワード抽出
+        YouTube Comments API連携 + 形態素解析によるキーワード抽出
         """
         ResearchService._check_research_permission(current_user_role, "コメントキーワード抽出")
 
-        # YouTube APIが利用可能な場合
+        # YouTube APIが利用可能な場合、コメントを全件取得して転置インデックスから集計
         if youtube_api.is_available():
-            comments = await youtube_api.get_video_comments(video_id, max_results=100)
-
-            if comments:
-                # 簡易キーワード抽出（頻出単語カウント）
-                from collections import Counter
-                import re
-
-                all_text = " ".join([c["text"] for c in comments])
-                # 簡易トークン化（日本語対応）
-                words = re.findall(r'[a-zA-Z]+|[ぁ-んァ-ン一-龥]+', all_text)
-                # 2文字以上の単語のみ
-                words = [w for w in words if len(w) >= 2]
-                word_counts = Counter(words).most_common(limit)
+            index = await analyze_video_comments(video_id)
 
+            if index:
                 keywords = [
                     CommentKeyword(
-                        keyword=word,
-                        frequency=count,
-                        sentiment="neutral",
-                        context_samples=[
-                            c["text"][:100] for c in comments
-                            if word in c["text"]
-                        ][:2],
+                        keyword=stat.keyword,
+                        frequency=stat.frequency,
+                        sentiment=stat.sentiment,
+                        context_samples=stat.context_samples,
                     )
-                    for word, count in word_counts
+                    for stat in index.top_keywords(limit)
                 ]
 
                 return CommentKeywordListResponse(
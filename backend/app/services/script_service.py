@@ -37,7 +37,10 @@ from app.schemas.script import (
     ThumbnailResponse,
     ThumbnailGenerateResponse,
 )
+from app.core.database import AsyncSessionLocal
+from app.core.sse import sse_broker, Emit
 from app.services.external import claude_client, gemini_client
+from app.services.external.provider_router import provider_router
 from app.services.central_db_service import central_db_service
 
 logger = logging.getLogger(__name__)
@@ -66,6 +69,150 @@ class ScriptService:
         Returns:
             ScriptGenerateResponse: 生成開始レスポンス
         """
+        knowledge_context = await ScriptService._prepare_generation(db, current_user_role, request)
+
+        # AI APIで台本生成
+        content = None
+        word_count = 200
+        estimated_duration = request.target_duration or 180
+
+        # Claudeを選択した場合
+        if request.generator == GeneratorType.CLAUDE and claude_client.is_available():
+            result = await claude_client.generate_script(
+                prompt=request.prompt,
+                title=request.title,
+                target_duration=request.target_duration or 180,
+                style=request.style or "educational",
+                knowledge_context=knowledge_context,
+            )
+            if result.get("content"):
+                content = result["content"]
+                word_count = result.get("word_count", len(content))
+                estimated_duration = result.get("estimated_duration", 180)
+
+        # Geminiを選択した場合
+        elif request.generator == GeneratorType.GEMINI and gemini_client.is_available():
+            result = await gemini_client.generate_script(
+                prompt=request.prompt,
+                title=request.title,
+                target_duration=request.target_duration or 180,
+                style=request.style or "educational",
+                knowledge_context=knowledge_context,
+            )
+            if result.get("content"):
+                content = result["content"]
+                word_count = result.get("word_count", len(content))
+                estimated_duration = result.get("estimated_duration", 180)
+
+        # APIが利用できない場合はスタブデータを使用
+        if content is None:
+            content = ScriptService._stub_script_content(request)
+            word_count = len(content)
+
+        script = await ScriptService._save_script(
+            db, request, content, word_count, estimated_duration, knowledge_context
+        )
+
+        return ScriptGenerateResponse(
+            script_id=script.id,
+            status=script.status,
+            message="台本の生成が完了しました",
+            estimated_completion=0,
+        )
+
+    @staticmethod
+    async def stream_generate_script(
+        db: AsyncSession,
+        current_user_role: str,
+        request: ScriptGenerateRequest,
+    ) -> str:
+        """
+        台本をストリーミング生成（SSE）
+
+        権限・動画の確認とナレッジ取得はリクエスト内で行い、
+        生成と保存はクライアント接続と独立したバックグラウンドタスクで実行する
+
+        イベント:
+            meta: 生成条件
+            token: 生成されたテキスト断片 {"text": str}
+            result: 保存後の ScriptGenerateResponse
+
+        Args:
+            db: データベースセッション
+            current_user_role: 実行者のロール
+            request: 台本生成リクエスト
+
+        Returns:
+            str: ストリームID
+        """
+        knowledge_context = await ScriptService._prepare_generation(db, current_user_role, request)
+
+        stream_params = dict(
+            prompt=request.prompt,
+            title=request.title,
+            target_duration=request.target_duration or 180,
+            style=request.style or "educational",
+            knowledge_context=knowledge_context,
+        )
+        if request.generator == GeneratorType.CLAUDE and claude_client.is_available():
+            source = claude_client.stream_script(**stream_params)
+        elif request.generator == GeneratorType.GEMINI and gemini_client.is_available():
+            source = gemini_client.stream_script(**stream_params)
+        else:
+            source = None
+
+        async def producer(emit: Emit) -> None:
+            await emit("meta", {
+                "generator": request.generator.value,
+                "has_knowledge_context": knowledge_context is not None,
+            })
+
+            parts = []
+            if source is not None:
+                try:
+                    async for text in source:
+                        parts.append(text)
+                        await emit("token", {"text": text})
+                except Exception as e:
+                    # 途中まで配信済みの場合は不完全な台本を保存しない
+                    if parts:
+                        raise
+                    logger.warning(f"Script stream failed, falling back to stub: {e}")
+
+            content = "".join(parts)
+            if not content:
+                content = ScriptService._stub_script_content(request)
+                await emit("token", {"text": content})
+
+            word_count = len(content)
+            estimated_duration = int(word_count / 300 * 60) if parts else (request.target_duration or 180)
+
+            async with AsyncSessionLocal() as session:
+                script = await ScriptService._save_script(
+                    session, request, content, word_count, estimated_duration, knowledge_context
+                )
+
+            await emit("result", ScriptGenerateResponse(
+                script_id=script.id,
+                status=script.status,
+                message="台本の生成が完了しました",
+                estimated_completion=0,
+            ).model_dump(mode="json"))
+
+        return sse_broker.start(producer)
+
+    @staticmethod
+    async def _prepare_generation(
+        db: AsyncSession,
+        current_user_role: str,
+        request: ScriptGenerateRequest,
+    ) -> Optional[str]:
+        """
+        台本生成の前処理（権限・動画確認とナレッジコンテキスト取得）
+
+        Returns:
+            Optional[str]: ナレッジコンテキスト
+        """
         if current_user_role not in [UserRole.OWNER.value, UserRole.TEAM.value]:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -103,43 +250,12 @@ class ScriptService:
         except Exception as e:
             logger.warning(f"Failed to get Central DB context: {e}")
 
-        # AI APIで台本生成
-        content = None
-        word_count = 200
-        estimated_duration = request.target_duration or 180
-        generator_used = request.generator.value
+        return knowledge_context
 
-        # Claudeを選択した場合
-        if request.generator == GeneratorType.CLAUDE and claude_client.is_available():
-            result = await claude_client.generate_script(
-                prompt=request.prompt,
-                title=request.title,
-                target_duration=request.target_duration or 180,
-                style=request.style or "educational",
-                knowledge_context=knowledge_context,
-            )
-            if result.get("content"):
-                content = result["content"]
-                word_count = result.get("word_count", len(content))
-                estimated_duration = result.get("estimated_duration", 180)
-
-        # Geminiを選択した場合
-        elif request.generator == GeneratorType.GEMINI and gemini_client.is_available():
-            result = await gemini_client.generate_script(
-                prompt=request.prompt,
-                title=request.title,
-                target_duration=request.target_duration or 180,
-                style=request.style or "educational",
-                knowledge_context=knowledge_context,
-            )
-            if result.get("content"):
-                content = result["content"]
-                word_count = result.get("word_count", len(content))
-                estimated_duration = result.get("estimated_duration", 180)
-
-        # APIが利用できない場合はスタブデータを使用
-        if content is None:
-            content = f"""【オープニング】
+    @staticmethod
+    def _stub_script_content(request: ScriptGenerateRequest) -> str:
+        """APIが利用できない場合のスタブ台本"""
+        return f"""【オープニング】
 こんにちは！今日は{request.title or 'このトピック'}についてお話しします。
 
 【本編】
@@ -156,9 +272,17 @@ class ScriptService:
 いかがでしたか？
 この動画が参考になったらチャンネル登録よろしくお願いします！
 """
-            word_count = len(content)
 
-        # 台本をDBに保存
+    @staticmethod
+    async def _save_script(
+        db: AsyncSession,
+        request: ScriptGenerateRequest,
+        content: str,
+        word_count: int,
+        estimated_duration: int,
+        knowledge_context: Optional[str],
+    ) -> Script:
+        """生成した台本をDBとCentral DBに保存"""
         script = Script(
             video_id=request.video_id,
             knowledge_id=request.knowledge_id,
@@ -170,7 +294,7 @@ class ScriptService:
             word_count=word_count,
             estimated_duration=estimated_duration,
             generation_params={
-                "generator": generator_used,
+                "generator": request.generator.value,
                 "target_duration": request.target_duration,
                 "style": request.style,
                 "has_knowledge_context": knowledge_context is not None,
@@ -192,12 +316,7 @@ class ScriptService:
         except Exception as e:
             logger.warning(f"Failed to save script to Central DB: {e}")
 
-        return ScriptGenerateResponse(
-            script_id=script.id,
-            status=script.status,
-            message="台本の生成が完了しました",
-            estimated_completion=0,
-        )
+        return script
 
     @staticmethod
     async def get_script(
@@ -334,29 +453,25 @@ class MetadataService:
         titles = None
         recommended_index = 0
 
-        # Claude APIで生成を試行
+        # Claude/Geminiをルーター経由で呼び出し（障害時は遮断・ヘッジ）
+        title_params = dict(
+            topic=request.topic or keywords_str,
+            keywords=keywords,
+            style=request.style or "engaging",
+            count=request.count or 5,
+        )
+        operations = {}
         if claude_client.is_available():
-            result = await claude_client.generate_title(
-                topic=request.topic or keywords_str,
-                keywords=keywords,
-                style=request.style or "engaging",
-                count=request.count or 5,
-            )
-            if result.get("titles"):
-                titles = result["titles"]
-                recommended_index = result.get("recommended_index", 0)
-
-        # Claudeが使えない場合はGeminiを試行
-        if titles is None and gemini_client.is_available():
-            result = await gemini_client.generate_title(
-                topic=request.topic or keywords_str,
-                keywords=keywords,
-                style=request.style or "engaging",
-                count=request.count or 5,
-            )
-            if result.get("titles"):
-                titles = result["titles"]
-                recommended_index = result.get("recommended_index", 0)
+            operations["claude"] = lambda: claude_client.generate_title(**title_params)
+        if gemini_client.is_available():
+            operations["gemini"] = lambda: gemini_client.generate_title(**title_params)
+
+        result = await provider_router.call(
+            "metadata.title", operations, accept=lambda r: bool(r.get("titles"))
+        )
+        if result:
+            titles = result["titles"]
+            recommended_index = result.get("recommended_index", 0)
 
         # APIが利用できない場合はスタブデータを使用
         if titles is None:
@@ -425,31 +540,26 @@ class MetadataService:
         description = None
         hashtags = None
 
-        # Claude APIで生成を試行
+        # Claude/Geminiをルーター経由で呼び出し（障害時は遮断・ヘッジ）
+        description_params = dict(
+            title=title,
+            script_summary=request.script_summary,
+            keywords=keywords,
+            include_timestamps=request.include_timestamps,
+            include_links=request.include_links,
+        )
+        operations = {}
         if claude_client.is_available():
-            result = await claude_client.generate_description(
-                title=title,
-                script_summary=request.script_summary,
-                keywords=keywords,
-                include_timestamps=request.include_timestamps,
-                include_links=request.include_links,
-            )
-            if result.get("description"):
-                description = result["description"]
-                hashtags = result.get("hashtags", [])
-
-        # Claudeが使えない場合はGeminiを試行
-        if description is None and gemini_client.is_available():
-            result = await gemini_client.generate_description(
-                title=title,
-                script_summary=request.script_summary,
-                keywords=keywords,
-                include_timestamps=request.include_timestamps,
-                include_links=request.include_links,
-            )
-            if result.get("description"):
-                description = result["description"]
-                hashtags = result.get("hashtags", [])
+            operations["claude"] = lambda: claude_client.generate_description(**description_params)
+        if gemini_client.is_available():
+            operations["gemini"] = lambda: gemini_client.generate_description(**description_params)
+
+        result = await provider_router.call(
+            "metadata.description", operations, accept=lambda r: bool(r.get("description"))
+        )
+        if result:
+            description = result["description"]
+            hashtags = result.get("hashtags", [])
 
         # APIが利用できない場合はスタブデータを使用
         if description is None:
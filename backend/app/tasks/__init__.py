@@ -1,4 +1,4 @@
 """Celery background tasks"""
-from app.tasks.agent_executor import run_agent, run_agent_manual, health_check
+from app.tasks.agent_executor import run_agent, run_idempotent_agent, run_agent_manual, health_check
 
-__all__ = ["run_agent", "run_agent_manual", "health_check"]
+__all__ = ["run_agent", "run_idempotent_agent", "run_agent_manual", "health_check"]
@@ -8,9 +8,9 @@ import asyncio
 from typing import Optional, Dict, Any
 from datetime import datetime
 
-from app.core.celery_config import celery_app
+from app.core.celery_config import IDEMPOTENT_AGENT_TYPES, celery_app
 from app.core.database import AsyncSessionLocal
-from app.models.agent import AgentType
+from app.models.agent import AgentType, TaskPriority
 from app.services.agent_orchestrator_service import AgentOrchestratorService
 from app.services.notification_service import notification_service
 
@@ -33,6 +33,7 @@ async def _execute_agent(
     agent_type_str: str,
     knowledge_id: Optional[str] = None,
     input_data: Optional[Dict[str, Any]] = None,
+    priority: Optional[str] = None,
 ) -> Dict[str, Any]:
     """エージェント実行の内部関数"""
     try:
@@ -40,6 +41,11 @@ async def _execute_agent(
     except ValueError:
         return {"success": False, "error": f"Invalid agent type: {agent_type_str}"}
 
+    try:
+        task_priority = TaskPriority(priority) if priority else TaskPriority.NORMAL
+    except ValueError:
+        task_priority = TaskPriority.NORMAL
+
     async with AsyncSessionLocal() as db:
         orchestrator = AgentOrchestratorService(db)
 
@@ -51,6 +57,7 @@ async def _execute_agent(
             agent_type=agent_type,
             knowledge_id=knowledge_id,
             input_data=input_data,
+            priority=task_priority,
         )
 
         # 通知送信
@@ -129,6 +136,33 @@ def _summarize_result(result: Optional[Dict[str, Any]]) -> Optional[str]:
     return ", ".join(summaries) if summaries else None
 
 
+def _run_with_retries(
+    task,
+    agent_type: str,
+    knowledge_id: Optional[str],
+    input_data: Optional[Dict[str, Any]],
+    priority: Optional[str],
+) -> Dict[str, Any]:
+    """エージェントを実行し、失敗時は task のリトライ設定に従って再試行する"""
+    logger.info(f"Starting agent task: {agent_type}")
+
+    try:
+        result = run_async(_execute_agent(agent_type, knowledge_id, input_data, priority))
+
+        if not result.get("success"):
+            logger.error(f"Agent task failed: {result.get('error')}")
+            # リトライ可能なエラーの場合
+            if task.request.retries < task.max_retries:
+                raise task.retry(exc=Exception(result.get("error")))
+
+        logger.info(f"Agent task completed: {agent_type}")
+        return result
+
+    except Exception as e:
+        logger.error(f"Agent task error: {e}")
+        raise
+
+
 @celery_app.task(
     bind=True,
     name="app.tasks.agent_executor.run_agent",
@@ -140,25 +174,40 @@ def run_agent(
     agent_type: str,
     knowledge_id: Optional[str] = None,
     input_data: Optional[Dict[str, Any]] = None,
+    priority: Optional[str] = None,
 ):
-    """エージェントを実行するCeleryタスク"""
-    logger.info(f"Starting agent task: {agent_type}")
+    """
+    エージェントを実行するCeleryタスク
 
-    try:
-        result = run_async(_execute_agent(agent_type, knowledge_id, input_data))
+    キューはエージェント種別、ブローカー優先度は priority（TaskPriorityの値）から
+    route_agent_task で決定される。受信時にACKするため、ワーカー喪失時も再実行されない
+    （コメント返信などの二重実行を防ぐ）
+    """
+    return _run_with_retries(self, agent_type, knowledge_id, input_data, priority)
 
-        if not result.get("success"):
-            logger.error(f"Agent task failed: {result.get('error')}")
-            # リトライ可能なエラーの場合
-            if self.request.retries < self.max_retries:
-                raise self.retry(exc=Exception(result.get("error")))
 
-        logger.info(f"Agent task completed: {agent_type}")
-        return result
+@celery_app.task(
+    bind=True,
+    name="app.tasks.agent_executor.run_idempotent_agent",
+    max_retries=3,
+    default_retry_delay=60,
+    acks_late=True,
+)
+def run_idempotent_agent(
+    self,
+    agent_type: str,
+    knowledge_id: Optional[str] = None,
+    input_data: Optional[Dict[str, Any]] = None,
+    priority: Optional[str] = None,
+):
+    """
+    冪等なエージェント（IDEMPOTENT_AGENT_TYPES）を実行するCeleryタスク
 
-    except Exception as e:
-        logger.error(f"Agent task error: {e}")
-        raise
+    完了までACKしないため、ワーカー喪失時は再配信されて実行し直される
+    """
+    if AgentType(agent_type) not in IDEMPOTENT_AGENT_TYPES:
+        raise ValueError(f"Agent type '{agent_type}' is not idempotent; use run_agent")
+    return _run_with_retries(self, agent_type, knowledge_id, input_data, priority)
 
 
 @celery_app.task(name="app.tasks.agent_executor.run_agent_manual")
@@ -166,15 +215,20 @@ def run_agent_manual(
     agent_type: str,
     knowledge_id: Optional[str] = None,
     input_data: Optional[Dict[str, Any]] = None,
+    priority: Optional[str] = TaskPriority.HIGH.value,
 ):
-    """手動実行用のエージェントタスク（リトライなし）"""
+    """
+    手動実行用のエージェントタスク（リトライなし）
+
+    agents.interactive キューに最高優先度で投入され、スケジュール実行より先に処理される
+    """
     logger.info(f"Starting manual agent task: {agent_type}")
-    result = run_async(_execute_agent(agent_type, knowledge_id, input_data))
+    result = run_async(_execute_agent(agent_type, knowledge_id, input_data, priority))
     logger.info(f"Manual agent task completed: {agent_type}")
     return result
 
 
-@celery_app.task(name="app.tasks.agent_executor.health_check")
+@celery_app.task(name="app.tasks.agent_executor.health_check", acks_late=True)
 def health_check():
     """Celeryワーカーのヘルスチェック"""
     return {
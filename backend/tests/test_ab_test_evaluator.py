@@ -0,0 +1,177 @@
+"""
+A/Bテスト評価エンジンのテスト
+
+2標本比率のz検定、逐次検定による早期終了（繰り返し評価しても第1種の過誤が α 以下）、
+ベイズ事後分布（最良確率）、多重比較の補正とコントロールの選択を検証
+"""
+import uuid
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services.ab_test_evaluator import (
+    STOP_INCONCLUSIVE,
+    STOP_SIGNIFICANT,
+    evaluate,
+    evaluate_ab_test,
+    sequential_boundary,
+)
+
+
+def _rng():
+    return np.random.default_rng(42)
+
+
+class TestEvaluate:
+    """evaluateのテスト"""
+
+    def test_two_proportion_z_test(self):
+        result = evaluate(["A", "B"], [1000, 1000], [50, 80], rng=_rng())
+
+        treatment = result.variants[1]
+        # プールした比率 0.065 から z = 0.03 / sqrt(0.065 * 0.935 * 2 / 1000)
+        assert treatment.z_score == pytest.approx(2.7211, abs=1e-3)
+        assert treatment.p_value == pytest.approx(0.0065, abs=1e-3)
+        assert result.confidence_interval["lower"] < 3.0 < result.confidence_interval["upper"]
+        assert (result.decided, result.winner, result.stop_reason) == (True, "B", STOP_SIGNIFICANT)
+
+    def test_clear_winner_stops_early(self):
+        result = evaluate(["A", "B"], [300, 300], [15, 60], min_sample_size=1000, rng=_rng())
+
+        assert result.information_fraction == pytest.approx(0.3)
+        assert result.z_boundary > 1.96
+        assert result.decided is True
+        assert result.winner == "B"
+
+    def test_small_difference_keeps_running_until_planned_sample(self):
+        # 固定サンプルなら有意（z ≈ 2.0）だが、情報量の割合が小さい間は境界が高い
+        early = evaluate(["A", "B"], [4000, 4000], [200, 245], min_sample_size=10000, rng=_rng())
+        assert early.variants[1].z_score > 1.96
+        assert early.decided is False
+
+        # 途中で終了しても境界は緩めない
+        final = evaluate(["A", "B"], [4000, 4000], [200, 245], min_sample_size=10000, final=True, rng=_rng())
+        assert (final.decided, final.winner, final.stop_reason) == (True, None, STOP_INCONCLUSIVE)
+
+    def test_boundary_at_planned_sample_exceeds_fixed_sample_critical_value(self):
+        # t = 1 の境界は c = Φ⁻¹(1 − α/4) ≈ 2.24（固定サンプルの 1.96 ではない）
+        assert sequential_boundary(0.05, 1.0) == pytest.approx(2.2414, abs=1e-4)
+        assert sequential_boundary(0.05, 0.25) == pytest.approx(2 * 2.2414, abs=1e-3)
+        assert sequential_boundary(0.05, 0.0) is None
+
+        # z ≈ 2.06 は固定サンプルなら有意だが、繰り返し評価する前提では有意としない
+        result = evaluate(["A", "B"], [1000, 1000], [50, 72], rng=_rng())
+        assert 1.96 < result.variants[1].z_score < result.z_boundary
+        assert (result.decided, result.winner) == (True, None)
+
+    def test_repeated_looks_keep_false_positive_rate_below_alpha(self):
+        # A/Aテストを計画サンプルまで20回評価しても、偽陽性率は α を超えない
+        rng = np.random.default_rng(7)
+        planned, looks, simulations, ctr = 2000, 20, 400, 0.05
+        step = planned // looks
+        false_positives = naive_false_positives = 0
+        for _ in range(simulations):
+            clicks = rng.binomial(1, ctr, size=(2, planned)).cumsum(axis=1)
+            stopped = naive_stopped = False
+            for n in range(step, planned + 1, step):
+                result = evaluate(
+                    ["A", "B"], [n, n], clicks[:, n - 1].tolist(),
+                    min_sample_size=planned, samples=10, rng=rng,
+                )
+                stopped = stopped or result.stop_reason == STOP_SIGNIFICANT
+                naive_stopped = naive_stopped or abs(result.variants[1].z_score) >= 1.96
+            false_positives += stopped
+            naive_false_positives += naive_stopped
+
+        assert false_positives / simulations <= 0.05
+        # 固定サンプルの棄却限界で繰り返し評価すると偽陽性が大きく膨らむ
+        assert naive_false_positives / simulations > 0.1
+
+    def test_no_difference_at_planned_sample_is_inconclusive(self):
+        result = evaluate(["A", "B"], [1000, 1000], [50, 52], rng=_rng())
+
+        assert (result.decided, result.winner, result.stop_reason) == (True, None, STOP_INCONCLUSIVE)
+
+    def test_prob_best_follows_posterior(self):
+        result = evaluate(["A", "B", "C"], [2000, 2000, 2000], [100, 110, 140], rng=_rng())
+
+        prob_best = [v.prob_best for v in result.variants]
+        assert sum(prob_best) == pytest.approx(1.0)
+        assert prob_best[2] > prob_best[1] > prob_best[0]
+        assert result.variants[2].expected_loss < result.variants[0].expected_loss
+
+    def test_bonferroni_adjusts_for_multiple_treatments(self):
+        two = evaluate(["A", "B"], [1000, 1000], [50, 75], rng=_rng())
+        three = evaluate(["A", "B", "C"], [1000, 1000, 1000], [50, 50, 75], rng=_rng())
+
+        assert three.p_value == pytest.approx(two.p_value * 2, rel=1e-3)
+        assert three.z_boundary > two.z_boundary
+
+    def test_no_impressions(self):
+        result = evaluate(["A", "B"], [0, 0], [0, 0], rng=_rng())
+
+        assert result.decided is False
+        assert result.z_boundary is None
+        assert result.p_value == pytest.approx(1.0)
+
+
+    @pytest.mark.parametrize("kwargs", [
+        {"confidence_level": 1.0},
+        {"confidence_level": 0.0},
+        {"min_sample_size": 0},
+    ])
+    def test_rejects_out_of_range_settings(self, kwargs):
+        with pytest.raises(ValueError):
+            evaluate(["A", "B"], [100, 100], [5, 8], rng=_rng(), **kwargs)
+
+    def test_create_schema_bounds_settings(self):
+        from pydantic import ValidationError
+
+        from app.schemas.optimization import ABTestCreate, ABTestVariantUpdate
+
+        base = {"video_id": str(uuid.uuid4()), "name": "サムネイル", "test_type": "thumbnail", "variants": []}
+        with pytest.raises(ValidationError):
+            ABTestCreate(**base, confidence_level=1.0)
+        with pytest.raises(ValidationError):
+            ABTestCreate(**base, min_sample_size=0)
+        with pytest.raises(ValidationError):
+            ABTestVariantUpdate(impressions=-1)
+        assert ABTestCreate(**base).confidence_level == 0.95
+
+
+class TestEvaluateABTest:
+    """evaluate_ab_testのテスト"""
+
+    def test_uses_control_variant(self):
+        ab_test = SimpleNamespace(
+            confidence_level=0.95,
+            min_sample_size=1000,
+            variants=[
+                SimpleNamespace(variant_name="A", is_control=False, impressions=1000, clicks=80),
+                SimpleNamespace(variant_name="B", is_control=True, impressions=1000, clicks=50),
+            ],
+        )
+
+        result = evaluate_ab_test(ab_test, rng=_rng())
+
+        assert result.control == "B"
+        assert result.challenger == "A"
+        assert result.winner == "A"
+        assert result.to_dict()["variants"][0]["variant_name"] == "A"
+
+    def test_missing_settings_use_model_defaults(self):
+        ab_test = SimpleNamespace(
+            confidence_level=None,
+            min_sample_size=None,
+            variants=[
+                SimpleNamespace(variant_name="A", is_control=True, impressions=100, clicks=5),
+                SimpleNamespace(variant_name="B", is_control=False, impressions=100, clicks=6),
+            ],
+        )
+
+        result = evaluate_ab_test(ab_test, rng=_rng())
+
+        # 計画サンプルサイズ1000に対して100件のため、まだ判定しない
+        assert result.information_fraction == pytest.approx(0.1)
+        assert result.decided is False
@@ -5,7 +5,7 @@ AIエージェント統合テスト
 """
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
-from datetime import datetime
+from datetime import date, datetime
 from uuid import uuid4
 
 # Test imports
@@ -77,6 +77,98 @@ class TestTrendMonitorService:
         score = service._calculate_youtube_score(videos)
         assert score == 100  # 10万再生で100点
 
+    @pytest.mark.asyncio
+    async def test_execute_uses_snapshot_deltas_and_dedupes_alerts(self):
+        """差分が小さいキーワードはLLM判定を省略し、未対応アラートは更新されることを確認"""
+        from app.models.agent import TrendAlert, TrendSnapshot
+        from app.services.agents.trend_monitor_service import TrendMonitorService
+
+        mock_db = MagicMock()
+        mock_db.commit = AsyncMock()
+        service = TrendMonitorService(mock_db)
+
+        scores = {"stable": 62.0, "jump": 85.0, "new": 55.0, "quiet": 20.0}
+        previous = {
+            "stable": TrendSnapshot(keyword="stable", score=60.0, importance="low", importance_score=58.0),
+            "jump": TrendSnapshot(keyword="jump", score=55.0, importance="medium", importance_score=55.0),
+        }
+        open_alert = TrendAlert(id=uuid4(), keyword="jump", trend_score=55.0, is_read=True)
+
+        service._get_monitoring_keywords = AsyncMock(return_value=list(scores))
+        service._get_latest_snapshots = AsyncMock(return_value=previous)
+        service._get_open_alerts = AsyncMock(return_value={"jump": open_alert})
+        service._analyze_keyword_trend = AsyncMock(
+            side_effect=lambda kw: {"score": scores[kw], "trends_score": 0, "youtube_score": scores[kw]}
+        )
+        service._evaluate_importance = AsyncMock(return_value="high")
+        service._prune_snapshots = AsyncMock(return_value=3)
+
+        agent = MagicMock(id=uuid4(), knowledge_id=None)
+        result = await service.execute(agent, MagicMock(), {})
+
+        # stable: 差分2で前回判定を再利用、jump / new: LLM判定
+        assert service._evaluate_importance.await_count == 2
+        assert result["importance_evaluations_skipped"] == 1
+        assert result["alerts_created"] == 2
+        assert result["alerts_updated"] == 1
+
+        # 既存アラートは更新され、大きく上昇したため未読に戻る
+        assert open_alert.trend_score == 85.0
+        assert open_alert.is_read is False
+        assert open_alert.growth_rate == pytest.approx(30 / 55)
+
+        # 閾値未満を含む全キーワードのスナップショットを保存
+        snapshots = [c.args[0] for c in mock_db.add.call_args_list if isinstance(c.args[0], TrendSnapshot)]
+        assert {s.keyword for s in snapshots} == set(scores)
+        assert {s.keyword: s.importance for s in snapshots}["stable"] == "low"
+        # 再利用時は判定時のスコアを引き継ぎ、再判定時は今回のスコアを記録
+        importance_scores = {s.keyword: s.importance_score for s in snapshots}
+        assert importance_scores["stable"] == 58.0
+        assert importance_scores["jump"] == 85.0
+        mock_db.commit.assert_awaited_once()
+
+        # 前回スナップショットを残して古いスナップショットを削除
+        assert result["snapshots_pruned"] == 3
+        service._prune_snapshots.assert_awaited_once_with(
+            None, keep_ids=[previous["stable"].id, previous["jump"].id]
+        )
+
+    def test_gradual_rise_is_rejudged_against_importance_score(self):
+        """1回ごとの変化が小さくても、判定時のスコアからの累計の変化で再判定することを確認"""
+        from app.models.agent import TrendSnapshot
+        from app.services.agents.trend_monitor_service import TrendMonitorService
+
+        service = TrendMonitorService(AsyncMock())
+        # 前回から +9 だが、判定時（50）からは +18
+        last = TrendSnapshot(keyword="rising", score=59.0, importance="low", importance_score=50.0)
+
+        assert service._can_reuse_importance(last, 68.0) is False
+        assert service._can_reuse_importance(last, 55.0) is True
+        assert service._can_reuse_importance(
+            TrendSnapshot(keyword="legacy", score=59.0, importance="low"), 60.0
+        ) is False
+
+    @pytest.mark.asyncio
+    async def test_prune_snapshots_keeps_latest_per_keyword(self):
+        """保持期間を過ぎたスナップショットのうち、前回分以外を削除することを確認"""
+        from sqlalchemy.dialects import postgresql
+
+        from app.services.agents.trend_monitor_service import TrendMonitorService
+
+        mock_db = AsyncMock()
+        mock_db.execute.return_value = MagicMock(rowcount=5)
+        service = TrendMonitorService(mock_db)
+        keep_id = uuid4()
+
+        pruned = await service._prune_snapshots(None, keep_ids=[keep_id])
+
+        assert pruned == 5
+        sql = str(mock_db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert sql.startswith("DELETE FROM trend_snapshots")
+        assert "trend_snapshots.knowledge_id IS NULL" in sql
+        assert "trend_snapshots.captured_at <" in sql
+        assert "NOT IN" in sql
+
 
 class TestCompetitorAnalyzerService:
     """競合分析サービスのテスト"""
@@ -138,6 +230,43 @@ class TestCommentResponderService:
             sentiment = await service._analyze_sentiment("これはどういうことですか?")
             assert sentiment == CommentSentiment.QUESTION
 
+    @pytest.mark.asyncio
+    async def test_execute_generates_replies_in_one_batch_per_video(self):
+        """動画ごとにバッチ生成し、処理済みコメントは除外されることを確認"""
+        from app.services.agents.comment_responder_service import CommentResponderService
+
+        mock_db = AsyncMock()
+        service = CommentResponderService(mock_db)
+        video = MagicMock(id=uuid4(), title="動画", video_metadata={"description": "説明"})
+        comments = [
+            {"comment_id": "c1", "text": "使い方は?"},
+            {"comment_id": "c2", "text": "最高!"},
+            {"comment_id": "c3", "text": "処理済み"},
+        ]
+        processed = MagicMock()
+        processed.scalars.return_value.all.return_value = ["c3"]
+        mock_db.execute = AsyncMock(return_value=processed)
+        service._get_published_videos = AsyncMock(return_value=[video])
+        service._get_new_comments = AsyncMock(return_value=comments)
+        service._find_matching_template = AsyncMock(return_value=None)
+        service._add_to_queue = AsyncMock()
+
+        with patch("app.services.agents.comment_responder_service.gemini_client") as mock_gemini, \
+                patch("app.services.agents.comment_responder_service.claude_client") as mock_claude:
+            mock_gemini.is_available.return_value = True
+            mock_gemini.generate_comment_replies = AsyncMock(return_value=[
+                {"reply": "回答です", "sentiment": "neutral", "tags": ["質問"]},
+                {"reply": "ありがとう", "sentiment": "positive", "tags": ["賞賛"]},
+            ])
+            result = await service.execute(MagicMock(), MagicMock(), {})
+
+        assert result["replies_generated"] == 2
+        mock_gemini.generate_comment_replies.assert_awaited_once()
+        assert mock_gemini.generate_comment_replies.call_args.args[0] == ["使い方は?", "最高!"]
+        mock_claude.create_message.assert_not_called()
+        sentiments = [c.kwargs["sentiment"] for c in service._add_to_queue.call_args_list]
+        assert sentiments == [CommentSentiment.QUESTION, CommentSentiment.POSITIVE]
+
 
 class TestContentSchedulerService:
     """コンテンツスケジューラーサービスのテスト"""
@@ -156,6 +285,89 @@ class TestContentSchedulerService:
         assert 11.9 < hours < 12.1
 
 
+class TestPerformanceTrackerService:
+    """パフォーマンス追跡サービスのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_get_videos_statistics_batches_by_50(self):
+        """videos.listが50件ずつ分割して呼ばれることを確認"""
+        from app.services.external.youtube_api import YouTubeAPIClient
+
+        client = YouTubeAPIClient()
+        client.api_key = "dummy"
+        mock_client = MagicMock()
+        client._client = mock_client
+
+        def fake_list(part, id, maxResults):
+            ids = id.split(",")
+            response = MagicMock()
+            response.execute.return_value = {
+                "items": [
+                    {"id": vid, "statistics": {"viewCount": "10", "likeCount": "2"}}
+                    for vid in ids
+                ]
+            }
+            return response
+
+        mock_client.videos.return_value.list.side_effect = fake_list
+
+        video_ids = [f"vid{i}" for i in range(120)]
+        stats = await client.get_videos_statistics(video_ids)
+
+        assert mock_client.videos.return_value.list.call_count == 3
+        assert len(stats) == 120
+        assert stats["vid0"]["view_count"] == 10
+        assert stats["vid0"]["comment_count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_execute_upserts_in_single_batch(self):
+        """取得した統計がまとめてUPSERTされることを確認"""
+        from app.services.agents.performance_tracker_service import PerformanceTrackerService
+
+        mock_db = AsyncMock()
+        service = PerformanceTrackerService(mock_db)
+        video_id = uuid4()
+        service._get_stale_videos = AsyncMock(return_value=[(video_id, "yt1", "タイトル")])
+        service._get_previous_totals = AsyncMock(return_value={})
+
+        with patch("app.services.agents.performance_tracker_service.youtube_api") as mock_yt, \
+                patch("app.services.agents.performance_tracker_service.AnalyticsRollupService") as mock_rollup:
+            mock_yt.get_videos_statistics = AsyncMock(
+                return_value={"yt1": {"view_count": 500, "like_count": 20, "comment_count": 3}}
+            )
+            mock_rollup.return_value.refresh = AsyncMock(return_value=1)
+            result = await service.execute(MagicMock(), MagicMock(), {})
+
+        mock_rollup.return_value.refresh.assert_awaited_once()
+
+        assert result["videos_analyzed"] == 1
+        assert result["videos_updated"] == 1
+        assert result["performance_data"][0]["views"] == 500
+        assert mock_db.execute.await_count == 1
+        mock_db.commit.assert_awaited_once()
+
+    def test_build_analytics_row_stores_daily_delta(self):
+        """累計から前日までの合計を引いた増加分が保存されることを確認"""
+        from app.services.agents.performance_tracker_service import PerformanceTrackerService
+
+        service = PerformanceTrackerService(AsyncMock())
+        metrics = {"view_count": 1500, "like_count": 40, "comment_count": 2}
+
+        row = service._build_analytics_row(uuid4(), date(2026, 10, 19), metrics, (1000, 30, 5))
+        # コメント数は再集計で減ったため負の補正値を保存する
+        assert (row["views"], row["likes"], row["comments"]) == (500, 10, -3)
+
+        # 補正後の日次行の合計は累計と一致し、翌日の増加分は過少計上されない
+        next_day = service._build_analytics_row(
+            uuid4(), date(2026, 10, 20), {"view_count": 1600, "like_count": 40, "comment_count": 4},
+            (1500, 40, 2),
+        )
+        assert (next_day["views"], next_day["comments"]) == (100, 2)
+
+        first = service._build_analytics_row(uuid4(), date(2026, 10, 19), metrics)
+        assert first["views"] == 1500
+
+
 class TestQACheckerService:
     """QAチェッカーサービスのテスト"""
 
@@ -248,6 +460,41 @@ class TestCeleryConfig:
         assert "trend-monitor-9am" in schedule
         assert "comment-responder-9am" in schedule
 
+    def test_agent_tasks_are_routed_by_type_and_priority(self):
+        """エージェント種別でキュー、TaskPriorityでブローカー優先度が決まることを確認"""
+        from app.core.celery_config import celery_app
+
+        router = celery_app.amqp.router
+        scheduled = router.route({}, "app.tasks.agent_executor.run_agent", ("comment_responder",), {})
+        batch = router.route(
+            {}, "app.tasks.agent_executor.run_agent", ("trend_monitor",), {"priority": "low"}
+        )
+        manual = router.route({}, "app.tasks.agent_executor.run_agent_manual", ("competitor_analyzer",), {})
+
+        assert scheduled["queue"].name == "agents.llm"
+        assert batch["queue"].name == "agents.io"
+        assert manual["queue"].name == "agents.interactive"
+        # Redisブローカーでは小さいほど優先
+        assert manual["priority"] < scheduled["priority"] < batch["priority"]
+
+    def test_acks_late_only_for_idempotent_tasks(self):
+        """ワーカー喪失時に再実行されるのは冪等なタスクのみであることを確認"""
+        from app.core.celery_config import celery_app
+        from app.tasks.agent_executor import run_agent, run_agent_manual, run_idempotent_agent
+
+        assert not celery_app.conf.task_acks_late
+        assert not run_agent.acks_late
+        assert not run_agent_manual.acks_late
+        assert run_idempotent_agent.acks_late
+
+        tracker = celery_app.conf.beat_schedule["performance-tracker-midnight"]
+        assert tracker["task"] == run_idempotent_agent.name
+        routed = celery_app.amqp.router.route({}, tracker["task"], tuple(tracker["args"]), {})
+        assert routed["queue"].name == "agents.io"
+
+        with pytest.raises(ValueError):
+            run_idempotent_agent.run("comment_responder")
+
 
 # テスト実行
 if __name__ == "__main__":
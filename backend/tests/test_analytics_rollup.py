@@ -0,0 +1,99 @@
+"""
+分析ロールアップテスト
+
+期間分割（日次の端数 + 月次）、推移の端の集計期間、集計単位とウォーターマークの決定ロジックを検証
+"""
+from datetime import date, datetime
+
+from app.models.analytics import RollupPeriod
+from app.services.analytics_rollup_service import (
+    WATERMARK_SAFETY_MARGIN,
+    next_watermark,
+    partial_buckets,
+    period_start,
+    series_period,
+    split_range,
+)
+
+
+class TestSplitRange:
+    """期間分割のテスト"""
+
+    def test_within_single_month_uses_daily(self):
+        """同一月内の期間は日次のみ"""
+        assert split_range(date(2025, 1, 5), date(2025, 1, 20)) == [
+            (RollupPeriod.DAILY, date(2025, 1, 5), date(2025, 1, 20)),
+        ]
+
+    def test_full_months_use_monthly(self):
+        """月初〜月末の期間は月次のみ"""
+        assert split_range(date(2025, 1, 1), date(2025, 3, 31)) == [
+            (RollupPeriod.MONTHLY, date(2025, 1, 1), date(2025, 3, 1)),
+        ]
+
+    def test_partial_edges_use_daily(self):
+        """端数の日は日次、完全な月は月次"""
+        assert split_range(date(2025, 1, 15), date(2025, 4, 10)) == [
+            (RollupPeriod.DAILY, date(2025, 1, 15), date(2025, 1, 31)),
+            (RollupPeriod.MONTHLY, date(2025, 2, 1), date(2025, 3, 1)),
+            (RollupPeriod.DAILY, date(2025, 4, 1), date(2025, 4, 10)),
+        ]
+
+    def test_year_boundary(self):
+        """年をまたぐ期間"""
+        segments = split_range(date(2024, 12, 20), date(2025, 2, 28))
+        assert segments == [
+            (RollupPeriod.DAILY, date(2024, 12, 20), date(2024, 12, 31)),
+            (RollupPeriod.MONTHLY, date(2025, 1, 1), date(2025, 2, 1)),
+        ]
+
+    def test_inverted_range_is_empty(self):
+        """開始日が終了日より後の場合は空"""
+        assert split_range(date(2025, 2, 1), date(2025, 1, 1)) == []
+
+
+class TestPeriodHelpers:
+    """集計単位ヘルパーのテスト"""
+
+    def test_period_start(self):
+        """期間開始日はdate_truncと同じ規則（週は月曜始まり）"""
+        d = date(2025, 1, 16)  # 木曜日
+        assert period_start(RollupPeriod.DAILY, d) == d
+        assert period_start(RollupPeriod.WEEKLY, d) == date(2025, 1, 13)
+        assert period_start(RollupPeriod.MONTHLY, d) == date(2025, 1, 1)
+
+    def test_series_period(self):
+        """推移グラフの集計単位は期間の長さで決まる"""
+        assert series_period(date(2025, 1, 1), date(2025, 1, 31)) == RollupPeriod.DAILY
+        assert series_period(date(2025, 1, 1), date(2025, 4, 30)) == RollupPeriod.WEEKLY
+        assert series_period(date(2024, 1, 1), date(2024, 12, 31)) == RollupPeriod.MONTHLY
+
+    def test_partial_buckets_clip_series_edges(self):
+        """期間外の日を含む先頭・末尾の週は期間内の日だけに切り詰める"""
+        # 2025-01-16（木）〜 2025-02-04（火）
+        assert partial_buckets(RollupPeriod.WEEKLY, date(2025, 1, 16), date(2025, 2, 4)) == [
+            (date(2025, 1, 13), date(2025, 1, 16), date(2025, 1, 19)),
+            (date(2025, 2, 3), date(2025, 2, 3), date(2025, 2, 4)),
+        ]
+        assert partial_buckets(RollupPeriod.MONTHLY, date(2025, 1, 1), date(2025, 3, 31)) == []
+        assert partial_buckets(RollupPeriod.MONTHLY, date(2025, 1, 10), date(2025, 1, 20)) == [
+            (date(2025, 1, 1), date(2025, 1, 10), date(2025, 1, 20)),
+        ]
+        assert partial_buckets(RollupPeriod.DAILY, date(2025, 1, 16), date(2025, 2, 4)) == []
+
+
+class TestWatermark:
+    """ウォーターマークのテスト"""
+
+    def test_recent_rows_are_reprocessed_next_time(self):
+        """直近の更新は猶予の分だけウォーターマークを手前に置き、次回も再集計する"""
+        since = datetime(2025, 1, 1)
+        now = datetime(2025, 1, 16, 12, 0)
+        assert next_watermark(since, now, now) == now - WATERMARK_SAFETY_MARGIN
+
+        # 十分古い更新までならそのまま進める
+        old = now - WATERMARK_SAFETY_MARGIN * 3
+        assert next_watermark(since, old, now) == old
+
+        # ウォーターマークは後退しない
+        assert next_watermark(now, now, now) == now
@@ -0,0 +1,119 @@
+"""
+Central DB連携サービスのテスト
+
+台本生成用コンテキストがEmbedding1回・SQL1回で組み立てられること、
+pgvector上でカテゴリごとの上位k件が取得できることを検証
+"""
+import pytest
+from unittest.mock import AsyncMock
+from sqlalchemy import text
+
+from app.services.central_db_service import CentralDBCategory, CentralDBService
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def mappings(self):
+        return self.rows
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def execute(self, statement, params=None):
+        self.statements.append((statement, params))
+        return FakeResult(self.rows)
+
+
+def _row(category, title, similarity=0.9):
+    return {
+        "requested_category": category,
+        "id": f"{category}-{title}",
+        "title": title,
+        "content": f"{title}の内容",
+        "summary": None,
+        "category": category,
+        "subcategory": None,
+        "tags": None,
+        "source": None,
+        "similarity": similarity,
+    }
+
+
+class TestScriptContext:
+    """get_knowledge_context_for_scriptのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_single_embedding_and_single_statement(self):
+        service = CentralDBService(database_url="postgresql://central")
+        conn = FakeConnection([
+            _row(CentralDBCategory.CONTENT, "新NISA解説"),
+            _row(CentralDBCategory.METHODS, "PASONAの法則"),
+            _row(CentralDBCategory.CLIENTS, "30代会社員"),
+            _row(CentralDBCategory.QUESTIONS, "いくらから始める？"),
+        ])
+        service._engine = type("Engine", (), {"connect": lambda self: conn})()
+        service._embed = AsyncMock(return_value=[0.1, 0.2, 0.3])
+
+        context = await service.get_knowledge_context_for_script("新NISA", target_audience="30代会社員")
+
+        service._embed.assert_awaited_once_with("新NISA 30代会社員")
+        assert len(conn.statements) == 1
+        params = conn.statements[0][1]
+        assert params["categories"] == ["content", "methods", "questions", "clients"]
+        assert params["limits"] == [3, 2, 3, 2]
+        assert "【関連コンテンツナレッジ】" in context
+        assert "- PASONAの法則" in context
+        assert "【ターゲット情報】" in context
+        assert "- いくらから始める？" in context
+
+    @pytest.mark.asyncio
+    async def test_unconfigured_returns_empty_context(self):
+        service = CentralDBService(database_url="")
+        service._embed = AsyncMock()
+
+        assert await service.get_knowledge_context_for_script("新NISA") == ""
+        service._embed.assert_not_awaited()
+
+
+class TestPgvectorSearch:
+    """pgvectorを使った検索のテスト（CENTRAL_DB_TEST_URL設定時のみ）"""
+
+    @pytest.mark.asyncio
+    async def test_top_k_per_category_in_one_query(self, central_db_engine):
+        async with central_db_engine.begin() as conn:
+            await conn.execute(text("""
+                INSERT INTO knowledge_base (title, content, category, embedding) VALUES
+                    ('近いメソッド', 'a', 'methods', '[1,0,0]'),
+                    ('遠いメソッド', 'b', 'methods', '[0,1,0]'),
+                    ('3番目のメソッド', 'c', 'methods', '[0,0,1]'),
+                    ('質問', 'd', 'questions', '[0.9,0.1,0]'),
+                    ('未ベクトル化', 'e', 'questions', NULL)
+            """))
+
+        service = CentralDBService(database_url="postgresql://central")
+        service._engine = central_db_engine
+        service._embed = AsyncMock(return_value=[1.0, 0.0, 0.0])
+
+        results = await service.search_knowledge_by_categories(
+            "query", {"methods": 2, "questions": 3, "tech": 1}
+        )
+
+        assert [r["title"] for r in results["methods"]] == ["近いメソッド", "遠いメソッド"]
+        assert results["methods"][0]["similarity"] == pytest.approx(1.0)
+        assert [r["title"] for r in results["questions"]] == ["質問"]
+        assert results["tech"] == []
+
+        # カテゴリ指定なしの検索
+        top = await service.search_knowledge("query", limit=2)
+        assert [r["title"] for r in top] == ["近いメソッド", "質問"]
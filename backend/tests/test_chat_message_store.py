@@ -0,0 +1,80 @@
+"""
+チャットメッセージストアのテスト
+
+追記専用テーブルへの書き込みとウィンドウ取得を検証
+"""
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from app.models.chat_session import ChatSessionMessage
+from app.models.planning import PlanningChatMessage
+from app.services.chat_message_store import ChatMessageStore
+
+
+def _rows_result(rows):
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = rows
+    return result
+
+
+class TestChatMessageStore:
+    """ChatMessageStoreのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_append_keeps_turn_order(self):
+        """同一ターンのメッセージは送信日時が単調増加する"""
+        db = MagicMock()
+        db.flush = AsyncMock()
+        store = ChatMessageStore(PlanningChatMessage)
+        session_id = uuid4()
+
+        rows = await store.append(
+            db,
+            session_id,
+            [
+                {"role": "user", "content": "質問"},
+                {"role": "assistant", "content": "回答", "suggestions": [{"id": "x"}]},
+            ],
+        )
+
+        assert db.add.call_count == 2
+        assert rows[0].session_id == session_id
+        assert rows[0].created_at < rows[1].created_at
+        assert rows[1].suggestions == [{"id": "x"}]
+        db.flush.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_fetch_window_returns_oldest_first_with_has_more(self):
+        """limit+1件を新しい順に取得し、古い順に並べ替えてhas_moreを判定"""
+        store = ChatMessageStore(ChatSessionMessage)
+        newest_first = [
+            ChatSessionMessage(id=uuid4(), role="assistant", content=str(i), created_at=datetime(2026, 1, 1, 0, 0, 10 - i))
+            for i in range(4)
+        ]
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=_rows_result(newest_first))
+
+        rows, has_more = await store.fetch_window(db, uuid4(), limit=3)
+
+        assert has_more is True
+        assert [row.content for row in rows] == ["2", "1", "0"]
+
+        query = db.execute.await_args.args[0]
+        assert query._limit_clause.value == 4
+
+    @pytest.mark.asyncio
+    async def test_fetch_window_unknown_before_id_is_empty(self):
+        """存在しないbefore_idの場合は空"""
+        store = ChatMessageStore(PlanningChatMessage)
+        anchor = MagicMock()
+        anchor.first.return_value = None
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=anchor)
+
+        rows, has_more = await store.fetch_window(db, uuid4(), limit=10, before_id=uuid4())
+
+        assert rows == []
+        assert has_more is False
+        assert db.execute.await_count == 1
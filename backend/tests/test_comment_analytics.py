@@ -0,0 +1,147 @@
+"""
+コメント分析エンジンのテスト
+
+トークン化、否定表現を考慮した感情スコア、転置インデックスの集計、ページ単位の全件取得を検証
+"""
+import threading
+import time
+
+import pytest
+from unittest.mock import patch
+
+from app.services.comment_analytics import (
+    CommentIndex,
+    JapaneseTokenizer,
+    SentimentLexicon,
+    analyze_video_comments,
+    normalize_text,
+)
+
+
+@pytest.fixture
+def index():
+    return CommentIndex(JapaneseTokenizer(), SentimentLexicon())
+
+
+def _comments(texts):
+    return [{"comment_id": f"c{i}", "text": t} for i, t in enumerate(texts)]
+
+
+class TestSentimentLexicon:
+    """SentimentLexiconのテスト"""
+
+    def test_negation_flips_sign(self):
+        lexicon = SentimentLexicon()
+        assert lexicon.label(lexicon.score("とてもわかりやすい解説でした")) == "positive"
+        assert lexicon.label(lexicon.score("あまりわかりやすくないです")) == "negative"
+        assert lexicon.label(lexicon.score("動画を見ました")) == "neutral"
+
+    def test_negator_does_not_match_across_clause_or_zutto(self):
+        lexicon = SentimentLexicon()
+        # 「ずっと」の「ず」や、文の区切りより後の否定表現では反転しない
+        assert lexicon.score(normalize_text("すごい！ずっと見てます")) > 0
+        assert lexicon.score(normalize_text("すごい。ないと困ります")) > 0
+        assert lexicon.score("参考にならずに終わった") < 0
+
+    def test_longer_term_takes_precedence(self):
+        lexicon = SentimentLexicon(positive={"わか": 1.0}, negative={"わかりにく": 1.5})
+        assert lexicon.score("説明がわかりにくい") == -1.5
+
+    def test_load_from_file(self, tmp_path):
+        path = tmp_path / "lexicon.json"
+        path.write_text('{"positive": {"神回": 3}}', encoding="utf-8")
+        lexicon = SentimentLexicon.from_file(str(path))
+        assert lexicon.score("今回は神回") == 3.0
+        # 指定のないセクションは既定値
+        assert lexicon.score("最悪") < 0
+
+
+class TestCommentIndex:
+    """CommentIndexのテスト"""
+
+    def test_keywords_frequency_and_context(self, index):
+        index.add_many(_comments([
+            "新NISAの解説がわかりやすい",
+            "新NISAは最高",
+            "ETFとNISAの違いがわからない",
+            "ＥＴＦの話も聞きたい",
+        ]))
+
+        stats = {s.keyword: s for s in index.top_keywords(10)}
+        assert stats["nisa"].frequency == 3
+        assert stats["nisa"].sentiment == "positive"
+        assert stats["nisa"].context_samples == ["新NISAの解説がわかりやすい", "新NISAは最高"]
+        # 全角英字は正規化して同じキーワードとして数える
+        assert stats["etf"].frequency == 2
+
+    def test_sentiment_summary(self, index):
+        index.add_many(_comments(["最高でした", "ありがとう", "つまらない", "見ました"]))
+
+        summary = index.sentiment_summary()
+        assert summary["positive_ratio"] == 0.5
+        assert summary["negative_ratio"] == 0.25
+        assert summary["neutral_ratio"] == 0.25
+        assert summary["sample_positive"][0] == "最高でした"
+        assert summary["sample_negative"] == ["つまらない"]
+
+    def test_ten_thousand_comments_in_seconds(self, index):
+        texts = [
+            f"{i}回目の視聴です。インデックス投資の解説が本当にわかりやすい！新NISAも参考になりました"
+            if i % 2 else
+            f"音声が小さくて聞き取りづらい。ETFの説明がわからないです（{i}）"
+            for i in range(10_000)
+        ]
+        started = time.monotonic()
+        index.add_many(_comments(texts))
+        index.top_keywords(20)
+        index.sentiment_summary()
+
+        assert index.size == 10_000
+        assert time.monotonic() - started < 5
+
+
+class TestAnalyzeVideoComments:
+    """analyze_video_commentsのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_streams_all_pages(self):
+        pages = [_comments(["最高", "良い"]), _comments(["残念"])]
+
+        async def fake_pages(video_id, max_comments=None):
+            for page in pages:
+                yield page
+
+        with patch("app.services.comment_analytics.youtube_api") as youtube:
+            youtube.iter_video_comment_pages = fake_pages
+            index = await analyze_video_comments("video1")
+
+        assert index.size == 3
+        assert index.sentiment_summary()["negative_ratio"] == 0.33
+
+    @pytest.mark.asyncio
+    async def test_prefetches_next_page_while_tokenizing(self):
+        second_page_requested = threading.Event()
+        overlapped = []
+
+        async def fake_pages(video_id, max_comments=None):
+            yield _comments(["最高"])
+            second_page_requested.set()
+            yield _comments(["残念"])
+
+        original_add_many = CommentIndex.add_many
+
+        def slow_add_many(index, comments):
+            # 1ページ目のトークン化中に2ページ目の取得が始まっていること
+            overlapped.append(second_page_requested.wait(timeout=2))
+            original_add_many(index, comments)
+
+        with patch("app.services.comment_analytics.youtube_api") as youtube, \
+                patch.object(CommentIndex, "add_many", slow_add_many):
+            youtube.iter_video_comment_pages = fake_pages
+            index = await analyze_video_comments("video1")
+
+        assert overlapped[0] is True
+        assert index.size == 2
+
+    def test_normalize_text(self):
+        assert normalize_text("ＮＩＳＡ ｶﾀｶﾅ") == "nisa カタカナ"
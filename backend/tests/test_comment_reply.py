@@ -0,0 +1,113 @@
+"""
+コメント返信生成のテスト
+
+構造化出力の1回呼び出し、スキーマ検証、バッチ版の補完を検証
+"""
+import json
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.external.ai_clients import COMMENT_REPLY_SCHEMA, GeminiClient
+
+
+def _client(*texts: str) -> GeminiClient:
+    client = GeminiClient()
+    client.api_key = "test"
+    client._model = MagicMock()
+    client._model.generate_content_async = AsyncMock(
+        side_effect=[SimpleNamespace(text=text) for text in texts]
+    )
+    return client
+
+
+VIDEO = {"title": "NISA入門", "description": "新NISAの基本を解説します"}
+
+
+class TestGenerateCommentReply:
+    """generate_comment_replyのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_single_structured_call(self):
+        client = _client(json.dumps({
+            "reply": " ありがとうございます！ ",
+            "sentiment": "Positive",
+            "tags": ["賞賛", " "],
+        }, ensure_ascii=False))
+
+        result = await client.generate_comment_reply("わかりやすい！", VIDEO)
+
+        assert result == {
+            "reply": "ありがとうございます！",
+            "sentiment": "positive",
+            "tags": ["賞賛"],
+            "provider": "gemini",
+        }
+        call = client._model.generate_content_async.call_args
+        assert client._model.generate_content_async.await_count == 1
+        assert call.kwargs["generation_config"]["response_schema"] == COMMENT_REPLY_SCHEMA
+
+    @pytest.mark.asyncio
+    async def test_invalid_output_returns_error(self):
+        client = _client(json.dumps({"reply": "返信", "sentiment": "angry", "tags": []}))
+
+        result = await client.generate_comment_reply("コメント", VIDEO)
+
+        assert result["reply"] is None
+        assert "error" in result
+
+
+class TestGenerateCommentReplies:
+    """generate_comment_repliesのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_batch_keeps_order_and_fills_missing_items(self):
+        batch = json.dumps({"results": [
+            {"index": 1, "reply": "返信B", "sentiment": "neutral", "tags": ["質問"]},
+            {"index": 0, "reply": "返信A", "sentiment": "positive", "tags": ["感想"]},
+            {"index": 2, "reply": "", "sentiment": "negative", "tags": []},  # 検証失敗
+        ]}, ensure_ascii=False)
+        single = json.dumps({"reply": "返信C", "sentiment": "negative", "tags": ["批判"]}, ensure_ascii=False)
+        client = _client(batch, single)
+
+        results = await client.generate_comment_replies(["A", "B", "C"], VIDEO)
+
+        assert [r["reply"] for r in results] == ["返信A", "返信B", "返信C"]
+        assert results[2]["sentiment"] == "negative"
+        assert client._model.generate_content_async.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_duplicate_index_in_later_batch_keeps_first(self):
+        first = json.dumps({"results": [
+            {"index": 0, "reply": "返信A", "sentiment": "positive", "tags": []},
+        ]}, ensure_ascii=False)
+        second = json.dumps({"results": [
+            {"index": 0, "reply": "返信B", "sentiment": "neutral", "tags": []},
+            {"index": 0, "reply": "重複", "sentiment": "neutral", "tags": []},
+        ]}, ensure_ascii=False)
+        client = _client(first, second)
+
+        results = await client.generate_comment_replies(["A", "B"], VIDEO, batch_size=1)
+
+        assert [r["reply"] for r in results] == ["返信A", "返信B"]
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_not_retried_per_comment(self):
+        second = json.dumps({"results": [
+            {"index": 0, "reply": "返信C", "sentiment": "positive", "tags": []},
+        ]}, ensure_ascii=False)
+        single = json.dumps({"reply": "返信D", "sentiment": "neutral", "tags": []}, ensure_ascii=False)
+        client = _client(second, single)
+        client._model.generate_content_async.side_effect = [
+            RuntimeError("429 Resource has been exhausted"),
+            SimpleNamespace(text=second),
+            SimpleNamespace(text=single),
+        ]
+
+        results = await client.generate_comment_replies(["A", "B", "C", "D"], VIDEO, batch_size=2)
+
+        # 失敗したバッチ（A, B）はエラーのまま、欠けたDのみ単体で補完する
+        assert [r["reply"] for r in results] == [None, None, "返信C", "返信D"]
+        assert "429" in results[0]["error"]
+        assert client._model.generate_content_async.await_count == 3
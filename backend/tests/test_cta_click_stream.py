@@ -0,0 +1,269 @@
+"""
+CTAクリックのストリーム取り込みのテスト
+
+リクエスト内の処理がRedisへの追加のみであること、コンシューマーの一括書き込みと
+CTAごとの差分集計（再処理時の重複除外）、デッドレターへの退避、Redis障害時のフォールバックを検証
+"""
+import uuid
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import redis.asyncio as redis
+from sqlalchemy.dialects import postgresql
+
+from app.services.cta_click_stream import (
+    CTA_IDS_KEY,
+    CTA_IDS_SENTINEL,
+    DEAD_LETTER_KEY,
+    STREAM_KEY,
+    CTAClickConsumer,
+    parse_click,
+    publish_click,
+    write_clicks,
+)
+from app.services.cta_service import CTAService
+
+
+def _redis(pipeline_results=None):
+    """pipeline() と xadd を持つモックRedisクライアント"""
+    client = MagicMock()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(side_effect=pipeline_results or [[]])
+    client.pipeline.return_value.__aenter__ = AsyncMock(return_value=pipe)
+    client.pipeline.return_value.__aexit__ = AsyncMock(return_value=False)
+    client.xadd = AsyncMock(return_value="1-0")
+    client.set = AsyncMock(return_value=True)
+    client.delete = AsyncMock(return_value=1)
+    return client, pipe
+
+
+def _compiled(stmt):
+    return stmt.compile(dialect=postgresql.dialect())
+
+
+def _inserted(clicks):
+    """INSERT ... RETURNING の結果（実際に書き込まれた行）"""
+    result = MagicMock()
+    result.mappings.return_value.all.return_value = [
+        {"cta_id": c["cta_id"], "clicked_at": c["clicked_at"]} for c in clicks
+    ]
+    return result
+
+
+def _scalars(values):
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = values
+    return result
+
+
+class TestRecordClick:
+    """CTAService.record_click のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_known_cta_is_published_without_db(self):
+        cta_id = str(uuid.uuid4())
+        client, _ = _redis([[1, 1]])
+        db = AsyncMock()
+
+        with patch("app.services.cta_service.get_redis", AsyncMock(return_value=client)):
+            ok = await CTAService(db).record_click(cta_id, utm_params={"source": "youtube"})
+
+        assert ok is True
+        db.execute.assert_not_called()
+        db.commit.assert_not_called()
+        key, fields = client.xadd.call_args.args
+        assert key == STREAM_KEY
+        assert fields["cta_id"] == cta_id
+
+    @pytest.mark.asyncio
+    async def test_unknown_cta(self):
+        client, _ = _redis([[1, 0]])
+
+        with patch("app.services.cta_service.get_redis", AsyncMock(return_value=client)):
+            ok = await CTAService(AsyncMock()).record_click(str(uuid.uuid4()))
+
+        assert ok is False
+        client.xadd.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_rebuilds_id_set_from_db(self):
+        cta_id = uuid.uuid4()
+        client, pipe = _redis([[0, 0], [1, 1, True]])
+        db = AsyncMock()
+        db.execute.return_value = _scalars([cta_id, uuid.uuid4()])
+
+        with patch("app.services.cta_service.get_redis", AsyncMock(return_value=client)):
+            ok = await CTAService(db).record_click(str(cta_id))
+
+        assert ok is True
+        assert pipe.sadd.call_args.args[0] == CTA_IDS_KEY
+        assert str(cta_id) in pipe.sadd.call_args.args[1:]
+        client.xadd.assert_called_once()
+        client.delete.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_caches_empty_id_set(self):
+        client, pipe = _redis([[0, 0], [1, 1, True]])
+        db = AsyncMock()
+        db.execute.return_value = _scalars([])
+
+        with patch("app.services.cta_service.get_redis", AsyncMock(return_value=client)):
+            ok = await CTAService(db).record_click(str(uuid.uuid4()))
+
+        # CTAが0件でも番兵だけのセットを保存し、以降のクリックでDBを引かない
+        assert ok is False
+        assert pipe.sadd.call_args.args == (CTA_IDS_KEY, CTA_IDS_SENTINEL)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_rebuild_falls_back_to_single_lookup(self):
+        cta_id = uuid.uuid4()
+        client, pipe = _redis([[0, 0]])
+        client.set = AsyncMock(return_value=None)
+        db = AsyncMock()
+        db.execute.return_value.scalar_one_or_none = MagicMock(return_value=cta_id)
+
+        with patch("app.services.cta_service.get_redis", AsyncMock(return_value=client)):
+            ok = await CTAService(db).record_click(str(cta_id))
+
+        # 他のリクエストが再構築中のため、全件読み込みではなく主キー検索で判定する
+        assert ok is True
+        assert "WHERE cta_templates.id =" in str(db.execute.call_args.args[0])
+        pipe.sadd.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_direct_write_when_redis_is_down(self):
+        service = CTAService(AsyncMock())
+        service._write_click = AsyncMock(return_value=True)
+
+        with patch("app.services.cta_service.get_redis", AsyncMock(side_effect=redis.ConnectionError("down"))):
+            ok = await service.record_click(str(uuid.uuid4()))
+
+        assert ok is True
+        service._write_click.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_invalid_id(self):
+        assert await CTAService(AsyncMock()).record_click("not-a-uuid") is False
+
+
+class TestConsumer:
+    """コンシューマー側の書き込みのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_publish_and_parse_round_trip(self):
+        client, _ = _redis()
+        cta_id, video_id = uuid.uuid4(), uuid.uuid4()
+        await publish_click(client, str(cta_id), str(video_id), "203.0.113.1", "x" * 600, None, {"source": "yt"})
+
+        click = parse_click(client.xadd.call_args.args[1], "1-0")
+        assert click["stream_entry_id"] == "1-0"
+        assert click["cta_id"] == cta_id
+        assert click["video_id"] == video_id
+        assert len(click["user_agent"]) == 500
+        assert click["referrer"] is None
+        assert click["utm_params"] == {"source": "yt"}
+        assert parse_click({"cta_id": "broken"}) is None
+
+    @pytest.mark.asyncio
+    async def test_write_clicks_aggregates_deltas_per_cta(self):
+        hot, cold, deleted = sorted(uuid.uuid4() for _ in range(3))
+        known_video, missing_video = uuid.uuid4(), uuid.uuid4()
+        clicked_at = datetime(2026, 10, 19, 12, 0)
+        clicks = [
+            {"cta_id": hot, "video_id": known_video, "clicked_at": clicked_at},
+            {"cta_id": hot, "video_id": missing_video, "clicked_at": clicked_at},
+            {"cta_id": hot, "video_id": None, "clicked_at": clicked_at},
+            {"cta_id": cold, "video_id": None, "clicked_at": clicked_at},
+            {"cta_id": deleted, "video_id": None, "clicked_at": clicked_at},
+        ]
+        db = AsyncMock()
+        db.execute.side_effect = [
+            _scalars([hot, cold]), _scalars([known_video]), _inserted(clicks[:4]), None, None,
+        ]
+
+        written = await write_clicks(db, clicks)
+
+        assert written == 4
+        insert_params = _compiled(db.execute.call_args_list[2].args[0]).params
+        assert [insert_params[f"video_id_m{i}"] for i in range(4)] == [known_video, None, None, None]
+        _, update_params = db.execute.call_args_list[3].args
+        assert update_params == [{"cta_id": hot, "delta": 3}, {"cta_id": cold, "delta": 1}]
+        daily_upsert = db.execute.call_args_list[4].args[0]
+        assert daily_upsert.table.name == "cta_daily_stats"
+        db.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_write_clicks_skips_already_written_entries(self):
+        cta_id = uuid.uuid4()
+        clicked_at = datetime(2026, 10, 19, 12, 0)
+        clicks = [
+            {"stream_entry_id": f"{i}-0", "cta_id": cta_id, "video_id": None, "clicked_at": clicked_at}
+            for i in range(3)
+        ]
+        db = AsyncMock()
+        # 再処理されたバッチのうち1件だけが未書き込み
+        db.execute.side_effect = [_scalars([cta_id]), _inserted(clicks[2:]), None, None]
+
+        written = await write_clicks(db, clicks)
+
+        assert written == 1
+        sql = str(_compiled(db.execute.call_args_list[1].args[0]))
+        assert "ON CONFLICT ON CONSTRAINT uq_cta_click_logs_stream_entry_id DO NOTHING" in sql
+        _, update_params = db.execute.call_args_list[2].args
+        assert update_params == [{"cta_id": cta_id, "delta": 1}]
+
+    @pytest.mark.asyncio
+    async def test_write_clicks_replayed_batch_changes_nothing(self):
+        cta_id = uuid.uuid4()
+        clicks = [{"stream_entry_id": "1-0", "cta_id": cta_id, "video_id": None,
+                   "clicked_at": datetime(2026, 10, 19, 12, 0)}]
+        db = AsyncMock()
+        db.execute.side_effect = [_scalars([cta_id]), _inserted([])]
+
+        assert await write_clicks(db, clicks) == 0
+        assert db.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_claim_moves_exhausted_entries_to_dead_letter(self):
+        client, pipe = _redis([[1, 1, 1]])
+        entries = [
+            ("1-0", {"cta_id": str(uuid.uuid4()), "clicked_at": "2026-10-19T10:00:00"}),
+            ("2-0", {"cta_id": str(uuid.uuid4()), "clicked_at": "2026-10-19T10:00:01"}),
+        ]
+        client.xautoclaim = AsyncMock(return_value=["0-0", entries, []])
+        client.xpending_range = AsyncMock(return_value=[
+            {"message_id": "1-0", "consumer": "test", "time_since_delivered": 60000, "times_delivered": 5},
+            {"message_id": "2-0", "consumer": "test", "time_since_delivered": 60000, "times_delivered": 2},
+        ])
+
+        claimed = await CTAClickConsumer("test")._claim_stale(client)
+
+        assert claimed == [entries[1]]
+        key, fields = pipe.xadd.call_args.args
+        assert key == DEAD_LETTER_KEY
+        assert fields["source_id"] == "1-0"
+        assert fields["deliveries"] == 5
+        assert pipe.xack.call_args.args[2:] == ("1-0",)
+        assert pipe.xdel.call_args.args[1:] == ("1-0",)
+
+    @pytest.mark.asyncio
+    async def test_process_acks_whole_batch(self):
+        client, pipe = _redis([[2, 2]])
+        entries = [
+            ("1-0", {"cta_id": str(uuid.uuid4()), "clicked_at": "2026-10-19T10:00:00"}),
+            ("2-0", {"cta_id": "broken"}),
+        ]
+        session = AsyncMock()
+        session_factory = MagicMock()
+        session_factory.return_value.__aenter__ = AsyncMock(return_value=session)
+        session_factory.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        with patch("app.services.cta_click_stream.AsyncSessionLocal", session_factory), \
+             patch("app.services.cta_click_stream.write_clicks", AsyncMock(return_value=1)) as write:
+            written = await CTAClickConsumer("test").process(client, entries)
+
+        assert written == 1
+        assert [click["stream_entry_id"] for click in write.call_args.args[1]] == ["1-0"]
+        assert pipe.xack.call_args.args[2:] == ("1-0", "2-0")
+        assert pipe.xdel.call_args.args[1:] == ("1-0", "2-0")
@@ -0,0 +1,92 @@
+"""
+日次集計サービスのテスト
+
+日次カウンターへの加算（UPSERT）と、日次カウンターからの統計の算出を検証
+"""
+import uuid
+from datetime import date, datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.daily_stats_service import DailyStatsService
+
+
+def _sql(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestCTADailyStats:
+    """CTAの日次クリック数"""
+
+    def test_count_clicks_per_cta_and_day(self):
+        a, b = uuid.uuid4(), uuid.uuid4()
+        rows = [
+            {"cta_id": a, "clicked_at": datetime(2026, 10, 18, 23, 59)},
+            {"cta_id": a, "clicked_at": datetime(2026, 10, 19, 0, 1)},
+            {"cta_id": a, "clicked_at": datetime(2026, 10, 19, 9, 0)},
+            {"cta_id": b, "clicked_at": datetime(2026, 10, 19, 9, 0)},
+        ]
+        assert DailyStatsService.count_cta_clicks(rows) == {
+            (a, date(2026, 10, 18)): 1,
+            (a, date(2026, 10, 19)): 2,
+            (b, date(2026, 10, 19)): 1,
+        }
+
+    @pytest.mark.asyncio
+    async def test_add_clicks_upserts_increment(self):
+        db = AsyncMock()
+        a, b = sorted(uuid.uuid4() for _ in range(2))
+
+        await DailyStatsService.add_cta_clicks(db, {(b, date(2026, 10, 19)): 1, (a, date(2026, 10, 19)): 5})
+
+        stmt = db.execute.call_args.args[0]
+        sql = _sql(stmt)
+        assert "ON CONFLICT ON CONSTRAINT uq_cta_daily_stats_cta_id_date DO UPDATE" in sql
+        assert "clicks = (cta_daily_stats.clicks + excluded.clicks)" in sql
+        # キー順に並べてロック順序を揃える
+        params = stmt.compile(dialect=postgresql.dialect()).params
+        assert (params["cta_id_m0"], params["clicks_m0"]) == (a, 5)
+
+    @pytest.mark.asyncio
+    async def test_add_nothing(self):
+        db = AsyncMock()
+        await DailyStatsService.add_cta_clicks(db, {})
+        db.execute.assert_not_called()
+
+
+class TestEngagementDailyStats:
+    """連携の日次指標"""
+
+    @pytest.mark.asyncio
+    async def test_add_metrics_accumulates_rate_sums(self):
+        db = AsyncMock()
+
+        await DailyStatsService.add_engagement_metrics(
+            db, uuid.uuid4(), date(2026, 10, 19),
+            short_views=1000, click_through_count=50, conversion_count=10,
+            click_through_rate=5.0, conversion_rate=None,
+        )
+
+        stmt = db.execute.call_args.args[0]
+        params = stmt.compile(dialect=postgresql.dialect()).params
+        assert params["ctr_sum"] == 5.0 and params["ctr_samples"] == 1
+        assert params["conversion_rate_sum"] == 0.0 and params["conversion_rate_samples"] == 0
+        assert "conversion_count = (engagement_daily_stats.conversion_count + excluded.conversion_count)" in _sql(stmt)
+
+    @pytest.mark.asyncio
+    async def test_totals(self):
+        db = AsyncMock()
+        result = MagicMock()
+        result.one.return_value = (120, 30, 15.0, 3, 0.0, 0)
+        db.execute.return_value = result
+
+        totals = await DailyStatsService.get_engagement_totals(db)
+
+        assert totals == {
+            "total_clicks": 120,
+            "total_conversions": 30,
+            "avg_ctr": 5.0,
+            "avg_conversion_rate": 0.0,
+        }
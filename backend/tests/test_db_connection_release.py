@@ -0,0 +1,101 @@
+"""
+外部API呼び出し中の接続返却のテスト
+
+released_connection によるトランザクション確定と、接続プールの待ち時間計測を検証
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+from app.core.database import (
+    DB_POOL_CHECKOUT_WAIT,
+    InstrumentedAsyncAdaptedQueuePool,
+    released_connection,
+)
+from app.services.knowledge_service import KnowledgeService
+
+
+def _histogram_count(histogram) -> float:
+    for metric in histogram.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_count"):
+                return sample.value
+    return 0.0
+
+
+class TestReleasedConnection:
+    """released_connectionのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_commits_open_transaction_before_external_call(self):
+        """トランザクション中ならブロックに入る前にコミットする"""
+        db = MagicMock()
+        db.in_transaction.return_value = True
+        db.commit = AsyncMock()
+        calls = []
+
+        async with released_connection(db, "test"):
+            calls.append(db.commit.await_count)
+
+        assert calls == [1]
+
+    @pytest.mark.asyncio
+    async def test_skips_commit_without_transaction(self):
+        """接続を保持していなければ何もしない"""
+        db = MagicMock()
+        db.in_transaction.return_value = False
+        db.commit = AsyncMock()
+
+        async with released_connection(db, "test"):
+            pass
+
+        db.commit.assert_not_awaited()
+
+
+class TestInstrumentedPool:
+    """InstrumentedAsyncAdaptedQueuePoolのテスト"""
+
+    def test_checkout_wait_is_observed(self):
+        """接続取得ごとに待ち時間が記録される"""
+        pool = InstrumentedAsyncAdaptedQueuePool(creator=MagicMock, pool_size=1, max_overflow=0)
+        before = _histogram_count(DB_POOL_CHECKOUT_WAIT)
+
+        connection = pool.connect()
+        connection.close()
+
+        assert _histogram_count(DB_POOL_CHECKOUT_WAIT) == before + 1
+
+
+class TestSendChatMessageReleasesConnection:
+    """チャット送信時の接続返却のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_commits_before_ai_response(self):
+        """AI応答の生成前に読み取りトランザクションを確定する"""
+        db = MagicMock()
+        db.in_transaction.return_value = True
+        db.commit = AsyncMock()
+        db.refresh = AsyncMock()
+        db.execute = AsyncMock(return_value=MagicMock(scalar_one_or_none=MagicMock(return_value=None)))
+        chat_session = MagicMock(id=uuid4())
+        commits_at_generation = []
+
+        async def fake_generate(*args):
+            commits_at_generation.append(db.commit.await_count)
+            return "応答"
+
+        with patch.object(
+            KnowledgeService, "get_chat_session", AsyncMock(return_value=chat_session)
+        ), patch.object(
+            KnowledgeService, "_generate_ai_response", side_effect=fake_generate
+        ), patch(
+            "app.services.knowledge_service.knowledge_chat_store"
+        ) as store:
+            store.fetch_window = AsyncMock(return_value=([], False))
+            store.append = AsyncMock()
+            await KnowledgeService.send_chat_message(
+                db, uuid4(), MagicMock(content="質問"), "owner"
+            )
+
+        assert commits_at_generation == [1]
+        assert db.commit.await_count == 2
@@ -0,0 +1,101 @@
+"""
+Google APIクライアント共通基盤テスト
+
+ディスカバリドキュメント/サービスオブジェクトのキャッシュと
+ダッシュボード一括取得の並列実行を検証
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.services.external import google_api_client
+from app.services.external.youtube_analytics_service import YouTubeAnalyticsService
+
+
+class TestServiceCache:
+    """サービスオブジェクトキャッシュのテスト"""
+
+    def setup_method(self):
+        google_api_client.clear_service_cache()
+
+    def test_same_token_reuses_service(self):
+        """同じトークンではサービスオブジェクトを再利用"""
+        first = google_api_client.get_service("youtubeAnalytics", "v2", access_token="token-a")
+        second = google_api_client.get_service("youtubeAnalytics", "v2", access_token="token-a")
+        assert first is second
+
+    def test_different_token_builds_new_service(self):
+        """異なるトークンでは別のサービスオブジェクト"""
+        first = google_api_client.get_service("youtubeAnalytics", "v2", access_token="token-a")
+        second = google_api_client.get_service("youtubeAnalytics", "v2", access_token="token-b")
+        assert first is not second
+
+    def test_discovery_document_parsed_once(self):
+        """ディスカバリドキュメントは1回だけパースされる"""
+        google_api_client.get_discovery_document.cache_clear()
+        with patch.object(
+            google_api_client.discovery_cache,
+            "get_static_doc",
+            wraps=google_api_client.discovery_cache.get_static_doc,
+        ) as mock_get:
+            google_api_client.get_service("youtubeAnalytics", "v2", access_token="token-a")
+            google_api_client.get_service("youtubeAnalytics", "v2", access_token="token-b")
+            assert mock_get.call_count == 1
+
+
+class TestChannelDashboard:
+    """ダッシュボード一括取得のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_reports_run_concurrently(self):
+        """各レポートが並列に実行される"""
+        service = YouTubeAnalyticsService()
+        in_flight = 0
+        max_in_flight = 0
+
+        async def slow_report(*args, **kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"ok": True}
+
+        with patch.object(service, "get_channel_analytics", side_effect=slow_report), \
+                patch.object(service, "get_traffic_sources", side_effect=slow_report), \
+                patch.object(service, "get_demographics", side_effect=slow_report), \
+                patch.object(service, "get_top_videos", AsyncMock(return_value=[{"video": "v1"}])), \
+                patch.object(service, "get_audience_retention", side_effect=slow_report) as mock_retention:
+            dashboard = await service.get_channel_dashboard(
+                "token", "UC123", "2025-01-01", "2025-01-31", retention_video_id="v1"
+            )
+
+        assert max_in_flight == 4
+        assert dashboard["top_videos"] == [{"video": "v1"}]
+        mock_retention.assert_called_once_with("token", "v1")
+
+    @pytest.mark.asyncio
+    async def test_retention_for_top_video_overlaps_other_reports(self):
+        """リテンション未指定時も人気1位のリテンション取得が他のレポートと並列に実行される"""
+        service = YouTubeAnalyticsService()
+        in_flight = 0
+        max_in_flight = 0
+
+        async def slow_report(*args, **kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"ok": True}
+
+        with patch.object(service, "get_channel_analytics", side_effect=slow_report), \
+                patch.object(service, "get_traffic_sources", side_effect=slow_report), \
+                patch.object(service, "get_demographics", side_effect=slow_report), \
+                patch.object(service, "get_top_videos", AsyncMock(return_value=[{"video": "v9"}])), \
+                patch.object(service, "get_audience_retention", side_effect=slow_report) as mock_retention:
+            dashboard = await service.get_channel_dashboard("token", "UC123", "2025-01-01", "2025-01-31")
+
+        assert max_in_flight == 4
+        assert dashboard["retention"] == {"ok": True}
+        mock_retention.assert_called_once_with("token", "v9")
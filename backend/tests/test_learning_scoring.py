@@ -0,0 +1,154 @@
+"""
+パフォーマンススコアリングテスト
+
+ベクトル化したバッチスコアリングが1件ずつの計算と一致することを検証
+"""
+import time
+import numpy as np
+import pytest
+from unittest.mock import MagicMock
+
+from app.models.learning import PerformanceLevel
+from app.services.learning_service import (
+    LearningService,
+    DEFAULT_BASELINE_STATS,
+    SCORE_COLUMNS,
+)
+
+
+def _record(**kwargs):
+    record = MagicMock()
+    for name in SCORE_COLUMNS:
+        setattr(record, name, kwargs.get(name, 0))
+    return record
+
+
+class TestBatchScoring:
+    """バッチスコアリングのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_batch_matches_single_record(self):
+        """バッチ計算と1件ずつの計算が一致"""
+        service = LearningService()
+        rng = np.random.default_rng(0)
+        n = 200
+        columns = {
+            "views": rng.integers(0, 20000, n).astype(float),
+            "likes": rng.integers(0, 800, n).astype(float),
+            "comments": rng.integers(0, 100, n).astype(float),
+            "ctr": rng.uniform(0, 12, n),
+            "avg_view_percentage": rng.uniform(0, 70, n),
+        }
+        columns["ctr"][:20] = 0  # CTR欠損
+        columns["views"][20:30] = 0  # 再生なし
+
+        batch = service.score_batch(columns, DEFAULT_BASELINE_STATS)
+
+        for i in range(n):
+            record = _record(**{name: columns[name][i] for name in SCORE_COLUMNS})
+            single = await service.calculate_performance_score(record)
+            assert single == pytest.approx(batch[i])
+
+    def test_empty_metrics_default_to_50(self):
+        """指標がすべて0の場合は50点"""
+        service = LearningService()
+        columns = {name: np.zeros(3) for name in SCORE_COLUMNS}
+        assert list(service.score_batch(columns, DEFAULT_BASELINE_STATS)) == [50.0, 50.0, 50.0]
+
+    def test_classify_batch_matches_determine_level(self):
+        """一括分類が determine_performance_level と一致"""
+        service = LearningService()
+        scores = np.array([0, 29.99, 30, 44.9, 45, 64.9, 65, 79.9, 80, 100])
+        expected = [service.determine_performance_level(s) for s in scores]
+        assert service.classify_batch(scores) == expected
+        assert expected[-1] == PerformanceLevel.EXCEPTIONAL
+
+    def test_compute_baselines_uses_recent_median(self):
+        """ベースラインは直近window件の中央値"""
+        service = LearningService()
+        columns = {
+            "views": np.array([100.0, 200, 300, 1000, 2000, 3000]),
+            "likes": np.array([1.0, 2, 3, 10, 20, 30]),
+            "comments": np.zeros(6),
+            "ctr": np.array([1.0, 1, 1, 5, 6, 7]),
+            "avg_view_percentage": np.array([10.0, 10, 10, 40, 50, 60]),
+        }
+        baselines = service.compute_baselines(columns, window=3)
+        assert baselines["avg_views"] == 2000
+        assert baselines["avg_likes"] == 20
+        assert baselines["avg_ctr"] == 6
+        assert baselines["avg_view_percentage"] == 50
+        # データが無い指標は既定値
+        assert baselines["avg_comments"] == DEFAULT_BASELINE_STATS["avg_comments"]
+
+    def test_batch_scoring_is_fast(self):
+        """10万件のスコアリングと分類が高速に終わる"""
+        service = LearningService()
+        n = 100_000
+        columns = {name: np.full(n, 10.0) for name in SCORE_COLUMNS}
+        start = time.perf_counter()
+        scores = service.score_batch(columns, service.compute_baselines(columns))
+        service.classify_batch(scores)
+        assert time.perf_counter() - start < 1.0
+
+
+def _digest_rows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(n):
+        score = float(rng.uniform(0, 100))
+        rows.append((
+            score if i % 10 else None,  # 一部はスコア未計算
+            int(score * 100), int(score * 5), int(score), score / 10, score / 2,
+            int(rng.integers(10, 60)), int(rng.integers(30, 3000)),
+            int(rng.integers(0, 7)), int(rng.integers(0, 24)),
+            bool(score > 50), bool(i % 3 == 0), False,
+            "short" if i % 2 else "long",
+            f"cat{i % 25}",
+            ["共通"] + ([f"tag{i % 40}"] if i % 4 else []),
+        ))
+    return rows
+
+
+class TestPerformanceDigest:
+    """パターン分析用ダイジェストのテスト"""
+
+    def _build(self, n):
+        from app.services.performance_digest import PerformanceDigestBuilder
+
+        builder = PerformanceDigestBuilder()
+        rows = _digest_rows(n)
+        for i in range(0, n, 1000):
+            builder.add_rows(rows[i:i + 1000])
+        fill = np.full(n, 50.0)
+        return builder.build(fill_scores=fill)
+
+    def test_digest_size_is_bounded(self):
+        """記録件数が増えてもダイジェストのサイズは一定"""
+        import json
+        from app.services.performance_digest import MAX_CATEGORIES, MAX_TAGS
+
+        small = self._build(500)
+        large = self._build(20000)
+
+        assert small["sample_size"] == 500
+        assert large["sample_size"] == 20000
+        assert len(large["by_category"]) == MAX_CATEGORIES
+        assert len(large["tags"]) <= MAX_TAGS
+        size_small = len(json.dumps(small, ensure_ascii=False))
+        size_large = len(json.dumps(large, ensure_ascii=False))
+        assert abs(size_large - size_small) < size_small * 0.1
+
+    def test_digest_statistics(self):
+        """分布・デシル・相関が算出される"""
+        digest = self._build(1000)
+
+        assert {g["value"] for g in digest["by_video_type"]} == {"short", "long"}
+        assert sum(g["count"] for g in digest["by_weekday"]) == 1000
+        top = digest["deciles"]["top_10_percent"]
+        bottom = digest["deciles"]["bottom_10_percent"]
+        assert top["avg_score"] > bottom["avg_score"]
+        assert top["number_in_title_rate"] == 1.0
+        # ctr はスコアから生成しているため強い正の相関
+        assert digest["correlations"]["ctr"] > 0.5
+        assert digest["tags"][0]["tag"] == "共通"
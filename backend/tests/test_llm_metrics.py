@@ -0,0 +1,157 @@
+"""
+LLM呼び出し計測のテスト
+
+リトライ、トークン数・コストの記録、リクエスト単位の集計を検証
+"""
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.config import settings
+from app.services.external.ai_clients import ClaudeClient
+from app.services.external.llm_metrics import (
+    LLM_COST,
+    LLM_ERRORS,
+    LLM_RETRIES,
+    LLM_TOKENS,
+    TokenUsage,
+    anthropic_usage,
+    estimate_cost,
+    instrumented_call,
+    track_llm_usage,
+)
+
+
+class OverloadedError(Exception):
+    """529 Overloaded の代替"""
+    status_code = 529
+
+
+class BadRequestError(Exception):
+    status_code = 400
+
+
+def _message(input_tokens: int = 1000, output_tokens: int = 200):
+    return SimpleNamespace(
+        content=[SimpleNamespace(text="応答")],
+        usage=SimpleNamespace(input_tokens=input_tokens, output_tokens=output_tokens),
+    )
+
+
+def _labels(site: str) -> dict:
+    return {"provider": "claude", "model": "claude-sonnet-4-20250514", "call_site": site}
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_RETRY_BACKOFF_SECONDS", 0)
+
+
+class TestEstimateCost:
+    """estimate_costのテスト"""
+
+    def test_prices_by_model_prefix(self):
+        usage = TokenUsage(input=1_000_000, output=1_000_000)
+        assert estimate_cost("claude-sonnet-4-20250514", usage) == pytest.approx(18.0)
+        assert estimate_cost("models/gemini-1.5-flash-002", usage) == pytest.approx(0.375)
+        assert estimate_cost("unknown-model", usage) == 0.0
+
+
+class TestInstrumentedCall:
+    """instrumented_callのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_retries_transient_errors_and_records_usage(self):
+        site = "test.retry"
+        operation = AsyncMock(side_effect=[OverloadedError(), _message()])
+        retries = LLM_RETRIES.labels(**_labels(site))._value.get()
+
+        with track_llm_usage() as usage:
+            result = await instrumented_call(
+                "claude", "claude-sonnet-4-20250514", site, operation, anthropic_usage
+            )
+
+        assert result.content[0].text == "応答"
+        assert operation.await_count == 2
+        assert LLM_RETRIES.labels(**_labels(site))._value.get() == retries + 1
+        assert LLM_TOKENS.labels(**_labels(site), kind="output")._value.get() >= 200
+        assert usage.calls == 1
+        assert usage.cost_usd == pytest.approx((1000 * 3.0 + 200 * 15.0) / 1_000_000)
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_error_is_raised_and_counted(self):
+        site = "test.error"
+        operation = AsyncMock(side_effect=BadRequestError())
+
+        with track_llm_usage() as usage:
+            with pytest.raises(BadRequestError):
+                await instrumented_call(
+                    "claude", "claude-sonnet-4-20250514", site, operation, anthropic_usage
+                )
+
+        assert operation.await_count == 1
+        assert LLM_ERRORS.labels(**_labels(site), error_type="BadRequestError")._value.get() == 1
+        assert usage.errors == 1
+
+
+class TestClientInstrumentation:
+    """クライアントへの組み込みのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_generate_text_records_cost_per_call_site(self):
+        client = ClaudeClient()
+        client.api_key = "test"
+        client._async_client = MagicMock()
+        client._async_client.messages.create = AsyncMock(return_value=_message(2000, 100))
+        site = "test.generate_text"
+        before = LLM_COST.labels(**_labels(site))._value.get()
+
+        with track_llm_usage() as usage:
+            await client.generate_text("質問", call_site=site)
+            await client.generate_text("質問2", call_site=site)
+
+        expected = 2 * (2000 * 3.0 + 100 * 15.0) / 1_000_000
+        assert LLM_COST.labels(**_labels(site))._value.get() == pytest.approx(before + expected)
+        assert usage.calls == 2
+        assert usage.cost_by_call_site[site] == pytest.approx(expected)
+        assert "calls=2" in usage.format()
+
+    @pytest.mark.asyncio
+    async def test_stream_text_retries_stream_setup(self):
+        client = ClaudeClient()
+        client.api_key = "test"
+        site = "test.stream"
+
+        class Stream:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            @property
+            def text_stream(self):
+                async def tokens():
+                    for token in ("こん", "にちは"):
+                        yield token
+                return tokens()
+
+            async def get_final_message(self):
+                return _message(50, 2)
+
+        class Overloaded:
+            async def __aenter__(self):
+                raise OverloadedError()
+
+            async def __aexit__(self, *exc):
+                return False
+
+        client._async_client = MagicMock()
+        client._async_client.messages.stream = MagicMock(side_effect=[Overloaded(), Stream()])
+        retries = LLM_RETRIES.labels(**_labels(site))._value.get()
+
+        tokens = [t async for t in client.stream_text("質問", call_site=site)]
+
+        assert tokens == ["こん", "にちは"]
+        assert client._async_client.messages.stream.call_count == 2
+        assert LLM_RETRIES.labels(**_labels(site))._value.get() == retries + 1
@@ -0,0 +1,166 @@
+"""
+LLM応答キャッシュのテスト
+
+キー正規化、ヒット/ミス/バイパス、件数上限による削除、クライアントへの組み込みを検証
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core.config import settings
+from app.services.external.ai_clients import ClaudeClient
+from app.services.external.llm_response_cache import (
+    INDEX_KEY,
+    LLM_CACHE_REQUESTS,
+    LLMResponseCache,
+    make_cache_key,
+)
+
+
+class InMemoryRedis:
+    """テスト用の最小限のRedis互換実装"""
+
+    def __init__(self):
+        self.values = {}
+        self.zsets = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.values[key] = value
+
+    async def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    async def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    async def zpopmin(self, key, count):
+        items = sorted(self.zsets.get(key, {}).items(), key=lambda kv: kv[1])[:count]
+        for member, _ in items:
+            del self.zsets[key][member]
+        return items
+
+    async def zrem(self, key, member):
+        self.zsets.get(key, {}).pop(member, None)
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+
+class _Pipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+        return queue
+
+    async def execute(self):
+        return [await getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+@pytest.fixture
+def fake_redis():
+    client = InMemoryRedis()
+    with patch(
+        "app.services.external.llm_response_cache.get_redis", AsyncMock(return_value=client)
+    ):
+        yield client
+
+
+def _count(call_site: str, result: str) -> float:
+    return LLM_CACHE_REQUESTS.labels(call_site=call_site, result=result)._value.get()
+
+
+class TestMakeCacheKey:
+    """make_cache_keyのテスト"""
+
+    def test_whitespace_and_param_order_are_normalized(self):
+        """改行コード・行末空白・パラメータ順の差は同じキーになる"""
+        a = make_cache_key("claude", "m", "タイトル\r\n候補  \n", {"max_tokens": 10, "t": 0})
+        b = make_cache_key("claude", "m", "タイトル\n候補", {"t": 0, "max_tokens": 10})
+        assert a == b
+
+    def test_model_and_params_change_the_key(self):
+        base = make_cache_key("claude", "m", "p", {"max_tokens": 10})
+        assert base != make_cache_key("gemini", "m", "p", {"max_tokens": 10})
+        assert base != make_cache_key("claude", "m2", "p", {"max_tokens": 10})
+        assert base != make_cache_key("claude", "m", "p", {"max_tokens": 20})
+
+
+class TestLLMResponseCache:
+    """LLMResponseCacheのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_hit_miss_and_bypass(self, fake_redis):
+        cache = LLMResponseCache()
+        site = "claude.generate_title"
+        key = make_cache_key("claude", "m", "p")
+        misses, hits, bypasses = _count(site, "miss"), _count(site, "hit"), _count(site, "bypass")
+
+        assert await cache.get(key, site) is None
+        await cache.set(key, site, "応答")
+        assert await cache.get(key, site) == "応答"
+        assert await cache.get(key, site, bypass=True) is None
+
+        assert _count(site, "miss") == misses + 1
+        assert _count(site, "hit") == hits + 1
+        assert _count(site, "bypass") == bypasses + 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_call_site_is_not_cached(self, fake_redis):
+        cache = LLMResponseCache()
+        key = make_cache_key("claude", "m", "p")
+
+        await cache.set(key, "claude.analyze_trend", "応答")
+
+        assert fake_redis.values == {}
+        assert await cache.get(key, "claude.analyze_trend") is None
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used(self, fake_redis, monkeypatch):
+        monkeypatch.setattr(settings, "LLM_RESPONSE_CACHE_MAX_ENTRIES", 2)
+        cache = LLMResponseCache()
+        site = "claude.generate_title"
+        keys = [make_cache_key("claude", "m", f"p{i}") for i in range(3)]
+
+        await cache.set(keys[0], site, "0")
+        await cache.set(keys[1], site, "1")
+        fake_redis.zsets[INDEX_KEY][keys[0]] += 100  # keys[0] を最近参照したことにする
+        await cache.set(keys[2], site, "2")
+
+        assert set(fake_redis.values) == {keys[0], keys[2]}
+        assert set(fake_redis.zsets[INDEX_KEY]) == {keys[0], keys[2]}
+
+
+class TestClaudeClientCaching:
+    """ClaudeClientへの組み込みのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_repeated_generate_title_calls_api_once(self, fake_redis):
+        client = ClaudeClient()
+        client.api_key = "test"
+        message = MagicMock()
+        message.content = [MagicMock(text="タイトルA\nタイトルB")]
+        client._async_client = MagicMock()
+        client._async_client.messages.create = AsyncMock(return_value=message)
+
+        first = await client.generate_title("投資", ["NISA"], count=2)
+        second = await client.generate_title("投資", ["NISA"], count=2)
+        refreshed = await client.generate_title("投資", ["NISA"], count=2, bypass_cache=True)
+
+        assert first["titles"] == second["titles"] == refreshed["titles"] == ["タイトルA", "タイトルB"]
+        assert client._async_client.messages.create.await_count == 2
@@ -0,0 +1,160 @@
+"""
+ページネーション共通処理のテスト
+
+カーソルの往復、キーセット条件の生成、次ページカーソル、推定件数とCOUNT(*)の切り替えを検証
+"""
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.core.pagination import (
+    ESTIMATE_EXACT_THRESHOLD,
+    count_rows,
+    decode_cursor,
+    encode_cursor,
+    paginate,
+)
+from app.models.project import Project
+
+
+def _rows(count):
+    return [
+        SimpleNamespace(id=uuid.uuid4(), created_at=datetime(2026, 10, 1, 12, 0, count - i))
+        for i in range(count)
+    ]
+
+
+def _session(rows, count=None):
+    """実行したクエリを記録するモックセッション（COUNT(*) と一覧取得に応答）"""
+    db = AsyncMock()
+    executed = []
+
+    async def execute(statement):
+        executed.append(statement)
+        result = MagicMock()
+        result.scalar_one.return_value = count if count is not None else len(rows)
+        result.scalars.return_value.all.return_value = rows
+        return result
+
+    db.execute.side_effect = execute
+    return db, executed
+
+
+def _sql(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestCursor:
+    """カーソルのエンコード/デコード"""
+
+    def test_round_trip(self):
+        created_at = datetime(2026, 10, 19, 9, 30, 15, 123456)
+        row_id = uuid.uuid4()
+        assert decode_cursor(encode_cursor(created_at, row_id)) == (created_at, row_id)
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "W10", "WyJ4IiwieSJd"])
+    def test_invalid_cursor(self, cursor):
+        with pytest.raises(HTTPException) as exc_info:
+            decode_cursor(cursor)
+        assert exc_info.value.status_code == 400
+
+
+class TestPaginate:
+    """paginateのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_first_page_has_next_cursor(self):
+        rows = _rows(4)
+        db, executed = _session(rows)
+
+        with patch("app.core.pagination.estimate_rows", AsyncMock(return_value=4)):
+            page = await paginate(db, select(Project), Project.created_at, Project.id, limit=3)
+
+        # limit+1 件取得して次ページの有無を判定する
+        assert page.items == rows[:3]
+        assert page.next_cursor == encode_cursor(rows[2].created_at, rows[2].id)
+        assert page.total == 4
+        assert page.total_is_estimate is False
+        assert "LIMIT" in _sql(executed[-1])
+
+    @pytest.mark.asyncio
+    async def test_last_page_has_no_cursor(self):
+        db, _ = _session(_rows(2))
+
+        with patch("app.core.pagination.estimate_rows", AsyncMock(return_value=2)):
+            page = await paginate(db, select(Project), Project.created_at, Project.id, limit=3)
+
+        assert len(page.items) == 2
+        assert page.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_cursor_uses_keyset_instead_of_offset(self):
+        db, executed = _session(_rows(1))
+        cursor = encode_cursor(datetime(2026, 10, 1), uuid.uuid4())
+
+        with patch("app.core.pagination.estimate_rows", AsyncMock(return_value=1)):
+            await paginate(
+                db, select(Project), Project.created_at, Project.id,
+                limit=20, cursor=cursor, offset=400,
+            )
+
+        sql = _sql(executed[-1])
+        assert "(projects.created_at, projects.id) <" in sql
+        assert "ORDER BY projects.created_at DESC, projects.id DESC" in sql
+        assert "OFFSET" not in sql
+
+
+    @pytest.mark.asyncio
+    async def test_page_ending_on_null_sort_value(self):
+        rows = _rows(3)
+        rows[1].created_at = None
+        db, executed = _session(rows)
+
+        with patch("app.core.pagination.estimate_rows", AsyncMock(return_value=3)):
+            page = await paginate(db, select(Project), Project.created_at, Project.id, limit=2)
+            assert decode_cursor(page.next_cursor) == (None, rows[1].id)
+
+            await paginate(db, select(Project), Project.created_at, Project.id, limit=2, cursor=page.next_cursor)
+
+        # NULLの区間の残りと、NULL以外の全行を取得する
+        sql = _sql(executed[-1])
+        assert "projects.created_at IS NULL AND projects.id <" in sql
+        assert "OR projects.created_at IS NOT NULL" in sql
+
+
+class TestCountRows:
+    """count_rowsのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_large_estimate_skips_count(self):
+        db, executed = _session([])
+        estimate = AsyncMock(return_value=ESTIMATE_EXACT_THRESHOLD * 5)
+
+        with patch("app.core.pagination.estimate_rows", estimate):
+            total, is_estimate = await count_rows(db, select(Project))
+
+        assert (total, is_estimate) == (ESTIMATE_EXACT_THRESHOLD * 5, True)
+        assert executed == []
+
+    @pytest.mark.asyncio
+    async def test_small_or_failed_estimate_counts_exactly(self):
+        for estimated in (12, None):
+            db, _ = _session([], count=10)
+            with patch("app.core.pagination.estimate_rows", AsyncMock(return_value=estimated)):
+                assert await count_rows(db, select(Project)) == (10, False)
+
+    @pytest.mark.asyncio
+    async def test_exact_count_does_not_estimate(self):
+        db, _ = _session([], count=123_456)
+        estimate = AsyncMock()
+
+        with patch("app.core.pagination.estimate_rows", estimate):
+            assert await count_rows(db, select(Project), exact=True) == (123_456, False)
+
+        estimate.assert_not_called()
@@ -0,0 +1,116 @@
+"""
+プロバイダー側プロンプトキャッシュのテスト
+
+プロバイダーAPIのローカル代替を使い、cache_control の付与・キャッシュトークン数の記録・
+Geminiへのシステムプロンプトの送信を検証
+"""
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from app.schemas.expert_review import ExpertType
+from app.services.expert_review_service import EXPERT_CONFIG, ExpertReviewService
+from app.services.external.ai_clients import ClaudeClient, GeminiClient
+from app.services.external.prompt_cache import PROMPT_CACHE_TOKENS
+
+
+class LocalAnthropicMessages:
+    """cache_control 付きのシステムプロンプトをプレフィックスキャッシュする Messages API の代替"""
+
+    def __init__(self):
+        self.cached_prefixes = set()
+        self.calls = []
+
+    async def create(self, **params):
+        self.calls.append(params)
+        system = params.get("system")
+        cache_read = cache_write = 0
+        uncached = len(params["messages"][0]["content"])
+        if isinstance(system, list):
+            text = "".join(block["text"] for block in system)
+            if system[-1].get("cache_control"):
+                if text in self.cached_prefixes:
+                    cache_read = len(text)
+                else:
+                    cache_write = len(text)
+                    self.cached_prefixes.add(text)
+            else:
+                uncached += len(text)
+        elif system:
+            uncached += len(system)
+        return SimpleNamespace(
+            content=[SimpleNamespace(text="応答")],
+            usage=SimpleNamespace(
+                input_tokens=uncached,
+                cache_read_input_tokens=cache_read,
+                cache_creation_input_tokens=cache_write,
+            ),
+        )
+
+
+def _tokens(provider: str, call_site: str, kind: str) -> float:
+    return PROMPT_CACHE_TOKENS.labels(provider=provider, call_site=call_site, kind=kind)._value.get()
+
+
+class TestClaudePromptCache:
+    """ClaudeClientのcache_controlのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_system_prompt_is_cached_across_calls(self):
+        client = ClaudeClient()
+        client.api_key = "test"
+        messages = LocalAnthropicMessages()
+        client._async_client = SimpleNamespace(messages=messages)
+        system = "固定のシステムプロンプト" * 50
+        site = "test.rag"
+        read_before = _tokens("claude", site, "cache_read")
+        write_before = _tokens("claude", site, "cache_write")
+
+        for user_prompt in ("チャンク1", "チャンク2", "チャンク3"):
+            await client.generate_text(user_prompt, system=system, cache_system=True, call_site=site)
+
+        assert messages.calls[0]["system"][0]["cache_control"] == {"type": "ephemeral"}
+        assert _tokens("claude", site, "cache_write") == write_before + len(system)
+        assert _tokens("claude", site, "cache_read") == read_before + 2 * len(system)
+
+    @pytest.mark.asyncio
+    async def test_plain_system_prompt_without_flag(self):
+        client = ClaudeClient()
+        client.api_key = "test"
+        messages = LocalAnthropicMessages()
+        client._async_client = SimpleNamespace(messages=messages)
+
+        await client.generate_text("質問", system="システム")
+
+        assert messages.calls[0]["system"] == "システム"
+
+
+class TestExpertPrompts:
+    """専門家プロンプトの分割のテスト"""
+
+    def test_system_prompt_is_identical_across_scripts(self):
+        template = EXPERT_CONFIG[ExpertType.TARGET_INSIGHT]["prompt_template"]
+
+        system_a, user_a = ExpertReviewService._build_expert_prompts(template, "台本A", "ナレッジA")
+        system_b, user_b = ExpertReviewService._build_expert_prompts(template, "台本B", "ナレッジB")
+
+        assert system_a == system_b
+        assert "台本A" not in system_a and "台本A" in user_a
+        assert "ナレッジB" in user_b
+
+
+class TestGeminiSystemPrompt:
+    """Geminiのシステムプロンプトのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_system_prompt_is_sent_inline(self):
+        client = GeminiClient()
+        client.api_key = "test"
+        response = SimpleNamespace(text="応答", usage_metadata=None)
+        client._model = MagicMock()
+        client._model.generate_content_async = AsyncMock(return_value=response)
+
+        text = await client.generate_text("質問", system="短いシステム")
+
+        assert text == "応答"
+        assert client._model.generate_content_async.call_args.args[0] == "短いシステム\n\n質問"
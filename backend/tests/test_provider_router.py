@@ -0,0 +1,147 @@
+"""
+プロバイダールーターのテスト
+
+サーキットブレーカーの遷移、ヘッジ、フォールバックを検証
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.services.external import provider_router as router_module
+from app.services.external.provider_router import CircuitBreaker, ProviderRouter, RoutePolicy
+
+
+@pytest.fixture
+def policies(monkeypatch):
+    monkeypatch.setattr(router_module, "ROUTE_POLICIES", {
+        "test.hedged": RoutePolicy(hedge=True, timeout_seconds=2.0),
+        "test.sequential": RoutePolicy(hedge=False, timeout_seconds=0.2),
+    })
+    monkeypatch.setattr(CircuitBreaker, "DEFAULT_HEDGE_DELAY_SECONDS", 0.05)
+    monkeypatch.setattr(CircuitBreaker, "MIN_HEDGE_DELAY_SECONDS", 0.01)
+
+
+def _returning(value, delay: float = 0.0, calls: list = None, name: str = ""):
+    async def operation():
+        if calls is not None:
+            calls.append(name)
+        await asyncio.sleep(delay)
+        return value
+    return operation
+
+
+class TestCircuitBreaker:
+    """CircuitBreakerのテスト"""
+
+    def test_opens_on_failure_rate_and_recovers_via_probe(self, monkeypatch):
+        breaker = CircuitBreaker("claude")
+        for _ in range(CircuitBreaker.MIN_CALLS):
+            breaker.record(False, 0.1)
+
+        assert breaker.state == "open"
+        assert breaker.allow() is False
+
+        monkeypatch.setattr(breaker, "_opened_at", time.monotonic() - CircuitBreaker.COOLDOWN_SECONDS - 1)
+        assert breaker.allow() is True  # half_open の試行
+        assert breaker.allow() is False  # 試行は1件のみ
+
+        breaker.record(True, 0.1)
+        assert breaker.state == "closed"
+
+    def test_late_failures_do_not_extend_cooldown(self):
+        breaker = CircuitBreaker("claude")
+        for _ in range(CircuitBreaker.MIN_CALLS):
+            breaker.record(False, 0.1)
+        opened_at = breaker._opened_at
+
+        # 遮断前に開始した呼び出しが open 中に失敗しても、クールダウンの起点は変わらない
+        breaker.record(False, 0.1)
+        assert breaker._opened_at == opened_at
+
+    def test_slow_calls_count_as_failures(self):
+        breaker = CircuitBreaker("gemini")
+        for _ in range(CircuitBreaker.MIN_CALLS):
+            breaker.record(True, CircuitBreaker.SLOW_CALL_SECONDS + 1)
+        assert breaker.state == "open"
+
+    def test_hedge_delay_uses_p95(self):
+        breaker = CircuitBreaker("claude")
+        for latency in [1.0] * 95 + [9.0] * 5:
+            breaker.record(True, latency)
+        assert breaker.hedge_delay(30.0) == 9.0
+        assert breaker.hedge_delay(3.0) == 3.0
+
+
+class TestProviderRouter:
+    """ProviderRouterのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_hedge_returns_fast_secondary(self, policies):
+        router = ProviderRouter()
+        started = time.monotonic()
+
+        result = await router.call("test.hedged", {
+            "claude": _returning("遅い応答", delay=1.0),
+            "gemini": _returning("速い応答", delay=0.01),
+        })
+
+        assert result == "速い応答"
+        assert time.monotonic() - started < 0.5
+
+    @pytest.mark.asyncio
+    async def test_hedge_does_not_fire_when_primary_is_fast(self, policies):
+        router = ProviderRouter()
+        calls = []
+
+        result = await router.call("test.hedged", {
+            "claude": _returning("応答", calls=calls, name="claude"),
+            "gemini": _returning("応答2", calls=calls, name="gemini"),
+        })
+
+        assert result == "応答"
+        assert calls == ["claude"]
+
+    @pytest.mark.asyncio
+    async def test_sequential_falls_back_on_error_and_timeout(self, policies):
+        router = ProviderRouter()
+
+        assert await router.call("test.sequential", {
+            "claude": _returning({"error": "overloaded"}),
+            "gemini": _returning({"titles": ["A"]}),
+        }) == {"titles": ["A"]}
+
+        assert await router.call("test.sequential", {
+            "claude": _returning("遅い", delay=1.0),
+            "gemini": _returning("代替"),
+        }) == "代替"
+
+    @pytest.mark.asyncio
+    async def test_client_error_is_labelled_error(self, policies):
+        router = ProviderRouter()
+        calls = router_module.ROUTER_CALLS
+
+        def count(outcome):
+            return calls.labels(call_site="test.sequential", provider="claude", outcome=outcome)._value.get()
+
+        errors, rejected = count("error"), count("rejected")
+        await router.call("test.sequential", {"claude": _returning(None)})
+        await router.call("test.sequential", {"claude": _returning("応答")}, accept=lambda r: False)
+
+        assert count("error") == errors + 1
+        assert count("rejected") == rejected + 1
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_is_skipped(self, policies):
+        router = ProviderRouter()
+        for _ in range(CircuitBreaker.MIN_CALLS):
+            router.breaker("claude").record(False, 0.1)
+        calls = []
+
+        result = await router.call("test.sequential", {
+            "claude": _returning("応答", calls=calls, name="claude"),
+            "gemini": _returning("代替", calls=calls, name="gemini"),
+        })
+
+        assert result == "代替"
+        assert calls == ["gemini"]
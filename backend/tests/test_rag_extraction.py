@@ -0,0 +1,125 @@
+"""
+RAG解析 map-reduce のテスト
+
+チャンク分割の安定性、信頼度重み付けの統合、チャンク単位キャッシュを検証
+"""
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.services.knowledge_service import KnowledgeService
+from app.services.rag_extraction import (
+    RAG_CHUNK_MAX_SIZE,
+    RAG_CHUNK_OVERLAP,
+    merge_chunk_results,
+    split_into_chunks,
+)
+
+
+def _document(sentences: int, marker: str = "") -> str:
+    return "".join(f"これは{marker}テスト用の文章その{i}です。\n" for i in range(sentences))
+
+
+class TestSplitIntoChunks:
+    """split_into_chunksのテスト"""
+
+    def test_short_document_is_single_chunk(self):
+        """最大サイズ以下ならそのまま1チャンク"""
+        assert split_into_chunks("短い文書です。") == ["短い文書です。"]
+        assert split_into_chunks("  \n") == []
+
+    def test_long_document_is_fully_covered_with_overlap(self):
+        """全文を欠落なく含み、チャンクサイズは上限を守る"""
+        content = _document(3000)
+        chunks = split_into_chunks(content)
+
+        assert len(chunks) > 1
+        assert all(len(c) <= RAG_CHUNK_MAX_SIZE + RAG_CHUNK_OVERLAP for c in chunks)
+        for sentence in ("その0です。", "その1500です。", "その2999です。"):
+            assert any(sentence in c for c in chunks)
+        # 2番目以降は前チャンクの末尾を含む
+        assert chunks[0][-50:] in chunks[1]
+
+    def test_local_edit_keeps_other_chunks(self):
+        """一部を編集しても、編集箇所以外のチャンクは変わらない"""
+        original = _document(3000)
+        edited = original.replace("その1500です。", "その1500です（追記あり）。")
+
+        before = split_into_chunks(original)
+        after = split_into_chunks(edited)
+        changed = set(after) - set(before)
+
+        assert 1 <= len(changed) <= 2
+        assert len(set(after) & set(before)) >= len(after) - 2
+
+
+class TestMergeChunkResults:
+    """merge_chunk_resultsのテスト"""
+
+    def test_weighted_vote_and_conflict(self):
+        """重みの大きい値を採用し、拮抗する候補は確認対象にする"""
+        results = [
+            {"confidence": 0.9, "extracted_data": {"business_info": {"industry": "コンサル業"}}},
+            {"confidence": 0.3, "extracted_data": {"business_info": {"industry": "コーチング"}}},
+            {"confidence": 0.8, "extracted_data": {"business_info": {"industry": "講座販売"}}},
+        ]
+
+        merged = merge_chunk_results(results)
+
+        assert merged["extracted_data"]["business_info"]["industry"] == "コンサル業"
+        conflict = merged["needs_confirmation"][0]
+        assert (conflict["step"], conflict["field"]) == ("business_info", "industry")
+        assert "講座販売" in conflict["reason"]
+        assert "コーチング" not in conflict["reason"]
+
+    def test_fields_are_unioned_across_chunks(self):
+        """チャンクごとに別のフィールドが抽出されれば統合される"""
+        results = [
+            {
+                "confidence": 0.8,
+                "extracted_data": {"company": {"strengths": "実績"}, "sub_target": None},
+                "needs_confirmation": [{"step": "company", "field": "strengths", "value": "実績", "reason": "曖昧"}],
+            },
+            {"confidence": 0.6, "extracted_data": {"company": {"mission": "使命", "strengths": " 実績 "}}},
+        ]
+
+        merged = merge_chunk_results(results)
+
+        assert merged["extracted_data"]["company"] == {"strengths": "実績", "mission": "使命"}
+        assert merged["extracted_data"]["sub_target"] is None
+        assert merged["needs_confirmation"] == results[0]["needs_confirmation"]
+        assert merged["confidence"] == pytest.approx((0.8 * 1 + 0.6 * 2) / 3)
+
+
+class TestAnalyzeRagContent:
+    """KnowledgeService.analyze_rag_contentのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_only_uncached_chunks_are_analyzed(self):
+        """キャッシュ済みチャンクはLLMを呼ばずに統合される"""
+        content = _document(3000)
+        chunks = split_into_chunks(content)
+        cached = {
+            chunks[0]: {"confidence": 0.9, "extracted_data": {"business_info": {"industry": "コンサル業"}}},
+        }
+        llm_response = json.dumps({
+            "confidence": 0.7,
+            "extracted_data": {"company": {"mission": "使命"}},
+        }, ensure_ascii=False)
+
+        with patch(
+            "app.services.knowledge_service.get_cached_chunk_result",
+            AsyncMock(side_effect=lambda chunk: cached.get(chunk)),
+        ), patch(
+            "app.services.knowledge_service.set_cached_chunk_result", AsyncMock()
+        ) as set_cache, patch.object(
+            KnowledgeService, "_call_claude_for_rag", AsyncMock(return_value=llm_response)
+        ) as call_claude, patch(
+            "app.services.knowledge_service.claude_client.is_available", return_value=True
+        ):
+            response = await KnowledgeService.analyze_rag_content(content)
+
+        assert call_claude.await_count == len(chunks) - 1
+        assert set_cache.await_count == len(chunks) - 1
+        assert response.extracted_data.business_info == {"industry": "コンサル業"}
+        assert response.extracted_data.company == {"mission": "使命"}
@@ -0,0 +1,157 @@
+"""
+SSEストリーミングのテスト
+
+イベントの配信・再接続（Last-Event-ID）・専門家レビューのストリーミングを検証
+"""
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import redis.asyncio as redis
+
+from app.core.sse import EventStream, EventStreamBroker, format_sse
+
+
+def _parse(messages):
+    """SSEメッセージを (id, event, data) のリストに変換"""
+    events = []
+    for message in messages:
+        if message.startswith(":"):
+            continue
+        fields = {}
+        for line in message.strip().split("\n"):
+            key, _, value = line.partition(": ")
+            fields[key] = value
+        events.append((fields.get("id"), fields["event"], json.loads(fields["data"])))
+    return events
+
+
+@pytest.fixture
+def no_redis():
+    """Redis未接続（複製は無効化され、プロセス内で配信）"""
+    with patch("app.core.sse.get_redis", AsyncMock(side_effect=redis.ConnectionError("down"))):
+        yield
+
+
+async def _collect(broker, stream_id, last_event_id=None):
+    return _parse([m async for m in broker.subscribe(stream_id, last_event_id)])
+
+
+class TestEventStreamBroker:
+    """EventStreamBrokerのテスト"""
+
+    def test_format_sse_multiline(self):
+        """複数行データは data: 行に分割される"""
+        message = format_sse("token", "a\nb", 3)
+        assert message == "id: 3\nevent: token\ndata: a\ndata: b\n\n"
+
+    @pytest.mark.asyncio
+    async def test_stream_and_resume(self, no_redis):
+        """全イベントを配信し、Last-Event-ID以降を再送できる"""
+        broker = EventStreamBroker()
+        release = asyncio.Event()
+
+        async def producer(emit):
+            await emit("token", {"text": "こん"})
+            await emit("token", {"text": "にちは"})
+            await release.wait()
+            await emit("result", {"ok": True})
+
+        stream_id = broker.start(producer)
+        release.set()
+        events = await _collect(broker, stream_id)
+
+        assert events[0][1] == "stream"
+        assert [e[1] for e in events[1:]] == ["token", "token", "result", "done"]
+        assert [e[0] for e in events[1:]] == ["1", "2", "3", "4"]
+
+        resumed = await _collect(broker, stream_id, last_event_id="2")
+        assert [e[1] for e in resumed[1:]] == ["result", "done"]
+
+    @pytest.mark.asyncio
+    async def test_producer_error_emits_error_event(self, no_redis):
+        """生成処理の例外はerrorイベントで通知される"""
+        broker = EventStreamBroker()
+
+        async def producer(emit):
+            await emit("token", {"text": "途中"})
+            raise RuntimeError("provider failed")
+
+        stream_id = broker.start(producer)
+        events = await _collect(broker, stream_id)
+
+        assert events[-1][1] == "error"
+        assert events[-1][2]["message"] == "provider failed"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_emits_mirror_in_order(self):
+        """並行して emit してもRedisへのXADDは連番順になる"""
+        ids = []
+
+        async def xadd(key, fields, id, **kwargs):
+            await asyncio.sleep(0.001 * (int(id.split("-")[1]) % 3))
+            ids.append(id)
+
+        client = MagicMock()
+        client.xadd = AsyncMock(side_effect=xadd)
+        client.expire = AsyncMock()
+        stream = EventStream("test")
+
+        async def expert(name):
+            for i in range(5):
+                await stream.emit("token", {"expert": name, "i": i})
+
+        with patch("app.core.sse.get_redis", AsyncMock(return_value=client)):
+            await asyncio.gather(*(expert(n) for n in "abcde"))
+
+        assert ids == [f"0-{seq}" for seq in range(1, 26)]
+        assert [seq for seq, _, _ in stream.events] == list(range(1, 26))
+
+
+class TestExpertReviewStreaming:
+    """専門家レビューのストリーミングテスト"""
+
+    @pytest.mark.asyncio
+    async def test_review_streams_tokens_and_expert_events(self):
+        """各専門家のトークンと完了イベントが配信される"""
+        from app.schemas.expert_review import ExpertReviewRequest, ExpertType
+        from app.services.expert_review_service import ExpertReviewService
+
+        payload = json.dumps({
+            "score": 80,
+            "original_text": "元",
+            "revised_text": "改",
+            "improvement_reason": "理由",
+            "suggestions": ["提案"],
+        }, ensure_ascii=False)
+
+        async def fake_stream(prompt, **kwargs):
+            for i in range(0, len(payload), 10):
+                yield payload[i:i + 10]
+
+        emitted = []
+
+        async def emit(event, data):
+            emitted.append((event, data))
+
+        request = ExpertReviewRequest(
+            script_id="s1",
+            sections=[{"id": "1", "label": "冒頭", "timestamp": "0:00", "content": "こんにちは"}],
+            source_ai_type="claude",
+        )
+
+        with patch("app.services.expert_review_service.claude_client") as mock_claude, \
+                patch("app.services.expert_review_service.gemini_client") as mock_gemini:
+            for client in (mock_claude, mock_gemini):
+                client.is_available.return_value = True
+                client.stream_text = fake_stream
+            response = await ExpertReviewService.review_script(request, None, emit)
+
+        expert_events = [data for event, data in emitted if event == "expert"]
+        tokens = [data for event, data in emitted if event == "token"]
+
+        assert len(expert_events) == len(ExpertType)
+        assert all(e["score"] == 80 for e in expert_events)
+        assert {t["expert_type"] for t in tokens} == {e.value for e in ExpertType}
+        assert all(f.score == 80 for f in response.expert_feedbacks)
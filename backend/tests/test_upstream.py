@@ -0,0 +1,112 @@
+"""
+外部API呼び出し制御のテスト
+
+同一リクエストの合流、同時実行数の上限、TTLキャッシュ、リサーチの並行ファンアウトを検証
+"""
+import asyncio
+import time
+
+import pytest
+from unittest.mock import patch
+
+from app.services.external.upstream import UpstreamAPI
+from app.services.research_service import ResearchService
+
+
+class InMemoryCache:
+    """CacheServiceのテスト用代替"""
+
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ttl=None):
+        self.values[key] = value
+        return True
+
+
+@pytest.fixture
+def memory_cache():
+    cache = InMemoryCache()
+    with patch("app.services.external.upstream.cache", cache):
+        yield cache
+
+
+class TestUpstreamAPI:
+    """UpstreamAPIのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_identical_inflight_requests_share_one_call(self, memory_cache):
+        api = UpstreamAPI("test", max_concurrency=4, ttl_seconds=60)
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return [{"keyword": "NISA"}]
+
+        results = await asyncio.gather(*(api.call("trends", {"q": "NISA"}, fetch) for _ in range(5)))
+
+        assert len(calls) == 1
+        assert all(r == [{"keyword": "NISA"}] for r in results)
+
+        # 期限内はキャッシュから返す
+        assert await api.call("trends", {"q": "NISA"}, fetch) == [{"keyword": "NISA"}]
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self, memory_cache):
+        api = UpstreamAPI("test", max_concurrency=2, ttl_seconds=60)
+        active = 0
+        peak = 0
+
+        def fetcher(value):
+            async def fetch():
+                nonlocal active, peak
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.02)
+                active -= 1
+                return [value]
+            return fetch
+
+        await asyncio.gather(*(api.call("search", {"q": i}, fetcher(i)) for i in range(6)))
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_empty_results_are_not_cached(self, memory_cache):
+        api = UpstreamAPI("test", max_concurrency=2, ttl_seconds=60)
+
+        async def failing_fetch():
+            return []
+
+        await api.call("search", {"q": "x"}, failing_fetch)
+
+        assert memory_cache.values == {}
+
+
+class TestResearchFanOut:
+    """ResearchServiceの並行ファンアウトのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_rising_keywords_are_fetched_concurrently(self, memory_cache):
+        trends = [{"keyword": f"kw{i}", "trend_direction": "up"} for i in range(8)]
+
+        async def fake_trends(query, *args, **kwargs):
+            if query == "投資":
+                return trends
+            await asyncio.sleep(0.05)
+            return [{"keyword": f"{query}-related"}]
+
+        with patch("app.services.research_service.serp_api") as serp:
+            serp.is_available.return_value = True
+            serp.search_google_trends.side_effect = fake_trends
+            started = time.monotonic()
+            result = await ResearchService.get_keyword_trends(None, "owner", query="投資")
+
+        assert time.monotonic() - started < 0.3
+        assert result.total == 8
+        assert result.data[0].related_keywords == ["kw0-related"]
@@ -16,11 +16,16 @@ Claude Desktop/Claude CodeからMCPツールとして利用可能にする
   - naomi_analyze: 学習ナオミによる分析
 """
 
+import asyncio
 import json
+import logging
 import os
+import sys
+import time
+from collections import deque
 from datetime import datetime
 from enum import Enum
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Awaitable, Callable, Iterable, Iterator, NamedTuple, Tuple
 from pathlib import Path
 
 from mcp.server.fastmcp import FastMCP
@@ -32,6 +37,15 @@ if env_path.exists():
     load_dotenv(env_path)
 
 
+# stdoutはstdioトランスポートのJSON-RPCストリームのため、ログはstderrに出力する
+logging.basicConfig(
+    stream=sys.stderr,
+    level=logging.INFO,
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+)
+logger = logging.getLogger("human-first-ai-staff")
+
+
 # =============================================================================
 # MCPサーバー初期化
 # =============================================================================
@@ -43,6 +57,10 @@ mcp = FastMCP("human-first-ai-staff")
 # Central DB接続
 # =============================================================================
 
+# PostgreSQLのエラーコード（undefined_table）
+UNDEFINED_TABLE = "42P01"
+
+
 class CentralDBClient:
     """Central DBクライアント（PostgreSQL + pgvector + OpenAI Embedding）"""
 
@@ -51,6 +69,8 @@ class CentralDBClient:
         self._openai = None
         self.database_url = os.getenv("DATABASE_URL")
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
+        # lexicon_terms テーブルが存在しない場合は以降の辞書確認を行わない
+        self.lexicon_table_missing = False
 
     def _get_pool(self):
         """データベース接続プール（遅延初期化）"""
@@ -63,7 +83,7 @@ class CentralDBClient:
                 # psycopg_poolがない場合はシンプル接続
                 pass
             except Exception as e:
-                print(f"DB接続エラー: {e}")
+                logger.error(f"DB接続エラー: {e}")
         return self._pool
 
     def _get_openai(self):
@@ -73,7 +93,7 @@ class CentralDBClient:
                 from openai import OpenAI
                 self._openai = OpenAI(api_key=self.openai_api_key)
             except Exception as e:
-                print(f"OpenAI初期化エラー: {e}")
+                logger.error(f"OpenAI初期化エラー: {e}")
         return self._openai
 
     def generate_embedding(self, text: str) -> Optional[List[float]]:
@@ -89,7 +109,7 @@ class CentralDBClient:
             )
             return response.data[0].embedding
         except Exception as e:
-            print(f"Embedding生成エラー: {e}")
+            logger.error(f"Embedding生成エラー: {e}")
             return None
 
     def search_knowledge(
@@ -148,9 +168,68 @@ class CentralDBClient:
                     return results
 
         except Exception as e:
-            print(f"検索エラー: {e}")
+            logger.error(f"検索エラー: {e}")
             return []
 
+    def get_lexicon_version(self) -> Optional[str]:
+        """
+        照合辞書（lexicon_terms）のバージョン（件数と最終更新日時。変更検知用）
+
+        テーブルが存在しなければ lexicon_table_missing を立て、以降は問い合わせない
+        """
+        if not self.database_url or self.lexicon_table_missing:
+            return None
+
+        try:
+            import psycopg
+
+            with psycopg.connect(self.database_url) as conn:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT COUNT(*), MAX(updated_at) FROM lexicon_terms WHERE is_active")
+                    count, updated_at = cur.fetchone()
+                    return f"{count}:{updated_at}"
+
+        except Exception as e:
+            if getattr(e, "sqlstate", None) == UNDEFINED_TABLE:
+                self.lexicon_table_missing = True
+                logger.warning("lexicon_terms テーブルがないため、組み込み辞書のみで照合します（README参照）")
+            else:
+                logger.error(f"辞書バージョン取得エラー: {e}")
+            return None
+
+    def get_lexicon_terms(self) -> Dict[str, List[str]]:
+        """照合辞書をカテゴリ別に取得"""
+        if not self.database_url:
+            return {}
+
+        try:
+            import psycopg
+
+            with psycopg.connect(self.database_url) as conn:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT category, term FROM lexicon_terms WHERE is_active")
+                    results: Dict[str, List[str]] = {}
+                    for category, term in cur.fetchall():
+                        results.setdefault(category, []).append(term)
+                    return results
+
+        except Exception as e:
+            logger.error(f"辞書取得エラー: {e}")
+            return {}
+
+    async def asearch_knowledge(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        limit: int = 5
+    ) -> List[Dict[str, Any]]:
+        """search_knowledge の非同期版（Embedding生成・DB検索をスレッドで実行し、複数検索を並行させる）"""
+        return await asyncio.to_thread(self.search_knowledge, query, category, limit)
+
+    async def aget_categories(self) -> Dict[str, int]:
+        """get_categories の非同期版"""
+        return await asyncio.to_thread(self.get_categories)
+
     def get_categories(self) -> Dict[str, int]:
         """カテゴリ一覧と件数を取得"""
         if not self.database_url:
@@ -184,7 +263,7 @@ class CentralDBClient:
                     return results
 
         except Exception as e:
-            print(f"カテゴリ取得エラー: {e}")
+            logger.error(f"カテゴリ取得エラー: {e}")
             return {}
 
 
@@ -192,6 +271,64 @@ class CentralDBClient:
 central_db = CentralDBClient()
 
 
+# =============================================================================
+# コンテキストキャッシュ
+# =============================================================================
+
+class ContextCache:
+    """
+    組み立て済みナレッジコンテキストのTTLキャッシュ
+
+    キーは (トピック, 種別)。同じキーの取得が実行中なら、その結果を共有する。
+    空のコンテキスト（検索失敗・該当なし）はキャッシュしない
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple[str, str], Tuple[float, asyncio.Task]] = {}
+
+    async def get_or_build(
+        self,
+        key: Tuple[str, str],
+        build: Callable[[], Awaitable[str]],
+    ) -> str:
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry and entry[0] > now:
+            return await asyncio.shield(entry[1])
+
+        self._evict(now)
+        task = asyncio.ensure_future(build())
+        self._entries[key] = (now + self.ttl_seconds, task)
+        try:
+            result = await asyncio.shield(task)
+        except Exception:
+            self._discard(key, task)
+            raise
+        if not result:
+            self._discard(key, task)
+        return result
+
+    def _discard(self, key: Tuple[str, str], task: asyncio.Task) -> None:
+        entry = self._entries.get(key)
+        if entry and entry[1] is task:
+            del self._entries[key]
+
+    def _evict(self, now: float) -> None:
+        """期限切れのエントリを削除し、上限を超える場合は古いものから削除"""
+        for key in [k for k, (expires, _) in self._entries.items() if expires <= now]:
+            del self._entries[key]
+        while len(self._entries) >= self.max_entries:
+            del self._entries[next(iter(self._entries))]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+context_cache = ContextCache(float(os.getenv("CONTEXT_CACHE_TTL_SECONDS", "300")))
+
+
 # =============================================================================
 # 共通定義
 # =============================================================================
@@ -222,16 +359,219 @@ EMOTION_KEYWORDS = {
 # HSP避けるべき表現
 HSP_AVOID = ["すぐに", "今すぐ", "絶対", "必ず", "〜しなければ", "〜すべき"]
 
+# 照合辞書のカテゴリ（Central DB の lexicon_terms.category と対応）
+LEXICON_EMOTION_PREFIX = "emotion."
+LEXICON_HSP_AVOID = "hsp_avoid"
+LEXICON_ETHICS_DANGER = "ethics.danger"
+LEXICON_ETHICS_WARNING = "ethics.warning"
+LEXICON_DISCLOSURE = "transparency.disclosure"
+LEXICON_FAQ_VIEWING = "faq.viewing"
+LEXICON_FAQ_ASSIGNMENT = "faq.assignment"
+LEXICON_FAQ_PRICING = "faq.pricing"
+
+# 組み込みの照合辞書（Central DBの辞書はこれに追加される）
+DEFAULT_LEXICONS: Dict[str, List[str]] = {
+    **{f"{LEXICON_EMOTION_PREFIX}{level}": terms for level, terms in EMOTION_KEYWORDS.items()},
+    LEXICON_HSP_AVOID: HSP_AVOID,
+    LEXICON_ETHICS_DANGER: ["自殺", "自傷", "死にたい"],
+    LEXICON_ETHICS_WARNING: ["医療", "診断", "治療", "法律", "訴訟"],
+    LEXICON_DISCLOSURE: ["AIです", "AI「", "自動返信", "AIアシスタント", "が作成しました"],
+    LEXICON_FAQ_VIEWING: ["視聴", "見方", "再生", "動画"],
+    LEXICON_FAQ_ASSIGNMENT: ["課題", "提出", "ワーク"],
+    LEXICON_FAQ_PRICING: ["料金", "価格", "プラン"],
+}
+
+
+# =============================================================================
+# 辞書照合（Aho-Corasick）
+# =============================================================================
+
+class LexiconMatch(NamedTuple):
+    """辞書の一致箇所"""
+    start: int
+    end: int  # 終端（この位置を含まない）
+    term: str
+    category: str
+
+
+class _Automaton:
+    """
+    Aho-Corasickオートマトン（pyahocorasick未導入時の純Python実装）
+
+    pyahocorasick.Automaton と同じく iter(text) で (終端インデックス, 値) を返す
+    """
+
+    def __init__(self, words: Dict[str, Any]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._out: List[List[Any]] = [[]]
+        for word, value in words.items():
+            state = 0
+            for ch in word:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._out.append([])
+                    self._goto[state][ch] = nxt
+                state = nxt
+            self._out[state].append(value)
+
+        # 失敗遷移（幅優先で構築し、出力は失敗先のものを引き継ぐ）
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter(self, text: str) -> Iterator[Tuple[int, Any]]:
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for value in out[state]:
+                yield i, value
+
+
+def _build_automaton(words: Dict[str, Any]):
+    """オートマトンを構築（pyahocorasickがあればC実装を使う）"""
+    try:
+        import ahocorasick
+    except ImportError:
+        return _Automaton(words)
+
+    automaton = ahocorasick.Automaton()
+    for word, value in words.items():
+        automaton.add_word(word, value)
+    if words:
+        automaton.make_automaton()
+    return automaton
+
+
+class LexiconMatcher:
+    """
+    複数カテゴリの辞書を1つのオートマトンにまとめ、テキストを1回走査して全一致箇所を返す
+
+    照合コストは辞書の語数に依らずテキスト長（+一致数）に比例する
+    """
+
+    def __init__(self, lexicons: Dict[str, Iterable[str]]):
+        categories_by_term: Dict[str, List[str]] = {}
+        for category, terms in lexicons.items():
+            for term in terms:
+                if term and category not in categories_by_term.setdefault(term, []):
+                    categories_by_term[term].append(category)
+
+        self.size = len(categories_by_term)
+        self._automaton = _build_automaton(
+            {term: (term, tuple(categories)) for term, categories in categories_by_term.items()}
+        )
+
+    def find_all(self, text: str, categories: Optional[Iterable[str]] = None) -> List[LexiconMatch]:
+        """
+        全一致箇所を出現順で返す
+
+        Args:
+            text: 照合対象のテキスト
+            categories: 対象カテゴリ（省略時は全カテゴリ）
+        """
+        if not self.size:
+            return []
+        wanted = set(categories) if categories is not None else None
+        matches = []
+        for end, (term, term_categories) in self._automaton.iter(text):
+            for category in term_categories:
+                if wanted is None or category in wanted:
+                    matches.append(LexiconMatch(end - len(term) + 1, end + 1, term, category))
+        matches.sort(key=lambda m: (m.start, -m.end))
+        return matches
+
+    def group_by_category(self, text: str) -> Dict[str, List[LexiconMatch]]:
+        """カテゴリ別の一致箇所"""
+        grouped: Dict[str, List[LexiconMatch]] = {}
+        for match in self.find_all(text):
+            grouped.setdefault(match.category, []).append(match)
+        return grouped
+
+
+class LexiconRegistry:
+    """
+    照合辞書の管理
+
+    組み込み辞書にCentral DBの lexicon_terms を加えてオートマトンを構築し、
+    一定間隔でバージョン（件数・最終更新日時）を確認して変更があれば再構築する
+    """
+
+    def __init__(self, defaults: Dict[str, List[str]], reload_interval_seconds: float):
+        self.defaults = defaults
+        self.reload_interval_seconds = reload_interval_seconds
+        self.matcher = LexiconMatcher(defaults)
+        self._version: Optional[str] = None
+        self._checked_at = float("-inf")
+
+    async def refresh_if_stale(self) -> None:
+        """
+        確認間隔を過ぎていればCentral DBの辞書の変更を確認し、変更があれば再構築
+
+        lexicon_terms テーブルがない場合は組み込み辞書のまま確認をやめる
+        """
+        now = time.monotonic()
+        if central_db.lexicon_table_missing or now - self._checked_at < self.reload_interval_seconds:
+            return
+        self._checked_at = now
+
+        version = await asyncio.to_thread(central_db.get_lexicon_version)
+        if version is None or version == self._version:
+            return
+
+        terms = await asyncio.to_thread(central_db.get_lexicon_terms)
+        lexicons = {category: list(words) for category, words in self.defaults.items()}
+        for category, words in terms.items():
+            lexicons.setdefault(category, []).extend(words)
+
+        # 構築中も既存のオートマトンで照合を続け、完成後に差し替える
+        self.matcher = await asyncio.to_thread(LexiconMatcher, lexicons)
+        self._version = version
+        logger.info(f"照合辞書を更新しました: {self.matcher.size}語 (version {version})")
+
+
+lexicons = LexiconRegistry(DEFAULT_LEXICONS, float(os.getenv("LEXICON_RELOAD_INTERVAL_SECONDS", "60")))
+
 
 def check_emotion(text: str) -> Optional[EscalationLevel]:
-    """感情キーワードをチェック"""
-    for level, keywords in EMOTION_KEYWORDS.items():
-        for kw in keywords:
-            if kw in text:
-                return EscalationLevel(level)
+    """感情キーワードをチェック（最も高いレベルを返す）"""
+    levels = {
+        m.category[len(LEXICON_EMOTION_PREFIX):]
+        for m in lexicons.matcher.find_all(text)
+        if m.category.startswith(LEXICON_EMOTION_PREFIX)
+    }
+    for level in EscalationLevel:
+        if level.value in levels:
+            return level
     return None
 
 
+def _positions(matches: List[LexiconMatch]) -> Dict[str, List[int]]:
+    """語ごとの出現位置（1始まりの文字位置）"""
+    positions: Dict[str, List[int]] = {}
+    for m in matches:
+        positions.setdefault(m.term, []).append(m.start + 1)
+    return positions
+
+
+def _format_positions(positions: List[int], limit: int = 5) -> str:
+    shown = ", ".join(str(p) for p in positions[:limit])
+    return f"{shown}, …" if len(positions) > limit else shown
+
+
 def add_ai_disclosure(content: str, agent_name: str) -> str:
     """AI開示ラベルを追加"""
     header = f"AI{agent_name}です\n\n"
@@ -243,26 +583,26 @@ def add_ai_disclosure(content: str, agent_name: str) -> str:
 # サチコ（秘書）
 # =============================================================================
 
-def _search_faq_knowledge(query: str) -> Optional[str]:
+async def _search_faq_knowledge(query: str) -> Optional[str]:
     """Central DBからFAQ関連ナレッジを検索"""
-    results = central_db.search_knowledge(
-        query=query,
-        category="questions",
-        limit=3
-    )
-    if results:
+    async def build() -> str:
+        results = await central_db.asearch_knowledge(
+            query=query,
+            category="questions",
+            limit=3
+        )
         answers = []
         for r in results:
             title = r.get("title", "")
-            content = r.get("content", "")[:200]
             if title:
                 answers.append(f"・{title}")
-        return "\n".join(answers) if answers else None
-    return None
+        return "\n".join(answers)
+
+    return await context_cache.get_or_build((query, "faq"), build) or None
 
 
 @mcp.tool()
-def sachiko_respond(
+async def sachiko_respond(
     message: str,
     customer_name: str = "お客様",
     tier: str = "free",
@@ -288,6 +628,8 @@ def sachiko_respond(
     if tier in ["premium", "standard"]:
         return f"【エスカレーション】\n{tier}のお客様への対応は金子さんが直接行います。"
 
+    await lexicons.refresh_if_stale()
+
     # 感情キーワードチェック
     emotion = check_emotion(message)
     if emotion:
@@ -314,21 +656,21 @@ def sachiko_respond(
             )
 
     # FAQ対応
-    msg_lower = message.lower()
+    faq_matches = lexicons.matcher.group_by_category(message.lower())
 
-    if any(kw in msg_lower for kw in ["視聴", "見方", "再生", "動画"]):
+    if LEXICON_FAQ_VIEWING in faq_matches:
         response = (
             "講座の視聴方法ですね！\n"
             "マイページの「講座一覧」からご覧いただけます。\n"
             "ご不明点があればお気軽にどうぞ！"
         )
-    elif any(kw in msg_lower for kw in ["課題", "提出", "ワーク"]):
+    elif LEXICON_FAQ_ASSIGNMENT in faq_matches:
         response = (
             "課題の提出方法ですね！\n"
             "マイページの「課題提出」からアップロードできます。\n"
             "期限は各週の日曜23:59までです。"
         )
-    elif any(kw in msg_lower for kw in ["料金", "価格", "プラン"]):
+    elif LEXICON_FAQ_PRICING in faq_matches:
         response = (
             "プランについてですね！\n"
             "詳細は公式サイトでご確認いただけます。\n"
@@ -338,7 +680,7 @@ def sachiko_respond(
         # Central DBからFAQナレッジを検索
         knowledge_hint = ""
         if use_knowledge:
-            faq_results = _search_faq_knowledge(message)
+            faq_results = await _search_faq_knowledge(message)
             if faq_results:
                 knowledge_hint = f"\n\n【関連する質問パターン（参考）】\n{faq_results}"
 
@@ -356,7 +698,7 @@ def sachiko_respond(
 # =============================================================================
 
 @mcp.tool()
-def kenji_research(
+async def kenji_research(
     query: str,
     research_type: str = "general",
     category: str = "",
@@ -381,7 +723,7 @@ def kenji_research(
 
     if research_type == "knowledge":
         # Central DBからRAG検索
-        results = central_db.search_knowledge(
+        results = await central_db.asearch_knowledge(
             query=query,
             category=category if category else None,
             limit=limit
@@ -435,7 +777,7 @@ Central DBに該当するナレッジが見つかりませんでした。
 
     elif research_type == "categories":
         # カテゴリ一覧取得
-        categories = central_db.get_categories()
+        categories = await central_db.aget_categories()
 
         if not categories:
             return f"""# カテゴリ一覧
@@ -515,7 +857,7 @@ Central DBに該当するナレッジが見つかりませんでした。
 
     else:  # general
         # 一般調査でもCentral DBを検索してみる
-        results = central_db.search_knowledge(query=query, limit=3)
+        results = await central_db.asearch_knowledge(query=query, limit=3)
 
         related_section = ""
         if results:
@@ -550,39 +892,52 @@ Central DBに該当するナレッジが見つかりませんでした。
 # ユウタ（クリエイティブ）- Central DB連携版
 # =============================================================================
 
-def _get_knowledge_context(topic: str, content_type: str) -> str:
-    """トピックに関連するナレッジコンテキストを取得"""
+async def _no_results() -> List[Dict[str, Any]]:
+    return []
+
+
+async def _get_knowledge_context(topic: str, content_type: str) -> str:
+    """トピックに関連するナレッジコンテキストを取得（検索は並行実行）"""
+    return await context_cache.get_or_build(
+        (topic, content_type),
+        lambda: _build_knowledge_context(topic, content_type),
+    )
+
+
+async def _build_knowledge_context(topic: str, content_type: str) -> str:
     context_parts = []
 
-    # メソッド・技法を検索
-    methods = central_db.search_knowledge(
-        query=f"{topic} 手法 テクニック",
-        category="methods",
-        limit=2
+    methods, scripts, questions = await asyncio.gather(
+        # メソッド・技法を検索
+        central_db.asearch_knowledge(
+            query=f"{topic} 手法 テクニック",
+            category="methods",
+            limit=2
+        ),
+        # 過去のコンテンツ・台本を検索
+        central_db.asearch_knowledge(
+            query=f"{topic} 台本 動画",
+            category="content",
+            limit=2
+        ) if content_type == "script" else _no_results(),
+        # 質問パターンを検索
+        central_db.asearch_knowledge(
+            query=topic,
+            category="questions",
+            limit=2
+        ),
     )
+
     if methods:
         context_parts.append("【関連メソッド】")
         for m in methods:
             context_parts.append(f"- {m.get('title', '')}: {(m.get('summary', '') or m.get('content', ''))[:150]}")
 
-    # 過去のコンテンツ・台本を検索
-    if content_type == "script":
-        scripts = central_db.search_knowledge(
-            query=f"{topic} 台本 動画",
-            category="content",
-            limit=2
-        )
-        if scripts:
-            context_parts.append("\n【参考コンテンツ】")
-            for s in scripts:
-                context_parts.append(f"- {s.get('title', '')}")
-
-    # 質問パターンを検索
-    questions = central_db.search_knowledge(
-        query=topic,
-        category="questions",
-        limit=2
-    )
+    if scripts:
+        context_parts.append("\n【参考コンテンツ】")
+        for s in scripts:
+            context_parts.append(f"- {s.get('title', '')}")
+
     if questions:
         context_parts.append("\n【よくある質問】")
         for q in questions:
@@ -592,7 +947,7 @@ def _get_knowledge_context(topic: str, content_type: str) -> str:
 
 
 @mcp.tool()
-def yuta_create(
+async def yuta_create(
     topic: str,
     content_type: str = "script",
     use_knowledge: bool = True,
@@ -617,7 +972,7 @@ def yuta_create(
     # Central DBからナレッジコンテキストを取得
     knowledge_context = ""
     if use_knowledge:
-        knowledge_context = _get_knowledge_context(topic, content_type)
+        knowledge_context = await _get_knowledge_context(topic, content_type)
 
     # ナレッジセクション生成
     knowledge_section = ""
@@ -799,27 +1154,34 @@ _ここにクライアント事例（匿名化）を入れてください_
 # マコト（品質＆倫理）- Central DB連携版
 # =============================================================================
 
-def _get_quality_guidelines(content: str) -> str:
-    """Central DBから品質ガイドラインを取得"""
+async def _get_quality_guidelines(content: str) -> str:
+    """Central DBから品質ガイドラインを取得（検索クエリは固定のため内容に依らずキャッシュを共有）"""
+    return await context_cache.get_or_build(("", "quality_guidelines"), _build_quality_guidelines)
+
+
+async def _build_quality_guidelines() -> str:
     guidelines = []
 
-    # methodsカテゴリからHSP関連の手法を検索
-    methods = central_db.search_knowledge(
-        query="HSP 配慮 コミュニケーション",
-        category="methods",
-        limit=2
+    methods, best_practices = await asyncio.gather(
+        # methodsカテゴリからHSP関連の手法を検索
+        central_db.asearch_knowledge(
+            query="HSP 配慮 コミュニケーション",
+            category="methods",
+            limit=2
+        ),
+        # contentカテゴリからベストプラクティスを検索
+        central_db.asearch_knowledge(
+            query="品質 ガイドライン 表現",
+            category="content",
+            limit=2
+        ),
     )
+
     if methods:
         guidelines.append("【HSP配慮のメソッド】")
         for m in methods:
             guidelines.append(f"・{m.get('title', '')}")
 
-    # contentカテゴリからベストプラクティスを検索
-    best_practices = central_db.search_knowledge(
-        query="品質 ガイドライン 表現",
-        category="content",
-        limit=2
-    )
     if best_practices:
         guidelines.append("\n【参考コンテンツ】")
         for b in best_practices:
@@ -829,7 +1191,7 @@ def _get_quality_guidelines(content: str) -> str:
 
 
 @mcp.tool()
-def makoto_check(
+async def makoto_check(
     content: str,
     check_types: str = "all",
     use_knowledge: bool = True,
@@ -855,12 +1217,17 @@ def makoto_check(
     suggestions = []
     scores = {}
 
+    # 全辞書を1回の走査で照合
+    await lexicons.refresh_if_stale()
+    matches = lexicons.matcher.group_by_category(content)
+
     # HSPチェック
     if check_types in ["hsp", "all"]:
         hsp_issues = []
-        for expr in HSP_AVOID:
-            if expr in content:
-                hsp_issues.append(f"「{expr}」はプレッシャーを与える可能性があります")
+        for expr, positions in _positions(matches.get(LEXICON_HSP_AVOID, [])).items():
+            hsp_issues.append(
+                f"「{expr}」はプレッシャーを与える可能性があります（{_format_positions(positions)}文字目）"
+            )
 
         hsp_score = max(1, 10 - len(hsp_issues) * 2)
         scores["HSP共感度"] = hsp_score
@@ -874,16 +1241,14 @@ def makoto_check(
         ethics_issues = []
 
         # 危険キーワード
-        danger_keywords = ["自殺", "自傷", "死にたい"]
-        for kw in danger_keywords:
-            if kw in content:
-                ethics_issues.append(f"危険キーワード検出: 「{kw}」")
+        for kw, positions in _positions(matches.get(LEXICON_ETHICS_DANGER, [])).items():
+            ethics_issues.append(f"危険キーワード検出: 「{kw}」（{_format_positions(positions)}文字目）")
 
         # 要注意キーワード
-        warning_keywords = ["医療", "診断", "治療", "法律", "訴訟"]
-        for kw in warning_keywords:
-            if kw in content:
-                ethics_issues.append(f"要注意: 「{kw}」- 専門家への相談を促してください")
+        for kw, positions in _positions(matches.get(LEXICON_ETHICS_WARNING, [])).items():
+            ethics_issues.append(
+                f"要注意: 「{kw}」- 専門家への相談を促してください（{_format_positions(positions)}文字目）"
+            )
 
         ethics_score = 1 if any("危険" in i for i in ethics_issues) else max(1, 10 - len(ethics_issues) * 2)
         scores["倫理"] = ethics_score
@@ -907,8 +1272,7 @@ def makoto_check(
 
     # 透明性チェック
     if check_types in ["transparency", "all"]:
-        has_disclosure = any(pattern in content for pattern in
-            ["AIです", "AI「", "自動返信", "AIアシスタント", "が作成しました"])
+        has_disclosure = LEXICON_DISCLOSURE in matches
 
         if not has_disclosure:
             issues.append("AI開示ラベルがありません")
@@ -949,7 +1313,7 @@ def makoto_check(
 
     # Central DBからガイドラインを取得
     if use_knowledge:
-        guidelines = _get_quality_guidelines(content)
+        guidelines = await _get_quality_guidelines(content)
         if guidelines:
             report += f"\n## Central DBからの参考ガイドライン\n\n{guidelines}\n"
 
@@ -967,63 +1331,55 @@ def makoto_check(
 # ナオミ（学習＆分析）- Central DB連携版
 # =============================================================================
 
-def _get_analysis_context(analysis_type: str, query: str = "") -> str:
-    """Central DBから分析に役立つコンテキストを取得"""
-    context_parts = []
+# 分析種別ごとの参考メソッド検索: (見出し, クエリ, カテゴリ)
+ANALYSIS_CONTEXT_SEARCHES = {
+    "progress": ("【顧客育成メソッド】", "顧客育成 フォローアップ エンゲージメント", "methods"),
+    "video": ("【参考コンテンツ】", "動画 パフォーマンス 分析", "content"),
+    "churn": ("【離脱防止メソッド】", "離脱 防止 リテンション", "methods"),
+}
 
-    if analysis_type == "progress":
-        # 顧客育成メソッドを検索
-        methods = central_db.search_knowledge(
-            query="顧客育成 フォローアップ エンゲージメント",
-            category="methods",
-            limit=2
-        )
-        if methods:
-            context_parts.append("【顧客育成メソッド】")
-            for m in methods:
-                context_parts.append(f"・{m.get('title', '')}")
-
-    elif analysis_type == "video":
-        # コンテンツ分析の知見を検索
-        content_insights = central_db.search_knowledge(
-            query="動画 パフォーマンス 分析",
-            category="content",
-            limit=2
-        )
-        if content_insights:
-            context_parts.append("【参考コンテンツ】")
-            for c in content_insights:
-                context_parts.append(f"・{c.get('title', '')}")
 
-    elif analysis_type == "churn":
-        # 離脱防止メソッドを検索
-        churn_methods = central_db.search_knowledge(
-            query="離脱 防止 リテンション",
-            category="methods",
+async def _get_analysis_context(analysis_type: str, query: str = "") -> str:
+    """Central DBから分析に役立つコンテキストを取得（検索は並行実行）"""
+    return await context_cache.get_or_build(
+        (query, f"analysis:{analysis_type}"),
+        lambda: _build_analysis_context(analysis_type, query),
+    )
+
+
+async def _build_analysis_context(analysis_type: str, query: str) -> str:
+    context_parts = []
+    search = ANALYSIS_CONTEXT_SEARCHES.get(analysis_type)
+
+    type_results, business = await asyncio.gather(
+        central_db.asearch_knowledge(
+            query=search[1],
+            category=search[2],
             limit=2
-        )
-        if churn_methods:
-            context_parts.append("【離脱防止メソッド】")
-            for m in churn_methods:
-                context_parts.append(f"・{m.get('title', '')}")
-
-    # ビジネスインサイトを検索
-    if query:
-        business = central_db.search_knowledge(
+        ) if search else _no_results(),
+        # ビジネスインサイトを検索
+        central_db.asearch_knowledge(
             query=query,
             category="business",
             limit=2
-        )
-        if business:
-            context_parts.append("\n【ビジネスインサイト】")
-            for b in business:
-                context_parts.append(f"・{b.get('title', '')}")
+        ) if query else _no_results(),
+    )
+
+    if type_results:
+        context_parts.append(search[0])
+        for r in type_results:
+            context_parts.append(f"・{r.get('title', '')}")
+
+    if business:
+        context_parts.append("\n【ビジネスインサイト】")
+        for b in business:
+            context_parts.append(f"・{b.get('title', '')}")
 
     return "\n".join(context_parts) if context_parts else ""
 
 
 @mcp.tool()
-def naomi_analyze(
+async def naomi_analyze(
     analysis_type: str = "progress",
     data: str = "{}",
     use_knowledge: bool = True,
@@ -1177,7 +1533,7 @@ def naomi_analyze(
     # Central DBからコンテキストを取得
     if use_knowledge:
         query = parsed_data.get("customer_name", "") or parsed_data.get("topic", "")
-        context = _get_analysis_context(analysis_type, query)
+        context = await _get_analysis_context(analysis_type, query)
         if context:
             report += f"\n## Central DBからの参考情報\n\n{context}\n"
         report = report.replace("が作成しました", "が作成しました（Central DB参照）")